@@ -71,3 +71,41 @@ DATA_EXTENSIONS = [
     ".csv",  # BOM or other data
     ".pos",  # Component position file
 ]
+
+# Parse cache settings
+# Upper bound on the estimated memory used by cached parse results
+PARSE_CACHE_MAX_BYTES = int(os.environ.get("KICAD_MCP_PARSE_CACHE_MB", "256")) * 1024 * 1024
+# Confirm files with changed timestamps by content hash before re-parsing
+PARSE_CACHE_VERIFY_CONTENT = os.environ.get("KICAD_MCP_PARSE_CACHE_VERIFY", "").lower() in ("1", "true", "yes")
+
+# Persistent cache of parsed designs, kept across server restarts
+if system == "Windows":
+    DISK_CACHE_DIR = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "kicad_mcp", "cache")
+else:
+    DISK_CACHE_DIR = os.path.expanduser("~/.kicad_mcp/cache")
+DISK_CACHE_DIR = os.environ.get("KICAD_MCP_CACHE_DIR", DISK_CACHE_DIR)
+DISK_CACHE_MAX_BYTES = int(os.environ.get("KICAD_MCP_DISK_CACHE_MB", "512")) * 1024 * 1024
+DISK_CACHE_ENABLED = os.environ.get("KICAD_MCP_DISK_CACHE", "1").lower() not in ("0", "false", "no")
+
+# Netlist tool pagination
+# Components and nets returned per page when the client does not set a limit
+NETLIST_PAGE_SIZE = int(os.environ.get("KICAD_MCP_NETLIST_PAGE_SIZE", "200"))
+# Largest page a client may request
+NETLIST_MAX_PAGE_SIZE = int(os.environ.get("KICAD_MCP_NETLIST_MAX_PAGE_SIZE", "2000"))
+
+# Cross-project component search index
+if system == "Windows":
+    COMPONENT_SEARCH_INDEX = os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "kicad_mcp", "component_index.sqlite3")
+else:
+    COMPONENT_SEARCH_INDEX = os.path.expanduser("~/.kicad_mcp/component_index.sqlite3")
+COMPONENT_SEARCH_INDEX = os.environ.get("KICAD_MCP_SEARCH_INDEX", COMPONENT_SEARCH_INDEX)
+
+# External commands (kicad-cli)
+# Seconds before a command is stopped
+CLI_TIMEOUT = float(os.environ.get("KICAD_MCP_CLI_TIMEOUT", "300"))
+# Bytes of a command's stdout and of its stderr that are kept
+CLI_MAX_OUTPUT_BYTES = int(os.environ.get("KICAD_MCP_CLI_MAX_OUTPUT_KB", "1024")) * 1024
+# Most kicad-cli commands run at once; 0 sizes the limit to the CPU cores and memory
+CLI_MAX_JOBS = int(os.environ.get("KICAD_MCP_CLI_MAX_JOBS", "0"))
+# Memory set aside for each running command when sizing the limit (a loaded board)
+CLI_JOB_MEMORY_BYTES = int(os.environ.get("KICAD_MCP_CLI_JOB_MEMORY_MB", "1024")) * 1024 * 1024
@@ -9,6 +9,11 @@ import os # Added for PID
 
 from mcp.server.fastmcp import FastMCP
 
+from kicad_mcp.config import DISK_CACHE_ENABLED
+from kicad_mcp.utils.cli_scheduler import get_cli_scheduler
+from kicad_mcp.utils.disk_cache import DiskCache
+from kicad_mcp.utils.parse_cache import ParseCache, set_parse_cache
+
 # Get PID for logging
 # _PID = os.getpid()
 
@@ -19,6 +24,9 @@ class KiCadAppContext:
     
     # Optional cache for expensive operations
     cache: Dict[str, Any]
+    
+    # Parsed schematics shared by all netlist consumers
+    parse_cache: ParseCache
 
 @asynccontextmanager
 async def kicad_lifespan(server: FastMCP, kicad_modules_available: bool = False) -> AsyncIterator[KiCadAppContext]:
@@ -46,6 +54,12 @@ async def kicad_lifespan(server: FastMCP, kicad_modules_available: bool = False)
     # Create in-memory cache for expensive operations
     cache: Dict[str, Any] = {}
     
+    # Share one parse cache between tools and resources; resources have no
+    # request context, so it is also installed as the process-wide default.
+    # The persistent store behind it keeps results across restarts.
+    parse_cache = ParseCache(store=DiskCache() if DISK_CACHE_ENABLED else None)
+    set_parse_cache(parse_cache)
+    
     # Initialize any other resources that need cleanup later
     created_temp_dirs = [] # Assuming this is managed elsewhere or not needed for now
     
@@ -62,7 +76,8 @@ async def kicad_lifespan(server: FastMCP, kicad_modules_available: bool = False)
         logging.info(f"KiCad MCP server initialization complete")
         yield KiCadAppContext(
             kicad_modules_available=kicad_modules_available, # Pass the flag through
-            cache=cache
+            cache=cache,
+            parse_cache=parse_cache
         )
     finally:
         # Clean up resources when server shuts down
@@ -73,6 +88,11 @@ async def kicad_lifespan(server: FastMCP, kicad_modules_available: bool = False)
             logging.info(f"Clearing cache with {len(cache)} entries")
             cache.clear()
         
+        logging.info(f"Parse cache stats: {parse_cache.stats()}")
+        logging.info(f"kicad-cli job stats: {get_cli_scheduler().stats()}")
+        set_parse_cache(None)
+        parse_cache.invalidate()
+        
         # Clean up any temporary directories
         import shutil
         for temp_dir in created_temp_dirs:
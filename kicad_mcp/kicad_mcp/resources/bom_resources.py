@@ -11,7 +11,7 @@ from mcp.server.fastmcp import FastMCP
 from kicad_mcp.utils.file_utils import get_project_files
 
 # Import the helper functions from bom_tools.py to avoid code duplication
-from kicad_mcp.tools.bom_tools import parse_bom_file, analyze_bom_data
+from kicad_mcp.tools.bom_tools import parse_bom_file, analyze_bom_file
 
 def register_bom_resources(mcp: FastMCP) -> None:
     """Register BOM-related resources with the MCP server.
@@ -58,14 +58,12 @@ def register_bom_resources(mcp: FastMCP) -> None:
         for file_type, file_path in bom_files.items():
             try:
                 # Parse and analyze the BOM
-                bom_data, format_info = parse_bom_file(file_path)
+                bom_data, format_info, analysis = analyze_bom_file(file_path)
                 
                 if not bom_data:
                     report += f"## {file_type}\n\nFailed to parse BOM file: {os.path.basename(file_path)}\n\n"
                     continue
                 
-                analysis = analyze_bom_data(bom_data, format_info)
-                
                 # Add file section
                 report += f"## {file_type.capitalize()}\n\n"
                 report += f"**File**: {os.path.basename(file_path)}\n\n"
@@ -104,6 +102,15 @@ def register_bom_resources(mcp: FastMCP) -> None:
                     
                     report += "\n"
                 
+                # Add passive values, grouped by parsed value
+                if analysis.get('value_groups'):
+                    report += "### Passive Component Values\n\n"
+                    
+                    for category, values in analysis['value_groups'].items():
+                        report += f"- **{category}**: " + ", ".join(f"{value} ×{count}" for value, count in values.items()) + "\n"
+                    
+                    report += "\n"
+                
                 # Add component table (first 20 items)
                 if bom_data:
                     report += "### Component List\n\n"
@@ -263,10 +270,9 @@ def register_bom_resources(mcp: FastMCP) -> None:
                             pass
 
                 # Otherwise parse with our utility
-                bom_data, format_info = parse_bom_file(file_path)
+                bom_data, format_info, analysis = analyze_bom_file(file_path)
 
                 if bom_data:
-                    analysis = analyze_bom_data(bom_data, format_info)
                     result["bom_files"][file_type] = {
                         "file": os.path.basename(file_path),
                         "format": format_info,
@@ -9,6 +9,9 @@ from kicad_mcp.utils.file_utils import get_project_files
 from kicad_mcp.utils.drc_history import get_drc_history
 from kicad_mcp.tools.drc_impl.cli_drc import run_drc_via_cli
 
+# Most checks shown in the history chart and table
+HISTORY_CHART_WIDTH = 60
+
 def register_drc_resources(mcp: FastMCP) -> None:
     """Register DRC resources with the MCP server.
     
@@ -31,8 +34,8 @@ def register_drc_resources(mcp: FastMCP) -> None:
         if not os.path.exists(project_path):
             return f"Project not found: {project_path}"
         
-        # Get history entries
-        history_entries = get_drc_history(project_path)
+        # Get history entries, thinned out to fit the chart
+        history_entries = get_drc_history(project_path, max_entries=HISTORY_CHART_WIDTH)
         
         if not history_entries:
             return "# DRC History\n\nNo DRC history available for this project. Run a DRC check first."
@@ -136,7 +139,7 @@ def register_drc_resources(mcp: FastMCP) -> None:
         return report
     
     @mcp.resource("kicad://drc/{project_path}")
-    def get_drc_report(project_path: str) -> str:
+    async def get_drc_report(project_path: str) -> str:
         """Get a formatted DRC report for a KiCad project.
         
         Args:
@@ -159,7 +162,7 @@ def register_drc_resources(mcp: FastMCP) -> None:
         print(f"Found PCB file: {pcb_file}")
         
         # Try to run DRC via command line
-        drc_results = run_drc_via_cli(pcb_file)
+        drc_results = await run_drc_via_cli(pcb_file)
         
         if not drc_results["success"]:
             error_message = drc_results.get("error", "Unknown error")
@@ -5,6 +5,7 @@ import os
 from mcp.server.fastmcp import FastMCP
 
 from kicad_mcp.utils.file_utils import get_project_files
+from kicad_mcp.utils.netlist_index import get_netlist_index
 from kicad_mcp.utils.netlist_parser import extract_netlist, analyze_netlist
 
 
@@ -220,8 +221,9 @@ def register_netlist_resources(mcp: FastMCP) -> None:
             nets = netlist_data.get("nets", {})
             connected_nets = []
             
-            for net_name, pins in nets.items():
-                # Check if any pin belongs to our component
+            # Only the nets this component is on
+            for net_name in get_netlist_index(netlist_data).nets_of(component_ref):
+                pins = nets[net_name]
                 for pin in pins:
                     if pin.get('component') == component_ref:
                         connected_nets.append({
@@ -6,15 +6,7 @@ from mcp.server.fastmcp import FastMCP
 
 from kicad_mcp.utils.file_utils import get_project_files
 from kicad_mcp.utils.netlist_parser import extract_netlist
-from kicad_mcp.utils.pattern_recognition import (
-    identify_power_supplies,
-    identify_amplifiers,
-    identify_filters,
-    identify_oscillators,
-    identify_digital_interfaces,
-    identify_microcontrollers,
-    identify_sensor_interfaces
-)
+from kicad_mcp.utils.pattern_recognition import identify_all_patterns
 
 
 def register_pattern_resources(mcp: FastMCP) -> None:
@@ -44,17 +36,15 @@ def register_pattern_resources(mcp: FastMCP) -> None:
             if "error" in netlist_data:
                 return f"# Circuit Pattern Analysis Error\n\nError: {netlist_data['error']}"
             
-            components = netlist_data.get("components", {})
-            nets = netlist_data.get("nets", {})
-            
             # Identify circuit patterns
-            power_supplies = identify_power_supplies(components, nets)
-            amplifiers = identify_amplifiers(components, nets)
-            filters = identify_filters(components, nets)
-            oscillators = identify_oscillators(components, nets)
-            digital_interfaces = identify_digital_interfaces(components, nets)
-            microcontrollers = identify_microcontrollers(components)
-            sensor_interfaces = identify_sensor_interfaces(components, nets)
+            patterns = identify_all_patterns(schematic_path, netlist_data)
+            power_supplies = patterns["power_supply_circuits"]
+            amplifiers = patterns["amplifier_circuits"]
+            filters = patterns["filter_circuits"]
+            oscillators = patterns["oscillator_circuits"]
+            digital_interfaces = patterns["digital_interface_circuits"]
+            microcontrollers = patterns["microcontroller_circuits"]
+            sensor_interfaces = patterns["sensor_interface_circuits"]
             
             # Format as Markdown report
             schematic_name = os.path.basename(schematic_path)
@@ -106,6 +96,11 @@ def register_pattern_resources(mcp: FastMCP) -> None:
                         report += f"- **Main Component**: {ps.get('main_component', 'Unknown')}\n"
                         report += f"- **Inductor**: {ps.get('inductor', 'Unknown')}\n"
                         report += f"- **Value**: {ps.get('value', 'Unknown')}\n"
+                        report += f"- **Switch Node**: {ps.get('switch_node', 'Unknown')}\n"
+                        if ps.get("input_net"):
+                            report += f"- **Input**: {ps['input_net']} ({', '.join(ps.get('input_capacitors', [])) or 'no capacitors'})\n"
+                        if ps.get("output_net"):
+                            report += f"- **Output**: {ps['output_net']} ({', '.join(ps.get('output_capacitors', [])) or 'no capacitors'})\n"
                     
                     report += "\n"
             
@@ -146,6 +141,8 @@ def register_pattern_resources(mcp: FastMCP) -> None:
                         report += f"- **Type**: Passive Filter\n"
                         report += f"- **Topology**: {filt_subtype.replace('_', ' ').upper() if filt_subtype else 'Unknown'}\n"
                         report += f"- **Components**: {', '.join(filt.get('components', []))}\n"
+                        if filt.get("cutoff_frequency"):
+                            report += f"- **Cutoff Frequency**: {filt['cutoff_frequency']:g} Hz\n"
                     elif filt_type == "active_filter":
                         report += f"- **Type**: Active Filter\n"
                         report += f"- **Main Component**: {filt.get('main_component', 'Unknown')}\n"
@@ -25,6 +25,7 @@ from kicad_mcp.tools.drc_tools import register_drc_tools
 from kicad_mcp.tools.bom_tools import register_bom_tools
 from kicad_mcp.tools.netlist_tools import register_netlist_tools
 from kicad_mcp.tools.pattern_tools import register_pattern_tools
+from kicad_mcp.tools.graph_tools import register_graph_tools
 
 # Import prompt handlers
 from kicad_mcp.prompts.templates import register_prompts
@@ -150,6 +151,7 @@ def create_server() -> FastMCP:
     register_bom_tools(mcp)
     register_netlist_tools(mcp)
     register_pattern_tools(mcp)
+    register_graph_tools(mcp)
     
     # Register prompts
     logging.info(f"Registering prompts...")
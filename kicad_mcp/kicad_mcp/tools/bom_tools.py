@@ -4,11 +4,19 @@ Bill of Materials (BOM) processing tools for KiCad projects.
 import os
 import csv
 import json
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional, Tuple
 from mcp.server.fastmcp import FastMCP, Context, Image
 
+from kicad_mcp.utils.component_utils import format_value, parse_values
 from kicad_mcp.utils.file_utils import get_project_files
+from kicad_mcp.utils.parse_cache import get_parse_cache
+from kicad_mcp.utils.cli_scheduler import PRIORITY_INTERACTIVE, get_cli_scheduler
+
+# Version of BOM parsing and analysis; bump when results change so
+# persisted analyses from older versions are not reused
+BOM_ANALYSIS_VERSION = 2
 
 def register_bom_tools(mcp: FastMCP) -> None:
     """Register BOM-related tools with the MCP server.
@@ -78,16 +86,13 @@ def register_bom_tools(mcp: FastMCP) -> None:
             try:
                 ctx.info(f"Analyzing {os.path.basename(file_path)}")
                 
-                # Parse the BOM file
-                bom_data, format_info = parse_bom_file(file_path)
+                # Parse and analyze the BOM file
+                bom_data, format_info, analysis = analyze_bom_file(file_path)
                 
                 if not bom_data or len(bom_data) == 0:
                     print(f"Failed to parse BOM file: {file_path}")
                     continue
                 
-                # Analyze the BOM data
-                analysis = analyze_bom_data(bom_data, format_info)
-                
                 # Add to results
                 results["bom_files"][file_type] = {
                     "path": file_path,
@@ -231,6 +236,35 @@ def register_bom_tools(mcp: FastMCP) -> None:
 
 # Helper functions for BOM processing
 
+def analyze_bom_file(file_path: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Parse and analyze a BOM file, reusing cached results while it is unchanged.
+    
+    Args:
+        file_path: Path to the BOM file
+        
+    Returns:
+        Tuple containing:
+            - List of component dictionaries
+            - Dictionary with format information
+            - Dictionary with analysis results, or None if nothing was parsed
+    """
+    cache = get_parse_cache()
+    if cache is not None:
+        cached = cache.get("bom_analysis", file_path, version=BOM_ANALYSIS_VERSION)
+        if cached is not None:
+            print(f"Using cached BOM analysis for {file_path}")
+            return cached
+    
+    bom_data, format_info = parse_bom_file(file_path)
+    analysis = analyze_bom_data(bom_data, format_info) if bom_data else None
+    result = (bom_data, format_info, analysis)
+    
+    if cache is not None and bom_data:
+        cache.put("bom_analysis", file_path, result, version=BOM_ANALYSIS_VERSION)
+    
+    return result
+
+
 def parse_bom_file(file_path: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """Parse a BOM file and detect its format.
     
@@ -555,6 +589,24 @@ def analyze_bom_data(components: List[Dict[str, Any]], format_info: Dict[str, An
             value_counts = df[value_col].value_counts()
             most_common = value_counts.head(5).to_dict()
             results["most_common_values"] = {str(k): int(v) for k, v in most_common.items()}
+            
+            # Group passives by their parsed value, so that 4k7, 4.7k and
+            # 4700 count as the same resistor
+            prefixes = df[ref_col].astype(str).str.extract(r'^\s*([A-Za-z]+)', expand=False)
+            si_values = parse_values(df[value_col])
+            if quantity_col:
+                counts = df[quantity_col].to_numpy()
+            else:
+                counts = (df[ref_col].astype(str).str.count(',') + 1).to_numpy()
+            
+            value_groups = {}
+            for prefix, category in (('R', 'Resistors'), ('C', 'Capacitors'), ('L', 'Inductors')):
+                mask = (prefixes == prefix).to_numpy() & ~np.isnan(si_values)
+                if mask.any():
+                    totals = pd.Series(counts[mask]).groupby(si_values[mask]).sum()
+                    value_groups[category] = {format_value(value, prefix): int(count) for value, count in totals.items()}
+            if value_groups:
+                results["value_groups"] = value_groups
     
     except Exception as e:
         print(f"Error analyzing BOM data: {str(e)}", exc_info=True)
@@ -618,7 +670,6 @@ async def export_bom_with_cli(schematic_file: str, output_dir: str, project_name
     Returns:
         Dictionary with export results
     """
-    import subprocess
     import platform
     
     system = platform.system()
@@ -697,20 +748,26 @@ async def export_bom_with_cli(schematic_file: str, output_dir: str, project_name
         }
     
     try:
-        print(f"Running command: {' '.join(cmd)}")
         await ctx.report_progress(60, 100)
         
-        # Run the command
-        process = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        # Run the command through the kicad-cli scheduler
+        process = await get_cli_scheduler().run_command(
+            cmd, PRIORITY_INTERACTIVE, inputs=[schematic_file], timeout=30)
+        
+        if process.timed_out:
+            return {
+                "success": False,
+                "error": "BOM export command timed out after 30 seconds",
+                "schematic_file": schematic_file
+            }
         
         # Check if the command was successful
-        if process.returncode != 0:
-            print(f"BOM export command failed with code {process.returncode}")
-            print(f"Error output: {process.stderr}")
+        if not process.success:
+            print(f"BOM export command failed: {process.describe_failure()}")
             
             return {
                 "success": False,
-                "error": f"BOM export command failed: {process.stderr}",
+                "error": f"BOM export command failed: {process.describe_failure()}",
                 "schematic_file": schematic_file,
                 "command": ' '.join(cmd)
             }
@@ -746,14 +803,6 @@ async def export_bom_with_cli(schematic_file: str, output_dir: str, project_name
             "message": "BOM exported successfully"
         }
     
-    except subprocess.TimeoutExpired:
-        print("BOM export command timed out after 30 seconds")
-        return {
-            "success": False,
-            "error": "BOM export command timed out after 30 seconds",
-            "schematic_file": schematic_file
-        }
-    
     except Exception as e:
         print(f"Error exporting BOM: {str(e)}", exc_info=True)
         return {
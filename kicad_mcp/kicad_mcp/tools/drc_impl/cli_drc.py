@@ -3,22 +3,42 @@ Design Rule Check (DRC) implementation using KiCad command-line interface.
 """
 import os
 import json
-import subprocess
+import shutil
 import tempfile
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from mcp.server.fastmcp import Context
 
-from kicad_mcp.config import system
+from kicad_mcp.config import KICAD_EXTENSIONS, system
+from kicad_mcp.utils.cli_scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE, get_cli_scheduler, job_key
+from kicad_mcp.utils.drc_diff import fingerprint_hex, fingerprint_violation
+from kicad_mcp.utils.parse_cache import get_parse_cache
+from kicad_mcp.utils.process_runner import run_process
 
-async def run_drc_via_cli(pcb_file: str, ctx: Context) -> Dict[str, Any]:
+# Bump when the layout of DRC results changes; cached results are then ignored
+DRC_RESULT_VERSION = 2
+
+# kicad-cli path -> (mtime_ns, version)
+_cli_versions: Dict[str, Tuple[int, str]] = {}
+
+async def run_drc_via_cli(pcb_file: str, ctx: Optional[Context] = None,
+                          force: bool = False) -> Dict[str, Any]:
     """Run DRC using KiCad command line tools.
     
+    Results are cached in memory and on disk per board file and content,
+    design rules (.kicad_dru and project settings) and kicad-cli version, so
+    checking an unchanged board again does not run kicad-cli. Otherwise the
+    command runs as a batch job of the kicad-cli scheduler; a check of a
+    board that is already being checked, with unchanged inputs, waits for
+    that run instead of starting another.
+    
     Args:
         pcb_file: Path to the PCB file (.kicad_pcb)
-        ctx: MCP context for progress reporting
+        ctx: MCP context for progress reporting, if any
+        force: Run kicad-cli even if a cached result exists
         
     Returns:
-        Dictionary with DRC results
+        Dictionary with DRC results; ``cached`` tells whether they came
+        from the cache
     """
     results = {
         "success": False,
@@ -27,91 +47,188 @@ async def run_drc_via_cli(pcb_file: str, ctx: Context) -> Dict[str, Any]:
     }
     
     try:
-        # Create a temporary directory for the output
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Output file for DRC report
-            output_file = os.path.join(temp_dir, "drc_report.json")
-            
-            # Find kicad-cli executable
-            kicad_cli = find_kicad_cli()
-            if not kicad_cli:
-                print("kicad-cli not found in PATH or common installation locations")
-                results["error"] = "kicad-cli not found. Please ensure KiCad 9.0+ is installed and kicad-cli is available."
-                return results
-            
-            # Report progress 
+        # Find kicad-cli executable
+        kicad_cli = find_kicad_cli()
+        if not kicad_cli:
+            print("kicad-cli not found in PATH or common installation locations")
+            results["error"] = "kicad-cli not found. Please ensure KiCad 9.0+ is installed and kicad-cli is available."
+            return results
+        
+        inputs = get_drc_inputs(pcb_file)
+        cache = get_parse_cache()
+        cli_version = await get_kicad_cli_version(kicad_cli)
+        # Which rule files exist is part of the version: a rules file added
+        # later must not hit a result computed without it. Results are
+        # stored per board path, so the rule files checked on a hit are
+        # always the ones next to this board, not those of a copy
+        version = (DRC_RESULT_VERSION, cli_version, tuple(os.path.splitext(path)[1] for path in inputs))
+        
+        if cache is not None and cli_version is not None and not force:
+            cached = cache.get("drc", pcb_file, version=version)
+            if cached is not None:
+                print(f"Using cached DRC result for {pcb_file}")
+                if ctx is not None:
+                    ctx.info(f"Board and rules unchanged; using cached DRC result with {cached['total_violations']} violations")
+                return {**cached, "cached": True}
+        
+        # Report progress 
+        if ctx is not None:
             await ctx.report_progress(50, 100)
             ctx.info("Running DRC using KiCad CLI...")
-            
-            # Build the DRC command
-            cmd = [
-                kicad_cli, 
-                "pcb", 
-                "drc",
-                "--format", "json",
-                "--output", output_file,
-                pcb_file
-            ]
-            
-            print(f"Running command: {' '.join(cmd)}")
-            process = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Check if the command was successful
-            if process.returncode != 0:
-                print(f"DRC command failed with code {process.returncode}")
-                print(f"Error output: {process.stderr}")
-                results["error"] = f"DRC command failed: {process.stderr}"
-                return results
-            
-            # Check if the output file was created
-            if not os.path.exists(output_file):
-                print("DRC report file not created")
-                results["error"] = "DRC report file not created"
-                return results
-            
-            # Read the DRC report
-            with open(output_file, 'r') as f:
-                try:
-                    drc_report = json.load(f)
-                except json.JSONDecodeError:
-                    print("Failed to parse DRC report JSON")
-                    results["error"] = "Failed to parse DRC report JSON"
-                    return results
-            
-            # Process the DRC report
-            violations = drc_report.get("violations", [])
-            violation_count = len(violations)
-            print(f"DRC completed with {violation_count} violations")
+        
+        async def run_and_cache() -> Dict[str, Any]:
+            drc_results = await _run_drc_command(kicad_cli, pcb_file)
+            if drc_results["success"] and cache is not None and cli_version is not None:
+                cache.put("drc", pcb_file, drc_results, dependencies=inputs[1:], version=version)
+            return drc_results
+        
+        key = job_key("drc", kicad_cli, os.path.abspath(pcb_file), inputs=inputs)
+        
+        # The result may be shared with other waiters; copy before returning
+        results = {**await get_cli_scheduler().run(run_and_cache, PRIORITY_BATCH, key), "cached": False}
+        
+        if results["success"] and ctx is not None:
             await ctx.report_progress(70, 100)
-            ctx.info(f"DRC completed with {violation_count} violations")
-            
-            # Categorize violations by type
-            error_types = {}
-            for violation in violations:
-                error_type = violation.get("message", "Unknown")
-                if error_type not in error_types:
-                    error_types[error_type] = 0
-                error_types[error_type] += 1
-            
-            # Create success response
-            results = {
-                "success": True,
-                "method": "cli",
-                "pcb_file": pcb_file,
-                "total_violations": violation_count,
-                "violation_categories": error_types,
-                "violations": violations
-            }
-            
+            ctx.info(f"DRC completed with {results['total_violations']} violations")
             await ctx.report_progress(90, 100)
-            return results
+        return results
             
     except Exception as e:
-        print(f"Error in CLI DRC: {str(e)}", exc_info=True)
+        print(f"Error in CLI DRC: {str(e)}")
         results["error"] = f"Error in CLI DRC: {str(e)}"
         return results
 
 
+async def get_kicad_cli_version(kicad_cli: str) -> Optional[str]:
+    """Get the version of a kicad-cli executable.
+    
+    The version is remembered until the executable changes.
+    
+    Args:
+        kicad_cli: Path to kicad-cli
+        
+    Returns:
+        Version string (e.g. "9.0.2"), or None if it cannot be determined
+    """
+    try:
+        mtime_ns = os.stat(kicad_cli).st_mtime_ns
+    except OSError:
+        return None
+    
+    known = _cli_versions.get(kicad_cli)
+    if known is not None and known[0] == mtime_ns:
+        return known[1]
+    
+    process = await get_cli_scheduler().run_command([kicad_cli, "version"], PRIORITY_INTERACTIVE, timeout=30)
+    lines = process.stdout.strip().splitlines()
+    if not process.success or not lines:
+        print(f"Could not determine kicad-cli version: {process.describe_failure()}")
+        return None
+    
+    _cli_versions[kicad_cli] = (mtime_ns, lines[-1].strip())
+    return lines[-1].strip()
+
+
+async def _run_drc_command(kicad_cli: str, pcb_file: str) -> Dict[str, Any]:
+    """Run kicad-cli DRC on a board and read its JSON report.
+    
+    Args:
+        kicad_cli: Path to kicad-cli
+        pcb_file: Path to the PCB file (.kicad_pcb)
+        
+    Returns:
+        Dictionary with DRC results
+    """
+    results = {
+        "success": False,
+        "method": "cli",
+        "pcb_file": pcb_file
+    }
+    
+    # Create a temporary directory for the output
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Output file for DRC report
+        output_file = os.path.join(temp_dir, "drc_report.json")
+        
+        # Build the DRC command
+        cmd = [
+            kicad_cli, 
+            "pcb", 
+            "drc",
+            "--format", "json",
+            "--output", output_file,
+            pcb_file
+        ]
+        
+        process = await run_process(cmd)
+        
+        # Check if the command was successful
+        if not process.success:
+            print(f"DRC command failed: {process.describe_failure()}")
+            results["error"] = f"DRC command failed: {process.describe_failure()}"
+            results["process"] = process.to_dict()
+            return results
+        
+        # Check if the output file was created
+        if not os.path.exists(output_file):
+            print("DRC report file not created")
+            results["error"] = "DRC report file not created"
+            return results
+        
+        # Read the DRC report
+        with open(output_file, 'r') as f:
+            try:
+                drc_report = json.load(f)
+            except json.JSONDecodeError:
+                print("Failed to parse DRC report JSON")
+                results["error"] = "Failed to parse DRC report JSON"
+                return results
+    
+    # Process the DRC report
+    violations = drc_report.get("violations", [])
+    violation_count = len(violations)
+    print(f"DRC completed with {violation_count} violations")
+    
+    # Categorize violations by type; fingerprint each violation so later
+    # checks can tell which ones were fixed (see drc_diff)
+    error_types = {}
+    for violation in violations:
+        violation["fingerprint"] = fingerprint_hex(fingerprint_violation(violation))
+        error_type = violation.get("message", "Unknown")
+        if error_type not in error_types:
+            error_types[error_type] = 0
+        error_types[error_type] += 1
+    
+    # Create success response
+    return {
+        "success": True,
+        "method": "cli",
+        "pcb_file": pcb_file,
+        "total_violations": violation_count,
+        "violation_categories": error_types,
+        "violations": violations
+    }
+
+
+def get_drc_inputs(pcb_file: str) -> List[str]:
+    """Get the files a DRC result depends on.
+    
+    Args:
+        pcb_file: Path to the PCB file (.kicad_pcb)
+        
+    Returns:
+        The board, followed by its custom design rules (.kicad_dru) and
+        project file (.kicad_pro, holding net classes and rule severities)
+        where they exist
+    """
+    base = os.path.splitext(pcb_file)[0]
+    inputs = [pcb_file]
+    for extension in (KICAD_EXTENSIONS["design_rules"], KICAD_EXTENSIONS["project"]):
+        if os.path.exists(base + extension):
+            inputs.append(base + extension)
+    return inputs
+
+
 def find_kicad_cli() -> Optional[str]:
     """Find the kicad-cli executable in the system PATH.
     
@@ -119,20 +236,9 @@ def find_kicad_cli() -> Optional[str]:
         Path to kicad-cli if found, None otherwise
     """
     # Check if kicad-cli is in PATH
-    try:
-        if system == "Windows":
-            # On Windows, check for kicad-cli.exe
-            result = subprocess.run(["where", "kicad-cli.exe"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip().split("\n")[0]
-        else:
-            # On Unix-like systems, use which
-            result = subprocess.run(["which", "kicad-cli"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-    
-    except Exception as e:
-        print(f"Error finding kicad-cli: {str(e)}")
+    kicad_cli = shutil.which("kicad-cli.exe" if system == "Windows" else "kicad-cli")
+    if kicad_cli:
+        return kicad_cli
     
     # If we get here, kicad-cli is not in PATH
     # Try common installation locations
@@ -2,12 +2,15 @@
 Design Rule Check (DRC) tools for KiCad PCB files.
 """
 import os
+import sqlite3
+import time
 # import logging # <-- Remove if no other logging exists
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from mcp.server.fastmcp import FastMCP, Context
 
 from kicad_mcp.utils.file_utils import get_project_files
-from kicad_mcp.utils.drc_history import save_drc_result, get_drc_history, compare_with_previous
+from kicad_mcp.utils.drc_history import save_drc_result, get_drc_history, compare_with_previous, compare_checks
+from kicad_mcp.utils.cli_scheduler import get_cli_scheduler
 
 # Import implementations
 from kicad_mcp.tools.drc_impl.cli_drc import run_drc_via_cli
@@ -20,11 +23,15 @@ def register_drc_tools(mcp: FastMCP) -> None:
     """
     
     @mcp.tool()
-    def get_drc_history_tool(project_path: str) -> Dict[str, Any]:
+    def get_drc_history_tool(project_path: str, days: Optional[float] = None,
+                             max_entries: int = 100) -> Dict[str, Any]:
         """Get the DRC check history for a KiCad project.
         
         Args:
             project_path: Path to the KiCad project file (.kicad_pro)
+            days: Only include checks from this many days back; omit for the whole history
+            max_entries: Longer histories are thinned out to about this many
+                entries, evenly spread over time
             
         Returns:
             Dictionary with DRC history entries
@@ -36,7 +43,8 @@ def register_drc_tools(mcp: FastMCP) -> None:
             return {"success": False, "error": f"Project not found: {project_path}"}
         
         # Get history entries
-        history_entries = get_drc_history(project_path)
+        since = time.time() - days * 86400 if days is not None else None
+        history_entries = get_drc_history(project_path, since=since, max_entries=max_entries)
         
         # Calculate trend information
         trend = None
@@ -63,12 +71,66 @@ def register_drc_tools(mcp: FastMCP) -> None:
         }
     
     @mcp.tool()
-    async def run_drc_check(project_path: str, ctx: Context) -> Dict[str, Any]:
+    def compare_drc_checks(project_path: str, newer_timestamp: Optional[float] = None,
+                           older_timestamp: Optional[float] = None) -> Dict[str, Any]:
+        """Compare two DRC checks of a KiCad project violation by violation.
+        
+        Violations are matched by fingerprint (type, board items involved and
+        position), so the result tells which violations were fixed and which
+        are new even when their total stayed the same. Timestamps are those
+        of the DRC history entries.
+        
+        Args:
+            project_path: Path to the KiCad project file (.kicad_pro)
+            newer_timestamp: Timestamp of the newer check; omit for the latest check
+            older_timestamp: Timestamp of the older check; omit for the check before the newer one
+            
+        Returns:
+            Dictionary with both checks and the added, resolved and
+            persistent violations
+        """
+        print(f"Comparing DRC checks for project: {project_path}")
+        
+        if not os.path.exists(project_path):
+            print(f"Project not found: {project_path}")
+            return {"success": False, "error": f"Project not found: {project_path}"}
+        
+        try:
+            comparison = compare_checks(project_path, newer_timestamp, older_timestamp)
+        except (ValueError, sqlite3.Error) as e:
+            print(f"Error comparing DRC checks: {str(e)}")
+            return {"success": False, "error": str(e)}
+        
+        if comparison is None:
+            return {"success": False, "error": "Need two DRC checks in the history to compare; run a DRC check first"}
+        
+        return {"success": True, "project_path": project_path, **comparison}
+    
+    @mcp.tool()
+    def get_cli_job_status() -> Dict[str, Any]:
+        """Get the state of the kicad-cli job queue.
+        
+        DRC runs, thumbnails and exports share a limited number of kicad-cli
+        processes; this shows how busy they are.
+        
+        Returns:
+            Dictionary with the job limit, running and queued jobs per
+            priority class, merged duplicate jobs and queue wait times
+        """
+        return {"success": True, **get_cli_scheduler().stats()}
+    
+    @mcp.tool()
+    async def run_drc_check(project_path: str, ctx: Context, force: bool = False) -> Dict[str, Any]:
         """Run a Design Rule Check on a KiCad PCB file.
         
+        If the board, its design rules and kicad-cli are unchanged since an
+        earlier check, the cached result of that check is returned (and
+        still recorded in the DRC history).
+        
         Args:
             project_path: Path to the KiCad project file (.kicad_pro)
             ctx: MCP context for progress reporting
+            force: Run the check even if a cached result exists
             
         Returns:
             Dictionary with DRC results and statistics
@@ -98,21 +160,24 @@ def register_drc_tools(mcp: FastMCP) -> None:
         print("Using kicad-cli for DRC")
         ctx.info("Using KiCad CLI for DRC check...")
         # logging.info(f"[DRC] Calling run_drc_via_cli for {pcb_file}") # <-- Remove log
-        drc_results = await run_drc_via_cli(pcb_file, ctx)
+        drc_results = await run_drc_via_cli(pcb_file, ctx, force=force)
         # logging.info(f"[DRC] run_drc_via_cli finished for {pcb_file}") # <-- Remove log
         
         # Process and save results if successful
         if drc_results and drc_results.get("success", False):
             # logging.info(f"[DRC] DRC check successful for {pcb_file}. Saving results.") # <-- Remove log
-            # Save results to history
+            # Compare with the previous run, then save results to history
+            comparison = compare_with_previous(project_path, drc_results)
             save_drc_result(project_path, drc_results)
             
-            # Add comparison with previous run
-            comparison = compare_with_previous(project_path, drc_results)
             if comparison:
                 drc_results["comparison"] = comparison
                 
-                if comparison["change"] < 0:
+                violations = comparison.get("violations")
+                if violations and (violations["added_count"] or violations["resolved_count"]):
+                    ctx.info(f"Since the last check: {violations['resolved_count']} violations fixed, "
+                             f"{violations['added_count']} new, {violations['persistent_count']} remaining.")
+                elif comparison["change"] < 0:
                     ctx.info(f"Great progress! You've fixed {abs(comparison['change'])} DRC violations since the last check.")
                 elif comparison["change"] > 0:
                     ctx.info(f"Found {comparison['change']} new DRC violations since the last check.")
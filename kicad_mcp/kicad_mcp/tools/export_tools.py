@@ -3,7 +3,6 @@ Export tools for KiCad projects.
 """
 import os
 import tempfile
-import subprocess
 import shutil
 import asyncio
 from typing import Dict, Any, Optional
@@ -11,6 +10,7 @@ from mcp.server.fastmcp import FastMCP, Context, Image
 
 from kicad_mcp.utils.file_utils import get_project_files
 from kicad_mcp.config import KICAD_APP_PATH, system
+from kicad_mcp.utils.cli_scheduler import PRIORITY_INTERACTIVE, get_cli_scheduler
 
 def register_export_tools(mcp: FastMCP) -> None:
     """Register export tools with the MCP server.
@@ -162,45 +162,36 @@ async def generate_thumbnail_with_cli(pcb_file: str, ctx: Context) -> Optional[I
             pcb_file
         ]
 
-        print(f"Running command: {' '.join(cmd)}")
         await ctx.report_progress(50, 100)
 
-        # Run the command
-        try:
-            process = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=30)
-            print(f"Command successful: {process.stdout}")
-
-            await ctx.report_progress(70, 100)
-
-            # Check if the output file was created
-            if not os.path.exists(output_file):
-                print(f"Output file not created: {output_file}")
-                return None
-
-            # Read the image file
-            with open(output_file, 'rb') as f:
-                img_data = f.read()
-
-            print(f"Successfully generated thumbnail with CLI, size: {len(img_data)} bytes")
-            await ctx.report_progress(90, 100)
-            # Inform user about the saved file
-            await ctx.info(f"Thumbnail saved to: {output_file}")
-            return Image(data=img_data, format="svg") # <-- Changed format to svg
-
-        except subprocess.CalledProcessError as e:
-            print(f"Command '{' '.join(e.cmd)}' failed with code {e.returncode}")
-            print(f"Stderr: {e.stderr}")
-            print(f"Stdout: {e.stdout}")
-            await ctx.info(f"KiCad CLI command failed: {e.stderr or e.stdout}")
-            return None
-        except subprocess.TimeoutExpired:
-            print(f"Command timed out after 30 seconds: {' '.join(cmd)}")
+        # Run the command as interactive work; a client already rendering
+        # the same board shares the result
+        process = await get_cli_scheduler().run_command(
+            cmd, PRIORITY_INTERACTIVE, inputs=[pcb_file], timeout=30)
+        if process.timed_out:
             await ctx.info("KiCad CLI command timed out")
             return None
-        except Exception as e:
-            print(f"Error running CLI command: {str(e)}", exc_info=True)
-            await ctx.info(f"Error running KiCad CLI: {str(e)}")
+        if not process.success:
+            await ctx.info(f"KiCad CLI command failed: {process.describe_failure()}")
+            return None
+        print(f"Command successful: {process.stdout}")
+
+        await ctx.report_progress(70, 100)
+
+        # Check if the output file was created
+        if not os.path.exists(output_file):
+            print(f"Output file not created: {output_file}")
             return None
+
+        # Read the image file
+        with open(output_file, 'rb') as f:
+            img_data = f.read()
+
+        print(f"Successfully generated thumbnail with CLI, size: {len(img_data)} bytes")
+        await ctx.report_progress(90, 100)
+        # Inform user about the saved file
+        await ctx.info(f"Thumbnail saved to: {output_file}")
+        return Image(data=img_data, format="svg") # <-- Changed format to svg
                 
     except asyncio.CancelledError:
         print("CLI thumbnail generation cancelled")
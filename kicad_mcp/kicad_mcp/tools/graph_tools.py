@@ -0,0 +1,243 @@
+"""
+Connectivity graph tools for KiCad schematics.
+"""
+import os
+from typing import Dict, Any, Optional, Tuple
+from mcp.server.fastmcp import FastMCP, Context
+
+import numpy as np
+
+from kicad_mcp.utils.netlist_index import NetlistIndex, get_netlist_index
+from kicad_mcp.utils.netlist_parser import extract_netlist
+
+def _load_graph(schematic_path: str, ctx: Context) -> Tuple[Optional[NetlistIndex], Dict[str, Any]]:
+    """Get the index of a schematic's netlist, with its graph.
+
+    Returns:
+        Tuple of (index, {}) or (None, error result)
+    """
+    if not os.path.exists(schematic_path):
+        print(f"Schematic file not found: {schematic_path}")
+        ctx.info(f"Schematic file not found: {schematic_path}")
+        return None, {"success": False, "error": f"Schematic file not found: {schematic_path}"}
+
+    netlist_data = extract_netlist(schematic_path)
+    if "error" in netlist_data:
+        print(f"Error extracting netlist: {netlist_data['error']}")
+        ctx.info(f"Error extracting netlist: {netlist_data['error']}")
+        return None, {"success": False, "error": netlist_data['error']}
+
+    return get_netlist_index(netlist_data), {}
+
+
+def _exclusions(index: NetlistIndex, include_supply_nets: bool) -> Optional[np.ndarray]:
+    """Get the nets traversals leave out: power and ground, unless included."""
+    if include_supply_nets:
+        return None
+    return index.graph.supply_mask(index.net_roles)
+
+
+def register_graph_tools(mcp: FastMCP) -> None:
+    """Register connectivity graph tools with the MCP server.
+
+    Args:
+        mcp: The FastMCP server instance
+    """
+
+    @mcp.tool()
+    async def export_netlist_graph(schematic_path: str, ctx: Context) -> Dict[str, Any]:
+        """Export the connectivity of a KiCad schematic as a sparse graph.
+
+        Components and nets get integer IDs (their positions in the
+        ``components`` and ``nets`` lists). The adjacency is given in
+        compressed sparse row form in both directions: the component IDs on
+        net n are ``net_indices[net_indptr[n]:net_indptr[n + 1]]``, and the
+        net IDs of component c are
+        ``component_indices[component_indptr[c]:component_indptr[c + 1]]``.
+
+        Args:
+            schematic_path: Path to the KiCad schematic file (.kicad_sch)
+            ctx: MCP context for progress reporting
+
+        Returns:
+            Dictionary with the ID lists, the CSR arrays and pin counts per net
+        """
+        print(f"Exporting netlist graph of schematic: {schematic_path}")
+
+        try:
+            index, error = _load_graph(schematic_path, ctx)
+            if index is None:
+                return error
+
+            graph = index.graph
+            return {
+                "success": True,
+                "schematic_path": schematic_path,
+                "component_count": len(graph.components),
+                "net_count": len(graph.nets),
+                "edge_count": graph.edge_count,
+                **graph.to_dict()
+            }
+
+        except Exception as e:
+            print(f"Error exporting netlist graph: {str(e)}")
+            ctx.info(f"Error exporting netlist graph: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    @mcp.tool()
+    async def find_connected_groups(schematic_path: str, ctx: Context,
+                                    include_supply_nets: bool = False,
+                                    limit: int = 20) -> Dict[str, Any]:
+        """Find the groups of components that are connected to each other.
+
+        Power and ground nets join almost every component, so by default
+        they do not connect groups; the result then shows the separate
+        circuit blocks of the design.
+
+        Args:
+            schematic_path: Path to the KiCad schematic file (.kicad_sch)
+            ctx: MCP context for progress reporting
+            include_supply_nets: Let power and ground nets connect components
+            limit: Maximum number of groups to list, largest first
+
+        Returns:
+            Dictionary with the number of groups and the largest groups
+        """
+        print(f"Finding connected groups in schematic: {schematic_path}")
+
+        try:
+            index, error = _load_graph(schematic_path, ctx)
+            if index is None:
+                return error
+
+            graph = index.graph
+            labels = graph.connected_components(_exclusions(index, include_supply_nets))
+            roots, sizes = np.unique(labels, return_counts=True)
+
+            # Largest groups first, ties by their first component
+            order = np.lexsort((roots, -sizes))[:max(limit, 0)]
+            groups = []
+            for root, size in zip(roots[order].tolist(), sizes[order].tolist()):
+                groups.append({
+                    "size": size,
+                    "components": [graph.components[i] for i in np.flatnonzero(labels == root).tolist()]
+                })
+
+            return {
+                "success": True,
+                "schematic_path": schematic_path,
+                "component_count": len(graph.components),
+                "group_count": len(roots),
+                "single_component_groups": int(np.count_nonzero(sizes == 1)),
+                "groups": groups
+            }
+
+        except Exception as e:
+            print(f"Error finding connected groups: {str(e)}")
+            ctx.info(f"Error finding connected groups: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    @mcp.tool()
+    async def find_component_path(schematic_path: str, from_ref: str, to_ref: str, ctx: Context,
+                                  include_supply_nets: bool = False) -> Dict[str, Any]:
+        """Find the components that sit between two components.
+
+        Returns a shortest chain of nets and components leading from one
+        component to the other, e.g. U1 -> SDA -> R5 -> I2C_CONN -> J3.
+
+        Args:
+            schematic_path: Path to the KiCad schematic file (.kicad_sch)
+            from_ref: Reference of the first component (e.g., "U1")
+            to_ref: Reference of the second component (e.g., "J3")
+            ctx: MCP context for progress reporting
+            include_supply_nets: Allow the path to run through power and ground nets
+
+        Returns:
+            Dictionary with the path and the components and nets on it
+        """
+        print(f"Finding path from {from_ref} to {to_ref} in schematic: {schematic_path}")
+
+        try:
+            index, error = _load_graph(schematic_path, ctx)
+            if index is None:
+                return error
+
+            graph = index.graph
+            for ref in (from_ref, to_ref):
+                if ref not in graph.component_ids:
+                    return {"success": False, "error": f"Component {ref} not found or not connected in schematic"}
+
+            path = graph.shortest_path(from_ref, to_ref, _exclusions(index, include_supply_nets))
+            if path is None:
+                return {
+                    "success": True,
+                    "schematic_path": schematic_path,
+                    "connected": False,
+                    "path": []
+                }
+
+            return {
+                "success": True,
+                "schematic_path": schematic_path,
+                "connected": True,
+                "path": path,
+                "components_between": path[2:-1:2],
+                "nets": path[1::2]
+            }
+
+        except Exception as e:
+            print(f"Error finding component path: {str(e)}")
+            ctx.info(f"Error finding component path: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+    @mcp.tool()
+    async def get_net_fanout(schematic_path: str, ctx: Context,
+                             net_name: Optional[str] = None,
+                             top: int = 20) -> Dict[str, Any]:
+        """Get the fanout (number of pins) of the nets in a KiCad schematic.
+
+        With a net name, returns the fanout of that net and the components
+        on it; otherwise a histogram of fanout over all nets and the nets
+        with the highest fanout.
+
+        Args:
+            schematic_path: Path to the KiCad schematic file (.kicad_sch)
+            ctx: MCP context for progress reporting
+            net_name: Net to report on (e.g., "CLK"); omit for all nets
+            top: Number of highest-fanout nets to list
+
+        Returns:
+            Dictionary with fanout information
+        """
+        print(f"Getting net fanout in schematic: {schematic_path}")
+
+        try:
+            index, error = _load_graph(schematic_path, ctx)
+            if index is None:
+                return error
+
+            graph = index.graph
+            if net_name is not None:
+                net_id = graph.net_ids.get(net_name)
+                if net_id is None:
+                    return {"success": False, "error": f"Net {net_name} not found in schematic"}
+                return {
+                    "success": True,
+                    "schematic_path": schematic_path,
+                    "net": net_name,
+                    "pins": int(graph.pin_counts[net_id]),
+                    "components": index.components_on(net_name)
+                }
+
+            return {
+                "success": True,
+                "schematic_path": schematic_path,
+                "net_count": len(graph.nets),
+                "histogram": graph.fanout_histogram(),
+                "top_nets": graph.top_fanout(top)
+            }
+
+        except Exception as e:
+            print(f"Error getting net fanout: {str(e)}")
+            ctx.info(f"Error getting net fanout: {str(e)}")
+            return {"success": False, "error": str(e)}
@@ -2,11 +2,17 @@
 Netlist extraction and analysis tools for KiCad schematics.
 """
 import os
-from typing import Dict, Any
+from collections import Counter
+from typing import Dict, Any, List, Optional
 from mcp.server.fastmcp import FastMCP, Context
 
+from kicad_mcp.config import NETLIST_MAX_PAGE_SIZE, NETLIST_PAGE_SIZE
+from kicad_mcp.utils.electrical_rules import check_electrical_rules
 from kicad_mcp.utils.file_utils import get_project_files
+from kicad_mcp.utils.netlist_index import get_netlist_index
+from kicad_mcp.utils.netlist_pages import paginate_netlist, query_components as query_netlist_components
 from kicad_mcp.utils.netlist_parser import extract_netlist, analyze_netlist
+from kicad_mcp.utils.schematic_model import as_dict
 
 def register_netlist_tools(mcp: FastMCP) -> None:
     """Register netlist-related tools with the MCP server.
@@ -16,18 +22,32 @@ def register_netlist_tools(mcp: FastMCP) -> None:
     """
     
     @mcp.tool()
-    async def extract_schematic_netlist(schematic_path: str, ctx: Context) -> Dict[str, Any]:
+    async def extract_schematic_netlist(schematic_path: str, ctx: Context,
+                                        cursor: Optional[str] = None,
+                                        limit: int = NETLIST_PAGE_SIZE,
+                                        fields: Optional[List[str]] = None,
+                                        ref_prefix: Optional[str] = None,
+                                        net_name: Optional[str] = None) -> Dict[str, Any]:
         """Extract netlist information from a KiCad schematic.
         
         This tool parses a KiCad schematic file and extracts comprehensive
         netlist information including components, connections, and labels.
+        Components and nets are returned a page at a time; pass the returned
+        next_cursor to get the next page. The analysis is included on the
+        first page only.
         
         Args:
             schematic_path: Path to the KiCad schematic file (.kicad_sch)
             ctx: MCP context for progress reporting
+            cursor: next_cursor from the previous page (omit for the first page)
+            limit: Maximum number of components and of nets per page
+            fields: Component fields to return, e.g. ["ref", "value", "footprint"]
+                (default: all fields)
+            ref_prefix: Only return components whose reference starts with this, e.g. "U"
+            net_name: Only return nets with this name; * and ? wildcards are allowed
             
         Returns:
-            Dictionary with netlist information
+            Dictionary with one page of netlist information
         """
         print(f"Extracting netlist from schematic: {schematic_path}")
         
@@ -55,13 +75,11 @@ def register_netlist_tools(mcp: FastMCP) -> None:
             await ctx.report_progress(60, 100)
             ctx.info(f"Extracted {netlist_data['component_count']} components and {netlist_data['net_count']} nets")
             
-            # Analyze the netlist
-            await ctx.report_progress(70, 100)
-            ctx.info("Analyzing netlist data...")
-            
-            analysis_results = analyze_netlist(netlist_data)
-            
-            await ctx.report_progress(90, 100)
+            # Cut the requested page from the (cached) netlist
+            page = paginate_netlist(
+                netlist_data, cursor=cursor, limit=min(limit, NETLIST_MAX_PAGE_SIZE),
+                fields=fields, ref_prefix=ref_prefix, net_name=net_name
+            )
             
             # Build result
             result = {
@@ -69,11 +87,17 @@ def register_netlist_tools(mcp: FastMCP) -> None:
                 "schematic_path": schematic_path,
                 "component_count": netlist_data["component_count"],
                 "net_count": netlist_data["net_count"],
-                "components": netlist_data["components"],
-                "nets": netlist_data["nets"],
-                "analysis": analysis_results
+                **page
             }
             
+            # Analyze the netlist once, with the first page
+            if not cursor:
+                await ctx.report_progress(70, 100)
+                ctx.info("Analyzing netlist data...")
+                result["analysis"] = analyze_netlist(netlist_data)
+            
+            await ctx.report_progress(90, 100)
+            
             # Complete progress
             await ctx.report_progress(100, 100)
             ctx.info("Netlist extraction complete")
@@ -86,18 +110,30 @@ def register_netlist_tools(mcp: FastMCP) -> None:
             return {"success": False, "error": str(e)}
 
     @mcp.tool()
-    async def extract_project_netlist(project_path: str, ctx: Context) -> Dict[str, Any]:
+    async def extract_project_netlist(project_path: str, ctx: Context,
+                                      cursor: Optional[str] = None,
+                                      limit: int = NETLIST_PAGE_SIZE,
+                                      fields: Optional[List[str]] = None,
+                                      ref_prefix: Optional[str] = None,
+                                      net_name: Optional[str] = None) -> Dict[str, Any]:
         """Extract netlist from a KiCad project's schematic.
         
         This tool finds the schematic associated with a KiCad project
-        and extracts its netlist information.
+        and extracts its netlist information, a page at a time like
+        extract_schematic_netlist.
         
         Args:
             project_path: Path to the KiCad project file (.kicad_pro)
             ctx: MCP context for progress reporting
+            cursor: next_cursor from the previous page (omit for the first page)
+            limit: Maximum number of components and of nets per page
+            fields: Component fields to return, e.g. ["ref", "value", "footprint"]
+                (default: all fields)
+            ref_prefix: Only return components whose reference starts with this, e.g. "U"
+            net_name: Only return nets with this name; * and ? wildcards are allowed
             
         Returns:
-            Dictionary with netlist information
+            Dictionary with one page of netlist information
         """
         print(f"Extracting netlist for project: {project_path}")
         
@@ -126,7 +162,10 @@ def register_netlist_tools(mcp: FastMCP) -> None:
             await ctx.report_progress(20, 100)
             
             # Call the schematic netlist extraction
-            result = await extract_schematic_netlist(schematic_path, ctx)
+            result = await extract_schematic_netlist(
+                schematic_path, ctx, cursor=cursor, limit=limit,
+                fields=fields, ref_prefix=ref_prefix, net_name=net_name
+            )
             
             # Add project path to result
             if "success" in result and result["success"]:
@@ -203,8 +242,9 @@ def register_netlist_tools(mcp: FastMCP) -> None:
             
             # Identify power nets
             nets = netlist_data.get("nets", {})
+            net_roles = get_netlist_index(netlist_data).net_roles
             for net_name, pins in nets.items():
-                if any(net_name.startswith(prefix) for prefix in ["VCC", "VDD", "GND", "+5V", "+3V3", "+12V"]):
+                if "power" in net_roles[net_name]:
                     analysis["power_nets"].append({
                         "name": net_name,
                         "pin_count": len(pins)
@@ -220,15 +260,18 @@ def register_netlist_tools(mcp: FastMCP) -> None:
             # Check for potential issues
             # 1. Nets with only one connection (floating)
             for net_name, pins in nets.items():
-                if len(pins) <= 1 and not any(net_name.startswith(prefix) for prefix in ["VCC", "VDD", "GND", "+5V", "+3V3", "+12V"]):
+                if len(pins) <= 1 and "power" not in net_roles[net_name]:
                     analysis["potential_issues"].append({
                         "type": "floating_net",
                         "net": net_name,
                         "description": f"Net '{net_name}' appears to be floating (only has {len(pins)} connection)"
                     })
             
-            # 2. Power pins without connections
-            # This would require more detailed parsing of the schematic
+            # 2. Pin type conflicts: unconnected power inputs, contested and
+            # undriven nets, stray no-connect flags
+            electrical_issues = check_electrical_rules(netlist_data)
+            analysis["potential_issues"].extend(electrical_issues)
+            analysis["issue_counts"] = dict(Counter(issue["type"] for issue in analysis["potential_issues"]))
             
             await ctx.report_progress(90, 100)
             
@@ -321,8 +364,9 @@ def register_netlist_tools(mcp: FastMCP) -> None:
             connections = []
             connected_nets = []
             
-            for net_name, pins in nets.items():
-                # Check if any pin belongs to our component
+            # Only the nets this component is on
+            for net_name in get_netlist_index(netlist_data).nets_of(component_ref):
+                pins = nets[net_name]
                 component_pins = []
                 for pin in pins:
                     if pin.get('component') == component_ref:
@@ -388,7 +432,7 @@ def register_netlist_tools(mcp: FastMCP) -> None:
                 "project_path": project_path,
                 "schematic_path": schematic_path,
                 "component": component_ref,
-                "component_info": component_info,
+                "component_info": as_dict(component_info),
                 "connections": connections,
                 "connected_nets": connected_nets,
                 "pin_functions": pin_functions,
@@ -404,3 +448,69 @@ def register_netlist_tools(mcp: FastMCP) -> None:
             print(f"Error finding component connections: {str(e)}", exc_info=True)
             ctx.info(f"Error finding component connections: {str(e)}")
             return {"success": False, "error": str(e)}
+
+    @mcp.tool()
+    async def query_components(schematic_path: str, query: str, ctx: Context,
+                               cursor: Optional[str] = None,
+                               limit: int = NETLIST_PAGE_SIZE,
+                               fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Find the components of a KiCad schematic matching a filter expression.
+        
+        Only matching components are returned, a page at a time; pass the
+        returned next_cursor to get the next page.
+        
+        A filter expression compares fields with =, !=, <, <=, >, >=, ~
+        (wildcards * and ?) or !~, and combines conditions with and, or, not
+        and parentheses. Fields are ref, value, footprint, lib_id, sheet and
+        any symbol property (e.g. MPN); a field on its own tests that it is
+        set. Values compare as numbers with SI prefixes. Text comparisons
+        ignore case. Examples:
+        
+            ref ~ "C*" and footprint ~ "*0402*" and value > 1u
+            not MPN
+            lib_id ~ "Regulator_*:*" or value = 4.7k
+        
+        Args:
+            schematic_path: Path to the KiCad schematic file (.kicad_sch)
+            query: Filter expression
+            ctx: MCP context for progress reporting
+            cursor: next_cursor from the previous page (omit for the first page)
+            limit: Maximum number of components per page
+            fields: Component fields to return, e.g. ["ref", "value", "footprint"]
+                (default: all fields)
+            
+        Returns:
+            Dictionary with one page of matching components
+        """
+        print(f"Querying components of schematic: {schematic_path}: {query}")
+        
+        if not os.path.exists(schematic_path):
+            print(f"Schematic file not found: {schematic_path}")
+            ctx.info(f"Schematic file not found: {schematic_path}")
+            return {"success": False, "error": f"Schematic file not found: {schematic_path}"}
+        
+        try:
+            netlist_data = extract_netlist(schematic_path)
+            
+            if "error" in netlist_data:
+                print(f"Error extracting netlist: {netlist_data['error']}")
+                ctx.info(f"Error extracting netlist: {netlist_data['error']}")
+                return {"success": False, "error": netlist_data['error']}
+            
+            page = query_netlist_components(
+                netlist_data, query, cursor=cursor, limit=min(limit, NETLIST_MAX_PAGE_SIZE), fields=fields
+            )
+            ctx.info(f"Found {page['matching_components']} matching components")
+            
+            return {
+                "success": True,
+                "schematic_path": schematic_path,
+                "query": query,
+                "component_count": netlist_data["component_count"],
+                **page
+            }
+            
+        except Exception as e:
+            print(f"Error querying components: {str(e)}")
+            ctx.info(f"Error querying components: {str(e)}")
+            return {"success": False, "error": str(e)}
@@ -7,15 +7,7 @@ from mcp.server.fastmcp import FastMCP, Context
 
 from kicad_mcp.utils.file_utils import get_project_files
 from kicad_mcp.utils.netlist_parser import extract_netlist, analyze_netlist
-from kicad_mcp.utils.pattern_recognition import (
-    identify_power_supplies,
-    identify_amplifiers,
-    identify_filters,
-    identify_oscillators,
-    identify_digital_interfaces,
-    identify_microcontrollers,
-    identify_sensor_interfaces
-)
+from kicad_mcp.utils.pattern_recognition import recognize_patterns
 
 def register_pattern_tools(mcp: FastMCP) -> None:
     """Register circuit pattern recognition tools with the MCP server.
@@ -25,7 +17,8 @@ def register_pattern_tools(mcp: FastMCP) -> None:
     """
     
     @mcp.tool()
-    async def identify_circuit_patterns(schematic_path: str, ctx: Context) -> Dict[str, Any]:
+    async def identify_circuit_patterns(schematic_path: str, ctx: Context,
+                                        families: Optional[List[str]] = None) -> Dict[str, Any]:
         """Identify common circuit patterns in a KiCad schematic.
         
         This tool analyzes a schematic to recognize common circuit blocks such as:
@@ -39,9 +32,12 @@ def register_pattern_tools(mcp: FastMCP) -> None:
         Args:
             schematic_path: Path to the KiCad schematic file (.kicad_sch)
             ctx: MCP context for progress reporting
+            families: Pattern families to look for, e.g. ["power_supply_circuits",
+                "amplifier_circuits"]; all families if omitted
             
         Returns:
-            Dictionary with identified circuit patterns
+            Dictionary with identified circuit patterns and, when recognition
+            ran, per-rule match counts and timings (slowest first)
         """
         if not os.path.exists(schematic_path):
             ctx.info(f"Schematic file not found: {schematic_path}")
@@ -62,55 +58,13 @@ def register_pattern_tools(mcp: FastMCP) -> None:
                 ctx.info(f"Error extracting netlist: {netlist_data['error']}")
                 return {"success": False, "error": netlist_data['error']}
             
-            # Analyze components and nets
-            await ctx.report_progress(30, 100)
-            ctx.info("Analyzing components and connections...")
-            
-            components = netlist_data.get("components", {})
-            nets = netlist_data.get("nets", {})
-            
             # Start pattern recognition
             await ctx.report_progress(50, 100)
             ctx.info("Identifying circuit patterns...")
             
-            identified_patterns = {
-                "power_supply_circuits": [],
-                "amplifier_circuits": [],
-                "filter_circuits": [],
-                "oscillator_circuits": [],
-                "digital_interface_circuits": [],
-                "microcontroller_circuits": [],
-                "sensor_interface_circuits": [],
-                "other_patterns": []
-            }
-            
-            # Identify power supply circuits
-            await ctx.report_progress(60, 100)
-            identified_patterns["power_supply_circuits"] = identify_power_supplies(components, nets)
-            
-            # Identify amplifier circuits
-            await ctx.report_progress(70, 100)
-            identified_patterns["amplifier_circuits"] = identify_amplifiers(components, nets)
+            identified_patterns, rule_stats = recognize_patterns(schematic_path, netlist_data, families)
             
-            # Identify filter circuits
-            await ctx.report_progress(75, 100)
-            identified_patterns["filter_circuits"] = identify_filters(components, nets)
-            
-            # Identify oscillator circuits
-            await ctx.report_progress(80, 100)
-            identified_patterns["oscillator_circuits"] = identify_oscillators(components, nets)
-            
-            # Identify digital interface circuits
-            await ctx.report_progress(85, 100)
-            identified_patterns["digital_interface_circuits"] = identify_digital_interfaces(components, nets)
-            
-            # Identify microcontroller circuits
-            await ctx.report_progress(90, 100)
-            identified_patterns["microcontroller_circuits"] = identify_microcontrollers(components)
-            
-            # Identify sensor interface circuits
             await ctx.report_progress(95, 100)
-            identified_patterns["sensor_interface_circuits"] = identify_sensor_interfaces(components, nets)
             
             # Build result
             result = {
@@ -124,6 +78,10 @@ def register_pattern_tools(mcp: FastMCP) -> None:
             total_patterns = sum(len(patterns) for patterns in identified_patterns.values())
             result["total_patterns_found"] = total_patterns
             
+            # Per-rule statistics, slowest rule first; absent for cached results
+            if rule_stats is not None:
+                result["rule_stats"] = sorted(rule_stats, key=lambda entry: entry["time_ms"], reverse=True)
+            
             # Complete progress
             await ctx.report_progress(100, 100)
             ctx.info(f"Pattern recognition complete. Found {total_patterns} circuit patterns.")
@@ -135,12 +93,14 @@ def register_pattern_tools(mcp: FastMCP) -> None:
             return {"success": False, "error": str(e)}
 
     @mcp.tool()
-    async def analyze_project_circuit_patterns(project_path: str, ctx: Context) -> Dict[str, Any]:
+    async def analyze_project_circuit_patterns(project_path: str, ctx: Context,
+                                               families: Optional[List[str]] = None) -> Dict[str, Any]:
         """Identify circuit patterns in a KiCad project's schematic.
         
         Args:
             project_path: Path to the KiCad project file (.kicad_pro)
             ctx: MCP context for progress reporting
+            families: Pattern families to look for; all families if omitted
             
         Returns:
             Dictionary with identified circuit patterns
@@ -164,7 +124,7 @@ def register_pattern_tools(mcp: FastMCP) -> None:
             ctx.info(f"Found schematic file: {os.path.basename(schematic_path)}")
             
             # Identify patterns in the schematic
-            result = await identify_circuit_patterns(schematic_path, ctx)
+            result = await identify_circuit_patterns(schematic_path, ctx, families)
             
             # Add project path to result
             if "success" in result and result["success"]:
@@ -1,11 +1,13 @@
 """
 Project management tools for KiCad.
 """
+import asyncio
 import os
 import logging
-from typing import Dict, List, Any
-from mcp.server.fastmcp import FastMCP
+from typing import Dict, List, Any, Optional
+from mcp.server.fastmcp import FastMCP, Context
 
+from kicad_mcp.utils.component_search import get_search_index
 from kicad_mcp.utils.kicad_utils import find_kicad_projects, open_kicad_project
 from kicad_mcp.utils.file_utils import get_project_files, load_project_json
 
@@ -57,3 +59,54 @@ def register_project_tools(mcp: FastMCP) -> None:
     def open_project(project_path: str) -> Dict[str, Any]:
         """Open a KiCad project in KiCad."""
         return open_kicad_project(project_path)
+
+    @mcp.tool()
+    async def search_components(query: str, ctx: Context,
+                                field: Optional[str] = None,
+                                limit: int = 100,
+                                refresh: bool = True) -> Dict[str, Any]:
+        """Search the components of all KiCad projects on this system.
+
+        Finds the projects using a part, e.g. "TPS54331", or parts matching
+        several words, e.g. "10u 0805". Each word must match the start of a
+        word in the component's value, library ID, footprint or a property
+        such as MPN, ignoring case. The projects are kept in a persistent
+        index, and only projects whose schematics changed are parsed again.
+
+        Args:
+            query: Words to search for
+            ctx: MCP context for progress reporting
+            field: Only search this field: "value", "lib_id", "footprint" or
+                a property name such as "MPN"
+            limit: Maximum number of components to return
+            refresh: Update the index from the current projects first; turn
+                off for the fastest lookups when no project changed
+
+        Returns:
+            Dictionary with the matching components grouped by project
+        """
+        print(f"Searching components of all projects for: {query}")
+
+        try:
+            index = get_search_index()
+            update = None
+            if refresh:
+                # Finding the projects and parsing changed schematics is
+                # blocking file I/O; keep it off the event loop
+                update = await asyncio.to_thread(lambda: index.update(find_kicad_projects()))
+                if update["indexed"] or update["removed"]:
+                    ctx.info(f"Updated component index: {update['indexed']} projects indexed, "
+                             f"{update['removed']} removed")
+
+            result = await asyncio.to_thread(index.search, query, field=field, limit=limit)
+            return {
+                "success": True,
+                "query": query,
+                **result,
+                "index_update": update
+            }
+
+        except Exception as e:
+            print(f"Error searching components: {str(e)}")
+            ctx.info(f"Error searching components: {str(e)}")
+            return {"success": False, "error": str(e)}
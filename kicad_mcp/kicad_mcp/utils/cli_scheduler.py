@@ -0,0 +1,271 @@
+"""
+Scheduler for kicad-cli commands shared by all clients of the server.
+
+Every kicad-cli run loads a whole board or schematic, so several agents
+checking designs at once could start more processes than the machine has
+cores or memory for. Commands run through the scheduler instead:
+
+- at most ``max_jobs`` run at once (KICAD_MCP_CLI_MAX_JOBS, by default the
+  number of CPU cores, fewer if memory would not hold that many loaded
+  boards); the rest wait in a queue
+- interactive work (thumbnails, exports a client waits on) is started
+  before queued batch work such as DRC runs
+- a job submitted while an identical one is queued or running (same key,
+  e.g. the same command on unchanged files) is not run again; it
+  waits for the running job and gets its result. The job is cancelled only
+  when every request waiting for it has been cancelled.
+
+Queue depth, wait times and merge counts are reported by ``stats()``.
+"""
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from kicad_mcp.config import CLI_JOB_MEMORY_BYTES, CLI_MAX_JOBS, CLI_TIMEOUT
+from kicad_mcp.utils.process_runner import ProcessResult, run_process
+
+# Priority classes; lower values start first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+
+def _physical_memory() -> Optional[int]:
+    """Get the machine's physical memory in bytes, if the platform reports it."""
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_job_limit(job_memory: int = CLI_JOB_MEMORY_BYTES) -> int:
+    """Get the number of commands to run at once on this machine.
+
+    Args:
+        job_memory: Memory a running command is expected to use, in bytes
+
+    Returns:
+        The number of CPU cores, or fewer if memory does not hold that
+        many commands; at least 1
+    """
+    limit = os.cpu_count() or 1
+    memory = _physical_memory()
+    if memory and job_memory > 0:
+        limit = min(limit, memory // job_memory)
+    return max(int(limit), 1)
+
+
+def job_key(kind: str, *parts: Any, inputs: Iterable[str] = ()) -> Optional[Tuple]:
+    """Build the key under which identical jobs are merged.
+
+    Args:
+        kind: Kind of job, e.g. "drc" or "command"
+        parts: Anything else the result depends on, e.g. the command line
+        inputs: Files the job reads; their paths, modification times and
+            sizes become part of the key
+
+    Returns:
+        Key tuple, or None if an input cannot be read (the job is then
+        never merged)
+    """
+    # Stamps like ParseCache's: a stat call does not hold up the event loop
+    # the way hashing a large board would
+    stamps = []
+    for path in inputs:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        stamps.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+    return (kind, *parts, *stamps)
+
+
+class _SharedJob:
+    """A scheduled job and the number of requests waiting for its result."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class CliScheduler:
+    """Runs jobs with a concurrency limit, priority classes and merging of identical jobs."""
+
+    def __init__(self, max_jobs: Optional[int] = None):
+        """Create a scheduler.
+
+        Args:
+            max_jobs: Most jobs running at once; None or 0 for default_job_limit()
+        """
+        self.max_jobs = max_jobs or default_job_limit()
+        self._running = 0
+        # Heap of (priority, sequence, future completed when the job may start)
+        self._waiting: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._in_flight: Dict[Hashable, _SharedJob] = {}
+
+        self.submitted = 0
+        self.merged = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.peak_queue_depth = 0
+        self._started = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    async def _acquire(self, priority: int) -> None:
+        """Wait for a free slot; waiting jobs get slots in priority order."""
+        if self._running < self.max_jobs and not self._waiting:
+            self._running += 1
+            return
+
+        slot = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), slot)
+        heapq.heappush(self._waiting, entry)
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._waiting))
+        try:
+            await slot
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            if slot.done() and not slot.cancelled():
+                # The slot was handed over just before the cancellation
+                self._release()
+            elif entry in self._waiting:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+            raise
+
+    def _release(self) -> None:
+        """Hand a finished job's slot to the next waiting job, or free it."""
+        while self._waiting:
+            _, _, slot = heapq.heappop(self._waiting)
+            if not slot.done():
+                slot.set_result(None)
+                return
+        self._running -= 1
+
+    async def _execute(self, job: Callable[[], Awaitable[Any]], priority: int) -> Any:
+        queued = time.monotonic()
+        await self._acquire(priority)
+        waited = time.monotonic() - queued
+        self._started += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        try:
+            result = await job()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._release()
+        self.completed += 1
+        return result
+
+    async def _wait(self, shared: _SharedJob) -> Any:
+        """Wait for a job's result; cancel the job when its last waiter is cancelled."""
+        shared.waiters += 1
+        try:
+            return await asyncio.shield(shared.task)
+        except asyncio.CancelledError:
+            if shared.waiters == 1 and not shared.task.done():
+                shared.task.cancel()
+            raise
+        finally:
+            shared.waiters -= 1
+
+    async def run(self, job: Callable[[], Awaitable[Any]], priority: int = PRIORITY_BATCH,
+                  key: Optional[Hashable] = None) -> Any:
+        """Run a job when a slot is free, or join an identical job.
+
+        Args:
+            job: Coroutine function doing the work, called without arguments
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH
+            key: Key identifying identical jobs (see job_key); None to never merge
+
+        Returns:
+            The job's result, shared by every request that waited for it;
+            callers that modify it must copy it first
+
+        Raises:
+            Whatever the job raises
+        """
+        shared = self._in_flight.get(key) if key is not None else None
+        if shared is not None:
+            self.merged += 1
+            print("Joining an identical CLI job that is already queued or running")
+            return await self._wait(shared)
+
+        self.submitted += 1
+        shared = _SharedJob(asyncio.ensure_future(self._execute(job, priority)))
+        if key is not None:
+            self._in_flight[key] = shared
+            shared.task.add_done_callback(lambda _: self._forget(key, shared))
+        return await self._wait(shared)
+
+    def _forget(self, key: Hashable, shared: _SharedJob) -> None:
+        if self._in_flight.get(key) is shared:
+            del self._in_flight[key]
+
+    async def run_command(self, command: Sequence[str], priority: int = PRIORITY_BATCH,
+                          inputs: Iterable[str] = (),
+                          timeout: Optional[float] = CLI_TIMEOUT) -> ProcessResult:
+        """Run a command through the scheduler (see process_runner.run_process).
+
+        Args:
+            command: Executable and arguments
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH
+            inputs: Files the command reads; the same command on unchanged
+                inputs is merged with a running one
+            timeout: Seconds after which the command is stopped
+
+        Returns:
+            ProcessResult of the command
+        """
+        command = [str(part) for part in command]
+        inputs = list(inputs)
+        key = job_key("command", tuple(command), inputs=inputs) if inputs else None
+        return await self.run(lambda: run_process(command, timeout=timeout), priority, key)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue and job statistics."""
+        queued = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, slot in self._waiting:
+            if not slot.done():
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                queued[name] = queued.get(name, 0) + 1
+        return {
+            "max_jobs": self.max_jobs,
+            "running": self._running,
+            "queue_depth": sum(queued.values()),
+            "queued": queued,
+            "peak_queue_depth": self.peak_queue_depth,
+            "submitted": self.submitted,
+            "merged": self.merged,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "average_wait": round(self._total_wait / self._started, 3) if self._started else 0.0,
+            "max_wait": round(self._max_wait, 3)
+        }
+
+
+# Scheduler shared by every tool and resource in the process
+_scheduler: Optional[CliScheduler] = None
+
+
+def get_cli_scheduler() -> CliScheduler:
+    """Get the process-wide kicad-cli scheduler, creating it on first use."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = CliScheduler(CLI_MAX_JOBS)
+    return _scheduler
@@ -0,0 +1,251 @@
+"""
+One-pass classification of schematic components by part number.
+
+Pattern recognizers need to know which components are regulators, op-amps,
+microcontrollers, sensors and so on. Rather than each recognizer running its
+own regular expressions over every component, all part-number patterns are
+merged at import time into one compiled expression per component field, and
+each component is classified once with a single match per field.
+
+Each pattern becomes an optional lookahead with its own named group, so one
+match reports every pattern found anywhere in the text, not just the first,
+together with the text it matched (e.g. the full STM32 part number).
+Results are memoized per (value, lib_id), since large designs repeat the
+same parts many times.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Pattern, Tuple
+
+# Number of distinct (value, lib_id) pairs whose classification is memoized
+CLASSIFIER_CACHE_SIZE = 4096
+
+# Role -> (fields searched, tag -> part-number pattern). Tags are listed in
+# the order recognizers prefer them. Fields are "value" or "both" (value and
+# lib_id).
+ROLE_PATTERNS: Dict[str, Tuple[str, Dict[str, str]]] = {
+    "linear_regulator": ("both", {
+        "78xx": r"78\d\d|LM78\d\d|MC78\d\d",  # 7805, 7812, etc.
+        "79xx": r"79\d\d|LM79\d\d|MC79\d\d",  # 7905, 7912, etc.
+        "LDO": r"LM\d{3}|LD\d{3}|AMS\d{4}|LT\d{4}|TLV\d{3}|AP\d{4}|MIC\d{4}|NCP\d{3}|LP\d{4}|L\d{2}|TPS\d{5}"
+    }),
+    "switching_regulator": ("both", {
+        "buck": r"LM\d{4}|TPS\d{4}|MP\d{4}|RT\d{4}|LT\d{4}|MC\d{4}|NCP\d{4}|TL\d{4}|LTC\d{4}",
+        "boost": r"MC\d{4}|LT\d{4}|TPS\d{4}|MAX\d{4}|NCP\d{4}|LTC\d{4}",
+        "buck_boost": r"LTC\d{4}|LM\d{4}|TPS\d{4}|MAX\d{4}"
+    }),
+    "opamp": ("both", {
+        "part_number": r"LM\d{3}|TL\d{3}|NE\d{3}|LF\d{3}|OP\d{2}|MCP\d{3}|AD\d{3}|LT\d{4}|OPA\d{3}",
+        "description": r"Opamp|Op-Amp|OpAmp|Operational Amplifier"
+    }),
+    "opamp_grade": ("value", {
+        "general_purpose": r"LM358|LM324|TL072|TL082|NE5532|LF353|MCP6002|AD8620|OPA2134",
+        "audio": r"NE5534|OPA134|OPA1612|OPA1652|LM4562|LME49720|LME49860|TL071|TL072",
+        "instrumentation": r"INA\d{3}|AD620|AD8221|AD8429|LT1167"
+    }),
+    "audio_amplifier": ("both", {
+        "ic": r"LM386|LM383|LM380|LM1875|LM3886|TDA\d{4}|TPA\d{4}|SSM\d{4}|PAM\d{4}|TAS\d{4}"
+    }),
+    "oscillator": ("value", {
+        "ic": r"OSC|OSCILLATOR"
+    }),
+    "timer": ("value", {
+        "555": r"NE555|LM555|ICM7555|TLC555"
+    }),
+    "interface_ic": ("value", {
+        "usb": r"FT232|CH340|CP210|MCP2200|TUSB|FT231|FT201",
+        "ethernet": r"W5500|ENC28J60|LAN87|KSZ80|DP83|RTL8|AX88"
+    }),
+    "sensor": ("both", {
+        "temperature": r"LM35|DS18B20|DHT11|DHT22|BME280|BMP280|TMP\d+|MCP9808|MAX31855|MAX6675|SI7021|HTU21|SHT[0123]\d|PCT2075",
+        "humidity": r"DHT11|DHT22|BME280|SI7021|HTU21|SHT[0123]\d|HDC1080",
+        "pressure": r"BMP\d+|BME280|LPS\d+|MS5611|DPS310|MPL3115|SPL06",
+        "accelerometer": r"ADXL\d+|LIS3DH|MMA\d+|MPU\d+|LSM\d+|BMI\d+|BMA\d+|KX\d+",
+        "gyroscope": r"L3G\d+|MPU\d+|BMI\d+|LSM\d+|ICM\d+",
+        "magnetometer": r"HMC\d+|QMC\d+|LSM\d+|MMC\d+|RM\d+",
+        "proximity": r"APDS9960|VL53L0X|VL6180|GP2Y|VCNL4040|VCNL4010",
+        "light": r"BH1750|TSL\d+|MAX4\d+|VEML\d+|APDS9960|LTR329|OPT\d+",
+        "air_quality": r"CCS811|BME680|SGP\d+|SEN\d+|MQ\d+|MiCS",
+        "current": r"ACS\d+|INA\d+|MAX\d+|ZXCT\d+",
+        "voltage": r"INA\d+|MCP\d+|ADS\d+",
+        "ADC": r"ADS\d+|MCP33\d+|MCP32\d+|LTC\d+|NAU7802|HX711",
+        "GPS": r"NEO-[67]M|L80|MTK\d+|SIM\d+|SAM-M8Q|MAX-M8"
+    }),
+    "mcu": ("both", {
+        "AVR": r"ATMEGA\d+|ATTINY\d+|AT90\w+",
+        "STM32": r"STM32\w+",
+        "PIC": r"PIC\d+\w+",
+        "ESP": r"ESP32|ESP8266",
+        "Arduino": r"ARDUINO",
+        "MSP430": r"MSP430\w+",
+        "RP2040": r"RP2040|PICO",
+        "NXP": r"LPC\d+|IMXRT\d+|MK\d+",
+        "SAM": r"SAMD\d+|SAM\w+",
+        "ARM Cortex": r"CORTEX|ARM",
+        "8051": r"8051|AT89"
+    }),
+    # Models the microcontroller and sensor recognizers describe in detail
+    "mcu_model": ("value", {
+        "ATmega328P": r"ATMEGA328P|ATMEGA328",
+        "ATmega32U4": r"ATMEGA32U4",
+        "ESP32": r"ESP32",
+        "ESP8266": r"ESP8266",
+        "STM32": r"STM32F\d+",
+        "RP2040": r"RP2040|PICO",
+        "PIC": r"PIC\d+\w+",
+        "MSP430": r"MSP430\w+"
+    }),
+    "sensor_model": ("value", {
+        "DS18B20": r"DS18B20",
+        "BMx280": r"BME280|BMP280",
+        "LM35": r"LM35",
+        "MPU6050": r"MPU6050",
+        "MPU9250": r"MPU9250",
+        "LSM6DS3": r"LSM6DS3",
+        "APDS9960": r"APDS9960",
+        "VL53L0X": r"VL53L0X",
+        "BH1750": r"BH1750",
+        "ADS1115": r"ADS1115",
+        "HX711": r"HX711"
+    }),
+    "dev_board": ("both", {
+        "Arduino": r"ARDUINO|UNO|NANO|MEGA|LEONARDO|DUE",
+        "ESP32 Dev Board": r"ESP32-DEVKIT|NODEMCU-32S|ESP-WROOM-32",
+        "ESP8266 Dev Board": r"NODEMCU|WEMOS|D1_MINI|ESP-01",
+        "STM32 Dev Board": r"NUCLEO|DISCOVERY|BLUEPILL",
+        "Raspberry Pi": r"RASPBERRY|RPI|RPICO|PICO"
+    })
+}
+
+
+def _compile(fields: Tuple[str, ...]) -> Tuple[Pattern, List[Tuple[str, str, str]]]:
+    """Merge the patterns of all roles searched in the given fields into one expression.
+
+    Returns:
+        Tuple of (compiled expression, (group name, role, tag) per pattern)
+    """
+    parts = []
+    groups = []
+    for role, (role_fields, tags) in ROLE_PATTERNS.items():
+        if role_fields not in fields:
+            continue
+        for tag, pattern in tags.items():
+            name = f"p{len(groups)}"
+            parts.append(f"(?:(?=.*?(?P<{name}>{pattern})))?")
+            groups.append((name, role, tag))
+    return re.compile(''.join(parts), re.IGNORECASE | re.DOTALL), groups
+
+
+_VALUE_CLASSIFIER = _compile(("value", "both"))
+_LIB_CLASSIFIER = _compile(("both",))
+
+
+def _match(classifier: Tuple[Pattern, List[Tuple[str, str, str]]],
+           text: str) -> Tuple[Dict[str, Tuple[str, ...]], Dict[Tuple[str, str], str]]:
+    """Match a merged expression once.
+
+    Returns:
+        Tuple of (role -> matched tags in pattern order, (role, tag) -> matched text)
+    """
+    if not text:
+        return {}, {}
+
+    regex, groups = classifier
+    match = regex.match(text)
+    found: Dict[str, List[str]] = {}
+    matched: Dict[Tuple[str, str], str] = {}
+    for name, role, tag in groups:
+        part = match.group(name)
+        if part is not None:
+            found.setdefault(role, []).append(tag)
+            matched[role, tag] = part
+    return {role: tuple(tags) for role, tags in found.items()}, matched
+
+
+class ComponentTags:
+    """The roles of one component, as tags per role.
+
+    ``value`` and ``lib`` hold role -> tags matched in the component's value
+    and lib_id; roles searched only in the value never appear in ``lib``.
+    ``matched`` holds the upper-cased text each (role, tag) matched, taken
+    from the value where both fields match. Instances are shared between
+    components with the same value and lib_id and must not be modified.
+    """
+
+    __slots__ = ("value", "lib", "matched")
+
+    def __init__(self, value: Dict[str, Tuple[str, ...]], lib: Dict[str, Tuple[str, ...]],
+                 matched: Optional[Dict[Tuple[str, str], str]] = None):
+        self.value = value
+        self.lib = lib
+        self.matched = matched or {}
+
+    def get(self, role: str) -> Tuple[str, ...]:
+        """Get the tags of a role matched in either field.
+
+        Args:
+            role: Role name from ROLE_PATTERNS
+
+        Returns:
+            Matched tags in pattern order, empty if the component lacks the role
+        """
+        in_value = self.value.get(role, ())
+        in_lib = self.lib.get(role, ())
+        if not in_lib:
+            return in_value
+        if not in_value:
+            return in_lib
+        return tuple(tag for tag in ROLE_PATTERNS[role][1] if tag in in_value or tag in in_lib)
+
+    def first(self, role: str) -> Optional[str]:
+        """Get the preferred tag of a role, or None if the component lacks it."""
+        tags = self.get(role)
+        return tags[0] if tags else None
+
+    def part_number(self, role: str, tag: str) -> Optional[str]:
+        """Get the text a tag's pattern matched, e.g. ``STM32F103`` for ("mcu_model", "STM32").
+
+        Args:
+            role: Role name from ROLE_PATTERNS
+            tag: Tag of the role
+
+        Returns:
+            Matched text, upper-cased, or None if the tag did not match
+        """
+        return self.matched.get((role, tag))
+
+    @property
+    def roles(self) -> List[str]:
+        """Roles the component has, in ROLE_PATTERNS order."""
+        return [role for role in ROLE_PATTERNS if role in self.value or role in self.lib]
+
+
+@lru_cache(maxsize=CLASSIFIER_CACHE_SIZE)
+def classify_part(value: str, lib_id: str) -> ComponentTags:
+    """Classify a part by its value and library symbol.
+
+    Args:
+        value: Component value, e.g. ``LM7805``
+        lib_id: Library symbol, e.g. ``Regulator_Linear:L7805``
+
+    Returns:
+        Tags of the part (shared; do not modify)
+    """
+    value_tags, value_matched = _match(_VALUE_CLASSIFIER, value.upper())
+    lib_tags, lib_matched = _match(_LIB_CLASSIFIER, lib_id.upper())
+    return ComponentTags(value_tags, lib_tags, {**lib_matched, **value_matched})
+
+
+def classify_components(components: Mapping[str, Any]) -> Dict[str, ComponentTags]:
+    """Classify every component of a netlist.
+
+    Args:
+        components: Dictionary of components from netlist
+
+    Returns:
+        Dictionary mapping component reference to its tags
+    """
+    return {
+        ref: classify_part(component.get('value', '') or '', component.get('lib_id', '') or '')
+        for ref, component in components.items()
+    }
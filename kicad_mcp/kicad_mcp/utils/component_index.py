@@ -0,0 +1,376 @@
+"""
+Field indexes and filter expressions over the components of a netlist.
+
+Clients looking for "all 0402 capacitors above 1 µF" should not have to
+download every component and filter them themselves. A filter expression
+such as::
+
+    ref ~ "C*" and footprint ~ "*0402*" and value > 1u
+
+is evaluated here against indexes of the component fields. Each field is
+indexed on first use: its distinct values map to the components having
+them, so equality tests are one lookup and wildcard tests match each
+distinct value once; numeric comparisons binary-search the field's values
+parsed as SI numbers (see component_utils.parse_value). Conditions combine
+as boolean masks over the components.
+
+Expression syntax:
+
+- ``field op operand`` with op one of ``=`` (or ``==``), ``!=``, ``<``,
+  ``<=``, ``>``, ``>=``, ``~`` (wildcard match, ``*`` and ``?``) and ``!~``
+- ``field`` alone tests that the field is set and not empty
+- ``and``, ``or``, ``not`` and parentheses combine conditions
+
+Fields are ``ref``, ``value``, ``footprint``, ``lib_id`` (or ``lib``),
+``sheet`` and any symbol property, e.g. ``MPN``; names and operands holding
+spaces or operator characters are quoted. Text comparisons ignore case.
+Ordering comparisons compare the field's value as an SI number; ``=``
+with a numeric operand also matches equal numbers, so ``value = 4.7k``
+matches ``4k7``.
+
+The index of a Netlist is built on first use and kept with the netlist.
+"""
+import re
+from bisect import bisect_left
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from kicad_mcp.utils.component_utils import parse_value, parse_values
+
+# Component fields that are not symbol properties, with their aliases
+INDEXED_FIELDS = {
+    "ref": "reference", "reference": "reference", "value": "value", "footprint": "footprint",
+    "lib": "lib_id", "lib_id": "lib_id", "sheet": "sheet"
+}
+
+_TOKEN_RE = re.compile(r"""\s*(?:(?P<paren>[()])|(?P<op>==|!=|<=|>=|!~|=|<|>|~)|"(?P<dq>[^"]*)"|'(?P<sq>[^']*)'|(?P<word>[^\s()=!<>~"']+))""")
+
+_WILDCARD_RE = re.compile(r"[*?\[]")
+
+# Relative tolerance of numeric equality, so 4.7k equals 4700 despite rounding
+_REL_TOLERANCE = 1e-9
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    """Split an expression into (kind, text) tokens; kind is paren, op, text or word."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if match is None:
+            raise ValueError(f"Invalid query at position {position}: {expression[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        if kind in ("dq", "sq"):
+            tokens.append(("text", match.group(kind)))
+        else:
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing nested tuples:
+
+    ``("or", a, b)``, ``("and", a, b)``, ``("not", a)``, ``("set", field)``
+    and ``("cmp", field, op, operand)``.
+    """
+
+    def __init__(self, expression: str):
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _keyword(self, keyword: str) -> bool:
+        token = self._peek()
+        if token is not None and token[0] == "word" and token[1].lower() == keyword:
+            self.position += 1
+            return True
+        return False
+
+    def parse(self) -> Tuple:
+        if not self.tokens:
+            raise ValueError("Empty query")
+        node = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected '{self._peek()[1]}' in query")
+        return node
+
+    def _or(self) -> Tuple:
+        node = self._and()
+        while self._keyword("or"):
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self) -> Tuple:
+        node = self._not()
+        while self._keyword("and"):
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self) -> Tuple:
+        if self._keyword("not"):
+            return ("not", self._not())
+
+        token = self._peek()
+        if token is None:
+            raise ValueError("Query ends where a condition was expected")
+        if token == ("paren", "("):
+            self.position += 1
+            node = self._or()
+            if self._peek() != ("paren", ")"):
+                raise ValueError("Missing ')' in query")
+            self.position += 1
+            return node
+        if token[0] not in ("word", "text"):
+            raise ValueError(f"Expected a field name, found '{token[1]}'")
+
+        self.position += 1
+        field = token[1]
+        operator = self._peek()
+        if operator is None or operator[0] != "op":
+            return ("set", field)
+
+        self.position += 1
+        operand = self._peek()
+        if operand is None or operand[0] not in ("word", "text"):
+            raise ValueError(f"Expected a value after '{field} {operator[1]}'")
+        self.position += 1
+        return ("cmp", field, "=" if operator[1] == "==" else operator[1], operand[1])
+
+
+@lru_cache(maxsize=256)
+def parse_query(expression: str) -> Tuple:
+    """Parse a filter expression.
+
+    Args:
+        expression: Filter expression (see module documentation)
+
+    Returns:
+        Expression tree of nested tuples
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    return _Parser(expression).parse()
+
+
+class FieldIndex:
+    """Index of one component field: distinct values and their components."""
+
+    __slots__ = ("size", "texts", "_ids", "_keys", "_order", "_sorted")
+
+    def __init__(self, texts: List[str]):
+        """Build the index.
+
+        Args:
+            texts: Field text of every component by component ID, "" if unset
+        """
+        self.size = len(texts)
+        self.texts = texts
+        groups: Dict[str, List[int]] = {}
+        for component_id, text in enumerate(texts):
+            groups.setdefault(text.casefold(), []).append(component_id)
+        self._ids = {text: np.array(ids, dtype=np.int64) for text, ids in groups.items()}
+        # Distinct texts in sorted order, for wildcard patterns with a literal prefix
+        self._keys: Optional[List[str]] = None
+        # IDs of the components whose field is a number, sorted by it, and
+        # their numbers; built on the first numeric comparison
+        self._order: Optional[np.ndarray] = None
+        self._sorted: Optional[np.ndarray] = None
+
+    def _mask(self, ids: List[np.ndarray]) -> np.ndarray:
+        mask = np.zeros(self.size, dtype=bool)
+        if len(ids) == 1:
+            mask[ids[0]] = True
+        elif ids:
+            mask[np.concatenate(ids)] = True
+        return mask
+
+    def present(self) -> np.ndarray:
+        """Mask of the components where the field is set and not empty."""
+        mask = np.ones(self.size, dtype=bool)
+        empty = self._ids.get("")
+        if empty is not None:
+            mask[empty] = False
+        return mask
+
+    def equals(self, text: str) -> np.ndarray:
+        """Mask of the components whose field equals a text, ignoring case."""
+        ids = self._ids.get(text.casefold())
+        return self._mask([ids] if ids is not None else [])
+
+    def matches(self, pattern: str) -> np.ndarray:
+        """Mask of the components whose field matches a wildcard pattern, ignoring case."""
+        pattern = pattern.casefold()
+        prefix = _WILDCARD_RE.split(pattern, 1)[0]
+        if prefix == pattern:
+            return self.equals(pattern)
+        if not prefix:
+            return self._mask([ids for text, ids in self._ids.items() if fnmatchcase(text, pattern)])
+
+        # Only texts starting with the literal prefix can match
+        if self._keys is None:
+            self._keys = sorted(self._ids)
+        keys = self._keys
+        start = bisect_left(keys, prefix)
+        any_suffix = pattern == prefix + "*"
+        candidates = []
+        for text in islice(keys, start, None):
+            if not text.startswith(prefix):
+                break
+            if any_suffix or fnmatchcase(text, pattern):
+                candidates.append(self._ids[text])
+        return self._mask(candidates)
+
+    def compare(self, operator: str, number: float) -> np.ndarray:
+        """Mask of the components whose field, as an SI number, compares to a number.
+
+        Args:
+            operator: One of ``=``, ``<``, ``<=``, ``>``, ``>=``
+            number: Number to compare with
+
+        Returns:
+            Mask of the matching components; fields that are not numbers never match
+        """
+        if self._sorted is None:
+            numbers = parse_values(self.texts)
+            order = np.argsort(numbers, kind='stable')
+            # NaNs sort last
+            self._order = order[:len(numbers) - int(np.count_nonzero(np.isnan(numbers)))]
+            self._sorted = numbers[self._order]
+        order, sorted_numbers = self._order, self._sorted
+
+        tolerance = abs(number) * _REL_TOLERANCE
+        low = np.searchsorted(sorted_numbers, number - tolerance, side='left')
+        high = np.searchsorted(sorted_numbers, number + tolerance, side='right')
+        selected = {
+            "=": order[low:high],
+            "<": order[:low],
+            "<=": order[:high],
+            ">": order[high:],
+            ">=": order[low:]
+        }[operator]
+        return self._mask([selected])
+
+
+class ComponentIndex:
+    """Field indexes over the components of one netlist, built per field on first use."""
+
+    __slots__ = ("components", "refs", "_fields", "_property_names")
+
+    def __init__(self, components: Mapping[str, Any]):
+        """Prepare the index.
+
+        Args:
+            components: Reference -> component (record or dictionary)
+        """
+        self.components = components
+        self.refs: List[str] = list(components)
+        self._fields: Dict[str, FieldIndex] = {}
+        self._property_names: Optional[Dict[str, List[str]]] = None
+
+    def _property_keys(self, name: str) -> List[str]:
+        """Get the spellings of a property name used in the design, matched ignoring case."""
+        if self._property_names is None:
+            names: Dict[str, List[str]] = {}
+            for component in self.components.values():
+                for key in component.get('properties') or ():
+                    spellings = names.setdefault(key.casefold(), [])
+                    if key not in spellings:
+                        spellings.append(key)
+            self._property_names = names
+        return self._property_names.get(name.casefold(), [])
+
+    def field(self, name: str) -> FieldIndex:
+        """Get the index of a field, building it if needed.
+
+        Args:
+            name: Field name or alias (see INDEXED_FIELDS), or a property name
+
+        Returns:
+            The field's index
+        """
+        field = INDEXED_FIELDS.get(name.lower())
+        key = field or f"property:{name.casefold()}"
+        index = self._fields.get(key)
+        if index is None:
+            components = self.components.values()
+            if field is not None:
+                texts = [component.get(field) or '' for component in components]
+            else:
+                spellings = self._property_keys(name)
+                texts = []
+                for component in components:
+                    properties = component.get('properties') or {}
+                    texts.append(next((properties[key] for key in spellings if properties.get(key)), ''))
+            index = self._fields[key] = FieldIndex(texts)
+        return index
+
+    def _evaluate(self, node: Tuple) -> np.ndarray:
+        kind = node[0]
+        if kind == "or":
+            return self._evaluate(node[1]) | self._evaluate(node[2])
+        if kind == "and":
+            return self._evaluate(node[1]) & self._evaluate(node[2])
+        if kind == "not":
+            return ~self._evaluate(node[1])
+        if kind == "set":
+            return self.field(node[1]).present()
+
+        _, name, operator, operand = node
+        index = self.field(name)
+        if operator in ("~", "!~"):
+            mask = index.matches(operand)
+            return ~mask if operator == "!~" else mask
+
+        number = parse_value(operand)
+        if operator in ("=", "!="):
+            # Equal as text, or as numbers when the operand is one (10k = 10000)
+            mask = index.equals(operand)
+            if number is not None:
+                mask |= index.compare("=", number)
+            return ~mask if operator == "!=" else mask
+
+        if number is None:
+            raise ValueError(f"'{name} {operator} {operand}' needs a number, e.g. 10k or 1u")
+        return index.compare(operator, number)
+
+    def query(self, expression: str) -> List[str]:
+        """Find the components matching a filter expression.
+
+        Args:
+            expression: Filter expression (see module documentation)
+
+        Returns:
+            References of the matching components, in netlist order
+
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        if not self.refs:
+            parse_query(expression)
+            return []
+        mask = self._evaluate(parse_query(expression))
+        return [self.refs[i] for i in np.flatnonzero(mask).tolist()]
+
+
+def get_component_index(netlist_data: Any) -> ComponentIndex:
+    """Get the component index of a netlist, building it if needed.
+
+    Args:
+        netlist_data: Netlist from extract_netlist, or a dictionary with ``components``
+
+    Returns:
+        The netlist's shared index, or a new one for plain dictionaries
+    """
+    index = getattr(netlist_data, 'component_index', None)
+    if index is not None:
+        return index
+    return ComponentIndex(netlist_data.get("components", {}))
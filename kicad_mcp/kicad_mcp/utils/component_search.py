@@ -0,0 +1,359 @@
+"""
+Persistent search index over the components of all discovered projects.
+
+Questions such as "which of our boards use the TPS54331" would otherwise
+parse the schematic of every project. The index keeps, in one SQLite
+database under ``~/.kicad_mcp``, the components of every project together
+with an inverted index: each word of a component's value, lib_id,
+footprint and symbol properties (MPN, manufacturer, ...) maps to the
+components having it. A search is then a few range scans of that table.
+
+Projects are re-indexed only when their schematic or one of its sub-sheets
+changed: the modification time and size of every file a project was built
+from are stored with it and compared on each update, so an update of an
+unchanged fleet costs one stat per file.
+
+Search words match the start of an indexed word, ignoring case, so
+``TPS54331`` finds ``TPS54331DDAR``; a component matches when it has every
+word of the query.
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from kicad_mcp.config import COMPONENT_SEARCH_INDEX
+from kicad_mcp.utils.netlist_parser import extract_netlist
+
+# Bump when the schema or the indexed words change; the index is then rebuilt
+SEARCH_INDEX_VERSION = 1
+
+# Properties already indexed as component fields, or not worth searching
+SKIPPED_PROPERTIES = frozenset(("reference", "value", "footprint", "datasheet"))
+
+# Most components one search returns
+MAX_SEARCH_RESULTS = 1000
+
+# Characters that separate the words of a field; dots, dashes and plus signs
+# belong to values and part numbers (4.7k, SOIC-8, LM7805+)
+_WORD_SPLIT_RE = re.compile(r"[\s:/\\_,;()\[\]{}|=\"']+")
+
+_SCHEMA = """
+CREATE TABLE projects (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    schematic TEXT NOT NULL
+);
+CREATE TABLE files (
+    project_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (project_id, path)
+);
+CREATE TABLE components (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    reference TEXT,
+    value TEXT,
+    lib_id TEXT,
+    footprint TEXT,
+    properties TEXT
+);
+CREATE INDEX components_project ON components (project_id);
+CREATE TABLE words (
+    id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL,
+    field TEXT NOT NULL,
+    UNIQUE (word, field)
+);
+CREATE TABLE postings (
+    word_id INTEGER NOT NULL,
+    component_id INTEGER NOT NULL,
+    PRIMARY KEY (word_id, component_id)
+) WITHOUT ROWID;
+CREATE INDEX postings_component ON postings (component_id);
+"""
+
+
+def index_words(text: str) -> List[str]:
+    """Get the words a field text is found by.
+
+    Args:
+        text: Field text, e.g. "Package_SO:SOIC-8_3.9x4.9mm"
+
+    Returns:
+        The whole text and each of its words, case-folded, without duplicates
+    """
+    text = text.strip().casefold()
+    if not text or text == "~":
+        return []
+    words = [text]
+    for word in _WORD_SPLIT_RE.split(text):
+        if word and word not in words:
+            words.append(word)
+    return words
+
+
+def _prefix_end(prefix: str) -> str:
+    """Get the smallest string greater than every string starting with a prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _stamp(path: str) -> Tuple[int, int]:
+    """Get a file's (mtime_ns, size), or (-1, -1) if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return -1, -1
+    return stat.st_mtime_ns, stat.st_size
+
+
+def schematic_for_project(project_path: str) -> str:
+    """Get the root schematic of a project: the .kicad_sch file next to it with the same name."""
+    return os.path.splitext(os.path.abspath(project_path))[0] + ".kicad_sch"
+
+
+class ComponentSearchIndex:
+    """Inverted index of the components of many projects, stored in SQLite."""
+
+    def __init__(self, path: str = COMPONENT_SEARCH_INDEX):
+        """Initialize the index; the database is created on first use.
+
+        Args:
+            path: Database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating or rebuilding the schema if needed."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version != SEARCH_INDEX_VERSION:
+            if version:
+                print(f"Rebuilding component search index {self.path} (version {version})")
+            with connection:
+                for table in ("postings", "words", "components", "files", "projects"):
+                    connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.executescript(_SCHEMA)
+                connection.execute(f"PRAGMA user_version = {SEARCH_INDEX_VERSION}")
+        return connection
+
+    def update(self, projects: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Bring the index up to date with a set of projects.
+
+        Projects whose files are unchanged are skipped; changed and new ones
+        are parsed again, and projects not in the set are removed.
+
+        Args:
+            projects: Projects as listed by find_kicad_projects (with a ``path``)
+
+        Returns:
+            Dictionary with the number of ``indexed``, ``unchanged``,
+            ``removed`` and ``failed`` projects
+        """
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        with self._lock:
+            connection = self._connect()
+            try:
+                known = {path: project_id for project_id, path in connection.execute("SELECT id, path FROM projects")}
+                stamps: Dict[int, List[Tuple[str, int, int]]] = {}
+                for project_id, path, mtime_ns, size in connection.execute(
+                        "SELECT project_id, path, mtime_ns, size FROM files"):
+                    stamps.setdefault(project_id, []).append((path, mtime_ns, size))
+
+                seen = set()
+                for project in projects:
+                    project_path = os.path.abspath(project["path"])
+                    if project_path in seen:
+                        continue
+                    seen.add(project_path)
+                    schematic = schematic_for_project(project_path)
+
+                    project_id = known.get(project_path)
+                    if project_id is not None:
+                        files = stamps.get(project_id, [])
+                        if any(path == schematic for path, _, _ in files) and \
+                                all(_stamp(path) == (mtime_ns, size) for path, mtime_ns, size in files):
+                            counts["unchanged"] += 1
+                            continue
+
+                    if self._index_project(connection, project_id, project_path,
+                                           project.get("name") or os.path.basename(project_path), schematic):
+                        counts["indexed"] += 1
+                    else:
+                        counts["failed"] += 1
+
+                for path, project_id in known.items():
+                    if path not in seen:
+                        with connection:
+                            self._remove_project(connection, project_id)
+                        counts["removed"] += 1
+
+                if counts["indexed"] or counts["failed"] or counts["removed"]:
+                    # Drop the words no component has any more
+                    with connection:
+                        connection.execute("DELETE FROM words WHERE NOT EXISTS "
+                                           "(SELECT 1 FROM postings WHERE word_id = words.id)")
+            finally:
+                connection.close()
+        return counts
+
+    def _remove_project(self, connection: sqlite3.Connection, project_id: int) -> None:
+        connection.execute("DELETE FROM postings WHERE component_id IN "
+                           "(SELECT id FROM components WHERE project_id = ?)", (project_id,))
+        connection.execute("DELETE FROM components WHERE project_id = ?", (project_id,))
+        connection.execute("DELETE FROM files WHERE project_id = ?", (project_id,))
+        connection.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+
+    def _index_project(self, connection: sqlite3.Connection, project_id: Optional[int],
+                       project_path: str, name: str, schematic: str) -> bool:
+        """Replace the stored components of one project.
+
+        Returns:
+            False if the schematic could not be parsed; the project is then
+            stored without components and retried once its files change
+        """
+        # Stamp the files before parsing, so edits made meanwhile are seen next time
+        files = {schematic: _stamp(schematic)}
+        components: Dict[str, Any] = {}
+        success = True
+        if files[schematic][0] >= 0:
+            netlist = extract_netlist(schematic)
+            if "error" in netlist:
+                print(f"Not indexing components of {project_path}: {netlist['error']}")
+                success = False
+            else:
+                components = netlist["components"]
+                for sheet in netlist.get("sheets") or ():
+                    if sheet["file"] not in files:
+                        files[sheet["file"]] = _stamp(sheet["file"])
+
+        with connection:
+            if project_id is not None:
+                self._remove_project(connection, project_id)
+            project_id = connection.execute(
+                "INSERT INTO projects (path, name, schematic) VALUES (?, ?, ?)",
+                (project_path, name, schematic)).lastrowid
+            connection.executemany(
+                "INSERT INTO files (project_id, path, mtime_ns, size) VALUES (?, ?, ?, ?)",
+                [(project_id, path, mtime_ns, size) for path, (mtime_ns, size) in files.items()])
+
+            postings = []
+            word_ids: Dict[Tuple[str, str], int] = {}
+            for ref, component in components.items():
+                properties = component.get("properties") or {}
+                component_id = connection.execute(
+                    "INSERT INTO components (project_id, reference, value, lib_id, footprint, properties) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (project_id, ref, component.get("value"), component.get("lib_id"),
+                     component.get("footprint"), json.dumps(properties) if properties else None)).lastrowid
+
+                fields = [(field, component.get(field)) for field in ("value", "lib_id", "footprint")]
+                fields.extend((key.casefold(), text) for key, text in properties.items()
+                              if key.casefold() not in SKIPPED_PROPERTIES)
+                for field, text in fields:
+                    for word in index_words(text or ""):
+                        word_id = word_ids.get((word, field))
+                        if word_id is None:
+                            word_id = word_ids[word, field] = self._word_id(connection, word, field)
+                        postings.append((word_id, component_id))
+            connection.executemany("INSERT OR IGNORE INTO postings (word_id, component_id) VALUES (?, ?)", postings)
+        return success
+
+    def _word_id(self, connection: sqlite3.Connection, word: str, field: str) -> int:
+        """Get the ID of a word of a field, adding the word if it is new."""
+        row = connection.execute("SELECT id FROM words WHERE word = ? AND field = ?", (word, field)).fetchone()
+        if row is not None:
+            return row[0]
+        return connection.execute("INSERT INTO words (word, field) VALUES (?, ?)", (word, field)).lastrowid
+
+    def search(self, query: str, field: Optional[str] = None,
+               limit: int = 100) -> Dict[str, Any]:
+        """Find the components matching every word of a query.
+
+        Args:
+            query: Words to look for, e.g. "TPS54331" or "10u 0805"
+            field: Only look in this field: value, lib_id, footprint or a
+                property name such as MPN
+            limit: Maximum number of components to return, at most
+                MAX_SEARCH_RESULTS
+
+        Returns:
+            Dictionary with the ``match_count`` and the matching components
+            grouped by project in ``projects``
+
+        Raises:
+            ValueError: If the query has no words
+        """
+        words = [word for word in _WORD_SPLIT_RE.split(query.strip().casefold()) if word]
+        if not words:
+            raise ValueError("Search query has no words")
+
+        condition = "word >= ? AND word < ?"
+        if field:
+            condition += " AND field = ?"
+        selects = []
+        parameters: List[Any] = []
+        for word in words:
+            selects.append(f"SELECT DISTINCT component_id FROM postings WHERE word_id IN (SELECT id FROM words WHERE {condition})")
+            parameters.extend((word, _prefix_end(word)))
+            if field:
+                parameters.append(field.casefold())
+        matches = " INTERSECT ".join(selects)
+
+        with self._lock:
+            connection = self._connect()
+            try:
+                component_ids = sorted(row[0] for row in connection.execute(matches, parameters))
+                selected = component_ids[:max(min(limit, MAX_SEARCH_RESULTS), 0)]
+                rows = connection.execute(
+                    "SELECT p.name, p.path, p.schematic, c.reference, c.value, c.lib_id, c.footprint, c.properties "
+                    "FROM components c JOIN projects p ON p.id = c.project_id "
+                    f"WHERE c.id IN ({','.join('?' * len(selected))}) ORDER BY c.id", selected).fetchall()
+                project_count = connection.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+            finally:
+                connection.close()
+
+        projects: Dict[str, Dict[str, Any]] = {}
+        for name, project_path, schematic, ref, value, lib_id, footprint, properties in rows:
+            project = projects.get(project_path)
+            if project is None:
+                project = projects[project_path] = {
+                    "name": name,
+                    "path": project_path,
+                    "schematic": schematic,
+                    "components": []
+                }
+            project["components"].append({
+                "reference": ref,
+                "value": value,
+                "lib_id": lib_id,
+                "footprint": footprint,
+                "properties": json.loads(properties) if properties else {}
+            })
+
+        return {
+            "indexed_projects": project_count,
+            "match_count": len(component_ids),
+            "truncated": len(component_ids) > len(rows),
+            "projects": list(projects.values())
+        }
+
+
+_search_index: Optional[ComponentSearchIndex] = None
+
+
+def get_search_index() -> ComponentSearchIndex:
+    """Get the server's component search index."""
+    global _search_index
+    if _search_index is None:
+        _search_index = ComponentSearchIndex()
+    return _search_index
@@ -2,7 +2,10 @@
 Utility functions for working with KiCad component values and properties.
 """
 import re
-from typing import Any, Optional, Tuple, Union, Dict
+from functools import lru_cache
+from typing import Any, Optional, Tuple, Union, Dict, Iterable
+
+import numpy as np
 
 def extract_voltage_from_regulator(value: str) -> str:
     """Extract output voltage from a voltage regulator part number or description.
@@ -144,159 +147,190 @@ def extract_frequency_from_value(value: str) -> str:
     return "unknown"
 
 
-def extract_resistance_value(value: str) -> Tuple[Optional[float], Optional[str]]:
-    """Extract resistance value and unit from component value.
+# Number of distinct value strings whose parse is memoized
+VALUE_CACHE_SIZE = 8192
+
+# SI prefix -> power of ten. R and Ω mark the decimal point of resistor
+# codes (4R7); upper-case U, N and P are accepted for upper-cased BOMs.
+_PREFIX_EXPONENTS = {
+    "p": -12, "P": -12, "n": -9, "N": -9, "u": -6, "U": -6, "µ": -6, "μ": -6, "m": -3,
+    "": 0, "R": 0, "r": 0, "Ω": 0, "k": 3, "K": 3, "M": 6, "meg": 6, "G": 9
+}
+
+_VALUE_RE = re.compile(
+    # RKM code, the prefix standing for the decimal point: 4k7, 4R7, 2n2
+    r"\s*(?:(?P<int>\d+)(?P<rkm>(?i:meg)|[pPnNuUµμmkKMGRrΩ])(?P<frac>\d+)"
+    # Resistor code below one ohm: R47
+    r"|[Rr](?P<sub>\d+)"
+    # Decimal number with optional exponent and prefix: 4.7k, 1,5k, 100 nF, 1e-6
+    r"|(?P<num>\d+(?:[.,]\d*)?|\.\d+)(?:[eE](?P<exp>[+-]?\d+))?\s*(?P<prefix>(?i:meg)|[pPnNuUµμmkKMGRrΩ])?)"
+)
+_UNIT_RE = re.compile(r"[A-Za-zΩ]*")
+# A comma before exactly three digits may be a thousands separator (1,000)
+_THOUSANDS_RE = re.compile(r"\d+,\d{3}")
+
+# Display units of each component type, largest first: (scale, unit)
+_RESISTANCE_UNITS = ((1e6, "M"), (1e3, "k"), (1.0, "Ω"))
+_CAPACITANCE_UNITS = ((1.0, "F"), (1e-6, "μF"), (1e-9, "nF"), (1e-12, "pF"))
+_INDUCTANCE_UNITS = ((1.0, "H"), (1e-3, "mH"), (1e-6, "μH"), (1e-9, "nH"), (1e-12, "pH"))
+
+
+@lru_cache(maxsize=VALUE_CACHE_SIZE)
+def _parse_value(value: str) -> Optional[Tuple[float, str, str]]:
+    """Parse a value string into (SI value, prefix as written, upper-cased unit after it)."""
+    match = _VALUE_RE.match(value)
+    if match is None:
+        return None
+    # A digit or separator after the match means the number was cut short
+    # (1.2.3, 4k7,5, 1 000); give up rather than return its first part
+    end = match.end()
+    if end < len(value) and (value[end].isdigit() or value[end] in ".,"):
+        return None
+
+    if match.group("int") is not None:
+        prefix = match.group("rkm")
+        digits = f"{match.group('int')}.{match.group('frac')}"
+        exponent = 0
+    elif match.group("sub") is not None:
+        prefix = "R"
+        digits = f"0.{match.group('sub')}"
+        exponent = 0
+    else:
+        prefix = match.group("prefix") or ""
+        digits = match.group("num")
+        if _THOUSANDS_RE.fullmatch(digits):
+            return None
+        digits = digits.replace(",", ".")
+        exponent = int(match.group("exp") or 0)
+
+    if prefix.lower() == "meg":
+        prefix = "meg"
+    # Scaling through the exponent keeps 4.7k at exactly 4700.0
+    si_value = float(f"{digits}e{exponent + _PREFIX_EXPONENTS[prefix]}")
+    unit = _UNIT_RE.match(value, match.end()).group().upper()
+    return si_value, prefix, unit
+
+
+def parse_value(value: str) -> Optional[float]:
+    """Parse a component value in engineering notation into an SI float.
+    
+    Understands SI prefixes (``4.7k``, ``100nF``, ``10 uH``, ``1Meg``), RKM
+    codes where the prefix stands for the decimal point (``4k7``, ``4R7``,
+    ``2n2``, ``R47``) and exponents (``1e-6``). A comma is taken as the
+    decimal point (``1,5k``), except before exactly three digits (``1,000``),
+    where it may separate thousands and the value is rejected. Prefixes are
+    case-sensitive as in SI, so ``m`` is milli and ``M`` is mega. Text after
+    the value, such as a unit or rating (``10uF 16V``), is ignored, but a
+    value followed by more digits or separators (``1.2.3``, ``1 000``) is
+    not parsed. Results are memoized per string.
     
     Args:
-        value: Resistance value (e.g., "10k", "4.7k", "100")
+        value: Component value (e.g., "4k7", "100nF", "2.2uH")
         
     Returns:
-        Tuple of (numeric value, unit) or (None, None) if parsing fails
+        Value in SI base units (e.g., 4700.0, 1e-07), or None if the
+        string does not start with a value
     """
-    # Common resistance patterns
-    # 10k, 4.7k, 100R, 1M, 10, etc.
-    match = re.search(r'(\d+\.?\d*)([kKmMrRΩ]?)', value)
-    if match:
-        try:
-            resistance = float(match.group(1))
-            unit = match.group(2).upper() if match.group(2) else "Ω"
-            
-            # Normalize unit
-            if unit == "R" or unit == "":
-                unit = "Ω"
-            
-            return resistance, unit
-        except ValueError:
-            pass
+    parsed = _parse_value(value)
+    return parsed[0] if parsed is not None else None
+
+
+def parse_values(values: Iterable[Any]) -> np.ndarray:
+    """Parse a column of component values into SI floats in one call.
     
-    # Handle special case like "4k7" (means 4.7k)
-    match = re.search(r'(\d+)[kKmM](\d+)', value)
-    if match:
-        try:
-            value1 = int(match.group(1))
-            value2 = int(match.group(2))
-            resistance = float(f"{value1}.{value2}")
-            unit = "k" if "k" in value.lower() else "M" if "m" in value.lower() else "Ω"
-            
-            return resistance, unit
-        except ValueError:
-            pass
+    Each distinct value is parsed once, so BOM and netlist columns with
+    many repeated values are cheap.
     
-    return None, None
+    Args:
+        values: Value strings, e.g. a BOM value column or the values of a
+            netlist's components; numbers are taken as they are
+        
+    Returns:
+        Float array of SI values, NaN where a value cannot be parsed
+    """
+    values = list(values)
+    parsed: Dict[Any, float] = {}
+    for value in values:
+        if value not in parsed:
+            if isinstance(value, str):
+                si_value = parse_value(value)
+                parsed[value] = np.nan if si_value is None else si_value
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                parsed[value] = float(value)
+            else:
+                parsed[value] = np.nan
+    return np.fromiter((parsed[value] for value in values), dtype=np.float64, count=len(values))
+
+
+def _in_unit(si_value: float, units: Tuple[Tuple[float, str], ...]) -> Tuple[float, str]:
+    """Express an SI value in the largest display unit not exceeding it."""
+    for scale, unit in units:
+        if abs(si_value) >= scale:
+            break
+    return float(f"{si_value / scale:.6g}"), unit
+
+
+def extract_resistance_value(value: str) -> Tuple[Optional[float], Optional[str]]:
+    """Extract resistance value and unit from component value.
+    
+    Args:
+        value: Resistance value (e.g., "10k", "4.7k", "4k7", "100")
+        
+    Returns:
+        Tuple of (numeric value, unit) or (None, None) if parsing fails.
+        The unit (Ω, k, M) is chosen by magnitude, so "4k7" and "4700"
+        both give (4.7, "k").
+    """
+    parsed = _parse_value(value)
+    if parsed is None:
+        return None, None
+    
+    si_value, prefix, unit = parsed
+    if prefix in ("p", "P", "n", "N", "u", "U", "µ", "μ") or unit not in ("", "Ω", "OHM", "OHMS"):
+        return None, None
+    return _in_unit(si_value, _RESISTANCE_UNITS)
 
 
 def extract_capacitance_value(value: str) -> Tuple[Optional[float], Optional[str]]:
     """Extract capacitance value and unit from component value.
     
     Args:
-        value: Capacitance value (e.g., "10uF", "4.7nF", "100pF")
+        value: Capacitance value (e.g., "10uF", "4.7nF", "4n7", "100pF")
         
     Returns:
-        Tuple of (numeric value, unit) or (None, None) if parsing fails
+        Tuple of (numeric value, unit) or (None, None) if parsing fails.
+        The unit (pF, nF, μF, F) is chosen by magnitude.
     """
-    # Common capacitance patterns
-    # 10uF, 4.7nF, 100pF, etc.
-    match = re.search(r'(\d+\.?\d*)([pPnNuUμF]+)', value)
-    if match:
-        try:
-            capacitance = float(match.group(1))
-            unit = match.group(2).lower()
-            
-            # Normalize unit
-            if "p" in unit or "pf" in unit:
-                unit = "pF"
-            elif "n" in unit or "nf" in unit:
-                unit = "nF"
-            elif "u" in unit or "μ" in unit or "uf" in unit or "μf" in unit:
-                unit = "μF"
-            else:
-                unit = "F"
-            
-            return capacitance, unit
-        except ValueError:
-            pass
-    
-    # Handle special case like "4n7" (means 4.7nF)
-    match = re.search(r'(\d+)[pPnNuUμ](\d+)', value)
-    if match:
-        try:
-            value1 = int(match.group(1))
-            value2 = int(match.group(2))
-            capacitance = float(f"{value1}.{value2}")
-            
-            if "p" in value.lower():
-                unit = "pF"
-            elif "n" in value.lower():
-                unit = "nF"
-            elif "u" in value.lower() or "μ" in value:
-                unit = "μF"
-            else:
-                unit = "F"
-            
-            return capacitance, unit
-        except ValueError:
-            pass
-    
-    return None, None
+    parsed = _parse_value(value)
+    if parsed is None:
+        return None, None
+    
+    si_value, prefix, unit = parsed
+    # Bare numbers are not capacitances; "100n" is
+    if not unit.startswith("F") and (unit or prefix not in ("p", "P", "n", "N", "u", "U", "µ", "μ")):
+        return None, None
+    return _in_unit(si_value, _CAPACITANCE_UNITS)
 
 
 def extract_inductance_value(value: str) -> Tuple[Optional[float], Optional[str]]:
     """Extract inductance value and unit from component value.
     
     Args:
-        value: Inductance value (e.g., "10uH", "4.7nH", "100mH")
+        value: Inductance value (e.g., "10uH", "4.7nH", "4u7", "100mH")
         
     Returns:
-        Tuple of (numeric value, unit) or (None, None) if parsing fails
+        Tuple of (numeric value, unit) or (None, None) if parsing fails.
+        The unit (pH, nH, μH, mH, H) is chosen by magnitude.
     """
-    # Common inductance patterns
-    # 10uH, 4.7nH, 100mH, etc.
-    match = re.search(r'(\d+\.?\d*)([pPnNuUμmM][hH])', value)
-    if match:
-        try:
-            inductance = float(match.group(1))
-            unit = match.group(2).lower()
-            
-            # Normalize unit
-            if "p" in unit:
-                unit = "pH"
-            elif "n" in unit:
-                unit = "nH"
-            elif "u" in unit or "μ" in unit:
-                unit = "μH"
-            elif "m" in unit:
-                unit = "mH"
-            else:
-                unit = "H"
-            
-            return inductance, unit
-        except ValueError:
-            pass
-    
-    # Handle special case like "4u7" (means 4.7uH)
-    match = re.search(r'(\d+)[pPnNuUμmM](\d+)[hH]', value)
-    if match:
-        try:
-            value1 = int(match.group(1))
-            value2 = int(match.group(2))
-            inductance = float(f"{value1}.{value2}")
-            
-            if "p" in value.lower():
-                unit = "pH"
-            elif "n" in value.lower():
-                unit = "nH"
-            elif "u" in value.lower() or "μ" in value:
-                unit = "μH"
-            elif "m" in value.lower():
-                unit = "mH"
-            else:
-                unit = "H"
-            
-            return inductance, unit
-        except ValueError:
-            pass
-    
-    return None, None
+    parsed = _parse_value(value)
+    if parsed is None:
+        return None, None
+    
+    si_value, prefix, unit = parsed
+    is_henry = unit.startswith("H") and not unit.startswith("HZ")
+    if not is_henry and (unit or prefix not in ("p", "P", "n", "N", "u", "U", "µ", "μ", "m")):
+        return None, None
+    return _in_unit(si_value, _INDUCTANCE_UNITS)
 
 
 def format_resistance(resistance: float, unit: str) -> str:
@@ -351,6 +385,25 @@ def format_inductance(inductance: float, unit: str) -> str:
         return f"{inductance}{unit}"
 
 
+def format_value(si_value: float, component_type: str) -> str:
+    """Format an SI value in the display unit of a component type.
+    
+    Args:
+        si_value: Value in SI base units (e.g., from parse_value)
+        component_type: Type of component (R, C, L); other types get the bare number
+        
+    Returns:
+        Formatted value string (e.g., "4.7kΩ", "100nF")
+    """
+    if component_type == "R":
+        return format_resistance(*_in_unit(si_value, _RESISTANCE_UNITS))
+    elif component_type == "C":
+        return format_capacitance(*_in_unit(si_value, _CAPACITANCE_UNITS))
+    elif component_type == "L":
+        return format_inductance(*_in_unit(si_value, _INDUCTANCE_UNITS))
+    return f"{si_value:g}"
+
+
 def normalize_component_value(value: str, component_type: str) -> str:
     """Normalize a component value string based on component type.
     
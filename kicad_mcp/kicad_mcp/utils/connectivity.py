@@ -0,0 +1,477 @@
+"""
+Schematic connectivity engine.
+
+Connections in a KiCad schematic are geometric: wires, pins, labels and
+junctions that touch belong to the same net. Items are merged with a
+union-find structure; coincident points are found through a hash keyed on
+KiCad's internal coordinate grid, and points lying on the middle of a wire
+are found through a grid-hashed segment index, so no pairwise comparison of
+items is ever needed.
+"""
+from collections import defaultdict
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Schematic coordinates are stored in mm; KiCad's internal unit is 100 nm
+COORD_SCALE = 10000
+
+# Side length of a segment index cell, in mm (four 0.1 inch grid steps)
+DEFAULT_CELL_SIZE = 10.16
+
+# Net name sources, strongest first, in KiCad's driver order. Global labels
+# and power symbols name nets across the whole design; local labels,
+# hierarchical labels and sheet pins only inside their sheet.
+NAME_PRIORITY = {
+    "global": 0,
+    "power": 1,
+    "local": 2,
+    "hierarchical": 3,
+    "sheet_pin": 4,
+}
+
+
+def grid_key(x: float, y: float) -> Tuple[int, int]:
+    """Snap a coordinate in mm to KiCad's internal integer grid.
+
+    Args:
+        x: X coordinate in mm
+        y: Y coordinate in mm
+
+    Returns:
+        Integer (x, y) key
+    """
+    return round(x * COORD_SCALE), round(y * COORD_SCALE)
+
+
+class UnionFind:
+    """Disjoint-set forest with union by size and path halving."""
+
+    __slots__ = ("parent", "size")
+
+    def __init__(self):
+        self.parent: List[int] = []
+        self.size: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def add(self) -> int:
+        """Create a new singleton set.
+
+        Returns:
+            ID of the new element
+        """
+        node = len(self.parent)
+        self.parent.append(node)
+        self.size.append(1)
+        return node
+
+    def find(self, node: int) -> int:
+        """Find the representative of an element's set.
+
+        Args:
+            node: Element ID
+
+        Returns:
+            Representative element ID
+        """
+        parent = self.parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a: int, b: int) -> int:
+        """Merge the sets containing two elements.
+
+        Args:
+            a: First element ID
+            b: Second element ID
+
+        Returns:
+            Representative of the merged set
+        """
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return root_a
+
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+
+class IncrementalConnectivity:
+    """Connected groups of a sheet, kept up to date as items change.
+
+    Wire endpoints, pins, junctions and labels that share a grid point are
+    connected. Junctions and labels also connect to any wire passing
+    through them, matching KiCad, where a pin or wire end touching the
+    middle of another wire needs a junction to connect. Nodes carrying the
+    same name key (for example a global label text) are connected as well.
+
+    Nodes (wires, junctions, labels, pins and bare points) are added under
+    the key of the schematic item they belong to and removed again per item.
+    Groups are kept between calls to resolve(), which only recomputes the
+    groups that added or removed nodes touch, so editing one wire of a large
+    sheet costs time proportional to the nets involved.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        """Initialize an empty structure.
+
+        Args:
+            cell_size: Spatial index cell size in mm
+        """
+        self.cell = max(1, round(cell_size * COORD_SCALE))
+        self._next_node = 0
+        self._next_group = 0
+        # node -> (kind, grid point or segment, payload)
+        self._nodes: Dict[int, Tuple[str, Tuple[int, ...], Any]] = {}
+        self._item_nodes: Dict[Hashable, List[int]] = defaultdict(list)
+        self._points: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._wire_cells: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._anchor_cells: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self._named: Dict[Hashable, Set[int]] = defaultdict(set)
+        self._node_names: Dict[int, List[Tuple[Hashable, Tuple[str, str]]]] = {}
+        self._group_of: Dict[int, int] = {}
+        self._members: Dict[int, Set[int]] = {}
+        self._summaries: Dict[int, Dict[str, List[Any]]] = {}
+        self._new: Set[int] = set()
+        self._dirty: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _cells(self, x1: int, y1: int, x2: int, y2: int) -> Iterator[Tuple[int, int]]:
+        cell = self.cell
+        for cx in range(min(x1, x2) // cell, max(x1, x2) // cell + 1):
+            for cy in range(min(y1, y2) // cell, max(y1, y2) // cell + 1):
+                yield cx, cy
+
+    @staticmethod
+    def _on_segment(segment: Tuple[int, ...], point: Tuple[int, int]) -> bool:
+        x1, y1, x2, y2 = segment
+        px, py = point
+        if not (min(x1, x2) <= px <= max(x1, x2) and min(y1, y2) <= py <= max(y1, y2)):
+            return False
+        return (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1) == 0
+
+    def _touch(self, nodes: Iterable[int]) -> None:
+        """Mark the groups of existing nodes for recomputation."""
+        group_of = self._group_of
+        for node in nodes:
+            group = group_of.get(node)
+            if group is not None:
+                self._dirty.add(group)
+
+    def _add_node(self, item: Hashable, kind: str, geometry: Tuple[int, ...], payload: Any = None) -> int:
+        node = self._next_node
+        self._next_node += 1
+        self._nodes[node] = (kind, geometry, payload)
+        self._item_nodes[item].append(node)
+        self._new.add(node)
+        return node
+
+    def _add_anchor(self, key: Tuple[int, int], node: int) -> None:
+        """Register a junction or label, which also connects to wires passing through it."""
+        cell = (key[0] // self.cell, key[1] // self.cell)
+        self._anchor_cells[cell].add(node)
+        nodes = self._nodes
+        self._touch(wire for wire in self._wire_cells.get(cell, ()) if self._on_segment(nodes[wire][1], key))
+
+    def add_wire(self, item: Hashable, x1: float, y1: float, x2: float, y2: float) -> int:
+        """Add a wire segment.
+
+        Args:
+            item: Key of the schematic item the wire belongs to
+            x1: Start X in mm
+            y1: Start Y in mm
+            x2: End X in mm
+            y2: End Y in mm
+
+        Returns:
+            Node ID
+        """
+        start = grid_key(x1, y1)
+        end = grid_key(x2, y2)
+        segment = start + end
+        node = self._add_node(item, 'wire', segment)
+        self._points[start].add(node)
+        self._points[end].add(node)
+
+        nodes = self._nodes
+        for cell in self._cells(*segment):
+            self._wire_cells[cell].add(node)
+            self._touch(anchor for anchor in self._anchor_cells.get(cell, ())
+                        if self._on_segment(segment, nodes[anchor][1]))
+        return node
+
+    def add_junction(self, item: Hashable, x: float, y: float) -> int:
+        """Add a junction dot.
+
+        Args:
+            item: Key of the schematic item
+            x: X in mm
+            y: Y in mm
+
+        Returns:
+            Node ID
+        """
+        key = grid_key(x, y)
+        node = self._add_node(item, 'anchor', key)
+        self._points[key].add(node)
+        self._add_anchor(key, node)
+        return node
+
+    def add_label(self, item: Hashable, x: float, y: float, kind: str, text: str,
+                  scope: Hashable = None) -> int:
+        """Add a net label anchor.
+
+        Args:
+            item: Key of the schematic item
+            x: Anchor X in mm
+            y: Anchor Y in mm
+            kind: One of the NAME_PRIORITY keys
+            text: Label text
+            scope: Extra key limiting which equal labels are merged
+
+        Returns:
+            Node ID
+        """
+        node = self.add_junction(item, x, y)
+        self.add_name(node, kind, text, scope)
+        return node
+
+    def add_name(self, node: int, kind: str, text: str, scope: Hashable = None) -> None:
+        """Attach a net name to a node; nodes with equal names are connected.
+
+        Args:
+            node: Node ID
+            kind: One of the NAME_PRIORITY keys
+            text: Net name text
+            scope: Extra key limiting which equal names are merged
+        """
+        name_key = (kind, scope, text)
+        self._named[name_key].add(node)
+        self._node_names.setdefault(node, []).append((name_key, (kind, text)))
+
+    def add_pin(self, item: Hashable, x: float, y: float, pin: Any) -> int:
+        """Add a symbol pin connection point.
+
+        Args:
+            item: Key of the schematic item
+            x: Pin X in mm
+            y: Pin Y in mm
+            pin: Payload reported in the group's ``pins``
+
+        Returns:
+            Node ID
+        """
+        key = grid_key(x, y)
+        node = self._add_node(item, 'pin', key, pin)
+        self._points[key].add(node)
+        return node
+
+    def add_point(self, item: Hashable, x: float, y: float, point: Any) -> int:
+        """Add a bare connection point such as a sheet pin.
+
+        Args:
+            item: Key of the schematic item
+            x: X in mm
+            y: Y in mm
+            point: Payload reported in the group's ``points``
+
+        Returns:
+            Node ID
+        """
+        key = grid_key(x, y)
+        node = self._add_node(item, 'point', key, point)
+        self._points[key].add(node)
+        return node
+
+    def pins_at(self, x: float, y: float) -> List[Any]:
+        """Get the pins whose connection point is at a position.
+
+        Args:
+            x: X in mm
+            y: Y in mm
+
+        Returns:
+            Payloads of the pins there
+        """
+        nodes = self._nodes
+        return [nodes[node][2] for node in self._points.get(grid_key(x, y), ()) if nodes[node][0] == 'pin']
+
+    def remove(self, item: Hashable) -> None:
+        """Remove every node added under an item key.
+
+        Args:
+            item: Key of the schematic item
+        """
+        for node in self._item_nodes.pop(item, ()):
+            kind, geometry, _ = self._nodes.pop(node)
+
+            group = self._group_of.pop(node, None)
+            if group is None:
+                self._new.discard(node)
+            else:
+                self._dirty.add(group)
+                self._members[group].discard(node)
+
+            if kind == 'wire':
+                for key in (geometry[:2], geometry[2:]):
+                    self._discard(self._points, key, node)
+                for cell in self._cells(*geometry):
+                    self._discard(self._wire_cells, cell, node)
+            else:
+                self._discard(self._points, geometry, node)
+                if kind == 'anchor':
+                    self._discard(self._anchor_cells, (geometry[0] // self.cell, geometry[1] // self.cell), node)
+
+            for name_key, _ in self._node_names.pop(node, ()):
+                self._discard(self._named, name_key, node)
+
+    @staticmethod
+    def _discard(index: Dict[Hashable, Set[int]], key: Hashable, node: int) -> None:
+        nodes = index.get(key)
+        if nodes is not None:
+            nodes.discard(node)
+            if not nodes:
+                del index[key]
+
+    def resolve(self) -> Dict[int, Dict[str, List[Any]]]:
+        """Recompute the groups changed since the last call.
+
+        Returns:
+            Dictionary mapping group ID to its ``pins`` and ``points``
+            payloads and ``names`` (kind, text) tuples, for all groups.
+            Groups with none of them are dropped. Unchanged groups keep
+            their ID and dictionary.
+        """
+        # New nodes join the groups of nodes at the same point or with the
+        # same name; members of one point or name share a group, so each
+        # is scanned once however many nodes were added to it
+        points, name_keys = set(), set()
+        for node in self._new:
+            kind, geometry, _ = self._nodes[node]
+            if kind == 'wire':
+                points.add(geometry[:2])
+                points.add(geometry[2:])
+            else:
+                points.add(geometry)
+            for name_key, _ in self._node_names.get(node, ()):
+                name_keys.add(name_key)
+        for key in points:
+            self._touch(self._points[key])
+        for name_key in name_keys:
+            self._touch(self._named[name_key])
+
+        affected = set(self._new)
+        for group in self._dirty:
+            members = self._members.pop(group, None)
+            if members:
+                affected.update(members)
+            self._summaries.pop(group, None)
+        self._new.clear()
+        self._dirty.clear()
+        if not affected:
+            return self._summaries
+
+        # Union-find over the affected nodes only; every node they connect
+        # to is affected as well, since additions touched their neighbours'
+        # groups and removals can only split groups
+        order = sorted(affected)
+        local = {node: index for index, node in enumerate(order)}
+        uf = UnionFind()
+        for _ in order:
+            uf.add()
+
+        nodes = self._nodes
+        keys = set()
+        name_keys = set()
+        for node in order:
+            kind, geometry, _ = nodes[node]
+            if kind == 'wire':
+                keys.add(geometry[:2])
+                keys.add(geometry[2:])
+                continue
+
+            keys.add(geometry)
+            if kind == 'anchor':
+                cell = (geometry[0] // self.cell, geometry[1] // self.cell)
+                for wire in self._wire_cells.get(cell, ()):
+                    if self._on_segment(nodes[wire][1], geometry):
+                        uf.union(local[node], local[wire])
+            for name_key, _ in self._node_names.get(node, ()):
+                name_keys.add(name_key)
+
+        for index, key in ((self._points, keys), (self._named, name_keys)):
+            for k in key:
+                members = iter(index[k])
+                first = local[next(members)]
+                for other in members:
+                    uf.union(first, local[other])
+
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for node in order:
+            groups[uf.find(local[node])].append(node)
+
+        for members in groups.values():
+            group = self._next_group
+            self._next_group += 1
+            self._members[group] = set(members)
+
+            pins, names, points = [], [], []
+            for node in members:
+                self._group_of[node] = group
+                kind, _, payload = nodes[node]
+                if kind == 'pin':
+                    pins.append(payload)
+                elif kind == 'point':
+                    points.append(payload)
+                for _, name in self._node_names.get(node, ()):
+                    if name not in names:
+                        names.append(name)
+
+            if pins or names or points:
+                self._summaries[group] = {"pins": pins, "names": names, "points": points}
+
+        return self._summaries
+
+
+def choose_net_name(names: List[Tuple[str, str]]) -> Optional[str]:
+    """Pick the net name KiCad would show for a group of driving names.
+
+    Names must already carry their sheet path prefix where one applies
+    (``/Power/VIN``). Stronger kinds win; among equal kinds the name from the
+    sheet highest up in the hierarchy wins.
+
+    Args:
+        names: (kind, text) tuples attached to the group
+
+    Returns:
+        Net name, or None if the group has no names
+    """
+    if not names:
+        return None
+
+    kind, text = min(names, key=lambda name: (NAME_PRIORITY.get(name[0], 99), name[1].count('/'), name[1]))
+    return text
+
+
+def default_net_name(pins: List[Tuple[str, str]]) -> str:
+    """Build KiCad's automatic name for an unlabelled net.
+
+    Args:
+        pins: (reference, pin number) tuples on the net
+
+    Returns:
+        ``Net-(R1-Pad1)`` style name, or ``unconnected-(R1-Pad1)`` for a
+        single pin
+    """
+    ref, num = min(pins)
+    if len(pins) == 1:
+        return f"unconnected-({ref}-Pad{num})"
+    return f"Net-({ref}-Pad{num})"
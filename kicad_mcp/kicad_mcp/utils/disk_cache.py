@@ -0,0 +1,311 @@
+"""
+Persistent on-disk cache of parse and analysis results.
+
+The stdio server restarts with every client session, so results worth
+keeping (netlists, BOM analyses, circuit patterns) are also written to
+``~/.kicad_mcp/cache``. The file name of an artifact is a hash of the result
+kind, the producer's version, the source file's absolute path and its content
+hash, and each artifact lists the content hashes of any other files it was
+built from (e.g. sub-sheets) so it is only used while those are unchanged.
+The path is part of the name because those other files are found relative
+to the source: a copy of a project with the same root schematic but
+different sub-sheets or design rules must not get the original's result.
+
+Content hashes are remembered per (path, mtime_ns, size) in a small index,
+so a warm lookup after a restart costs a file stat and one artifact read.
+The directory is capped in size; least recently used artifacts are removed
+first.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from kicad_mcp.config import DISK_CACHE_DIR, DISK_CACHE_MAX_BYTES
+from kicad_mcp.utils.parse_cache import file_digest
+
+# Bump when the artifact layout changes; old artifacts are then ignored
+CACHE_FORMAT_VERSION = 1
+
+# Number of remembered (path, stat) -> content hash entries
+INDEX_MAX_ENTRIES = 10000
+
+ARTIFACT_SUFFIX = ".bin"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write a file so concurrent readers never see partial content."""
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class DiskCache:
+    """Size-capped, content-addressed artifact store in a directory."""
+
+    def __init__(self, directory: str = DISK_CACHE_DIR, max_bytes: int = DISK_CACHE_MAX_BYTES):
+        """Initialize the store; the directory is created on first write.
+
+        Args:
+            directory: Cache directory
+            max_bytes: Upper bound on the total size of stored artifacts
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index_path = os.path.join(directory, "index.pickle")
+        self._index: Optional[Dict[str, Tuple[int, int, bytes]]] = None
+        self._index_dirty = False
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.RLock()
+
+    def _load_index(self) -> Dict[str, Tuple[int, int, bytes]]:
+        """Load the path -> (mtime_ns, size, digest) index on first use."""
+        if self._index is None:
+            try:
+                with open(self._index_path, 'rb') as f:
+                    index = pickle.loads(zlib.decompress(f.read()))
+                self._index = index if isinstance(index, dict) else {}
+            except (OSError, ValueError, EOFError, pickle.UnpicklingError, zlib.error):
+                self._index = {}
+        return self._index
+
+    def _save_index(self) -> None:
+        """Write the index back if it changed."""
+        if not self._index_dirty:
+            return
+
+        index = self._index
+        if len(index) > INDEX_MAX_ENTRIES:
+            # Dicts keep insertion order, and refreshed entries are re-inserted
+            for path in list(index)[:len(index) - INDEX_MAX_ENTRIES]:
+                del index[path]
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _write_atomic(self._index_path, zlib.compress(pickle.dumps(index, pickle.HIGHEST_PROTOCOL)))
+            self._index_dirty = False
+        except OSError as e:
+            print(f"Error saving cache index: {str(e)}")
+
+    def digest(self, path: str) -> Optional[bytes]:
+        """Get a file's content hash, reusing the stored one while its stat is unchanged.
+
+        Args:
+            path: File path
+
+        Returns:
+            Content digest, or None if the file cannot be read
+        """
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(path)
+            if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                return entry[2]
+
+        try:
+            digest = file_digest(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            index.pop(path, None)
+            index[path] = (stat.st_mtime_ns, stat.st_size, digest)
+            self._index_dirty = True
+        return digest
+
+    def _artifact_path(self, kind: str, version: Any, path: str, digest: bytes) -> str:
+        """Get the artifact file for a result of one source file and content."""
+        key = hashlib.blake2b(f"{CACHE_FORMAT_VERSION}\0{kind}\0{version}\0{path}\0".encode('utf-8'),
+                              digest_size=20)
+        key.update(digest)
+        name = key.hexdigest()
+        return os.path.join(self.directory, name[:2], name + ARTIFACT_SUFFIX)
+
+    def get(self, kind: str, version: Any, path: str) -> Optional[Tuple[Any, List[str]]]:
+        """Load a stored result.
+
+        Args:
+            kind: Result type, e.g. "netlist"
+            version: Version of the code producing the result
+            path: Source file the result was built from
+
+        Returns:
+            Tuple of (result, other source files), or None on a miss
+        """
+        path = os.path.abspath(path)
+        digest = self.digest(path)
+        if digest is None:
+            return self._miss()
+
+        artifact = self._artifact_path(kind, version, path, digest)
+        try:
+            with open(artifact, 'rb') as f:
+                dependencies, value = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return self._miss()
+        except Exception as e:
+            # Truncated or foreign file; drop it and parse again
+            print(f"Discarding unreadable cache artifact {artifact}: {str(e)}")
+            self._remove(artifact)
+            return self._miss()
+
+        for dependency, dependency_digest in dependencies:
+            if self.digest(dependency) != dependency_digest:
+                return self._miss()
+
+        # Reads refresh the timestamp used for LRU collection
+        try:
+            os.utime(artifact)
+        except OSError:
+            pass
+
+        with self._lock:
+            self.hits += 1
+            self._save_index()
+        return value, [dependency for dependency, _ in dependencies]
+
+    def _miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+            self._save_index()
+        return None
+
+    def put(self, kind: str, version: Any, path: str, value: Any,
+            dependencies: Iterable[str] = ()) -> None:
+        """Store a result.
+
+        Args:
+            kind: Result type, e.g. "netlist"
+            version: Version of the code producing the result
+            path: Source file the result was built from
+            value: Result to store; must be picklable
+            dependencies: Other source files the result was built from
+        """
+        path = os.path.abspath(path)
+        digest = self.digest(path)
+        if digest is None:
+            return
+
+        stamps = []
+        for dependency in dict.fromkeys(os.path.abspath(p) for p in dependencies):
+            if dependency == path:
+                continue
+            dependency_digest = self.digest(dependency)
+            if dependency_digest is None:
+                return
+            stamps.append((dependency, dependency_digest))
+
+        try:
+            data = zlib.compress(pickle.dumps((stamps, value), pickle.HIGHEST_PROTOCOL), 1)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f"Cannot cache {kind} result for {path}: {str(e)}")
+            return
+
+        if len(data) > self.max_bytes:
+            return
+
+        artifact = self._artifact_path(kind, version, path, digest)
+        with self._lock:
+            try:
+                os.makedirs(os.path.dirname(artifact), exist_ok=True)
+                previous = os.path.getsize(artifact) if os.path.exists(artifact) else 0
+                _write_atomic(artifact, data)
+            except OSError as e:
+                print(f"Error writing cache artifact: {str(e)}")
+                return
+
+            self._save_index()
+            if self._total_bytes is not None:
+                self._total_bytes += len(data) - previous
+            if self._current_size() > self.max_bytes:
+                self.collect()
+
+    def _artifacts(self) -> List[Tuple[float, int, str]]:
+        """List stored artifacts as (last use, size, path)."""
+        artifacts = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(ARTIFACT_SUFFIX):
+                    continue
+                artifact = os.path.join(root, name)
+                try:
+                    stat = os.stat(artifact)
+                except OSError:
+                    continue
+                artifacts.append((stat.st_mtime, stat.st_size, artifact))
+        return artifacts
+
+    def _current_size(self) -> int:
+        """Total artifact size, scanned once and tracked afterwards."""
+        if self._total_bytes is None:
+            self._total_bytes = sum(size for _, size, _ in self._artifacts())
+        return self._total_bytes
+
+    def _remove(self, artifact: str) -> None:
+        try:
+            os.unlink(artifact)
+        except OSError:
+            pass
+
+    def collect(self, target_fraction: float = 0.8) -> int:
+        """Delete least recently used artifacts until under the size cap.
+
+        Args:
+            target_fraction: Fraction of the cap to shrink to, leaving headroom
+                so collection does not run on every write
+
+        Returns:
+            Number of artifacts removed
+        """
+        with self._lock:
+            artifacts = sorted(self._artifacts())
+            total = sum(size for _, size, _ in artifacts)
+            target = self.max_bytes * target_fraction
+            removed = 0
+
+            for _, size, artifact in artifacts:
+                if total <= target:
+                    break
+                self._remove(artifact)
+                total -= size
+                removed += 1
+
+            self._total_bytes = total
+            if removed:
+                print(f"Removed {removed} cache artifacts, {total} bytes remain")
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store counters.
+
+        Returns:
+            Dictionary with hits, misses, size and location
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bytes": self._current_size(),
+                "max_bytes": self.max_bytes,
+                "directory": self.directory
+            }
@@ -0,0 +1,191 @@
+"""
+Violation-level comparison of DRC results.
+
+Counting violations per category cannot tell that three clearance errors
+were fixed while three others appeared. Each violation is therefore given
+a fingerprint: a 64-bit hash of its type, the UUIDs of the board items
+involved and their positions rounded to FINGERPRINT_GRID. The same
+violation found by a later check has the same fingerprint, so two checks
+are compared with set operations over their fingerprints, in time linear
+in the number of violations. Only the added and resolved violations are
+described in detail, so comparing two checks of a board with tens of
+thousands of unchanged violations stays cheap.
+
+Moving an item by more than the grid makes its violations count as
+resolved and added again.
+"""
+import hashlib
+import json
+import zlib
+from array import array
+from collections import Counter
+from typing import Any, Dict, List, Sequence
+
+# Grid in mm that violation positions are rounded to before hashing
+FINGERPRINT_GRID = 0.1
+
+# Most added and resolved violations listed in a diff; counts cover all of them
+DIFF_DETAIL_LIMIT = 100
+
+
+def _violation_type(violation: Dict[str, Any]) -> str:
+    return violation.get("type") or violation.get("message") or violation.get("description") or "unknown"
+
+
+def _grid(value: Any) -> int:
+    try:
+        return round(float(value) / FINGERPRINT_GRID)
+    except (TypeError, ValueError):
+        return 0
+
+
+def fingerprint_violation(violation: Dict[str, Any]) -> int:
+    """Get the fingerprint of a violation from a kicad-cli DRC report.
+
+    Args:
+        violation: Violation with ``type`` and ``items`` (each with ``uuid``
+            and ``pos``), as in kicad-cli's JSON report
+
+    Returns:
+        Signed 64-bit fingerprint
+    """
+    parts = []
+    for item in violation.get("items") or (violation,):
+        position = item.get("pos") or {}
+        parts.append(f"{item.get('uuid', '')}@{_grid(position.get('x'))},{_grid(position.get('y'))}")
+    parts.sort()
+    parts.append(_violation_type(violation))
+    digest = hashlib.blake2b("\0".join(parts).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little', signed=True)
+
+
+def fingerprint_hex(fingerprint: int) -> str:
+    """Format a fingerprint as 16 hex digits."""
+    return f"{fingerprint & 0xFFFFFFFFFFFFFFFF:016x}"
+
+
+def violation_fingerprints(violations: Sequence[Dict[str, Any]]) -> List[int]:
+    """Get the fingerprints of violations.
+
+    Args:
+        violations: Violations from a DRC result; a ``fingerprint`` already
+            set on a violation (as hex) is used instead of hashing it again
+
+    Returns:
+        Fingerprints in the order of the violations
+    """
+    fingerprints = []
+    for violation in violations:
+        known = violation.get("fingerprint")
+        if known is not None:
+            value = int(known, 16)
+            fingerprints.append(value - (1 << 64) if value >= 1 << 63 else value)
+        else:
+            fingerprints.append(fingerprint_violation(violation))
+    return fingerprints
+
+
+def summarize_violation(violation: Dict[str, Any]) -> Dict[str, Any]:
+    """Get the short description of a violation kept in the DRC history.
+
+    Args:
+        violation: Violation from a kicad-cli DRC report
+
+    Returns:
+        Dictionary with type, severity, description and position of the first item
+    """
+    items = violation.get("items") or [violation]
+    position = items[0].get("pos") or {}
+    return {
+        "type": _violation_type(violation),
+        "severity": violation.get("severity"),
+        "description": violation.get("description") or violation.get("message"),
+        "position": {"x": position.get("x"), "y": position.get("y")}
+    }
+
+
+class ViolationSummaries(Sequence):
+    """Short descriptions of violations, made when accessed."""
+
+    def __init__(self, violations: Sequence[Dict[str, Any]]):
+        self._violations = violations
+
+    def __len__(self) -> int:
+        return len(self._violations)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return summarize_violation(self._violations[index])
+
+
+class StoredSummaries(Sequence):
+    """Short descriptions of violations packed with pack_summaries, decoded when accessed."""
+
+    def __init__(self, data: bytes):
+        text = zlib.decompress(data)
+        self._lines = text.split(b"\n") if text else []
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return json.loads(self._lines[index])
+
+
+def pack_fingerprints(fingerprints: Sequence[int]) -> bytes:
+    """Pack fingerprints into bytes for storage."""
+    return array('q', fingerprints).tobytes()
+
+
+def unpack_fingerprints(data: bytes) -> List[int]:
+    """Unpack fingerprints stored with pack_fingerprints."""
+    fingerprints = array('q')
+    fingerprints.frombytes(data)
+    return fingerprints.tolist()
+
+
+def pack_summaries(violations: Sequence[Dict[str, Any]]) -> bytes:
+    """Pack the short descriptions of violations for storage, one JSON line each."""
+    lines = "\n".join(json.dumps(summarize_violation(violation), separators=(',', ':'))
+                      for violation in violations)
+    return zlib.compress(lines.encode('utf-8'), 6)
+
+
+def diff_violations(current: Sequence[int], current_details: Sequence[Dict[str, Any]],
+                    previous: Sequence[int], previous_details: Sequence[Dict[str, Any]],
+                    limit: int = DIFF_DETAIL_LIMIT) -> Dict[str, Any]:
+    """Compare the violations of two checks by fingerprint.
+
+    Args:
+        current: Fingerprints of the newer check's violations
+        current_details: Short descriptions of the newer check's violations,
+            in the same order; only those of added violations are read
+        previous: Fingerprints of the older check's violations
+        previous_details: Short descriptions of the older check's
+            violations; only those of resolved violations are read
+        limit: Most added and resolved violations to list
+
+    Returns:
+        Dictionary with the numbers of added, resolved and persistent
+        violations, added and resolved counts per violation type, and the
+        first ``limit`` added and resolved violations
+    """
+    current_set = set(current)
+    previous_set = set(previous)
+    added = [index for index, fingerprint in enumerate(current) if fingerprint not in previous_set]
+    resolved = [index for index, fingerprint in enumerate(previous) if fingerprint not in current_set]
+
+    added_details = [current_details[index] for index in added]
+    resolved_details = [previous_details[index] for index in resolved]
+
+    return {
+        "added_count": len(added),
+        "resolved_count": len(resolved),
+        "persistent_count": len(current) - len(added),
+        "added_by_type": dict(Counter(detail["type"] for detail in added_details)),
+        "resolved_by_type": dict(Counter(detail["type"] for detail in resolved_details)),
+        "added": [{"fingerprint": fingerprint_hex(current[index]), **detail}
+                  for index, detail in zip(added[:limit], added_details)],
+        "resolved": [{"fingerprint": fingerprint_hex(previous[index]), **detail}
+                     for index, detail in zip(resolved[:limit], resolved_details)],
+        "truncated": len(added) > limit or len(resolved) > limit
+    }
@@ -2,13 +2,31 @@
 Utilities for tracking DRC history for KiCad projects.
 
 This will allow users to compare DRC results over time.
+
+History is kept in one SQLite database shared by all projects and by every
+server process (SQLite's file locking serializes writers). Projects are
+identified by a digest of their resolved path, which is the same in every
+process and across restarts. Checks are appended, never rewritten; to keep
+long histories small, older checks are thinned out as they age (see
+HISTORY_RETENTION) while the first check of a project is always kept.
+
+Each check also keeps the fingerprints and short descriptions of its
+violations (see drc_diff), so any two checks can be compared violation by
+violation.
 """
-import os
+import glob
+import hashlib
 import json
+import os
 import platform
+import sqlite3
+import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
+
+from kicad_mcp.utils.drc_diff import (StoredSummaries, ViolationSummaries, diff_violations, pack_fingerprints,
+                                      pack_summaries, unpack_fingerprints, violation_fingerprints)
 
 # Directory for storing DRC history
 if platform.system() == "Windows":
@@ -18,127 +36,359 @@ else:
     # macOS/Linux: Use ~/.kicad_mcp/drc_history
     DRC_HISTORY_DIR = os.path.expanduser("~/.kicad_mcp/drc_history")
 
-def ensure_history_dir() -> None:
-    """Ensure the DRC history directory exists."""
-    os.makedirs(DRC_HISTORY_DIR, exist_ok=True)
+DRC_HISTORY_DB = os.path.join(DRC_HISTORY_DIR, "drc_history.sqlite3")
 
+# Version of the database schema; older databases are migrated on open
+HISTORY_SCHEMA_VERSION = 2
+
+# (age in seconds, bucket in seconds): checks older than the age are kept
+# only as the latest check of each bucket. Recent checks are all kept.
+HISTORY_RETENTION = (
+    (24 * 3600, 3600),          # older than a day: one per hour
+    (30 * 24 * 3600, 24 * 3600)  # older than 30 days: one per day
+)
+
+_SCHEMA = """
+CREATE TABLE projects (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL
+);
+CREATE TABLE runs (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    total_violations INTEGER NOT NULL,
+    categories TEXT NOT NULL
+);
+CREATE INDEX runs_project_time ON runs (project_id, timestamp);
+"""
+
+# Schema changes by the version introducing them
+_MIGRATIONS = {
+    2: """
+CREATE TABLE run_violations (
+    run_id INTEGER PRIMARY KEY,
+    fingerprints BLOB NOT NULL,
+    details BLOB NOT NULL
+);
+CREATE TRIGGER runs_delete AFTER DELETE ON runs BEGIN
+    DELETE FROM run_violations WHERE run_id = OLD.id;
+END;
+"""
+}
+
+
+def project_key(project_path: str) -> str:
+    """Get the stable key of a project: a digest of its resolved path.
 
-def get_project_history_path(project_path: str) -> str:
-    """Get the path to the DRC history file for a project.
-    
     Args:
         project_path: Path to the KiCad project file
-        
+
     Returns:
-        Path to the project's DRC history file
+        Hex digest identifying the project
     """
-    # Create a safe filename from the project path
-    project_hash = hash(project_path) & 0xffffffff  # Ensure positive hash
-    basename = os.path.basename(project_path)
-    history_filename = f"{basename}_{project_hash}_drc_history.json"
-    
-    return os.path.join(DRC_HISTORY_DIR, history_filename)
+    path = os.path.normcase(os.path.realpath(project_path))
+    return hashlib.blake2b(path.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _execute_script(connection: sqlite3.Connection, script: str) -> None:
+    """Run SQL statements one by one inside the open transaction (executescript would commit it)."""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            connection.execute(statement)
+            statement = ""
+
+
+def _format_time(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class DrcHistoryStore:
+    """DRC results of all projects over time, stored in SQLite."""
+
+    def __init__(self, path: str = DRC_HISTORY_DB):
+        """Initialize the store; the database is created on first use.
+
+        Args:
+            path: Database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating or migrating the schema if needed."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Writers of other server processes hold the lock only briefly
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version < HISTORY_SCHEMA_VERSION:
+            with connection:
+                # Another process may have created the schema meanwhile
+                connection.execute("BEGIN IMMEDIATE")
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                if version == 0:
+                    _execute_script(connection, _SCHEMA)
+                    self._import_json_history(connection)
+                    version = 1
+                for target in range(version + 1, HISTORY_SCHEMA_VERSION + 1):
+                    _execute_script(connection, _MIGRATIONS[target])
+                connection.execute(f"PRAGMA user_version = {HISTORY_SCHEMA_VERSION}")
+        return connection
+
+    def _import_json_history(self, connection: sqlite3.Connection) -> None:
+        """Import the per-project JSON files written by earlier versions."""
+        directory = os.path.dirname(self.path)
+        for history_path in glob.glob(os.path.join(directory, "*_drc_history.json")):
+            try:
+                with open(history_path, 'r') as f:
+                    history = json.load(f)
+                project_id = self._project_id(connection, history["project_path"])
+                connection.executemany(
+                    "INSERT INTO runs (project_id, timestamp, total_violations, categories) VALUES (?, ?, ?, ?)",
+                    [(project_id, entry["timestamp"], entry.get("total_violations", 0),
+                      json.dumps(entry.get("violation_categories", {})))
+                     for entry in history.get("entries", [])])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                print(f"Skipping unreadable DRC history file {history_path}: {str(e)}")
+
+    def _project_id(self, connection: sqlite3.Connection, project_path: str,
+                    create: bool = True) -> Optional[int]:
+        key = project_key(project_path)
+        if create:
+            connection.execute("INSERT OR IGNORE INTO projects (key, path) VALUES (?, ?)",
+                               (key, os.path.abspath(project_path)))
+        row = connection.execute("SELECT id FROM projects WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def _thin_out(self, connection: sqlite3.Connection, project_id: int, now: float) -> None:
+        """Apply HISTORY_RETENTION to a project's checks."""
+        for age, bucket in HISTORY_RETENTION:
+            connection.execute(
+                "DELETE FROM runs WHERE project_id = :project AND timestamp < :cutoff "
+                "AND id != (SELECT MIN(id) FROM runs WHERE project_id = :project) "
+                "AND id NOT IN (SELECT MAX(id) FROM runs WHERE project_id = :project AND timestamp < :cutoff "
+                "GROUP BY CAST(timestamp / :bucket AS INTEGER))",
+                {"project": project_id, "cutoff": now - age, "bucket": bucket})
+
+    def add(self, project_path: str, total_violations: int, categories: Dict[str, int],
+            timestamp: Optional[float] = None,
+            violations: Optional[Sequence[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Record a DRC check.
+
+        Args:
+            project_path: Path to the KiCad project file
+            total_violations: Number of violations found
+            categories: Violation counts per message
+            timestamp: Time of the check; defaults to now
+            violations: Violations from the kicad-cli report, fingerprinted
+                and kept for violation-level comparisons
+
+        Returns:
+            The stored history entry
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        violation_data = None
+        if violations is not None:
+            violation_data = (pack_fingerprints(violation_fingerprints(violations)), pack_summaries(violations))
+        with self._lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute("BEGIN IMMEDIATE")
+                    project_id = self._project_id(connection, project_path)
+                    run_id = connection.execute(
+                        "INSERT INTO runs (project_id, timestamp, total_violations, categories) VALUES (?, ?, ?, ?)",
+                        (project_id, timestamp, total_violations, json.dumps(categories))).lastrowid
+                    if violation_data is not None:
+                        connection.execute("INSERT INTO run_violations (run_id, fingerprints, details) VALUES (?, ?, ?)",
+                                           (run_id, *violation_data))
+                    self._thin_out(connection, project_id, time.time())
+            finally:
+                connection.close()
+        return {
+            "timestamp": timestamp,
+            "datetime": _format_time(timestamp),
+            "total_violations": total_violations,
+            "violation_categories": categories
+        }
+
+    def entries(self, project_path: str, since: Optional[float] = None, until: Optional[float] = None,
+                max_entries: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get a project's checks in a time range.
+
+        Args:
+            project_path: Path to the KiCad project file
+            since: Earliest timestamp to include
+            until: Latest timestamp to include
+            max_entries: If the range holds more checks, return the latest
+                check of each of ``max_entries`` equal time slices instead
+                (plus the earliest check)
+
+        Returns:
+            History entries, newest first
+        """
+        conditions = "project_id = :project AND timestamp >= :since AND timestamp <= :until"
+        with self._lock:
+            connection = self._connect()
+            try:
+                project_id = self._project_id(connection, project_path, create=False)
+                if project_id is None:
+                    return []
+                parameters = {
+                    "project": project_id,
+                    "since": float("-inf") if since is None else since,
+                    "until": float("inf") if until is None else until
+                }
+
+                first, last, count = connection.execute(
+                    f"SELECT MIN(timestamp), MAX(timestamp), COUNT(*) FROM runs WHERE {conditions}",
+                    parameters).fetchone()
+                if max_entries is not None and count > max(max_entries, 1):
+                    parameters["first"] = first
+                    parameters["slice"] = ((last - first) / max(max_entries, 1)) or 1.0
+                    query = (f"SELECT timestamp, total_violations, categories FROM runs WHERE id IN ("
+                             f"SELECT MAX(id) FROM runs WHERE {conditions} "
+                             f"GROUP BY MIN(CAST((timestamp - :first) / :slice AS INTEGER), {max(max_entries, 1) - 1}) "
+                             f"UNION SELECT MIN(id) FROM runs WHERE {conditions}) "
+                             f"ORDER BY timestamp DESC, id DESC")
+                else:
+                    query = (f"SELECT timestamp, total_violations, categories FROM runs WHERE {conditions} "
+                             f"ORDER BY timestamp DESC, id DESC")
+                rows = connection.execute(query, parameters).fetchall()
+            finally:
+                connection.close()
+
+        return [{
+            "timestamp": timestamp,
+            "datetime": _format_time(timestamp),
+            "total_violations": total_violations,
+            "violation_categories": json.loads(categories)
+        } for timestamp, total_violations, categories in rows]
+
+    def check(self, project_path: str, at: Optional[float] = None, skip: int = 0) -> Optional[Dict[str, Any]]:
+        """Get one check of a project together with its violations.
+
+        Args:
+            project_path: Path to the KiCad project file
+            at: Get the latest check at or before this timestamp; defaults to the latest check
+            skip: Number of checks to go further back, e.g. 1 for the one before
+
+        Returns:
+            History entry with ``fingerprints`` and ``violations`` (short
+            descriptions in the same order), both None for checks recorded
+            without violations; None if there is no such check
+        """
+        with self._lock:
+            connection = self._connect()
+            try:
+                project_id = self._project_id(connection, project_path, create=False)
+                if project_id is None:
+                    return None
+                row = connection.execute(
+                    "SELECT timestamp, total_violations, categories, fingerprints, details FROM runs "
+                    "LEFT JOIN run_violations ON run_violations.run_id = runs.id "
+                    "WHERE project_id = ? AND timestamp <= ? ORDER BY timestamp DESC, id DESC LIMIT 1 OFFSET ?",
+                    (project_id, float("inf") if at is None else at, skip)).fetchone()
+            finally:
+                connection.close()
+
+        if row is None:
+            return None
+        timestamp, total_violations, categories, fingerprints, details = row
+        return {
+            "timestamp": timestamp,
+            "datetime": _format_time(timestamp),
+            "total_violations": total_violations,
+            "violation_categories": json.loads(categories),
+            "fingerprints": unpack_fingerprints(fingerprints) if fingerprints is not None else None,
+            "violations": StoredSummaries(details) if details is not None else None
+        }
+
+
+# Store shared by every tool and resource in the process
+_store: Optional[DrcHistoryStore] = None
+
+
+def get_history_store() -> DrcHistoryStore:
+    """Get the process-wide DRC history store."""
+    global _store
+    if _store is None:
+        _store = DrcHistoryStore()
+    return _store
 
 
 def save_drc_result(project_path: str, drc_result: Dict[str, Any]) -> None:
     """Save a DRC result to the project's history.
-    
+
     Args:
         project_path: Path to the KiCad project file
         drc_result: DRC result dictionary
     """
-    ensure_history_dir()
-    history_path = get_project_history_path(project_path)
-    
-    # Create a history entry
-    timestamp = time.time()
-    formatted_time = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
-    
-    history_entry = {
-        "timestamp": timestamp,
-        "datetime": formatted_time,
-        "total_violations": drc_result.get("total_violations", 0),
-        "violation_categories": drc_result.get("violation_categories", {})
-    }
-    
-    # Load existing history or create new
-    if os.path.exists(history_path):
-        try:
-            with open(history_path, 'r') as f:
-                history = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Error loading DRC history: {str(e)}")
-            history = {"project_path": project_path, "entries": []}
-    else:
-        history = {"project_path": project_path, "entries": []}
-    
-    # Add new entry and save
-    history["entries"].append(history_entry)
-    
-    # Keep only the last 10 entries to avoid excessive storage
-    if len(history["entries"]) > 10:
-        history["entries"] = sorted(
-            history["entries"], 
-            key=lambda x: x["timestamp"], 
-            reverse=True
-        )[:10]
-    
     try:
-        with open(history_path, 'w') as f:
-            json.dump(history, f, indent=2)
-        print(f"Saved DRC history entry to {history_path}")
-    except IOError as e:
+        get_history_store().add(project_path, drc_result.get("total_violations", 0),
+                                drc_result.get("violation_categories", {}),
+                                violations=drc_result.get("violations"))
+        print(f"Saved DRC history entry for {project_path}")
+    except (sqlite3.Error, OSError) as e:
         print(f"Error saving DRC history: {str(e)}")
 
 
-def get_drc_history(project_path: str) -> List[Dict[str, Any]]:
+def get_drc_history(project_path: str, since: Optional[float] = None, until: Optional[float] = None,
+                    max_entries: Optional[int] = None) -> List[Dict[str, Any]]:
     """Get the DRC history for a project.
-    
+
     Args:
         project_path: Path to the KiCad project file
-        
+        since: Earliest timestamp to include
+        until: Latest timestamp to include
+        max_entries: Thin out longer histories to about this many entries
+
     Returns:
         List of DRC history entries, sorted by timestamp (newest first)
     """
-    history_path = get_project_history_path(project_path)
-    
-    if not os.path.exists(history_path):
-        print(f"No DRC history found for {project_path}")
-        return []
-    
     try:
-        with open(history_path, 'r') as f:
-            history = json.load(f)
-        
-        # Sort entries by timestamp (newest first)
-        entries = sorted(
-            history.get("entries", []),
-            key=lambda x: x.get("timestamp", 0),
-            reverse=True
-        )
-        
-        return entries
-    except (json.JSONDecodeError, IOError) as e:
+        entries = get_history_store().entries(project_path, since, until, max_entries)
+    except (sqlite3.Error, OSError) as e:
         print(f"Error reading DRC history: {str(e)}")
         return []
+    if not entries:
+        print(f"No DRC history found for {project_path}")
+    return entries
 
 
-def compare_with_previous(project_path: str, current_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Compare current DRC result with the previous one.
+def compare_with_previous(project_path: str, current_result: Dict[str, Any],
+                          before: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Compare current DRC result with an earlier check.
+    
+    Call this before saving the current result, which would otherwise be
+    the latest check.
     
     Args:
         project_path: Path to the KiCad project file
         current_result: Current DRC result dictionary
+        before: Compare with the latest check at or before this timestamp;
+            defaults to the latest check
         
     Returns:
-        Comparison dictionary or None if no history exists
+        Comparison dictionary or None if no history exists. When both have
+        violation details, ``violations`` holds the added, resolved and
+        persistent violations (see drc_diff.diff_violations).
     """
-    history = get_drc_history(project_path)
+    try:
+        previous = get_history_store().check(project_path, before)
+    except (sqlite3.Error, OSError) as e:
+        print(f"Error reading DRC history: {str(e)}")
+        return None
     
-    if not history or len(history) < 2:  # Need at least one previous entry
+    if previous is None:
         return None
     
-    previous = history[0]  # Most recent entry
     current_violations = current_result.get("total_violations", 0)
     previous_violations = previous.get("total_violations", 0)
     
@@ -178,4 +428,56 @@ def compare_with_previous(project_path: str, current_result: Dict[str, Any]) ->
         "changed_categories": changed_categories
     }
     
+    # Compare individual violations
+    violations = current_result.get("violations")
+    if violations is not None and previous["fingerprints"] is not None:
+        comparison["violations"] = diff_violations(
+            violation_fingerprints(violations), ViolationSummaries(violations),
+            previous["fingerprints"], previous["violations"])
+    
     return comparison
+
+
+def compare_checks(project_path: str, newer: Optional[float] = None,
+                   older: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """Compare two recorded checks of a project violation by violation.
+    
+    Args:
+        project_path: Path to the KiCad project file
+        newer: Timestamp of the newer check (the latest check at or before
+            it is used); defaults to the latest check
+        older: Timestamp of the older check (likewise); defaults to the
+            check before the newer one
+        
+    Returns:
+        Dictionary with both checks and the diff from the older to the newer
+        one, or None if there are not two checks to compare
+        
+    Raises:
+        ValueError: If a check was recorded without violation details
+    """
+    store = get_history_store()
+    newer_check = store.check(project_path, newer)
+    if newer_check is None:
+        return None
+    if older is None:
+        older_check = store.check(project_path, newer_check["timestamp"], skip=1)
+    else:
+        older_check = store.check(project_path, older)
+    if older_check is None:
+        return None
+    
+    for check in (newer_check, older_check):
+        if check["fingerprints"] is None:
+            raise ValueError(f"The check of {check['datetime']} was recorded without violation details")
+    
+    def entry(check: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: check[key] for key in ("timestamp", "datetime", "total_violations")}
+    
+    return {
+        "newer": entry(newer_check),
+        "older": entry(older_check),
+        "change": newer_check["total_violations"] - older_check["total_violations"],
+        "violations": diff_violations(newer_check["fingerprints"], newer_check["violations"],
+                                      older_check["fingerprints"], older_check["violations"])
+    }
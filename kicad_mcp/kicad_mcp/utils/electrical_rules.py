@@ -0,0 +1,156 @@
+"""
+Electrical rule checks from the pin types of each net.
+
+KiCad's ERC needs kicad-cli and a full run; most of the problems it reports
+follow from which kinds of pins share a net. Every library pin has an
+electrical type (input, output, power_in, ...), so the checks here tag
+each pin of the netlist with its type in one pass over the nets, count the
+pin types of every net with one ``bincount`` and flag:
+
+- ``unconnected_power_input``: a power input pin alone on a net that is
+  not a supply net; nets named by a power symbol are supply nets, since
+  the power symbol's own pin is not part of the netlist
+- ``multiple_drivers``: nets with more than one output or power output pin
+- ``undriven_input``: nets with input pins but no pin that can drive them;
+  nets with a single pin are left to the floating net check
+- ``unused_no_connect``: no-connect flags that are not on a pin
+
+Pins marked with a no-connect flag are not reported as unconnected.
+"""
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+
+from kicad_mcp.utils.netlist_graph import SUPPLY_ROLES
+from kicad_mcp.utils.netlist_index import get_netlist_index
+
+# KiCad pin electrical types; pins of unknown type count as unspecified
+PIN_TYPES = ("input", "output", "bidirectional", "tri_state", "passive", "free", "unspecified",
+             "power_in", "power_out", "open_collector", "open_emitter", "no_connect")
+
+_TYPE_CODES = {pin_type: code for code, pin_type in enumerate(PIN_TYPES)}
+_UNSPECIFIED = _TYPE_CODES["unspecified"]
+_INPUT = _TYPE_CODES["input"]
+_POWER_INPUT = _TYPE_CODES["power_in"]
+
+# Pin types that actively drive a net and conflict with each other
+DRIVER_TYPES = ("output", "power_out")
+
+# Pin types that cannot supply a signal to an input
+NON_SOURCE_TYPES = ("input", "power_in", "no_connect")
+
+_DRIVERS = [_TYPE_CODES[pin_type] for pin_type in DRIVER_TYPES]
+_SOURCES = [code for pin_type, code in _TYPE_CODES.items() if pin_type not in NON_SOURCE_TYPES]
+
+
+def _pin_label(pin: Any) -> str:
+    return f"{pin.get('component')} pin {pin.get('pin')}"
+
+
+def check_electrical_rules(netlist_data: Any) -> List[Dict[str, Any]]:
+    """Check a netlist for electrical problems given away by its pin types.
+
+    Args:
+        netlist_data: Netlist from extract_netlist, or a dictionary with
+            ``components``, ``nets`` and optionally ``no_connects`` and
+            ``power_symbols``
+
+    Returns:
+        List of issues, each with a ``type`` (see module documentation), the
+        ``net`` or flag position concerned and a ``description``
+    """
+    components = netlist_data.get("components", {})
+    nets = netlist_data.get("nets", {})
+    no_connects = netlist_data.get("no_connects") or []
+    issues: List[Dict[str, Any]] = []
+
+    # Pin number -> type code of every component
+    pin_types: Dict[str, Dict[str, int]] = {}
+    for ref, component in components.items():
+        pin_types[ref] = {
+            pin.get('num'): _TYPE_CODES.get(pin.get('type'), _UNSPECIFIED)
+            for pin in component.get('pins') or ()
+        }
+
+    # Flatten the pins of all nets, net by net
+    names = list(nets)
+    pins: List[Any] = []
+    codes: List[int] = []
+    sizes = np.empty(len(names), dtype=np.int64)
+    no_types: Dict[str, int] = {}
+    for net_id, net_pins in enumerate(nets.values()):
+        sizes[net_id] = len(net_pins)
+        for pin in net_pins:
+            pins.append(pin)
+            codes.append(pin_types.get(pin.get('component'), no_types).get(pin.get('pin'), _UNSPECIFIED))
+    pin_codes = np.array(codes, dtype=np.int64)
+    pin_nets = np.repeat(np.arange(len(names), dtype=np.int64), sizes)
+
+    # Pin type counts of every net: row per net, column per type
+    counts = np.bincount(pin_nets * len(PIN_TYPES) + pin_codes,
+                         minlength=len(names) * len(PIN_TYPES)).reshape(len(names), len(PIN_TYPES))
+
+    marked: Set[Tuple[str, str]] = set()
+    for flag in no_connects:
+        if flag['pins']:
+            marked.update((pin.get('component'), pin.get('pin')) for pin in flag['pins'])
+        else:
+            issues.append({
+                "type": "unused_no_connect",
+                "sheet": flag['sheet'],
+                "position": {"x": flag['x'], "y": flag['y']},
+                "description": f"No-connect flag at ({flag['x']}, {flag['y']}) on sheet {flag['sheet']} is not on a pin"
+            })
+
+    net_roles = get_netlist_index(netlist_data).net_roles
+    power_names = {symbol.get('value') for symbol in netlist_data.get("power_symbols") or ()}
+    supply = np.fromiter((name in power_names or not SUPPLY_ROLES.isdisjoint(net_roles[name]) for name in names),
+                         dtype=bool, count=len(names))
+
+    lone_power_inputs = (pin_codes == _POWER_INPUT) & (sizes[pin_nets] == 1) & ~supply[pin_nets]
+    for pin_id in np.flatnonzero(lone_power_inputs).tolist():
+        pin = pins[pin_id]
+        if (pin.get('component'), pin.get('pin')) in marked:
+            continue
+        issues.append({
+            "type": "unconnected_power_input",
+            "net": names[pin_nets[pin_id]],
+            "component": pin.get('component'),
+            "pin": pin.get('pin'),
+            "description": f"Power input {_pin_label(pin)} is not connected"
+        })
+
+    contested = counts[:, _DRIVERS].sum(axis=1) > 1
+    undriven = (sizes > 1) & (counts[:, _INPUT] > 0) & (counts[:, _SOURCES].sum(axis=1) == 0)
+    driver_pins = np.isin(pin_codes, _DRIVERS)
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+
+    for net_id in np.flatnonzero(contested).tolist():
+        net_pins = range(starts[net_id], starts[net_id + 1])
+        drivers = [pins[pin_id] for pin_id in net_pins if driver_pins[pin_id]]
+        issues.append({
+            "type": "multiple_drivers",
+            "net": names[net_id],
+            "pins": [{"component": pin.get('component'), "pin": pin.get('pin')} for pin in drivers],
+            "description": f"Net '{names[net_id]}' is driven by {len(drivers)} outputs: "
+                           + ", ".join(_pin_label(pin) for pin in drivers)
+        })
+
+    for net_id in np.flatnonzero(undriven).tolist():
+        net_pins = range(starts[net_id], starts[net_id + 1])
+        inputs = [
+            pins[pin_id] for pin_id in net_pins
+            if pin_codes[pin_id] == _INPUT
+            and (pins[pin_id].get('component'), pins[pin_id].get('pin')) not in marked
+        ]
+        if not inputs:
+            continue
+        issues.append({
+            "type": "undriven_input",
+            "net": names[net_id],
+            "pins": [{"component": pin.get('component'), "pin": pin.get('pin')} for pin in inputs],
+            "description": f"Net '{names[net_id]}' has inputs but nothing drives it: "
+                           + ", ".join(_pin_label(pin) for pin in inputs)
+        })
+
+    return issues
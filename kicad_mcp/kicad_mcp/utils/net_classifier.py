@@ -0,0 +1,131 @@
+"""
+Classification of nets by name.
+
+Net names say what a net carries: ``I2C_SDA`` is part of an I2C bus,
+``+3V3`` is a supply rail. Several analyses ask such questions about every
+net, so the signal names of all bus families are merged at import time
+into one compiled alternation, factored like a trie, and each net name is
+classified in a single scan into a set of roles:
+
+- bus roles: ``i2c``, ``spi``, ``uart``, ``usb``, ``ethernet``, for names
+  containing one of the family's signal names
+- power-domain roles: ``power`` for names starting with a supply or ground
+  prefix, ``ground`` for ground nets
+
+The roles of all nets of a netlist are computed once and kept with its
+index (see NetlistIndex.net_roles).
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, Tuple
+
+# Bus role -> signal names; a net belongs to a bus if its upper-cased name
+# contains one of them
+BUS_SIGNALS = {
+    "i2c": ("SCL", "SDA", "I2C_SCL", "I2C_SDA"),
+    "spi": ("MOSI", "MISO", "SCK", "SS", "SPI_MOSI", "SPI_MISO", "SPI_SCK", "SPI_CS"),
+    "uart": ("TX", "RX", "TXD", "RXD", "UART_TX", "UART_RX"),
+    "usb": ("USB_D+", "USB_D-", "USB_DP", "USB_DM", "D+", "D-", "DP", "DM", "VBUS"),
+    "ethernet": ("TX+", "TX-", "RX+", "RX-", "MDI", "MDIO", "ETH")
+}
+
+# Prefixes of power net names
+POWER_NET_PREFIXES = ("VCC", "VDD", "GND", "+5V", "+3V3", "+12V")
+
+# Ground net names
+GROUND_NETS = ('GND', 'AGND', 'DGND', 'PGND', 'VSS')
+
+_SIGNALS = sorted({signal for signals in BUS_SIGNALS.values() for signal in signals})
+
+# Signal -> bus roles of the signal and of every signal it contains; a
+# signal found at a position implies the shorter ones found within it
+_SIGNAL_ROLES = {
+    signal: [role for role, signals in BUS_SIGNALS.items() if any(other in signal for other in signals)]
+    for signal in _SIGNALS
+}
+
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build an alternation of words with common prefixes factored out.
+
+    The expression tries one branch per distinct next character instead of
+    one per word, and its optional tails are greedy, so it matches the
+    longest word starting at a position.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{pattern})?" if '' in node else pattern
+
+    return build(trie)
+
+
+_SIGNAL_ALTERNATION = _trie_pattern(_SIGNALS)
+_SIGNAL_RE = re.compile(_SIGNAL_ALTERNATION)
+# Zero-width, so overlapping signals are found at every position
+_SIGNAL_AT_RE = re.compile(f"(?=({_SIGNAL_ALTERNATION}))")
+
+_NO_ROLES: FrozenSet[str] = frozenset()
+
+# (signals found, power, ground) -> roles; few combinations occur, and nets
+# with the same roles share one set
+_role_sets: Dict[Tuple[FrozenSet[str], bool, bool], FrozenSet[str]] = {}
+
+
+def _roles(key: Tuple[FrozenSet[str], bool, bool]) -> FrozenSet[str]:
+    """Build the role set of a combination of signals and power-domain flags."""
+    signals, is_power, is_ground = key
+    found = {role for signal in signals for role in _SIGNAL_ROLES[signal]}
+    roles = [role for role in BUS_SIGNALS if role in found]
+    if is_power:
+        roles.append("power")
+    if is_ground:
+        roles.append("ground")
+    return frozenset(roles)
+
+
+def classify_net(name: str) -> FrozenSet[str]:
+    """Get the roles of a net from its name.
+
+    Args:
+        name: Net name
+
+    Returns:
+        Set of roles, empty for plain signal nets
+    """
+    upper_name = name.upper()
+    first = _SIGNAL_RE.search(upper_name)
+    is_power = name.startswith(POWER_NET_PREFIXES)
+    is_ground = name in GROUND_NETS
+    if first is None:
+        if not is_power and not is_ground:
+            return _NO_ROLES
+        key = (_NO_ROLES, is_power, is_ground)
+    else:
+        key = (frozenset(_SIGNAL_AT_RE.findall(upper_name, first.start())), is_power, is_ground)
+
+    role_set = _role_sets.get(key)
+    if role_set is None:
+        role_set = _role_sets.setdefault(key, _roles(key))
+    return role_set
+
+
+def classify_nets(names: Iterable[str]) -> Dict[str, FrozenSet[str]]:
+    """Get the roles of several nets.
+
+    Args:
+        names: Net names
+
+    Returns:
+        Dictionary mapping net name to its roles
+    """
+    return {name: classify_net(name) for name in names}
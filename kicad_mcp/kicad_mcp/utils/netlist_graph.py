@@ -0,0 +1,256 @@
+"""
+Component/net graph of an extracted netlist in compressed sparse row form.
+
+The netlist is a bipartite graph: components on one side, nets on the
+other, an edge wherever a component has a pin on a net. Questions such as
+"which components sit between U1 and J3" or "which parts of the design are
+connected at all" are graph traversals, which are slow as repeated scans of
+the net dictionary. The graph gives components and nets integer IDs and
+keeps the adjacency in both directions as NumPy CSR arrays (``indptr`` /
+``indices``, as in scipy.sparse), so traversals expand whole frontiers with
+array operations.
+
+Supply nets connect nearly everything, so the queries accept a mask of
+nets to leave out (see supply_mask).
+"""
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Net roles whose nets are left out of traversals by default
+SUPPLY_ROLES = frozenset(("power", "ground"))
+
+
+def _expand(indptr: np.ndarray, indices: np.ndarray, frontier: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the neighbours of a frontier of nodes.
+
+    Returns:
+        Tuple of (neighbour IDs, ID of the frontier node each was reached from)
+    """
+    starts = indptr[frontier]
+    counts = indptr[frontier + 1] - starts
+    total = int(counts.sum())
+    if not total:
+        return indices[:0], frontier[:0]
+    # Position of every neighbour in indices: the start of its node's row
+    # plus its offset within the row
+    row_offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    neighbours = indices[row_offsets + np.arange(total)]
+    return neighbours, np.repeat(frontier, counts)
+
+
+class NetlistGraph:
+    """Bipartite component/net adjacency of one netlist.
+
+    ``components`` and ``nets`` map IDs to references and net names, in
+    netlist order. ``net_indptr``/``net_indices`` hold the component IDs on
+    each net, ``component_indptr``/``component_indices`` the net IDs of each
+    component, and ``pin_counts`` the number of pins on each net.
+    Components without connections are not part of the graph.
+    """
+
+    __slots__ = ("components", "nets", "component_ids", "net_ids", "net_indptr", "net_indices",
+                 "component_indptr", "component_indices", "pin_counts")
+
+    def __init__(self, nets: Mapping[str, Sequence[Any]], net_components: Mapping[str, Sequence[str]]):
+        """Build the graph.
+
+        Args:
+            nets: Net name -> connected pins
+            net_components: Net name -> distinct component references on it
+                (see NetlistIndex.components_on)
+        """
+        self.nets: List[str] = list(nets)
+        self.net_ids: Dict[str, int] = {name: net_id for net_id, name in enumerate(self.nets)}
+        self.component_ids: Dict[str, int] = {}
+
+        component_ids = self.component_ids
+        members: List[int] = []
+        row_lengths = np.empty(len(self.nets), dtype=np.int64)
+        for net_id, name in enumerate(self.nets):
+            refs = net_components.get(name, ())
+            for ref in refs:
+                component_id = component_ids.get(ref)
+                if component_id is None:
+                    component_id = component_ids[ref] = len(component_ids)
+                members.append(component_id)
+            row_lengths[net_id] = len(refs)
+        self.components: List[str] = list(component_ids)
+
+        self.net_indptr = np.zeros(len(self.nets) + 1, dtype=np.int64)
+        np.cumsum(row_lengths, out=self.net_indptr[1:])
+        self.net_indices = np.array(members, dtype=np.int32)
+        self.pin_counts = np.fromiter((len(pins) for pins in nets.values()), dtype=np.int32, count=len(self.nets))
+
+        # Transpose: sort the edges by component, keeping net order within each
+        edge_nets = np.repeat(np.arange(len(self.nets), dtype=np.int32), row_lengths)
+        order = np.argsort(self.net_indices, kind='stable')
+        self.component_indices = edge_nets[order]
+        self.component_indptr = np.zeros(len(self.components) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.net_indices, minlength=len(self.components)), out=self.component_indptr[1:])
+
+    @property
+    def edge_count(self) -> int:
+        """Number of component/net connections."""
+        return len(self.net_indices)
+
+    def mask_nets(self, names: Iterable[str]) -> np.ndarray:
+        """Get a mask over the net IDs that is set for the given nets.
+
+        Args:
+            names: Net names; unknown names are ignored
+
+        Returns:
+            Boolean array with one entry per net
+        """
+        mask = np.zeros(len(self.nets), dtype=bool)
+        ids = [self.net_ids[name] for name in names if name in self.net_ids]
+        mask[ids] = True
+        return mask
+
+    def supply_mask(self, net_roles: Mapping[str, Iterable[str]]) -> np.ndarray:
+        """Get a mask of the power and ground nets.
+
+        Args:
+            net_roles: Net name -> roles (see NetlistIndex.net_roles)
+
+        Returns:
+            Boolean array with one entry per net
+        """
+        return self.mask_nets(name for name, roles in net_roles.items() if not SUPPLY_ROLES.isdisjoint(roles))
+
+    def connected_components(self, exclude: Optional[np.ndarray] = None) -> np.ndarray:
+        """Label the components by the connected group they belong to.
+
+        Two components are in the same group if a chain of nets, none of
+        them excluded, links them.
+
+        Args:
+            exclude: Mask of nets to ignore (see mask_nets)
+
+        Returns:
+            Array mapping component ID to the smallest component ID of its group
+        """
+        # Link consecutive components of every net; the chain connects them all
+        same_net = np.diff(np.repeat(np.arange(len(self.nets)), np.diff(self.net_indptr))) == 0
+        if exclude is not None and exclude.any():
+            edge_excluded = np.repeat(exclude, np.diff(self.net_indptr))
+            same_net &= ~edge_excluded[1:]
+        first = self.net_indices[:-1][same_net].astype(np.int64)
+        second = self.net_indices[1:][same_net].astype(np.int64)
+
+        # Union-find over the whole edge list at a time: hook the larger root
+        # of every unsatisfied edge onto the smaller, then compress paths
+        # until every label is a root
+        labels = np.arange(len(self.components), dtype=np.int64)
+        while True:
+            first_roots = labels[first]
+            second_roots = labels[second]
+            pending = first_roots != second_roots
+            if not pending.any():
+                return labels
+            first, second = first[pending], second[pending]
+            first_roots, second_roots = first_roots[pending], second_roots[pending]
+            low = np.minimum(first_roots, second_roots)
+            np.minimum.at(labels, np.maximum(first_roots, second_roots), low)
+            while True:
+                parents = labels[labels]
+                if np.array_equal(parents, labels):
+                    break
+                labels = parents
+
+    def shortest_path(self, source: str, target: str, exclude: Optional[np.ndarray] = None) -> Optional[List[str]]:
+        """Find a shortest chain of components and nets between two components.
+
+        Args:
+            source: Reference of the first component
+            target: Reference of the second component
+            exclude: Mask of nets the path must not pass through
+
+        Returns:
+            Alternating component references and net names from source to
+            target, or None if they are not connected
+
+        Raises:
+            KeyError: If either component is not in the graph
+        """
+        source_id = self.component_ids[source]
+        target_id = self.component_ids[target]
+        if source_id == target_id:
+            return [source]
+
+        # Parent of every reached node: the net a component was reached
+        # through, the component a net was reached from
+        component_parent = np.full(len(self.components), -1, dtype=np.int64)
+        net_parent = np.full(len(self.nets), -1, dtype=np.int64)
+        component_parent[source_id] = source_id
+        if exclude is not None:
+            # Excluded nets count as already reached
+            net_parent[exclude] = -2
+
+        frontier = np.array([source_id], dtype=np.int64)
+        while len(frontier) and component_parent[target_id] < 0:
+            nets, parents = _expand(self.component_indptr, self.component_indices, frontier)
+            new = net_parent[nets] == -1
+            nets, first = np.unique(nets[new], return_index=True)
+            net_parent[nets] = parents[new][first]
+
+            components, parents = _expand(self.net_indptr, self.net_indices, nets.astype(np.int64))
+            new = component_parent[components] < 0
+            frontier, first = np.unique(components[new], return_index=True)
+            component_parent[frontier] = parents[new][first]
+            frontier = frontier.astype(np.int64)
+
+        if component_parent[target_id] < 0:
+            return None
+
+        path = [self.components[target_id]]
+        component_id = target_id
+        while component_id != source_id:
+            net_id = int(component_parent[component_id])
+            component_id = int(net_parent[net_id])
+            path.extend((self.nets[net_id], self.components[component_id]))
+        path.reverse()
+        return path
+
+    def fanout_histogram(self) -> Dict[int, int]:
+        """Count the nets by fanout.
+
+        Returns:
+            Dictionary mapping pin count to the number of nets with that many pins
+        """
+        counts = np.bincount(self.pin_counts)
+        return {fanout: int(count) for fanout, count in enumerate(counts.tolist()) if count}
+
+    def top_fanout(self, limit: int) -> List[Dict[str, Any]]:
+        """Get the nets with the most pins.
+
+        Args:
+            limit: Maximum number of nets
+
+        Returns:
+            List of nets with their ``net`` name, ``pins`` and ``components`` count
+        """
+        limit = min(limit, len(self.nets))
+        if limit <= 0:
+            return []
+        top = np.argpartition(-self.pin_counts, limit - 1)[:limit]
+        top = top[np.lexsort((top, -self.pin_counts[top]))]
+        component_counts = np.diff(self.net_indptr)
+        return [
+            {"net": self.nets[net_id], "pins": int(self.pin_counts[net_id]),
+             "components": int(component_counts[net_id])}
+            for net_id in top.tolist()
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export the graph as JSON-compatible lists."""
+        return {
+            "components": self.components,
+            "nets": self.nets,
+            "net_indptr": self.net_indptr.tolist(),
+            "net_indices": self.net_indices.tolist(),
+            "component_indptr": self.component_indptr.tolist(),
+            "component_indices": self.component_indices.tolist(),
+            "pin_counts": self.pin_counts.tolist()
+        }
@@ -0,0 +1,139 @@
+"""
+Inverted index over the nets of an extracted netlist.
+
+A netlist maps each net to the pins on it, which makes "which nets does R5
+touch" a scan over every pin of the design. Analysis code asks that kind of
+question for every component, so the index answers it, and its reverse
+lookups, from dictionaries built in one pass over the nets.
+
+The index of a Netlist is built on first use and kept with the netlist, so
+all tools working on the same cached parse share it, along with the roles
+of its nets (see net_classifier) and its graph (see netlist_graph).
+"""
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+from kicad_mcp.utils.net_classifier import classify_nets
+from kicad_mcp.utils.netlist_graph import NetlistGraph
+
+_NO_ROLES: FrozenSet[str] = frozenset()
+
+
+class NetlistIndex:
+    """Component, net and pin lookups for one netlist.
+
+    Nets are listed in netlist order and components in pin order; neither
+    list holds duplicates.
+    """
+
+    __slots__ = ("nets", "_component_nets", "_net_components", "_pin_net", "_net_roles", "_graph")
+
+    def __init__(self, nets: Mapping[str, Sequence[Any]]):
+        """Build the index.
+
+        Args:
+            nets: Net name -> connected pins, each with ``component`` and ``pin``
+        """
+        self.nets = nets
+        self._component_nets: Dict[str, List[str]] = {}
+        self._net_components: Dict[str, List[str]] = {}
+        self._pin_net: Dict[Tuple[str, str], str] = {}
+        self._net_roles: Optional[Dict[str, FrozenSet[str]]] = None
+        self._graph: Optional[NetlistGraph] = None
+
+        component_nets = self._component_nets
+        pin_net = self._pin_net
+        for name, pins in nets.items():
+            members: Dict[str, None] = {}
+            for pin in pins:
+                ref = pin.get('component')
+                if not ref:
+                    continue
+                members[ref] = None
+                pin_net[(ref, pin.get('pin'))] = name
+
+            self._net_components[name] = list(members)
+            for ref in members:
+                component_nets.setdefault(ref, []).append(name)
+
+    def nets_of(self, ref: str) -> List[str]:
+        """Get the nets a component is connected to.
+
+        Args:
+            ref: Component reference
+
+        Returns:
+            Net names, empty if the component has no connections
+        """
+        return self._component_nets.get(ref, [])
+
+    def components_on(self, net: str) -> List[str]:
+        """Get the components connected to a net.
+
+        Args:
+            net: Net name
+
+        Returns:
+            Component references, empty for unknown nets
+        """
+        return self._net_components.get(net, [])
+
+    def net_of(self, ref: str, pin: str) -> Optional[str]:
+        """Get the net a component pin is connected to.
+
+        Args:
+            ref: Component reference
+            pin: Pin number
+
+        Returns:
+            Net name, or None if the pin is not connected
+        """
+        return self._pin_net.get((ref, pin))
+
+    def connects(self, ref: str, net: str) -> bool:
+        """Check whether a component has a pin on a net."""
+        return net in self._component_nets.get(ref, ())
+
+    @property
+    def net_roles(self) -> Dict[str, FrozenSet[str]]:
+        """Roles of every net (bus, power, ground), classified on first use."""
+        if self._net_roles is None:
+            self._net_roles = classify_nets(self.nets)
+        return self._net_roles
+
+    @property
+    def graph(self) -> NetlistGraph:
+        """Component/net graph in CSR form, built on first use."""
+        if self._graph is None:
+            self._graph = NetlistGraph(self.nets, self._net_components)
+        return self._graph
+
+    def roles_of(self, net: str) -> FrozenSet[str]:
+        """Get the roles of a net, e.g. ``{"i2c"}`` or ``{"power", "ground"}``."""
+        return self.net_roles.get(net, _NO_ROLES)
+
+    def net_has_prefix(self, net: str, prefix: str) -> bool:
+        """Check whether a net connects any component whose reference starts with a prefix.
+
+        Args:
+            net: Net name
+            prefix: Reference prefix, e.g. ``R``
+
+        Returns:
+            True if such a component is on the net
+        """
+        return any(ref.startswith(prefix) for ref in self._net_components.get(net, ()))
+
+
+def get_netlist_index(netlist_data: Any) -> NetlistIndex:
+    """Get the index of a netlist, building it if needed.
+
+    Args:
+        netlist_data: Netlist from extract_netlist, or a dictionary with ``nets``
+
+    Returns:
+        The netlist's shared index, or a new one for plain dictionaries
+    """
+    index = getattr(netlist_data, 'index', None)
+    if index is not None:
+        return index
+    return NetlistIndex(netlist_data.get("nets", {}))
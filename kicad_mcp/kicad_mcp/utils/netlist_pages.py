@@ -0,0 +1,229 @@
+"""
+Paginated, filtered and projected views of an extracted netlist.
+
+Netlist tools return components and nets a page at a time, so a large
+design never has to cross the wire in one payload. Pages are cut from the
+cached netlist; fetching the next page does not parse anything again.
+
+A cursor is an opaque string holding the offsets reached in both
+collections and a fingerprint of the query and netlist it belongs to, so a
+cursor from another query, or from before the design changed, is rejected
+instead of silently skipping or repeating entries.
+"""
+import base64
+import binascii
+import hashlib
+import json
+from fnmatch import fnmatchcase
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from kicad_mcp.utils.component_index import get_component_index
+from kicad_mcp.utils.schematic_model import as_dict
+
+# Component fields a client can select, in output order
+COMPONENT_FIELDS = ("reference", "lib_id", "value", "footprint", "properties", "position", "pins", "sheet")
+
+# Short names accepted in field selections
+FIELD_ALIASES = {"ref": "reference", "lib": "lib_id"}
+
+
+def normalize_fields(fields: Optional[Sequence[str]]) -> Optional[List[str]]:
+    """Validate a component field selection.
+
+    Args:
+        fields: Requested field names or aliases; None or empty selects all
+
+    Returns:
+        Field names in output order, or None for all fields
+
+    Raises:
+        ValueError: If a field is unknown
+    """
+    if not fields:
+        return None
+
+    selected = set()
+    for field in fields:
+        name = FIELD_ALIASES.get(field, field)
+        if name not in COMPONENT_FIELDS:
+            raise ValueError(f"Unknown component field '{field}'; valid fields: {', '.join(COMPONENT_FIELDS)}")
+        selected.add(name)
+
+    return [name for name in COMPONENT_FIELDS if name in selected]
+
+
+def _fingerprint(netlist: Any, *query: Any) -> str:
+    """Hash a query together with the revision and size of the netlist it runs on."""
+    key = json.dumps([*query, netlist.get("revision"), netlist["component_count"], netlist["net_count"]])
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def encode_cursor(component_offset: int, net_offset: int, fingerprint: str) -> str:
+    """Build an opaque cursor.
+
+    Args:
+        component_offset: Matching components already returned
+        net_offset: Matching nets already returned
+        fingerprint: Query fingerprint
+
+    Returns:
+        URL-safe cursor string
+    """
+    data = json.dumps({"c": component_offset, "n": net_offset, "q": fingerprint}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Tuple[int, int]:
+    """Read the offsets from a cursor.
+
+    Args:
+        cursor: Cursor from a previous page
+        fingerprint: Fingerprint of the current query
+
+    Returns:
+        Tuple of (component offset, net offset)
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another query
+            or an earlier version of the design
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        component_offset, net_offset = int(data["c"]), int(data["n"])
+        query = data["q"]
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Invalid cursor: {str(e)}")
+
+    if query != fingerprint:
+        raise ValueError("Cursor does not match this query or the design changed; start again without a cursor")
+    if component_offset < 0 or net_offset < 0:
+        raise ValueError("Invalid cursor: negative offset")
+    return component_offset, net_offset
+
+
+def _page(entries: Iterator[Tuple[str, Any]], offset: int, limit: int) -> Tuple[List[Tuple[str, Any]], bool]:
+    """Take one page from an iterator; also report whether more entries follow."""
+    page = list(islice(entries, offset, offset + limit + 1))
+    return page[:limit], len(page) > limit
+
+
+def project_component(component: Any, fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Convert a component to a dictionary holding only the selected fields.
+
+    Args:
+        component: Component record or dictionary
+        fields: Field names from normalize_fields, or None for all
+
+    Returns:
+        JSON-friendly dictionary
+    """
+    if fields is None:
+        return as_dict(component)
+
+    result = {}
+    for field in fields:
+        value = component.get(field)
+        if value is not None:
+            result[field] = as_dict(value)
+    return result
+
+
+def paginate_netlist(netlist: Any, cursor: Optional[str] = None, limit: int = 200,
+                     fields: Optional[Sequence[str]] = None, ref_prefix: Optional[str] = None,
+                     net_name: Optional[str] = None) -> Dict[str, Any]:
+    """Cut one page of components and nets from a netlist.
+
+    Args:
+        netlist: Netlist from extract_netlist
+        cursor: ``next_cursor`` of the previous page, or None for the first
+        limit: Maximum number of components and of nets on the page
+        fields: Component fields to return (see COMPONENT_FIELDS); None for all
+        ref_prefix: Only return components whose reference starts with this
+        net_name: Only return nets matching this name; ``*`` and ``?``
+            wildcards are supported
+
+    Returns:
+        Dictionary with the page's ``components`` and ``nets``, the number of
+        ``matching_components`` and ``matching_nets``, and ``next_cursor``
+        (None on the last page)
+
+    Raises:
+        ValueError: If the cursor, limit or field selection is invalid
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    fields = normalize_fields(fields)
+    fingerprint = _fingerprint(netlist, fields, ref_prefix, net_name)
+    component_offset, net_offset = decode_cursor(cursor, fingerprint) if cursor else (0, 0)
+
+    components = netlist["components"]
+    if ref_prefix:
+        matching_components = [(ref, component) for ref, component in components.items()
+                               if ref.startswith(ref_prefix)]
+    else:
+        matching_components = components.items()
+
+    nets = netlist["nets"]
+    if net_name:
+        matching_nets = [(name, pins) for name, pins in nets.items() if fnmatchcase(name, net_name)]
+    else:
+        matching_nets = nets.items()
+
+    component_page, more_components = _page(iter(matching_components), component_offset, limit)
+    net_page, more_nets = _page(iter(matching_nets), net_offset, limit)
+
+    next_cursor = None
+    if more_components or more_nets:
+        next_cursor = encode_cursor(component_offset + len(component_page),
+                                    net_offset + len(net_page), fingerprint)
+
+    return {
+        "components": {ref: project_component(component, fields) for ref, component in component_page},
+        "nets": {name: as_dict(pins) for name, pins in net_page},
+        "matching_components": len(matching_components),
+        "matching_nets": len(matching_nets),
+        "next_cursor": next_cursor
+    }
+
+
+def query_components(netlist: Any, query: str, cursor: Optional[str] = None, limit: int = 200,
+                     fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Cut one page of the components matching a filter expression from a netlist.
+
+    Args:
+        netlist: Netlist from extract_netlist
+        query: Filter expression (see component_index), e.g.
+            ``footprint ~ "*0402*" and value > 1u``
+        cursor: ``next_cursor`` of the previous page, or None for the first
+        limit: Maximum number of components on the page
+        fields: Component fields to return (see COMPONENT_FIELDS); None for all
+
+    Returns:
+        Dictionary with the page's ``components``, the number of
+        ``matching_components`` and ``next_cursor`` (None on the last page)
+
+    Raises:
+        ValueError: If the query, cursor, limit or field selection is invalid
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    fields = normalize_fields(fields)
+    fingerprint = _fingerprint(netlist, "query", fields, query)
+    offset = decode_cursor(cursor, fingerprint)[0] if cursor else 0
+
+    matching = get_component_index(netlist).query(query)
+    page = matching[offset:offset + limit]
+    next_cursor = None
+    if offset + limit < len(matching):
+        next_cursor = encode_cursor(offset + len(page), 0, fingerprint)
+
+    components = netlist["components"]
+    return {
+        "components": {ref: project_component(components[ref], fields) for ref in page},
+        "matching_components": len(matching),
+        "next_cursor": next_cursor
+    }
@@ -1,10 +1,33 @@
 """
 KiCad schematic netlist extraction utilities.
 """
+import hashlib
 import os
 import re
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from kicad_mcp.utils.sexpr_parser import SExpr, SExprReader, gc_paused, map_file, parse_sexpr, split_top_level
+from kicad_mcp.utils.pin_geometry import Placement, PinTable, parse_lib_symbols, place_pins
+from kicad_mcp.utils.connectivity import IncrementalConnectivity
+from kicad_mcp.utils.netlist_index import get_netlist_index
+from kicad_mcp.utils.parse_cache import ParseCache, get_parse_cache
+from kicad_mcp.utils.schematic_hierarchy import merge_sheets
+from kicad_mcp.utils.sheet_state import (
+    PlacedPin, SheetItem, SheetState, SymbolItem, file_stamp, has_sheet_state, keep_sheet_state,
+    take_sheet_state
+)
+from kicad_mcp.utils.schematic_model import (
+    Component, Label, Netlist, Pin, PowerSymbol, intern, point_array, wire_array
+)
+
+# Version of the netlist format; bump when parsing changes the result so
+# persisted netlists from older versions are not reused
+NETLIST_VERSION = 4
+
+# First UUID inside a top-level item; an item's own UUID precedes its pins'
+_UUID_RE = re.compile(rb'\(uuid\s+"?([^\s()"]+)')
 
 class SchematicParser:
     """Parser for KiCad schematic files to extract netlist information."""
@@ -16,392 +39,818 @@ class SchematicParser:
             schematic_path: Path to the KiCad schematic file (.kicad_sch)
         """
         self.schematic_path = schematic_path
-        self.content = ""
+        self.content = b""  # mapped file while parsing
+        self.uuid = None
         self.components = []
+        self.symbols = []  # (symbol uuid, instance path -> reference) per component
         self.labels = []
-        self.wires = []
-        self.junctions = []
+        self.wires = []  # (x1, y1, x2, y2) while reading, then an (N, 4) array
+        self.junctions = []  # (x, y) while reading, then an (N, 2) array
         self.no_connects = []
         self.power_symbols = []
         self.hierarchical_labels = []
         self.global_labels = []
+        self.sheets = []  # child sheets placed on this sheet
+        self.symbol_instances = {}  # KiCad 6 instance path -> reference table
+        
+        # Library pin definitions and symbols awaiting pin placement
+        self.lib_symbols = None
+        self.placements = []  # SymbolItems whose library pins are not placed yet
+        self.component_index = {}  # Symbol item key -> component index
         
         # Netlist information
+        self.groups = []  # Locally connected pins, names and sheet pins
         self.nets = defaultdict(list)  # Net name -> connected pins
-        self.component_pins = {}  # (component_ref, pin_num) -> net_name
         
-        # Component information
-        self.component_info = {}  # component_ref -> component details
+        # State for the next, incremental parse of the file
+        self.state = None
+        self._header = None
         
         # Load the file
         self._load_schematic()
 
     def _load_schematic(self) -> None:
-        """Load the schematic file content."""
+        """Check that the schematic file exists; it is mapped when parsed."""
         if not os.path.exists(self.schematic_path):
             print(f"Schematic file not found: {self.schematic_path}")
             raise FileNotFoundError(f"Schematic file not found: {self.schematic_path}")
-        
-        try:
-            with open(self.schematic_path, 'r') as f:
-                self.content = f.read()
-                print(f"Successfully loaded schematic: {self.schematic_path}")
-        except Exception as e:
-            print(f"Error reading schematic file: {str(e)}")
-            raise
-
-    def parse(self) -> Dict[str, Any]:
+
+    def parse(self) -> Netlist:
         """Parse the schematic to extract netlist information.
         
+        Only this file is read; use extract_netlist to include sub-sheets.
+        
         Returns:
-            Dictionary with parsed netlist information
+            Netlist of this file
         """
         print("Starting schematic parsing")
         
-        # Extract symbols (components)
-        self._extract_components()
+        sheet = self.parse_sheet()
+        result = merge_sheets({sheet['file']: sheet}, sheet['file'])
+        self.nets = result['nets']
         
-        # Extract wires
-        self._extract_wires()
-        
-        # Extract junctions
-        self._extract_junctions()
-        
-        # Extract labels
-        self._extract_labels()
+        print(f"Schematic parsing complete: found {result.component_count} components and {result.net_count} nets")
+        return result
+
+    def parse_sheet(self, previous: Optional[SheetState] = None) -> Dict[str, Any]:
+        """Parse this file as one sheet of a possibly hierarchical design.
         
-        # Extract power symbols
-        self._extract_power_symbols()
+        The file is memory-mapped and its top-level items are read one at a
+        time, so only the extracted data is kept in memory. Connectivity is
+        resolved within the sheet only; net names and references are
+        assigned when sheets are merged.
         
-        # Extract no-connects
-        self._extract_no_connects()
+        Given the state of an earlier parse of the same file, only items
+        that changed since are read and the earlier connectivity is patched.
+        The state for the next parse is left in ``self.state``.
         
-        # Build netlist
-        self._build_netlist()
+        Args:
+            previous: State of an earlier parse of this file; it is updated
+                in place and must not be used again
+            
+        Returns:
+            Picklable dictionary with the sheet's components, local
+            connectivity groups and child sheets
+        """
+        stamp = file_stamp(self.schematic_path)
+        if previous is not None and previous.stamp == stamp:
+            print(f"Schematic unchanged since last parse: {self.schematic_path}")
+            self.state = previous
+            return previous.data
+        
+        # Top-level item type -> reader; all other items (graphics, text,
+        # images, buses) are skipped without decoding
+        readers = {
+            'uuid': self._read_uuid,
+            'lib_symbols': self._read_lib_symbols,
+            'symbol': self._read_symbol,
+            'wire': self._read_wire,
+            'junction': self._read_junction,
+            'label': self._read_label,
+            'global_label': self._read_label,
+            'hierarchical_label': self._read_label,
+            'no_connect': self._read_no_connect,
+            'sheet': self._read_sheet,
+            'symbol_instances': self._read_symbol_instances
+        }
         
-        # Create result
-        result = {
-            "components": self.component_info,
-            "nets": dict(self.nets),
+        with map_file(self.schematic_path) as content:
+            reader = SExprReader(content)
+            if reader.name != "kicad_sch":
+                raise ValueError(f"Not a KiCad schematic file: {self.schematic_path}")
+            
+            self.content = content
+            try:
+                with gc_paused():
+                    spans = split_top_level(content)
+                    items = None
+                    if previous is not None:
+                        items = self._read_changed_items(readers, spans, previous)
+                    if items is None:
+                        previous = None
+                        items = self._read_all_items(readers, reader, spans)
+            finally:
+                self.content = b""
+        print(f"Successfully read schematic: {self.schematic_path}")
+        
+        self._collect_items(items)
+        
+        # Pin positions of all newly read symbols are computed in one batch
+        self._place_component_pins()
+        self.wires = wire_array(self.wires)
+        self.junctions = point_array(self.junctions)
+        
+        print(f"Extracted {len(self.components)} components, {len(self.power_symbols)} power symbols, "
+              f"{len(self.wires)} wires, {len(self.junctions)} junctions, {len(self.no_connects)} no-connects "
+              f"and {len(self.sheets)} sheets")
+        print(f"Extracted {len(self.labels)} local labels, {len(self.global_labels)} global labels, "
+              f"and {len(self.hierarchical_labels)} hierarchical labels")
+        
+        # Resolve connectivity within the sheet
+        connectivity = self._build_connectivity(items, previous)
+        
+        # No-connect flags with the pins they mark, if any
+        component_index = self.component_index
+        no_connects = [
+            {
+                'x': flag['x'],
+                'y': flag['y'],
+                'pins': [(component_index[key], num) for key, num in connectivity.pins_at(flag['x'], flag['y'])]
+            }
+            for flag in self.no_connects
+        ]
+        
+        data = {
+            "file": os.path.abspath(self.schematic_path),
+            "stamp": stamp,
+            "uuid": self.uuid,
+            "components": self.components,
+            "symbols": self.symbols,
+            "symbol_instances": self.symbol_instances,
+            "groups": self.groups,
+            "sheets": self.sheets,
             "labels": self.labels,
             "wires": self.wires,
             "junctions": self.junctions,
             "power_symbols": self.power_symbols,
-            "component_count": len(self.component_info),
-            "net_count": len(self.nets)
+            "no_connects": no_connects
         }
-        
-        print(f"Schematic parsing complete: found {len(self.component_info)} components and {len(self.nets)} nets")
-        return result
+        self.state = SheetState(stamp, self._header, items, data, connectivity)
+        return data
+
+    def _digest(self, start: int, end: int) -> bytes:
+        """Hash a byte range of the file."""
+        return hashlib.blake2b(self.content[start:end], digest_size=16).digest()
 
-    def _extract_s_expressions(self, pattern: str) -> List[str]:
-        """Extract all matching S-expressions from the schematic content.
+    def _item_key(self, head: str, start: int, end: int, digest: bytes, seen: set) -> Hashable:
+        """Build the key identifying a top-level item between parses.
         
         Args:
-            pattern: Regex pattern to match the start of S-expressions
+            head: Item type
+            start: Offset of the item in the file
+            end: End offset of the item
+            digest: Hash of the item's bytes, used when it has no UUID
+            seen: Keys already used in this file; updated
             
         Returns:
-            List of matching S-expressions
+            Key unique within the file
         """
-        matches = []
-        positions = []
-        
-        # Find all starting positions of matches
-        for match in re.finditer(pattern, self.content):
-            positions.append(match.start())
-        
-        # Extract full S-expressions for each match
-        for pos in positions:
-            # Start from the matching position
-            current_pos = pos
-            depth = 0
-            s_exp = ""
+        # The item's own UUID comes before those of its pins
+        match = _UUID_RE.search(self.content, start, end)
+        key = (head, match.group(1).decode('ascii', errors='replace') if match else digest)
+        if key in seen:
+            key = key + (len(seen),)
+        seen.add(key)
+        return key
+
+    def _read_all_items(self, readers: Dict[str, Callable[[SExpr], Any]], reader: SExprReader,
+                        spans: Optional[List[Tuple[int, int, str]]]) -> List[SheetItem]:
+        """Read every top-level item of the file.
+        
+        Items are keyed and hashed for the next parse if the file's layout
+        lines up with the item spans found by split_top_level.
+        
+        Args:
+            readers: Item type -> reader
+            reader: Stream reader over the file
+            spans: Candidate item spans, or None
             
-            # Extract the full S-expression by tracking parentheses
-            while current_pos < len(self.content):
-                char = self.content[current_pos]
-                s_exp += char
-                
-                if char == '(':
-                    depth += 1
-                elif char == ')':
-                    depth -= 1
-                    if depth == 0:
-                        # Found the end of the S-expression
-                        break
-                
-                current_pos += 1
+        Returns:
+            Items in file order
+        """
+        span_ends = {start: (end, head) for start, end, head in spans or () if head in readers}
+        aligned = bool(span_ends)
+        
+        items = []
+        offsets = []
+        early = []  # symbols seen before lib_symbols
+        for node in reader.items(keep=readers):
+            span = span_ends.get(node.start)
+            if span is None or span[1] != node.name or self.content[node.end:span[0]].strip():
+                aligned = False
+            offsets.append(node.start)
             
-            matches.append(s_exp)
+            if node.name == 'symbol' and self.lib_symbols is None:
+                # KiCad always writes lib_symbols first, but placements need
+                # the library pins, so symbols of other writers are held back
+                early.append((len(items), node))
+                items.append(SheetItem(None, None, node.name, None))
+            else:
+                items.append(SheetItem(None, None, node.name, readers[node.name](node)))
+        
+        # Files without a lib_symbols section only have instance pins
+        self.lib_symbols = self.lib_symbols or {}
+        for index, node in early:
+            items[index].value = self._read_symbol(node)
+        
+        self._header = None
+        if aligned and len(items) == len(span_ends):
+            self._header = self._digest(0, spans[0][0])
+            seen = set()
+            for item, start in zip(items, offsets):
+                end = span_ends[start][0]
+                item.digest = self._digest(start, end)
+                item.key = self._item_key(item.kind, start, end, item.digest, seen)
+        else:
+            for index, item in enumerate(items):
+                item.key = (item.kind, index)
+        
+        return items
+
+    def _read_changed_items(self, readers: Dict[str, Callable[[SExpr], Any]],
+                            spans: Optional[List[Tuple[int, int, str]]],
+                            previous: SheetState) -> Optional[List[SheetItem]]:
+        """Read only the top-level items that changed since an earlier parse.
         
-        return matches
+        Args:
+            readers: Item type -> reader
+            spans: Item spans found by split_top_level, or None
+            previous: State of the earlier parse
+            
+        Returns:
+            Items in file order, reusing unchanged ones, or None if the file
+            has to be read in full (layout or library symbols changed)
+        """
+        if not spans or previous.header is None:
+            return None
+        
+        self._header = self._digest(0, spans[0][0])
+        if self._header != previous.header:
+            return None
+        
+        # Unchanged items are found by their hash and keep their key
+        known = {item.digest: item for item in previous.items}
+        seen = set()
+        items = []
+        changed = []
+        for start, end, head in spans:
+            if head not in readers:
+                continue
+            
+            digest = self._digest(start, end)
+            item = known.get(digest)
+            if item is not None and item.kind == head and item.key not in seen:
+                seen.add(item.key)
+                items.append(item)
+            else:
+                items.append(SheetItem(self._item_key(head, start, end, digest, seen), digest, head, None))
+                changed.append((len(items) - 1, start, end))
+        
+        # Placed symbols depend on the library pins
+        libraries = [item for item in previous.items if item.kind == 'lib_symbols']
+        if [item.digest for item in items if item.kind == 'lib_symbols'] != \
+                [item.digest for item in libraries]:
+            return None
+        self.lib_symbols = libraries[0].value if libraries else {}
+        
+        for index, start, end in changed:
+            item = items[index]
+            try:
+                node = parse_sexpr(self.content[start:end])
+            except ValueError:
+                return None
+            if node.name != item.kind:
+                return None
+            item.value = readers[item.kind](node)
+        
+        print(f"Re-read {len(changed)} changed items of {len(items)}")
+        return items
+
+    def _collect_items(self, items: List[SheetItem]) -> None:
+        """Gather the values of all items into the sheet's lists, in file order."""
+        for item in items:
+            value = item.value
+            if value is None:
+                continue
+            
+            kind = item.kind
+            if kind == 'symbol':
+                self.component_index[item.key] = len(self.components)
+                self.components.append(value.component)
+                self.symbols.append((value.uuid, value.references))
+                if value.power_symbol is not None:
+                    self.power_symbols.append(value.power_symbol)
+                if value.pins is None:
+                    self.placements.append(value)
+            elif kind == 'wire':
+                self.wires.append(value)
+            elif kind == 'junction':
+                self.junctions.append(value)
+            elif kind == 'label':
+                self.labels.append(value)
+            elif kind == 'global_label':
+                self.global_labels.append(value)
+            elif kind == 'hierarchical_label':
+                self.hierarchical_labels.append(value)
+            elif kind == 'no_connect':
+                self.no_connects.append(value)
+            elif kind == 'sheet':
+                self.sheets.append(value)
+            elif kind == 'uuid':
+                self.uuid = value
+            elif kind == 'symbol_instances':
+                self.symbol_instances.update(value)
 
-    def _extract_components(self) -> None:
-        """Extract component information from schematic."""
-        print("Extracting components")
+    @staticmethod
+    def _parse_position(node: SExpr) -> Optional[Dict[str, float]]:
+        """Read an ``(at x y [angle])`` child into a position dictionary.
         
-        # Extract all symbol expressions (components)
-        symbols = self._extract_s_expressions(r'\(symbol\s+')
+        Args:
+            node: S-expression that may contain an ``at`` child
+            
+        Returns:
+            Position dictionary or None if the node has no valid position
+        """
+        at = node.child('at')
+        if at is None:
+            return None
         
+        try:
+            return {
+                'x': float(at.value(1)),
+                'y': float(at.value(2)),
+                'angle': float(at.value(3, '0'))
+            }
+        except (TypeError, ValueError):
+            return None
+
+    def _read_uuid(self, item: SExpr) -> Optional[str]:
+        """Read the sheet's own UUID."""
+        return item.value(1)
+
+    def _read_lib_symbols(self, item: SExpr) -> Dict[str, PinTable]:
+        """Read pin definitions of the embedded library symbols."""
+        self.lib_symbols = parse_lib_symbols(item, self.content)
+        return self.lib_symbols
+
+    def _read_symbol(self, symbol: SExpr) -> SymbolItem:
+        """Read a placed symbol into a component and, for power ports, a power symbol."""
+        component, placement, pins = self._parse_component(symbol)
+        
+        power_symbol = None
+        lib_id = component.lib_id or ''
+        if lib_id.startswith('power:') and component.x is not None:
+            power_type = lib_id[len('power:'):]
+            value = power_type
+            for prop in symbol.children('property'):
+                if prop.value(1) == 'Value' and prop.value(2):
+                    value = prop.value(2)
+                    break
+            
+            power_symbol = PowerSymbol(power_type, value, component.x, component.y, component.angle)
+        
+        return SymbolItem(
+            component, symbol.child_value('uuid'), self._parse_instances(symbol),
+            power_symbol, placement, pins
+        )
+
+    def _place_component_pins(self) -> None:
+        """Place library pins of all symbols read in this parse on the sheet."""
+        symbols = self.placements
         for symbol in symbols:
-            component = self._parse_component(symbol)
-            if component:
-                self.components.append(component)
-                
-                # Add to component info dictionary
-                ref = component.get('reference', 'Unknown')
-                self.component_info[ref] = component
+            symbol.pins = []
+        
+        placements = [symbol.placement for symbol in symbols]
+        for position, table, pin_index, x, y in place_pins(self.lib_symbols, placements):
+            symbol = symbols[position]
+            symbol.pins.append((
+                table.num[pin_index], table.name[pin_index], table.type[pin_index],
+                table.hidden[pin_index], x, y, table.power
+            ))
+            
+            component = symbol.component
+            if component.pins is None:
+                component.pins = []
+            component.pins.append(table.pins[pin_index])
         
-        print(f"Extracted {len(self.components)} components")
+        self.placements = []
 
-    def _parse_component(self, symbol_expr: str) -> Dict[str, Any]:
-        """Parse a component from a symbol S-expression.
+    @staticmethod
+    def _parse_instances(symbol_expr: SExpr) -> Dict[str, str]:
+        """Read the per-sheet-instance references of a placed symbol (KiCad 7+).
         
         Args:
-            symbol_expr: Symbol S-expression
+            symbol_expr: Symbol S-expression node
             
         Returns:
-            Component information dictionary
+            Dictionary mapping instance path to reference
         """
-        component = {}
+        references = {}
+        instances = symbol_expr.child('instances')
+        if instances is None:
+            return references
+        
+        for project in instances.children('project'):
+            for path in project.children('path'):
+                reference = path.child_value('reference')
+                if path.value(1) and reference:
+                    references[path.value(1)] = reference
+        
+        return references
+
+    def _parse_component(self, symbol_expr: SExpr) -> Tuple[Component, Optional[Placement], Optional[List[PlacedPin]]]:
+        """Parse a component from a symbol S-expression.
         
+        Args:
+            symbol_expr: Symbol S-expression node
+            
+        Returns:
+            Tuple of the component record, the placement of its library
+            pins (or None) and, without a placement, its connection points
+        """
         # Extract library component ID
-        lib_id_match = re.search(r'\(lib_id\s+"([^"]+)"\)', symbol_expr)
-        if lib_id_match:
-            component['lib_id'] = lib_id_match.group(1)
-        
-        # Extract reference (e.g., R1, C2)
-        property_matches = re.finditer(r'\(property\s+"([^"]+)"\s+"([^"]+)"', symbol_expr)
-        for match in property_matches:
-            prop_name = match.group(1)
-            prop_value = match.group(2)
+        lib_id = symbol_expr.child_value('lib_id') or None
+        component = Component(lib_id=lib_id)
+        
+        # Extract reference (e.g., R1, C2) and other properties
+        for prop in symbol_expr.children('property'):
+            prop_name = prop.value(1)
+            prop_value = prop.value(2)
+            if not prop_name or not prop_value:
+                continue
             
             if prop_name == "Reference":
-                component['reference'] = prop_value
+                component.reference = intern(prop_value)
             elif prop_name == "Value":
-                component['value'] = prop_value
+                component.value = intern(prop_value)
             elif prop_name == "Footprint":
-                component['footprint'] = prop_value
+                component.footprint = intern(prop_value)
             else:
                 # Store other properties
-                if 'properties' not in component:
-                    component['properties'] = {}
-                component['properties'][prop_name] = prop_value
+                if component.properties is None:
+                    component.properties = {}
+                component.properties[intern(prop_name)] = intern(prop_value)
         
         # Extract position
-        pos_match = re.search(r'\(at\s+([\d\.-]+)\s+([\d\.-]+)(\s+[\d\.-]+)?\)', symbol_expr)
-        if pos_match:
-            component['position'] = {
-                'x': float(pos_match.group(1)),
-                'y': float(pos_match.group(2)),
-                'angle': float(pos_match.group(3).strip() if pos_match.group(3) else 0)
-            }
-        
-        # Extract pins
+        position = self._parse_position(symbol_expr)
+        if position:
+            component.x, component.y, component.angle = position['x'], position['y'], position['angle']
+        
+        # Pins come from the library definition and are placed on the sheet
+        # later, together with all other symbols
+        lib_name = symbol_expr.child_value('lib_name') or lib_id
+        
+        if lib_name in self.lib_symbols and position:
+            try:
+                unit = int(symbol_expr.child_value('unit', '1'))
+                # KiCad 9 renamed "convert" to "body_style"
+                style = int(symbol_expr.child_value('body_style') or symbol_expr.child_value('convert', '1'))
+            except ValueError:
+                unit, style = 1, 1
+            
+            placement = Placement(
+                lib_name, unit, style,
+                position['x'], position['y'], position['angle'],
+                symbol_expr.child_value('mirror')
+            )
+            return component, placement, None
+        
+        # No library data: fall back to the pin numbers listed on the instance
         pins = []
-        pin_matches = re.finditer(r'\(pin\s+\(num\s+"([^"]+)"\)\s+\(name\s+"([^"]+)"\)', symbol_expr)
-        for match in pin_matches:
-            pin_num = match.group(1)
-            pin_name = match.group(2)
-            pins.append({
-                'num': pin_num,
-                'name': pin_name
-            })
+        for pin in symbol_expr.children('pin'):
+            pin_num = pin.value(1)
+            if pin_num:
+                pins.append(Pin(pin_num))
         
         if pins:
-            component['pins'] = pins
-        
-        return component
-
-    def _extract_wires(self) -> None:
-        """Extract wire information from schematic."""
-        print("Extracting wires")
-        
-        # Extract all wire expressions
-        wires = self._extract_s_expressions(r'\(wire\s+')
-        
-        for wire in wires:
-            # Extract the wire coordinates
-            pts_match = re.search(r'\(pts\s+\(xy\s+([\d\.-]+)\s+([\d\.-]+)\)\s+\(xy\s+([\d\.-]+)\s+([\d\.-]+)\)\)', wire)
-            if pts_match:
-                self.wires.append({
-                    'start': {
-                        'x': float(pts_match.group(1)),
-                        'y': float(pts_match.group(2))
-                    },
-                    'end': {
-                        'x': float(pts_match.group(3)),
-                        'y': float(pts_match.group(4))
-                    }
-                })
+            component.pins = pins
         
-        print(f"Extracted {len(self.wires)} wires")
+        # Power symbols connect at their origin
+        if lib_id and lib_id.startswith('power:') and position:
+            return component, None, [('1', '', 'power_in', True, position['x'], position['y'], True)]
+        return component, None, []
 
-    def _extract_junctions(self) -> None:
-        """Extract junction information from schematic."""
-        print("Extracting junctions")
-        
-        # Extract all junction expressions
-        junctions = self._extract_s_expressions(r'\(junction\s+')
+    def _read_wire(self, wire: SExpr) -> Optional[Tuple[float, float, float, float]]:
+        """Read the end points of a wire segment."""
+        pts = wire.child('pts')
+        points = list(pts.children('xy')) if pts is not None else []
+        if len(points) < 2:
+            return None
         
-        for junction in junctions:
-            # Extract the junction coordinates
-            xy_match = re.search(r'\(junction\s+\(xy\s+([\d\.-]+)\s+([\d\.-]+)\)\)', junction)
-            if xy_match:
-                self.junctions.append({
-                    'x': float(xy_match.group(1)),
-                    'y': float(xy_match.group(2))
-                })
-        
-        print(f"Extracted {len(self.junctions)} junctions")
-
-    def _extract_labels(self) -> None:
-        """Extract label information from schematic."""
-        print("Extracting labels")
-        
-        # Extract local labels
-        local_labels = self._extract_s_expressions(r'\(label\s+')
-        
-        for label in local_labels:
-            # Extract label text and position
-            label_match = re.search(r'\(label\s+"([^"]+)"\s+\(at\s+([\d\.-]+)\s+([\d\.-]+)(\s+[\d\.-]+)?\)', label)
-            if label_match:
-                self.labels.append({
-                    'type': 'local',
-                    'text': label_match.group(1),
-                    'position': {
-                        'x': float(label_match.group(2)),
-                        'y': float(label_match.group(3)),
-                        'angle': float(label_match.group(4).strip() if label_match.group(4) else 0)
-                    }
-                })
+        try:
+            return (
+                float(points[0].value(1)), float(points[0].value(2)),
+                float(points[1].value(1)), float(points[1].value(2))
+            )
+        except (TypeError, ValueError):
+            return None
+
+    def _read_junction(self, junction: SExpr) -> Optional[Tuple[float, float]]:
+        """Read the position of a junction."""
+        # KiCad 6+ uses (at x y); older files used (xy x y)
+        xy = junction.child('at') or junction.child('xy')
+        if xy is None:
+            return None
         
-        # Extract global labels
-        global_labels = self._extract_s_expressions(r'\(global_label\s+')
-        
-        for label in global_labels:
-            # Extract global label text and position
-            label_match = re.search(r'\(global_label\s+"([^"]+)"\s+\(shape\s+([^\s\)]+)\)\s+\(at\s+([\d\.-]+)\s+([\d\.-]+)(\s+[\d\.-]+)?\)', label)
-            if label_match:
-                self.global_labels.append({
-                    'type': 'global',
-                    'text': label_match.group(1),
-                    'shape': label_match.group(2),
-                    'position': {
-                        'x': float(label_match.group(3)),
-                        'y': float(label_match.group(4)),
-                        'angle': float(label_match.group(5).strip() if label_match.group(5) else 0)
-                    }
-                })
+        try:
+            return float(xy.value(1)), float(xy.value(2))
+        except (TypeError, ValueError):
+            return None
+
+    def _read_label(self, label: SExpr) -> Optional[Label]:
+        """Read a local, global or hierarchical label."""
+        text = label.value(1)
+        position = self._parse_position(label)
+        if not text or not position:
+            return None
+        
+        if label.name == 'label':
+            return Label('local', text, position['x'], position['y'], position['angle'])
+        elif label.name == 'global_label':
+            return Label(
+                'global', text, position['x'], position['y'], position['angle'],
+                shape=label.child_value('shape', '')
+            )
+        else:
+            return Label(
+                'hierarchical', text, position['x'], position['y'], position['angle'],
+                shape=label.child_value('shape', '')
+            )
+
+    def _read_no_connect(self, no_connect: SExpr) -> Optional[Dict[str, float]]:
+        """Read the position of a no-connect flag."""
+        position = self._parse_position(no_connect)
+        if position:
+            return {
+                'x': position['x'],
+                'y': position['y']
+            }
+        return None
+
+    def _read_sheet(self, sheet: SExpr) -> Optional[Dict[str, Any]]:
+        """Read a child sheet placed on this schematic."""
+        name = None
+        file_name = None
+        for prop in sheet.children('property'):
+            # KiCad 6 wrote "Sheet name"/"Sheet file", later versions "Sheetname"/"Sheetfile"
+            prop_name = (prop.value(1) or '').replace(' ', '')
+            if prop_name == 'Sheetname':
+                name = prop.value(2)
+            elif prop_name == 'Sheetfile':
+                file_name = prop.value(2)
+        
+        if not file_name:
+            return None
         
-        # Extract hierarchical labels
-        hierarchical_labels = self._extract_s_expressions(r'\(hierarchical_label\s+')
-        
-        for label in hierarchical_labels:
-            # Extract hierarchical label text and position
-            label_match = re.search(r'\(hierarchical_label\s+"([^"]+)"\s+\(shape\s+([^\s\)]+)\)\s+\(at\s+([\d\.-]+)\s+([\d\.-]+)(\s+[\d\.-]+)?\)', label)
-            if label_match:
-                self.hierarchical_labels.append({
-                    'type': 'hierarchical',
-                    'text': label_match.group(1),
-                    'shape': label_match.group(2),
-                    'position': {
-                        'x': float(label_match.group(3)),
-                        'y': float(label_match.group(4)),
-                        'angle': float(label_match.group(5).strip() if label_match.group(5) else 0)
-                    }
+        pins = []
+        for pin in sheet.children('pin'):
+            position = self._parse_position(pin)
+            if pin.value(1) and position:
+                pins.append({
+                    'name': pin.value(1),
+                    'type': pin.value(2, ''),
+                    'position': position
                 })
         
-        print(f"Extracted {len(self.labels)} local labels, {len(self.global_labels)} global labels, and {len(self.hierarchical_labels)} hierarchical labels")
+        directory = os.path.dirname(os.path.abspath(self.schematic_path))
+        return {
+            'uuid': sheet.child_value('uuid', ''),
+            'name': name,
+            'file': os.path.normpath(os.path.join(directory, file_name)),
+            'pins': pins
+        }
 
-    def _extract_power_symbols(self) -> None:
-        """Extract power symbol information from schematic."""
-        print("Extracting power symbols")
-        
-        # Extract all power symbol expressions
-        power_symbols = self._extract_s_expressions(r'\(symbol\s+\(lib_id\s+"power:')
+    def _read_symbol_instances(self, table: SExpr) -> Dict[str, str]:
+        """Read the KiCad 6 root-level table of per-instance references."""
+        references = {}
+        for path in table.children('path'):
+            reference = path.child_value('reference')
+            if path.value(1) and reference:
+                references[path.value(1)] = reference
+        return references
+
+    @staticmethod
+    def _connect_item(connectivity: IncrementalConnectivity, item: SheetItem) -> None:
+        """Add the connection points of one item."""
+        key, kind, value = item.key, item.kind, item.value
+        if value is None:
+            return
+        
+        # Wires and junctions carry connectivity between points
+        if kind == 'wire':
+            connectivity.add_wire(key, *value)
+        elif kind == 'junction':
+            connectivity.add_junction(key, *value)
+        # Labels connect where they are placed and name the net
+        elif kind in ('label', 'global_label', 'hierarchical_label'):
+            connectivity.add_label(key, value.x, value.y, value.type, value.text)
+        # Symbol pins; power symbols name their net after their value, and
+        # hidden power input pins join the global net of the pin name
+        elif kind == 'symbol':
+            for num, name, pin_type, hidden, x, y, is_power_symbol in value.pins:
+                node = connectivity.add_pin(key, x, y, (key, num))
+                
+                if is_power_symbol:
+                    net_name = value.component.value or name
+                    if net_name:
+                        connectivity.add_name(node, 'power', net_name)
+                elif hidden and pin_type == 'power_in' and name:
+                    connectivity.add_name(node, 'power', name)
+        # Sheet pins only connect to what touches them here; the link to the
+        # child sheet's hierarchical label is made when sheets are merged
+        elif kind == 'sheet':
+            for pin in value['pins']:
+                connectivity.add_point(key, pin['position']['x'], pin['position']['y'],
+                                       (value['uuid'], pin['name']))
+
+    def _build_connectivity(self, items: List[SheetItem],
+                            previous: Optional[SheetState] = None) -> IncrementalConnectivity:
+        """Group the sheet's pins, names and sheet pins by connectivity.
         
-        for symbol in power_symbols:
-            # Extract power symbol type and position
-            type_match = re.search(r'\(lib_id\s+"power:([^"]+)"\)', symbol)
-            pos_match = re.search(r'\(at\s+([\d\.-]+)\s+([\d\.-]+)(\s+[\d\.-]+)?\)', symbol)
+        Args:
+            items: Items of the sheet
+            previous: State of an earlier parse whose connectivity is updated
+                with the items that changed since
             
-            if type_match and pos_match:
-                self.power_symbols.append({
-                    'type': type_match.group(1),
-                    'position': {
-                        'x': float(pos_match.group(1)),
-                        'y': float(pos_match.group(2)),
-                        'angle': float(pos_match.group(3).strip() if pos_match.group(3) else 0)
-                    }
-                })
+        Returns:
+            Connectivity structure of the sheet
+        """
+        print("Building connectivity from schematic data")
+        
+        connectivity = previous.connectivity if previous is not None else None
+        if connectivity is None:
+            # States from worker processes do not carry their connectivity
+            connectivity = IncrementalConnectivity()
+            added = items
+        else:
+            current = {item.key: item for item in items}
+            for item in previous.items:
+                if current.get(item.key) is not item:
+                    connectivity.remove(item.key)
+            
+            unchanged = {item.key: item for item in previous.items}
+            added = [item for item in items if unchanged.get(item.key) is not item]
+        
+        for item in added:
+            self._connect_item(connectivity, item)
+        
+        component_index = self.component_index
+        self.groups = [
+            {
+                "pins": [(component_index[key], num) for key, num in group["pins"]],
+                "names": list(group["names"]),
+                "sheet_pins": list(group["points"])
+            }
+            for group in connectivity.resolve().values()
+        ]
         
-        print(f"Extracted {len(self.power_symbols)} power symbols")
+        print(f"Found {len(self.groups)} connected groups")
+        return connectivity
 
-    def _extract_no_connects(self) -> None:
-        """Extract no-connect information from schematic."""
-        print("Extracting no-connects")
-        
-        # Extract all no-connect expressions
-        no_connects = self._extract_s_expressions(r'\(no_connect\s+')
-        
-        for no_connect in no_connects:
-            # Extract the no-connect coordinates
-            xy_match = re.search(r'\(no_connect\s+\(at\s+([\d\.-]+)\s+([\d\.-]+)\)', no_connect)
-            if xy_match:
-                self.no_connects.append({
-                    'x': float(xy_match.group(1)),
-                    'y': float(xy_match.group(2))
-                })
-        
-        print(f"Extracted {len(self.no_connects)} no-connects")
 
-    def _build_netlist(self) -> None:
-        """Build the netlist from extracted components and connections."""
-        print("Building netlist from schematic data")
-        
-        # TODO: Implement netlist building algorithm
-        # This is a complex task that involves:
-        # 1. Tracking connections between components via wires
-        # 2. Handling labels (local, global, hierarchical)
-        # 3. Processing power symbols
-        # 4. Resolving junctions
-        
-        # For now, we'll implement a basic version that creates a list of nets
-        # based on component references and pin numbers
-        
-        # Process global labels as nets
-        for label in self.global_labels:
-            net_name = label['text']
-            self.nets[net_name] = []  # Initialize empty list for this net
-        
-        # Process power symbols as nets
-        for power in self.power_symbols:
-            net_name = power['type']
-            if net_name not in self.nets:
-                self.nets[net_name] = []
+def _parse_sheet_file(schematic_path: str,
+                      previous: Optional[SheetState] = None) -> Tuple[Dict[str, Any], SheetState]:
+    """Parse one sheet file; module-level so worker processes can run it.
+    
+    Args:
+        schematic_path: Path to the sheet file
+        previous: State of an earlier parse of the file, if retained
         
-        # In a full implementation, we would now trace connections between
-        # components, but that requires a more complex algorithm to follow wires
-        # and detect connected pins
+    Returns:
+        Tuple of sheet data from SchematicParser.parse_sheet and the state
+        for the next parse
+    """
+    parser = SchematicParser(schematic_path)
+    data = parser.parse_sheet(previous)
+    return data, parser.state
+
+
+def load_schematic_sheets(schematic_path: str, max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Parse a root schematic and every sheet file it references.
+    
+    The root, and every sheet with a retained state from an earlier parse,
+    is parsed incrementally in-process; other sub-sheets are parsed in a
+    process pool as soon as the sheet referencing them is done. Each file
+    is parsed once, however many times it is placed.
+    
+    Args:
+        schematic_path: Path to the root schematic
+        max_workers: Maximum number of worker processes (defaults to CPU count)
         
-        # For demonstration, we'll add a placeholder note
-        print("Note: Full netlist building requires complex connectivity tracing")
-        print(f"Found {len(self.nets)} potential nets from labels and power symbols")
+    Returns:
+        Dictionary mapping absolute file path to sheet data
+    """
+    root_file = os.path.abspath(schematic_path)
+    sheets = {}
+    requested = {root_file}
+    local = [root_file]  # files to parse in this process
+    remote = []  # files to parse in worker processes
+    
+    def schedule_children(data: Dict[str, Any]) -> None:
+        for sheet in data['sheets']:
+            child_file = sheet['file']
+            if child_file in requested:
+                continue
+            requested.add(child_file)
+            if not os.path.exists(child_file):
+                print(f"Sheet file not found: {child_file}")
+            elif has_sheet_state(child_file):
+                local.append(child_file)
+            else:
+                remote.append(child_file)
+    
+    def parse_local() -> None:
+        while local:
+            path = local.pop()
+            try:
+                data, state = _parse_sheet_file(path, take_sheet_state(path))
+            except Exception as e:
+                if path == root_file:
+                    raise
+                print(f"Error parsing sheet {path}: {str(e)}")
+                continue
+            
+            keep_sheet_state(path, state)
+            sheets[path] = data
+            schedule_children(data)
+    
+    parse_local()
+    if not remote:
+        return sheets
+    
+    try:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    except (OSError, NotImplementedError) as e:
+        # Platforms without working multiprocessing still get the hierarchy
+        print(f"Process pool unavailable, parsing sheets in a thread: {str(e)}")
+        executor = ThreadPoolExecutor(max_workers=1)
+    
+    with executor:
+        futures = {}
+        while remote or futures:
+            while remote:
+                child_file = remote.pop()
+                futures[executor.submit(_parse_sheet_file, child_file)] = child_file
+            
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                child_file = futures.pop(future)
+                try:
+                    data, state = future.result()
+                except Exception as e:
+                    print(f"Error parsing sheet {child_file}: {str(e)}")
+                    continue
+                
+                keep_sheet_state(child_file, state)
+                sheets[child_file] = data
+                schedule_children(data)
+            parse_local()
+    
+    return sheets
 
 
-def extract_netlist(schematic_path: str) -> Dict[str, Any]:
-    """Extract netlist information from a KiCad schematic file.
+def extract_netlist(schematic_path: str, cache: Optional[ParseCache] = None) -> Netlist:
+    """Extract netlist information from a KiCad schematic and all its sub-sheets.
+    
+    Results are served from the parse cache while the schematic and its
+    sub-sheets are unchanged; cached results are shared and read-only.
     
     Args:
         schematic_path: Path to the KiCad schematic file (.kicad_sch)
+        cache: Parse cache to use (defaults to the server's shared cache)
         
     Returns:
-        Dictionary with netlist information
+        Netlist with dictionary-style access (see schematic_model), or an
+        error dictionary with an "error" key
     """
+    if cache is None:
+        cache = get_parse_cache()
+    
     try:
-        parser = SchematicParser(schematic_path)
-        return parser.parse()
+        if cache is not None:
+            cached = cache.get("netlist", schematic_path, version=NETLIST_VERSION)
+            if cached is not None:
+                print(f"Using cached netlist for {schematic_path}")
+                return cached
+        
+        sheets = load_schematic_sheets(schematic_path)
+        result = merge_sheets(sheets, os.path.abspath(schematic_path))
+        print(f"Netlist extraction complete: {len(result.sheets)} sheet instances, "
+              f"{result.component_count} components and {result.net_count} nets")
+        
+        if cache is not None:
+            cache.put("netlist", schematic_path, result, dependencies=sheets.keys(), version=NETLIST_VERSION)
+        return result
     except Exception as e:
         print(f"Error extracting netlist: {str(e)}")
         return {
@@ -437,8 +886,9 @@ def analyze_netlist(netlist_data: Dict[str, Any]) -> Dict[str, Any]:
             results["component_types"][comp_type.group(1)] += 1
     
     # Identify power nets
+    net_roles = get_netlist_index(netlist_data).net_roles
     for net_name in netlist_data.get("nets", {}):
-        if any(net_name.startswith(prefix) for prefix in ["VCC", "VDD", "GND", "+5V", "+3V3", "+12V"]):
+        if "power" in net_roles[net_name]:
             results["power_nets"].append(net_name)
     
     # Count pin connections
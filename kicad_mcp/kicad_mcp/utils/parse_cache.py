@@ -0,0 +1,306 @@
+"""
+In-memory cache for parsed KiCad files.
+
+Parsed results are stored per (kind, path) together with a stamp of every
+file they were built from: the root schematic plus all its sub-sheets for a
+netlist. A cached result is reused while every dependency still has the
+same modification time and size; with content verification enabled, a
+changed stamp falls back to comparing content hashes, so a file that was only
+touched or saved unchanged is still a hit.
+
+The cache is bounded by the estimated in-memory size of the stored results
+and evicts least recently used entries first. An optional persistent store
+(see disk_cache.DiskCache) backs it, so results survive server restarts.
+"""
+import hashlib
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from kicad_mcp.config import PARSE_CACHE_MAX_BYTES, PARSE_CACHE_VERIFY_CONTENT
+
+if TYPE_CHECKING:
+    from kicad_mcp.utils.disk_cache import DiskCache
+
+# (path, mtime_ns, size, content digest or None)
+FileStamp = Tuple[str, int, int, Optional[bytes]]
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> bytes:
+    """Hash a file's content.
+
+    Args:
+        path: File path
+        chunk_size: Read size in bytes
+
+    Returns:
+        BLAKE2b digest of the content
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def estimate_size(value: Any, sample: int = 64) -> int:
+    """Estimate the memory held by a tree of dicts, lists, tuples, slotted records and scalars.
+
+    Large containers are measured from an evenly spaced sample of their items
+    and extrapolated, so the cost stays small for big netlists. Strings are
+    not counted: in parse results they are dictionary keys and names shared
+    with many other entries.
+
+    Args:
+        value: Object to measure
+        sample: Number of items measured per container
+
+    Returns:
+        Approximate size in bytes
+    """
+    if isinstance(value, str):
+        return 0
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        items = list(value.values())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value)
+    elif hasattr(type(value), '__slots__') and not hasattr(value, '__dict__'):
+        items = [getattr(value, name, None) for name in type(value).__slots__]
+    else:
+        return size
+
+    if len(items) > sample:
+        step = len(items) / sample
+        picked = [items[int((i + 0.5) * step)] for i in range(sample)]
+    else:
+        picked = items
+
+    if picked:
+        measured = sum(estimate_size(item, sample) for item in picked)
+        size += measured * len(items) // len(picked)
+    return size
+
+
+class ParseCache:
+    """Size-bounded LRU cache of parse results validated against file stamps."""
+
+    def __init__(self, max_bytes: int = PARSE_CACHE_MAX_BYTES,
+                 verify_content: bool = PARSE_CACHE_VERIFY_CONTENT,
+                 store: Optional["DiskCache"] = None):
+        """Initialize an empty cache.
+
+        Args:
+            max_bytes: Upper bound on the estimated size of cached results
+            verify_content: Compare content hashes when a file's stamp changed
+            store: Persistent DiskCache consulted on misses and written through
+        """
+        self.max_bytes = max_bytes
+        self.verify_content = verify_content
+        self.store = store
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        # (kind, path) -> (result, dependency stamps, estimated size, version)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, List[FileStamp], int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _stamp(self, path: str) -> Optional[FileStamp]:
+        """Take the current stamp of a file, or None if it cannot be read."""
+        try:
+            stat = os.stat(path)
+            digest = file_digest(path) if self.verify_content else None
+        except OSError:
+            return None
+        return path, stat.st_mtime_ns, stat.st_size, digest
+
+    def _is_current(self, stamps: List[FileStamp]) -> bool:
+        """Check that none of the dependencies of an entry changed."""
+        for index, (path, mtime_ns, size, digest) in enumerate(stamps):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if stat.st_mtime_ns == mtime_ns and stat.st_size == size:
+                continue
+            if digest is None or stat.st_size != size:
+                return False
+            try:
+                if file_digest(path) != digest:
+                    return False
+            except OSError:
+                return False
+            # Same content under a new timestamp; skip hashing next time
+            stamps[index] = (path, stat.st_mtime_ns, size, digest)
+        return True
+
+    def get(self, kind: str, path: str, version: Any = None) -> Optional[Any]:
+        """Look up a cached result.
+
+        Args:
+            kind: Result type, e.g. "netlist"
+            path: Path of the file the result was parsed from
+            version: Version of the producing code; results of other versions are misses
+
+        Returns:
+            The cached result, or None on a miss. Cached results are shared
+            and must be treated as read-only.
+        """
+        key = (kind, os.path.abspath(path))
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None and entry[3] == version and self._is_current(entry[1]):
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                self.hits += 1
+            return entry[0]
+
+        with self._lock:
+            if entry is not None and self._entries.get(key) is entry:
+                del self._entries[key]
+                self.current_bytes -= entry[2]
+
+        if self.store is not None:
+            stored = self.store.get(kind, version, path)
+            if stored is not None:
+                value, dependencies = stored
+                self._remember(kind, path, value, dependencies, version)
+                with self._lock:
+                    self.store_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, kind: str, path: str, value: Any, dependencies: Iterable[str] = (),
+            version: Any = None) -> None:
+        """Store a result.
+
+        Args:
+            kind: Result type, e.g. "netlist"
+            path: Path of the file the result was parsed from
+            value: Parsed result
+            dependencies: Other files the result was built from
+            version: Version of the producing code
+        """
+        dependencies = list(dependencies)
+        self._remember(kind, path, value, dependencies, version)
+        if self.store is not None:
+            self.store.put(kind, version, path, value, dependencies)
+
+    def _remember(self, kind: str, path: str, value: Any, dependencies: Iterable[str],
+                  version: Any = None) -> None:
+        """Keep a result in memory."""
+        path = os.path.abspath(path)
+        stamps = []
+        for dependency in dict.fromkeys([path] + [os.path.abspath(p) for p in dependencies]):
+            stamp = self._stamp(dependency)
+            if stamp is None:
+                return
+            stamps.append(stamp)
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        key = (kind, path)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[2]
+
+            self._entries[key] = (value, stamps, size, version)
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_load(self, kind: str, path: str,
+                    loader: Callable[[], Tuple[Any, Iterable[str]]], version: Any = None) -> Any:
+        """Return a cached result or load, store and return it.
+
+        Args:
+            kind: Result type, e.g. "netlist"
+            path: Path of the file to parse
+            loader: Called on a miss; returns the result and the files it was
+                built from besides ``path``
+            version: Version of the producing code
+
+        Returns:
+            Parsed result
+        """
+        value = self.get(kind, path, version)
+        if value is None:
+            value, dependencies = loader()
+            self.put(kind, path, value, dependencies, version)
+        return value
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop cached results for a file, or everything.
+
+        Args:
+            path: File whose results to drop; None clears the cache
+        """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                self.current_bytes = 0
+                return
+
+            path = os.path.abspath(path)
+            for key in [key for key in self._entries if key[1] == path]:
+                self.current_bytes -= self._entries.pop(key)[2]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entries and sizes
+        """
+        with self._lock:
+            lookups = self.hits + self.store_hits + self.misses
+            return {
+                "hits": self.hits,
+                "store_hits": self.store_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.store_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "verify_content": self.verify_content,
+                "store": self.store.stats() if self.store is not None else None
+            }
+
+
+# Cache shared by every consumer in the process; installed by the server lifespan
+_default_cache: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> Optional[ParseCache]:
+    """Get the process-wide parse cache, if one is installed."""
+    return _default_cache
+
+
+def set_parse_cache(cache: Optional[ParseCache]) -> None:
+    """Install or remove the process-wide parse cache.
+
+    Args:
+        cache: Cache to share, or None to disable caching
+    """
+    global _default_cache
+    _default_cache = cache
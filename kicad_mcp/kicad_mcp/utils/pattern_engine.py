@@ -0,0 +1,199 @@
+"""
+Rule engine for circuit pattern recognition.
+
+A pattern rule recognizes one kind of circuit and contributes its matches to
+a pattern family such as ``amplifier_circuits``. Rules do not walk the
+design themselves: the engine traverses the components and nets once and
+hands each item to the rules that asked for it, by reference prefix or by
+the roles the component classifier tagged it with. Rules that need the
+whole design to decide collect what they see and emit their matches when
+the traversal finishes.
+
+The engine measures the time spent in every rule and counts its matches,
+so slow rules can be found, and runs only the rules of the requested
+families.
+"""
+import time
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+
+from kicad_mcp.utils.component_classifier import ComponentTags, classify_components
+from kicad_mcp.utils.netlist_index import NetlistIndex
+
+_RULES: List[Type["PatternRule"]] = []
+
+
+class PatternContext:
+    """Design data shared by the rules of one run."""
+
+    __slots__ = ("components", "nets", "index", "tags")
+
+    def __init__(self, components: Mapping[str, Any], nets: Mapping[str, Any], index: NetlistIndex,
+                 tags: Dict[str, ComponentTags]):
+        self.components = components
+        self.nets = nets
+        self.index = index
+        self.tags = tags
+
+
+class PatternRule:
+    """Base class of pattern rules.
+
+    Subclasses set ``family`` and ``name`` and override the hooks they need;
+    a new instance is created for every run. ``component`` is called for
+    components whose reference starts with one of ``prefixes`` or that have
+    one of ``roles``; a rule that sets neither sees every component.
+    Matches are appended to ``matches``.
+    """
+
+    family = ""
+    name = ""
+    prefixes: Tuple[str, ...] = ()
+    roles: Tuple[str, ...] = ()
+
+    def __init__(self, context: PatternContext):
+        self.context = context
+        self.matches: List[Dict[str, Any]] = []
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        """Look at one component."""
+
+    def net(self, name: str, pins: Sequence[Any]) -> None:
+        """Look at one net."""
+
+    def finish(self) -> None:
+        """Emit matches that depend on the whole design."""
+
+
+def pattern_rule(rule: Type[PatternRule]) -> Type[PatternRule]:
+    """Class decorator registering a pattern rule.
+
+    Rules of a family contribute their matches in registration order.
+    """
+    if not rule.family or not rule.name:
+        raise ValueError(f"Pattern rule {rule.__name__} needs a family and a name")
+    _RULES.append(rule)
+    return rule
+
+
+def pattern_families() -> List[str]:
+    """Get the families of the registered rules, in registration order."""
+    return list(dict.fromkeys(rule.family for rule in _RULES))
+
+
+def normalize_families(families: Optional[Iterable[str]]) -> List[str]:
+    """Validate a family selection.
+
+    Args:
+        families: Requested families; None or empty selects all
+
+    Returns:
+        Selected families in registration order
+
+    Raises:
+        ValueError: If a family is unknown
+    """
+    known = pattern_families()
+    if not families:
+        return known
+
+    selected = set(families)
+    unknown = selected.difference(known)
+    if unknown:
+        raise ValueError(f"Unknown pattern families: {', '.join(sorted(unknown))}; "
+                         f"valid families: {', '.join(known)}")
+    return [family for family in known if family in selected]
+
+
+def _overrides(rule: PatternRule, hook: str) -> bool:
+    """Check whether a rule implements a hook."""
+    return getattr(type(rule), hook) is not getattr(PatternRule, hook)
+
+
+def run_pattern_rules(components: Mapping[str, Any], nets: Mapping[str, Any],
+                      families: Optional[Iterable[str]] = None, index: Optional[NetlistIndex] = None,
+                      tags: Optional[Dict[str, ComponentTags]] = None
+                      ) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Run the registered rules over a design in one traversal.
+
+    Args:
+        components: Dictionary of components from netlist
+        nets: Dictionary of nets from netlist
+        families: Families to recognize (see pattern_families); None for all
+        index: Index over the nets (built from nets if not given)
+        tags: Component classification (computed from components if not given)
+
+    Returns:
+        Tuple of (family -> matches, per-rule statistics). Each statistics
+        entry holds the rule's ``rule`` name, ``family``, number of
+        ``matches``, number of ``calls`` and total ``time_ms``.
+
+    Raises:
+        ValueError: If a family is unknown
+    """
+    selected = normalize_families(families)
+    if index is None:
+        index = NetlistIndex(nets)
+    if tags is None:
+        tags = classify_components(components)
+
+    context = PatternContext(components, nets, index, tags)
+    rules = [rule_class(context) for rule_class in _RULES if rule_class.family in selected]
+    elapsed = {id(rule): 0.0 for rule in rules}
+    calls = {id(rule): 0 for rule in rules}
+
+    # Dispatch tables: rules seeing every component, by reference prefix and by role
+    component_rules = [rule for rule in rules if _overrides(rule, 'component')]
+    general_rules = [rule for rule in component_rules if not rule.prefixes and not rule.roles]
+    prefix_rules = [rule for rule in component_rules if rule.prefixes]
+    role_rules: Dict[str, List[PatternRule]] = {}
+    for rule in component_rules:
+        for role in rule.roles:
+            role_rules.setdefault(role, []).append(rule)
+    net_rules = [rule for rule in rules if _overrides(rule, 'net')]
+
+    clock = time.perf_counter
+    for ref, component in components.items():
+        component_tags = tags[ref]
+        targets = list(general_rules)
+        for rule in prefix_rules:
+            if ref.startswith(rule.prefixes):
+                targets.append(rule)
+        if component_tags.value or component_tags.lib:
+            for role in chain(component_tags.value, component_tags.lib):
+                for rule in role_rules.get(role, ()):
+                    if rule not in targets:
+                        targets.append(rule)
+
+        for rule in targets:
+            start = clock()
+            rule.component(ref, component, component_tags)
+            elapsed[id(rule)] += clock() - start
+            calls[id(rule)] += 1
+
+    if net_rules:
+        for name, pins in nets.items():
+            for rule in net_rules:
+                start = clock()
+                rule.net(name, pins)
+                elapsed[id(rule)] += clock() - start
+                calls[id(rule)] += 1
+
+    for rule in rules:
+        start = clock()
+        rule.finish()
+        elapsed[id(rule)] += clock() - start
+
+    patterns: Dict[str, List[Dict[str, Any]]] = {family: [] for family in selected}
+    stats = []
+    for rule in rules:
+        patterns[rule.family].extend(rule.matches)
+        stats.append({
+            "rule": rule.name,
+            "family": rule.family,
+            "matches": len(rule.matches),
+            "calls": calls[id(rule)],
+            "time_ms": round(elapsed[id(rule)] * 1000, 3)
+        })
+
+    return patterns, stats
@@ -1,350 +1,413 @@
 """
 Circuit pattern recognition functions for KiCad schematics.
+
+Each kind of circuit is recognized by a rule registered with the pattern
+engine; identify_all_patterns runs them all in one traversal of the design.
+The identify_* functions run the rules of a single family.
 """
 
+import math
 import re
-from typing import Dict, List, Any
-from kicad_mcp.utils.component_utils import extract_voltage_from_regulator, extract_frequency_from_value
+from typing import Dict, List, Any, Optional, Pattern, Sequence, Tuple
 
-def identify_power_supplies(components: Dict[str, Any], nets: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Identify power supply circuits in the schematic.
+import numpy as np
+
+from kicad_mcp.utils.component_classifier import ComponentTags, classify_components
+from kicad_mcp.utils.component_utils import extract_voltage_from_regulator, extract_frequency_from_value, parse_values
+from kicad_mcp.utils.netlist_index import NetlistIndex, get_netlist_index
+from kicad_mcp.utils.netlist_parser import NETLIST_VERSION
+from kicad_mcp.utils.parse_cache import get_parse_cache
+from kicad_mcp.utils.pattern_engine import (PatternRule, normalize_families, pattern_families, pattern_rule,
+                                            run_pattern_rules)
+
+# Version of the pattern recognizers; bump when detection changes so
+# persisted pattern results from older versions are not reused
+PATTERN_VERSION = 4
+
+# Pin names of switching controllers: switch node, supply input, output and
+# output sense (feedback)
+_SWITCH_PIN_RE = re.compile(r"(?:SW|LX|PH|PHASE)_?(?:\d|[AB])?$", re.IGNORECASE)
+_VIN_PIN_RE = re.compile(r"(?:P?VIN\w*|IN|P?VCC|P?VDD)$", re.IGNORECASE)
+_VOUT_PIN_RE = re.compile(r"(?:VOUT\w*|OUT|VO)$", re.IGNORECASE)
+_SENSE_PIN_RE = re.compile(r"(?:VOUT\w*|OUT|VO|VOS|FB|VSENSE)$", re.IGNORECASE)
+
+
+# Power supply circuits
+
+@pattern_rule
+class LinearRegulatorRule(PatternRule):
+    """Voltage regulators (Linear), by part value or lib_id."""
     
-    Args:
-        components: Dictionary of components from netlist
-        nets: Dictionary of nets from netlist
+    family = "power_supply_circuits"
+    name = "linear_regulator"
+    roles = ("linear_regulator",)
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        component_value = component.get('value', '').upper()
         
-    Returns:
-        List of identified power supply circuits
+        for reg_type in tags.get("linear_regulator"):
+            # Found a regulator, look for associated components
+            self.matches.append({
+                "type": "linear_regulator",
+                "subtype": reg_type,
+                "main_component": ref,
+                "value": component_value,
+                "input_voltage": "unknown",  # Would need more analysis to determine
+                "output_voltage": extract_voltage_from_regulator(component_value),
+                "associated_components": []  # Would need connection analysis to find these
+            })
+
+
+@pattern_rule
+class SwitchingRegulatorRule(PatternRule):
+    """Switching regulators, found from their topology.
+
+    A converter is an inductor sharing a switch node with a controller IC:
+    an IC whose pin on that net is named like a switch pin (SW, LX, PH), or
+    a known switching controller part whose pins are unnamed. Where the
+    other side of the inductor goes tells buck from boost, and the input
+    and output capacitors to ground are reported. One entry is emitted per
+    controller and switch node.
     """
-    power_supplies = []
-    
-    # Look for voltage regulators (Linear)
-    regulator_patterns = {
-        "78xx": r"78\d\d|LM78\d\d|MC78\d\d",  # 7805, 7812, etc.
-        "79xx": r"79\d\d|LM79\d\d|MC79\d\d",  # 7905, 7912, etc.
-        "LDO": r"LM\d{3}|LD\d{3}|AMS\d{4}|LT\d{4}|TLV\d{3}|AP\d{4}|MIC\d{4}|NCP\d{3}|LP\d{4}|L\d{2}|TPS\d{5}"
-    }
     
-    for ref, component in components.items():
-        # Check for voltage regulators by part value or lib_id
-        component_value = component.get('value', '').upper()
-        component_lib = component.get('lib_id', '').upper()
+    family = "power_supply_circuits"
+    name = "switching_regulator"
+    prefixes = ("L", "U", "IC")
+    
+    def __init__(self, context):
+        super().__init__(context)
+        self.inductors: List[str] = []
+        # Controller candidate -> net -> names of its pins on that net
+        self.controller_pins: Dict[str, Dict[str, List[str]]] = {}
+        self.tagged: Dict[str, bool] = {}
+        self.net_controllers: Dict[str, List[str]] = {}
+        self.net_caps: Dict[str, List[str]] = {}
+    
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        # Inductors are the key component in switching supplies
+        if ref.startswith('L'):
+            self.inductors.append(ref)
+            return
         
-        for reg_type, pattern in regulator_patterns.items():
-            if re.search(pattern, component_value, re.IGNORECASE) or re.search(pattern, component_lib, re.IGNORECASE):
-                # Found a regulator, look for associated components
-                power_supplies.append({
-                    "type": "linear_regulator",
-                    "subtype": reg_type,
-                    "main_component": ref,
-                    "value": component_value,
-                    "input_voltage": "unknown",  # Would need more analysis to determine
-                    "output_voltage": extract_voltage_from_regulator(component_value),
-                    "associated_components": []  # Would need connection analysis to find these
-                })
-    
-    # Look for switching regulators
-    switching_patterns = {
-        "buck": r"LM\d{4}|TPS\d{4}|MP\d{4}|RT\d{4}|LT\d{4}|MC\d{4}|NCP\d{4}|TL\d{4}|LTC\d{4}",
-        "boost": r"MC\d{4}|LT\d{4}|TPS\d{4}|MAX\d{4}|NCP\d{4}|LTC\d{4}",
-        "buck_boost": r"LTC\d{4}|LM\d{4}|TPS\d{4}|MAX\d{4}"
-    }
-    
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        component_lib = component.get('lib_id', '').upper()
+        index = self.context.index
+        pins_by_net: Dict[str, List[str]] = {}
+        for pin in component.get('pins') or ():
+            net = index.net_of(ref, pin.get('num'))
+            if net is not None:
+                pins_by_net.setdefault(net, []).append((pin.get('name') or '').upper())
         
-        # Check for inductor (key component in switching supplies)
-        if ref.startswith('L') or 'Inductor' in component_lib:
-            # Look for nearby ICs that might be switching controllers
-            for ic_ref, ic_component in components.items():
-                if ic_ref.startswith('U') or ic_ref.startswith('IC'):
-                    ic_value = ic_component.get('value', '').upper()
-                    ic_lib = ic_component.get('lib_id', '').upper()
-                    
-                    for converter_type, pattern in switching_patterns.items():
-                        if re.search(pattern, ic_value, re.IGNORECASE) or re.search(pattern, ic_lib, re.IGNORECASE):
-                            power_supplies.append({
-                                "type": "switching_regulator",
-                                "subtype": converter_type,
-                                "main_component": ic_ref,
-                                "inductor": ref,
-                                "value": ic_value
-                            })
-    
-    return power_supplies
-
-
-def identify_amplifiers(components: Dict[str, Any], nets: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Identify amplifier circuits in the schematic.
-    
-    Args:
-        components: Dictionary of components from netlist
-        nets: Dictionary of nets from netlist
+        tagged = bool(tags.get("switching_regulator"))
+        has_switch_pin = any(_SWITCH_PIN_RE.match(name) for names in pins_by_net.values() for name in names)
+        if tagged or has_switch_pin:
+            self.controller_pins[ref] = pins_by_net
+            self.tagged[ref] = tagged
+    
+    def _controllers_on(self, net: str) -> List[str]:
+        """Controller candidates connected to a net, computed once per net."""
+        controllers = self.net_controllers.get(net)
+        if controllers is None:
+            controllers = self.net_controllers[net] = [
+                ref for ref in self.context.index.components_on(net) if ref in self.controller_pins
+            ]
+        return controllers
+    
+    def _caps_to_ground(self, net: Optional[str]) -> List[str]:
+        """Capacitors between a net and ground, computed once per net."""
+        if net is None:
+            return []
+        caps = self.net_caps.get(net)
+        if caps is None:
+            index = self.context.index
+            caps = self.net_caps[net] = [
+                ref for ref in index.components_on(net)
+                if ref.startswith('C') and any("ground" in index.roles_of(c_net) for c_net in index.nets_of(ref))
+            ]
+        return caps
+    
+    def _pin_net(self, controller: str, pattern: Pattern) -> Optional[str]:
+        """First net of a controller with a pin whose name matches a pattern."""
+        for net, names in self.controller_pins[controller].items():
+            if any(pattern.match(name) for name in names):
+                return net
+        return None
+    
+    def _diode_output(self, switch_node: str) -> Optional[str]:
+        """Net on the far side of a diode from the switch node (boost rectifier)."""
+        index = self.context.index
+        for ref in index.components_on(switch_node):
+            if ref.startswith('D'):
+                for net in index.nets_of(ref):
+                    if net != switch_node and "ground" not in index.roles_of(net):
+                        return net
+        return None
+    
+    def _switch_nets(self, controller: str, shared: List[str]) -> List[str]:
+        """Nets shared by an inductor and a controller that are the controller's switch nodes."""
+        pins_by_net = self.controller_pins[controller]
+        switch_nets = [net for net in shared if any(_SWITCH_PIN_RE.match(name) for name in pins_by_net.get(net, ()))]
+        if switch_nets:
+            return switch_nets
         
-    Returns:
-        List of identified amplifier circuits
-    """
-    amplifiers = []
-    
-    # Look for op-amps
-    opamp_patterns = [
-        r"LM\d{3}|TL\d{3}|NE\d{3}|LF\d{3}|OP\d{2}|MCP\d{3}|AD\d{3}|LT\d{4}|OPA\d{3}",
-        r"Opamp|Op-Amp|OpAmp|Operational Amplifier"
-    ]
-    
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        component_lib = component.get('lib_id', '').upper()
+        # A known controller whose pins on the shared nets are unnamed
+        if self.tagged[controller] and all(name in ('', '~') for net in shared for name in pins_by_net.get(net, ())):
+            return shared
+        return []
+    
+    def finish(self) -> None:
+        index = self.context.index
+        components = self.context.components
+        seen = set()
         
-        # Check for op-amps
-        for pattern in opamp_patterns:
-            if re.search(pattern, component_value, re.IGNORECASE) or re.search(pattern, component_lib, re.IGNORECASE):
-                # Common op-amps
-                if re.search(r"LM358|LM324|TL072|TL082|NE5532|LF353|MCP6002|AD8620|OPA2134", component_value, re.IGNORECASE):
-                    amplifiers.append({
-                        "type": "operational_amplifier",
-                        "subtype": "general_purpose",
-                        "component": ref,
-                        "value": component_value
-                    })
-                # Audio op-amps
-                elif re.search(r"NE5534|OPA134|OPA1612|OPA1652|LM4562|LME49720|LME49860|TL071|TL072", component_value, re.IGNORECASE):
-                    amplifiers.append({
-                        "type": "operational_amplifier",
-                        "subtype": "audio",
-                        "component": ref,
-                        "value": component_value
-                    })
-                # Instrumentation amplifiers
-                elif re.search(r"INA\d{3}|AD620|AD8221|AD8429|LT1167", component_value, re.IGNORECASE):
-                    amplifiers.append({
-                        "type": "operational_amplifier",
-                        "subtype": "instrumentation",
-                        "component": ref,
-                        "value": component_value
-                    })
+        for inductor in self.inductors:
+            inductor_nets = [net for net in index.nets_of(inductor) if "ground" not in index.roles_of(net)]
+            
+            # Controllers sharing a net with the inductor, with the shared nets
+            shared_nets: Dict[str, List[str]] = {}
+            for net in inductor_nets:
+                for controller in self._controllers_on(net):
+                    shared_nets.setdefault(controller, []).append(net)
+            
+            for controller, shared in shared_nets.items():
+                switch_nets = self._switch_nets(controller, shared)
+                if not switch_nets or (controller, switch_nets[0]) in seen:
+                    continue
+                switch_node = switch_nets[0]
+                seen.add((controller, switch_node))
+                
+                other = next((net for net in index.nets_of(inductor) if net != switch_node), None)
+                other_pins = self.controller_pins[controller].get(other, [])
+                vin_net = self._pin_net(controller, _VIN_PIN_RE)
+                vout_net = self._pin_net(controller, _VOUT_PIN_RE)
+                
+                if len(switch_nets) > 1:
+                    # Inductor between two switch nodes (four-switch buck-boost)
+                    subtype, input_net, output_net = "buck_boost", vin_net, vout_net
+                elif other is None:
+                    subtype, input_net, output_net = "unknown", vin_net, vout_net
+                elif "ground" in index.roles_of(other):
+                    # Inductor from the switch node to ground
+                    subtype, input_net, output_net = "inverting", vin_net, vout_net or self._diode_output(switch_node)
+                elif any(_VIN_PIN_RE.match(name) for name in other_pins) or (other_pins and not any(
+                        _SENSE_PIN_RE.match(name) for name in other_pins)):
+                    # Inductor fed from the controller's supply
+                    subtype, input_net, output_net = "boost", other, vout_net or self._diode_output(switch_node)
                 else:
-                    amplifiers.append({
-                        "type": "operational_amplifier",
-                        "subtype": "unknown",
-                        "component": ref,
-                        "value": component_value
-                    })
+                    # Inductor from the switch node to the load
+                    subtype, input_net, output_net = "buck", vin_net, other
+                
+                self.matches.append({
+                    "type": "switching_regulator",
+                    "subtype": subtype,
+                    "main_component": controller,
+                    "inductor": inductor,
+                    "value": components[controller].get('value', '').upper(),
+                    "switch_node": switch_node,
+                    "input_net": input_net,
+                    "output_net": output_net,
+                    "input_capacitors": self._caps_to_ground(input_net),
+                    "output_capacitors": self._caps_to_ground(output_net)
+                })
+
+
+# Amplifier circuits
+
+@pattern_rule
+class OpAmpRule(PatternRule):
+    """Op-amps; one entry per matching op-amp pattern."""
     
-    # Look for transistor amplifiers
-    transistor_refs = [ref for ref in components.keys() if ref.startswith('Q')]
+    family = "amplifier_circuits"
+    name = "operational_amplifier"
+    roles = ("opamp",)
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        # General purpose, audio or instrumentation op-amp, by part value
+        grade = tags.value.get("opamp_grade")
+        subtype = grade[0] if grade else "unknown"
+        component_value = component.get('value', '').upper()
+        
+        for _ in tags.get("opamp"):
+            self.matches.append({
+                "type": "operational_amplifier",
+                "subtype": subtype,
+                "component": ref,
+                "value": component_value
+            })
+
+
+@pattern_rule
+class TransistorAmplifierRule(PatternRule):
+    """BJTs and FETs with resistors on their nets (biasing network)."""
     
-    for ref in transistor_refs:
-        component = components[ref]
+    family = "amplifier_circuits"
+    name = "transistor_amplifier"
+    prefixes = ("Q",)
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
         component_lib = component.get('lib_id', '').upper()
         
         # Check if it's a BJT or FET
         if 'BJT' in component_lib or 'NPN' in component_lib or 'PNP' in component_lib:
-            # Look for resistors connected to transistor (biasing network)
-            has_biasing = False
-            for net_name, pins in nets.items():
-                # Check if this net connects to our transistor
-                if any(pin.get('component') == ref for pin in pins):
-                    # Check if the net also connects to resistors
-                    if any(pin.get('component', '').startswith('R') for pin in pins):
-                        has_biasing = True
-                        break
-            
-            if has_biasing:
-                amplifiers.append({
-                    "type": "transistor_amplifier",
-                    "subtype": "BJT",
-                    "component": ref,
-                    "value": component.get('value', '')
-                })
-        
+            subtype = "BJT"
         elif 'FET' in component_lib or 'MOSFET' in component_lib or 'JFET' in component_lib:
-            # Similar check for FET amplifiers
-            has_biasing = False
-            for net_name, pins in nets.items():
-                if any(pin.get('component') == ref for pin in pins):
-                    if any(pin.get('component', '').startswith('R') for pin in pins):
-                        has_biasing = True
-                        break
-            
-            if has_biasing:
-                amplifiers.append({
-                    "type": "transistor_amplifier",
-                    "subtype": "FET",
-                    "component": ref,
-                    "value": component.get('value', '')
-                })
-    
-    # Look for audio amplifier ICs
-    audio_amp_patterns = [
-        r"LM386|LM383|LM380|LM1875|LM3886|TDA\d{4}|TPA\d{4}|SSM\d{4}|PAM\d{4}|TAS\d{4}"
-    ]
-    
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        component_lib = component.get('lib_id', '').upper()
+            subtype = "FET"
+        else:
+            return
         
-        for pattern in audio_amp_patterns:
-            if re.search(pattern, component_value, re.IGNORECASE) or re.search(pattern, component_lib, re.IGNORECASE):
-                amplifiers.append({
-                    "type": "audio_amplifier_ic",
-                    "component": ref,
-                    "value": component_value
-                })
+        index = self.context.index
+        has_biasing = any(index.net_has_prefix(net_name, 'R') for net_name in index.nets_of(ref))
+        
+        if has_biasing:
+            self.matches.append({
+                "type": "transistor_amplifier",
+                "subtype": subtype,
+                "component": ref,
+                "value": component.get('value', '')
+            })
+
+
+@pattern_rule
+class AudioAmplifierRule(PatternRule):
+    """Audio amplifier ICs."""
     
-    return amplifiers
+    family = "amplifier_circuits"
+    name = "audio_amplifier_ic"
+    roles = ("audio_amplifier",)
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        self.matches.append({
+            "type": "audio_amplifier_ic",
+            "component": ref,
+            "value": component.get('value', '').upper()
+        })
 
 
-def identify_filters(components: Dict[str, Any], nets: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Identify filter circuits in the schematic.
+# Filter circuits
+
+@pattern_rule
+class RCLowPassRule(PatternRule):
+    """RC low-pass filters: a resistor sharing a net with a capacitor to ground."""
     
-    Args:
-        components: Dictionary of components from netlist
-        nets: Dictionary of nets from netlist
+    family = "filter_circuits"
+    name = "rc_low_pass"
+    prefixes = ("R",)
+
+    def __init__(self, context):
+        super().__init__(context)
+        # Capacitors per net, computed once per net rather than per resistor
+        self.net_caps: Dict[str, List[str]] = {}
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        index = self.context.index
+        nets = self.context.nets
         
-    Returns:
-        List of identified filter circuits
-    """
-    filters = []
-    
-    # Look for RC low-pass filters
-    # These typically have a resistor followed by a capacitor to ground
-    resistor_refs = [ref for ref in components.keys() if ref.startswith('R')]
-    capacitor_refs = [ref for ref in components.keys() if ref.startswith('C')]
-    
-    for r_ref in resistor_refs:
-        r_nets = []
-        # Find which nets this resistor is connected to
-        for net_name, pins in nets.items():
-            if any(pin.get('component') == r_ref for pin in pins):
-                r_nets.append(net_name)
-        
-        # For each net, check if there's a capacitor connected to it
-        for net_name in r_nets:
+        for net_name in index.nets_of(ref):
             # Find capacitors connected to this net
-            connected_caps = []
-            for pin in nets.get(net_name, []):
-                comp = pin.get('component')
-                if comp and comp.startswith('C'):
-                    connected_caps.append(comp)
+            connected_caps = self.net_caps.get(net_name)
+            if connected_caps is None:
+                connected_caps = self.net_caps[net_name] = [
+                    pin.get('component') for pin in nets.get(net_name, [])
+                    if (pin.get('component') or '').startswith('C')
+                ]
             
-            if connected_caps:
-                # Check if the other side of the capacitor goes to ground
-                for c_ref in connected_caps:
-                    c_is_to_ground = False
-                    for gnd_name in ['GND', 'AGND', 'DGND', 'VSS']:
-                        for pin in nets.get(gnd_name, []):
-                            if pin.get('component') == c_ref:
-                                c_is_to_ground = True
-                                break
-                        if c_is_to_ground:
-                            break
-                    
-                    if c_is_to_ground:
-                        filters.append({
-                            "type": "passive_filter",
-                            "subtype": "rc_low_pass",
-                            "components": [r_ref, c_ref]
-                        })
-    
-    # Look for active filters (op-amp with feedback RC components)
-    opamp_refs = []
-    
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        component_lib = component.get('lib_id', '').upper()
+            # Check if the other side of the capacitor goes to ground
+            for c_ref in connected_caps:
+                c_is_to_ground = any("ground" in index.roles_of(c_net) for c_net in index.nets_of(c_ref))
+                
+                if c_is_to_ground:
+                    self.matches.append({
+                        "type": "passive_filter",
+                        "subtype": "rc_low_pass",
+                        "components": [ref, c_ref]
+                    })
+
+    def finish(self) -> None:
+        if not self.matches:
+            return
+        
+        # Estimate the cutoff frequencies, 1 / (2 pi R C), of all filters at once
+        components = self.context.components
+        resistances = parse_values((components.get(m["components"][0]) or {}).get('value', '') for m in self.matches)
+        capacitances = parse_values((components.get(m["components"][1]) or {}).get('value', '') for m in self.matches)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cutoffs = 1.0 / (2 * np.pi * resistances * capacitances)
         
-        if re.search(r"LM\d{3}|TL\d{3}|NE\d{3}|LF\d{3}|OP\d{2}|MCP\d{3}|AD\d{3}|LT\d{4}|OPA\d{3}", 
-                     component_value, re.IGNORECASE) or "OP_AMP" in component_lib:
-            opamp_refs.append(ref)
+        for match, cutoff in zip(self.matches, cutoffs.tolist()):
+            match["cutoff_frequency"] = float(f"{cutoff:.4g}") if math.isfinite(cutoff) and cutoff > 0 else None
+
+
+@pattern_rule
+class ActiveFilterRule(PatternRule):
+    """Active filters: op-amps whose nets also connect resistors and capacitors (feedback RC)."""
     
-    for op_ref in opamp_refs:
-        # Find op-amp output
+    family = "filter_circuits"
+    name = "active_filter"
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        component_lib = component.get('lib_id', '').upper()
+        if "part_number" not in tags.value.get("opamp", ()) and "OP_AMP" not in component_lib:
+            return
+        
         # In a full implementation, we'd know which pin is the output
         # For simplicity, we'll look for feedback components
-        has_feedback_r = False
-        has_feedback_c = False
-        
-        for net_name, pins in nets.items():
-            # If this net connects to our op-amp
-            if any(pin.get('component') == op_ref for pin in pins):
-                # Check if it also connects to resistors and capacitors
-                connects_to_r = any(pin.get('component', '').startswith('R') for pin in pins)
-                connects_to_c = any(pin.get('component', '').startswith('C') for pin in pins)
-                
-                if connects_to_r:
-                    has_feedback_r = True
-                if connects_to_c:
-                    has_feedback_c = True
+        index = self.context.index
+        op_nets = index.nets_of(ref)
+        has_feedback_r = any(index.net_has_prefix(net_name, 'R') for net_name in op_nets)
+        has_feedback_c = any(index.net_has_prefix(net_name, 'C') for net_name in op_nets)
         
         if has_feedback_r and has_feedback_c:
-            filters.append({
+            self.matches.append({
                 "type": "active_filter",
-                "main_component": op_ref,
-                "value": components[op_ref].get('value', '')
+                "main_component": ref,
+                "value": component.get('value', '')
             })
+
+
+@pattern_rule
+class CrystalCeramicFilterRule(PatternRule):
+    """Crystal filters and ceramic filters."""
     
-    # Look for crystal filters or ceramic filters
-    for ref, component in components.items():
+    family = "filter_circuits"
+    name = "crystal_ceramic_filter"
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
         component_value = component.get('value', '').upper()
         component_lib = component.get('lib_id', '').upper()
         
         if ref.startswith('Y') or ref.startswith('X') or "CRYSTAL" in component_lib or "XTAL" in component_lib:
-            filters.append({
+            self.matches.append({
                 "type": "crystal_filter",
                 "component": ref,
                 "value": component_value
             })
         
         if "FILTER" in component_lib or "MURATA" in component_lib or "CERAMIC_FILTER" in component_lib:
-            filters.append({
+            self.matches.append({
                 "type": "ceramic_filter",
                 "component": ref,
                 "value": component_value
             })
-    
-    return filters
 
 
-def identify_oscillators(components: Dict[str, Any], nets: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Identify oscillator circuits in the schematic.
-    
-    Args:
-        components: Dictionary of components from netlist
-        nets: Dictionary of nets from netlist
-        
-    Returns:
-        List of identified oscillator circuits
-    """
-    oscillators = []
+# Oscillator circuits
+
+@pattern_rule
+class OscillatorRule(PatternRule):
+    """Crystal oscillators, oscillator ICs and RC oscillators (555 timer, etc)."""
     
-    # Look for crystal oscillators
-    for ref, component in components.items():
+    family = "oscillator_circuits"
+    name = "oscillator"
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
         component_value = component.get('value', '').upper()
         component_lib = component.get('lib_id', '').upper()
         
         # Crystals
         if ref.startswith('Y') or ref.startswith('X') or "CRYSTAL" in component_lib or "XTAL" in component_lib:
-            # Check if the crystal has load capacitors
-            has_load_caps = False
-            crystal_nets = []
-            
-            for net_name, pins in nets.items():
-                if any(pin.get('component') == ref for pin in pins):
-                    crystal_nets.append(net_name)
-            
-            # Look for capacitors connected to the crystal nets
-            for net_name in crystal_nets:
-                for pin in nets.get(net_name, []):
-                    comp = pin.get('component')
-                    if comp and comp.startswith('C'):
-                        has_load_caps = True
-                        break
-                if has_load_caps:
-                    break
+            # Check if the crystal has load capacitors on its nets
+            index = self.context.index
+            has_load_caps = any(index.net_has_prefix(net_name, 'C') for net_name in index.nets_of(ref))
             
-            oscillators.append({
+            self.matches.append({
                 "type": "crystal_oscillator",
                 "component": ref,
                 "value": component_value,
@@ -353,8 +416,8 @@ def identify_oscillators(components: Dict[str, Any], nets: Dict[str, Any]) -> Li
             })
         
         # Oscillator ICs
-        if "OSC" in component_lib or "OSCILLATOR" in component_lib or re.search(r"OSC|OSCILLATOR", component_value, re.IGNORECASE):
-            oscillators.append({
+        if "OSC" in component_lib or "OSCILLATOR" in component_lib or "oscillator" in tags.value:
+            self.matches.append({
                 "type": "oscillator_ic",
                 "component": ref,
                 "value": component_value,
@@ -362,498 +425,594 @@ def identify_oscillators(components: Dict[str, Any], nets: Dict[str, Any]) -> Li
             })
         
         # RC oscillators (555 timer, etc)
-        if re.search(r"NE555|LM555|ICM7555|TLC555", component_value, re.IGNORECASE) or "555" in component_lib:
-            oscillators.append({
+        if "timer" in tags.value or "555" in component_lib:
+            self.matches.append({
                 "type": "rc_oscillator",
                 "subtype": "555_timer",
                 "component": ref,
                 "value": component_value
             })
-    
-    return oscillators
 
 
-def identify_digital_interfaces(components: Dict[str, Any], nets: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Identify digital interface circuits in the schematic.
+# Digital interface circuits
+
+class SignalInterfaceRule(PatternRule):
+    """A digital interface recognized by its signal names, and optionally by interface ICs.
     
-    Args:
-        components: Dictionary of components from netlist
-        nets: Dictionary of nets from netlist
-        
-    Returns:
-        List of identified digital interface circuits
+    Subclasses set ``interface_type``, ``bus`` (a bus role of the net
+    classifier) and, for interfaces with dedicated ICs, ``interface_ic`` (a
+    tag of the ``interface_ic`` component role).
     """
-    interfaces = []
     
-    # I2C interface detection
-    i2c_signals = {"SCL", "SDA", "I2C_SCL", "I2C_SDA"}
-    has_i2c = False
+    family = "digital_interface_circuits"
+    roles = ("interface_ic",)
+    interface_type = ""
+    bus = ""
+    interface_ic: Optional[str] = None
+
+    def __init__(self, context):
+        super().__init__(context)
+        self.has_ic = False
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        if self.interface_ic in tags.value.get("interface_ic", ()):
+            self.has_ic = True
+
+    def finish(self) -> None:
+        signals_found = [name for name, roles in self.context.index.net_roles.items() if self.bus in roles]
+        if signals_found or self.has_ic:
+            self.matches.append({
+                "type": self.interface_type,
+                "signals_found": signals_found
+            })
+
+
+@pattern_rule
+class I2CInterfaceRule(SignalInterfaceRule):
+    name = interface_type = "i2c_interface"
+    bus = "i2c"
+
+
+@pattern_rule
+class SPIInterfaceRule(SignalInterfaceRule):
+    name = interface_type = "spi_interface"
+    bus = "spi"
+
+
+@pattern_rule
+class UARTInterfaceRule(SignalInterfaceRule):
+    name = interface_type = "uart_interface"
+    bus = "uart"
+
+
+@pattern_rule
+class USBInterfaceRule(SignalInterfaceRule):
+    name = interface_type = "usb_interface"
+    bus = "usb"
+    interface_ic = "usb"
+
+
+@pattern_rule
+class EthernetInterfaceRule(SignalInterfaceRule):
+    name = interface_type = "ethernet_interface"
+    bus = "ethernet"
+    interface_ic = "ethernet"
+
+
+# Microcontroller circuits
+
+@pattern_rule
+class MicrocontrollerRule(PatternRule):
+    """Microcontrollers; a component is identified as the first matching family only."""
     
-    for net_name in nets.keys():
-        if any(signal in net_name.upper() for signal in i2c_signals):
-            has_i2c = True
-            break
+    family = "microcontroller_circuits"
+    name = "microcontroller"
+    roles = ("mcu",)
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        family = tags.first("mcu")
+        model = tags.first("mcu_model")
+        component_value = component.get('value', '').upper()
+        
+        # Identify specific models
+        identified = False
+        
+        # ATmega328P (Arduino Uno/Nano)
+        if model == "ATmega328P":
+            self.matches.append({
+                "type": "microcontroller",
+                "family": "AVR",
+                "model": "ATmega328P",
+                "component": ref,
+                "common_usage": "Arduino Uno/Nano compatible"
+            })
+            identified = True
+        
+        # ATmega32U4 (Arduino Leonardo/Micro)
+        elif model == "ATmega32U4":
+            self.matches.append({
+                "type": "microcontroller",
+                "family": "AVR",
+                "model": "ATmega32U4",
+                "component": ref,
+                "common_usage": "Arduino Leonardo/Micro compatible"
+            })
+            identified = True
+        
+        # ESP32
+        elif model == "ESP32":
+            self.matches.append({
+                "type": "microcontroller",
+                "family": "ESP",
+                "model": "ESP32",
+                "component": ref,
+                "features": "Wi-Fi & Bluetooth"
+            })
+            identified = True
+        
+        # ESP8266
+        elif model == "ESP8266":
+            self.matches.append({
+                "type": "microcontroller",
+                "family": "ESP",
+                "model": "ESP8266",
+                "component": ref,
+                "features": "Wi-Fi"
+            })
+            identified = True
+        
+        # STM32 series
+        elif model == "STM32":
+            self.matches.append({
+                "type": "microcontroller",
+                "family": "STM32",
+                "model": tags.part_number("mcu_model", "STM32"),
+                "component": ref,
+                "features": "ARM Cortex-M"
+            })
+            identified = True
+        
+        # Raspberry Pi Pico (RP2040)
+        elif model == "RP2040":
+            self.matches.append({
+                "type": "microcontroller",
+                "family": "RP2040",
+                "model": "RP2040",
+                "component": ref,
+                "common_usage": "Raspberry Pi Pico"
+            })
+            identified = True
+        
+        # PIC microcontrollers
+        elif model == "PIC":
+            self.matches.append({
+                "type": "microcontroller",
+                "family": "PIC",
+                "model": tags.part_number("mcu_model", "PIC"),
+                "component": ref
+            })
+            identified = True
+        
+        # MSP430 series
+        elif model == "MSP430":
+            self.matches.append({
+                "type": "microcontroller",
+                "family": "MSP430",
+                "model": tags.part_number("mcu_model", "MSP430"),
+                "component": ref,
+                "features": "Ultra-low power"
+            })
+            identified = True
+        
+        # If not identified specifically but matches a family
+        if not identified:
+            self.matches.append({
+                "type": "microcontroller",
+                "family": family,
+                "component": ref,
+                "value": component_value
+            })
+
+
+@pattern_rule
+class DevelopmentBoardRule(PatternRule):
+    """Microcontroller development boards."""
     
-    if has_i2c:
-        interfaces.append({
-            "type": "i2c_interface",
-            "signals_found": [net for net in nets.keys() if any(signal in net.upper() for signal in i2c_signals)]
+    family = "microcontroller_circuits"
+    name = "development_board"
+    roles = ("dev_board",)
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        self.matches.append({
+            "type": "development_board",
+            "board_type": tags.first("dev_board"),
+            "component": ref,
+            "value": component.get('value', '').upper()
         })
+
+
+# Sensor interface circuits
+
+@pattern_rule
+class SensorICRule(PatternRule):
+    """Sensor ICs; a component is identified as the first matching sensor type only."""
     
-    # SPI interface detection
-    spi_signals = {"MOSI", "MISO", "SCK", "SS", "SPI_MOSI", "SPI_MISO", "SPI_SCK", "SPI_CS"}
-    has_spi = False
+    family = "sensor_interface_circuits"
+    name = "sensor_ic"
+    roles = ("sensor",)
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        sensor_type = tags.first("sensor")
+        models = tags.get("sensor_model")
+        component_value = component.get('value', '').upper()
+        
+        # Identify specific sensors
+        
+        # Temperature sensors
+        if sensor_type == "temperature":
+            if "DS18B20" in models:
+                self.matches.append({
+                    "type": "temperature_sensor",
+                    "model": "DS18B20",
+                    "component": ref,
+                    "interface": "1-Wire",
+                    "range": "-55°C to +125°C"
+                })
+            elif "BMx280" in models:
+                self.matches.append({
+                    "type": "multi_sensor",
+                    "model": component_value,
+                    "component": ref,
+                    "measures": ["temperature", "pressure", "humidity" if "BME" in component_value else "pressure"],
+                    "interface": "I2C/SPI"
+                })
+            elif "LM35" in models:
+                self.matches.append({
+                    "type": "temperature_sensor",
+                    "model": "LM35",
+                    "component": ref,
+                    "interface": "Analog",
+                    "range": "0°C to +100°C"
+                })
+            else:
+                self.matches.append({
+                    "type": "temperature_sensor",
+                    "model": component_value,
+                    "component": ref
+                })
+        
+        # Motion sensors (accelerometer, gyroscope, etc.)
+        elif sensor_type in ["accelerometer", "gyroscope"]:
+            if "MPU6050" in models:
+                self.matches.append({
+                    "type": "motion_sensor",
+                    "model": "MPU6050",
+                    "component": ref,
+                    "measures": ["accelerometer", "gyroscope"],
+                    "interface": "I2C"
+                })
+            elif "MPU9250" in models:
+                self.matches.append({
+                    "type": "motion_sensor",
+                    "model": "MPU9250",
+                    "component": ref,
+                    "measures": ["accelerometer", "gyroscope", "magnetometer"],
+                    "interface": "I2C/SPI"
+                })
+            elif "LSM6DS3" in models:
+                self.matches.append({
+                    "type": "motion_sensor",
+                    "model": "LSM6DS3",
+                    "component": ref,
+                    "measures": ["accelerometer", "gyroscope"],
+                    "interface": "I2C/SPI"
+                })
+            else:
+                self.matches.append({
+                    "type": "motion_sensor",
+                    "model": component_value,
+                    "component": ref,
+                    "measures": [sensor_type]
+                })
+        
+        # Light and proximity sensors
+        elif sensor_type in ["light", "proximity"]:
+            if "APDS9960" in models:
+                self.matches.append({
+                    "type": "optical_sensor",
+                    "model": "APDS9960",
+                    "component": ref,
+                    "measures": ["proximity", "light", "gesture", "color"],
+                    "interface": "I2C"
+                })
+            elif "VL53L0X" in models:
+                self.matches.append({
+                    "type": "optical_sensor",
+                    "model": "VL53L0X",
+                    "component": ref,
+                    "measures": ["time-of-flight distance"],
+                    "interface": "I2C",
+                    "range": "Up to 2m"
+                })
+            elif "BH1750" in models:
+                self.matches.append({
+                    "type": "optical_sensor",
+                    "model": "BH1750",
+                    "component": ref,
+                    "measures": ["ambient light"],
+                    "interface": "I2C"
+                })
+            else:
+                self.matches.append({
+                    "type": "optical_sensor",
+                    "model": component_value,
+                    "component": ref,
+                    "measures": [sensor_type]
+                })
+        
+        # ADCs (often used for sensor interfaces)
+        elif sensor_type == "ADC":
+            if "ADS1115" in models:
+                self.matches.append({
+                    "type": "analog_interface",
+                    "model": "ADS1115",
+                    "component": ref,
+                    "resolution": "16-bit",
+                    "channels": 4,
+                    "interface": "I2C"
+                })
+            elif "HX711" in models:
+                self.matches.append({
+                    "type": "analog_interface",
+                    "model": "HX711",
+                    "component": ref,
+                    "resolution": "24-bit",
+                    "common_usage": "Load cell/strain gauge",
+                    "interface": "Digital"
+                })
+            else:
+                self.matches.append({
+                    "type": "analog_interface",
+                    "model": component_value,
+                    "component": ref
+                })
+        
+        # Other types of sensors
+        else:
+            self.matches.append({
+                "type": f"{sensor_type}_sensor",
+                "model": component_value,
+                "component": ref
+            })
+
+
+class AnalogSensorRule(PatternRule):
+    """Analog sensors recognized by designator, which often have no specific IC.
     
-    for net_name in nets.keys():
-        if any(signal in net_name.upper() for signal in spi_signals):
-            has_spi = True
-            break
+    Subclasses set ``prefixes`` and the ``sensor_type`` and ``subtype`` reported.
+    """
     
-    if has_spi:
-        interfaces.append({
-            "type": "spi_interface",
-            "signals_found": [net for net in nets.keys() if any(signal in net.upper() for signal in spi_signals)]
+    family = "sensor_interface_circuits"
+    sensor_type = ""
+    subtype = ""
+
+    def component(self, ref: str, component: Any, tags: ComponentTags) -> None:
+        self.matches.append({
+            "type": self.sensor_type,
+            "subtype": self.subtype,
+            "component": ref,
+            "value": component.get('value', ''),
+            "interface": "Analog"
         })
+
+
+@pattern_rule
+class ThermistorRule(AnalogSensorRule):
+    name = "thermistor"
+    prefixes = ("RT", "TH")
+    sensor_type = "temperature_sensor"
+    subtype = "thermistor"
+
+
+@pattern_rule
+class PhotosensorRule(AnalogSensorRule):
+    # Photodiodes, photoresistors (LDRs)
+    name = "photosensor"
+    prefixes = ("PD", "LDR")
+    sensor_type = "optical_sensor"
+    subtype = "photosensor"
+
+
+@pattern_rule
+class PotentiometerRule(AnalogSensorRule):
+    # Often used for manual sensing/control
+    name = "potentiometer"
+    prefixes = ("RV", "POT")
+    sensor_type = "position_sensor"
+    subtype = "potentiometer"
+
+
+def _identify(family: str, components: Dict[str, Any], nets: Dict[str, Any],
+              index: Optional[NetlistIndex], tags: Optional[Dict[str, ComponentTags]]) -> List[Dict[str, Any]]:
+    """Run the rules of one family."""
+    patterns, _ = run_pattern_rules(components, nets, [family], index, tags)
+    return patterns[family]
+
+
+def identify_power_supplies(components: Dict[str, Any], nets: Dict[str, Any],
+                            tags: Optional[Dict[str, ComponentTags]] = None) -> List[Dict[str, Any]]:
+    """Identify power supply circuits in the schematic.
     
-    # UART interface detection
-    uart_signals = {"TX", "RX", "TXD", "RXD", "UART_TX", "UART_RX"}
-    has_uart = False
+    Args:
+        components: Dictionary of components from netlist
+        nets: Dictionary of nets from netlist
+        tags: Component classification (computed from components if not given)
     
-    for net_name in nets.keys():
-        if any(signal in net_name.upper() for signal in uart_signals):
-            has_uart = True
-            break
+    Returns:
+        List of identified power supply circuits
+    """
+    return _identify("power_supply_circuits", components, nets, None, tags)
+
+
+def identify_amplifiers(components: Dict[str, Any], nets: Dict[str, Any],
+                        index: Optional[NetlistIndex] = None,
+                        tags: Optional[Dict[str, ComponentTags]] = None) -> List[Dict[str, Any]]:
+    """Identify amplifier circuits in the schematic.
     
-    if has_uart:
-        interfaces.append({
-            "type": "uart_interface",
-            "signals_found": [net for net in nets.keys() if any(signal in net.upper() for signal in uart_signals)]
-        })
+    Args:
+        components: Dictionary of components from netlist
+        nets: Dictionary of nets from netlist
+        index: Index over the nets (built from nets if not given)
+        tags: Component classification (computed from components if not given)
     
-    # USB interface detection
-    usb_signals = {"USB_D+", "USB_D-", "USB_DP", "USB_DM", "D+", "D-", "DP", "DM", "VBUS"}
-    has_usb = False
+    Returns:
+        List of identified amplifier circuits
+    """
+    return _identify("amplifier_circuits", components, nets, index, tags)
+
+
+def identify_filters(components: Dict[str, Any], nets: Dict[str, Any],
+                     index: Optional[NetlistIndex] = None,
+                     tags: Optional[Dict[str, ComponentTags]] = None) -> List[Dict[str, Any]]:
+    """Identify filter circuits in the schematic.
     
-    for net_name in nets.keys():
-        if any(signal in net_name.upper() for signal in usb_signals):
-            has_usb = True
-            break
+    Args:
+        components: Dictionary of components from netlist
+        nets: Dictionary of nets from netlist
+        index: Index over the nets (built from nets if not given)
+        tags: Component classification (computed from components if not given)
     
-    # Also check for USB interface ICs
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        if re.search(r"FT232|CH340|CP210|MCP2200|TUSB|FT231|FT201", component_value, re.IGNORECASE):
-            has_usb = True
-            break
-    
-    if has_usb:
-        interfaces.append({
-            "type": "usb_interface",
-            "signals_found": [net for net in nets.keys() if any(signal in net.upper() for signal in usb_signals)]
-        })
+    Returns:
+        List of identified filter circuits
+    """
+    return _identify("filter_circuits", components, nets, index, tags)
+
+
+def identify_oscillators(components: Dict[str, Any], nets: Dict[str, Any],
+                         index: Optional[NetlistIndex] = None,
+                         tags: Optional[Dict[str, ComponentTags]] = None) -> List[Dict[str, Any]]:
+    """Identify oscillator circuits in the schematic.
     
-    # Ethernet interface detection
-    ethernet_signals = {"TX+", "TX-", "RX+", "RX-", "MDI", "MDIO", "ETH"}
-    has_ethernet = False
+    Args:
+        components: Dictionary of components from netlist
+        nets: Dictionary of nets from netlist
+        index: Index over the nets (built from nets if not given)
+        tags: Component classification (computed from components if not given)
     
-    for net_name in nets.keys():
-        if any(signal in net_name.upper() for signal in ethernet_signals):
-            has_ethernet = True
-            break
+    Returns:
+        List of identified oscillator circuits
+    """
+    return _identify("oscillator_circuits", components, nets, index, tags)
+
+
+def identify_digital_interfaces(components: Dict[str, Any], nets: Dict[str, Any],
+                                tags: Optional[Dict[str, ComponentTags]] = None) -> List[Dict[str, Any]]:
+    """Identify digital interface circuits in the schematic.
     
-    # Also check for Ethernet PHY ICs
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        if re.search(r"W5500|ENC28J60|LAN87|KSZ80|DP83|RTL8|AX88", component_value, re.IGNORECASE):
-            has_ethernet = True
-            break
-    
-    if has_ethernet:
-        interfaces.append({
-            "type": "ethernet_interface",
-            "signals_found": [net for net in nets.keys() if any(signal in net.upper() for signal in ethernet_signals)]
-        })
+    Args:
+        components: Dictionary of components from netlist
+        nets: Dictionary of nets from netlist
+        tags: Component classification (computed from components if not given)
     
-    return interfaces
+    Returns:
+        List of identified digital interface circuits
+    """
+    return _identify("digital_interface_circuits", components, nets, None, tags)
 
 
-def identify_sensor_interfaces(components: Dict[str, Any], nets: Dict[str, Any]) -> List[Dict[str, Any]]:
+def identify_sensor_interfaces(components: Dict[str, Any], nets: Dict[str, Any],
+                               tags: Optional[Dict[str, ComponentTags]] = None) -> List[Dict[str, Any]]:
     """Identify sensor interface circuits in the schematic.
     
     Args:
         components: Dictionary of components from netlist
         nets: Dictionary of nets from netlist
-        
+        tags: Component classification (computed from components if not given)
+    
     Returns:
         List of identified sensor interface circuits
     """
-    sensor_interfaces = []
-    
-    # Common sensor IC patterns
-    sensor_patterns = {
-        "temperature": r"LM35|DS18B20|DHT11|DHT22|BME280|BMP280|TMP\d+|MCP9808|MAX31855|MAX6675|SI7021|HTU21|SHT[0123]\d|PCT2075",
-        "humidity": r"DHT11|DHT22|BME280|SI7021|HTU21|SHT[0123]\d|HDC1080",
-        "pressure": r"BMP\d+|BME280|LPS\d+|MS5611|DPS310|MPL3115|SPL06",
-        "accelerometer": r"ADXL\d+|LIS3DH|MMA\d+|MPU\d+|LSM\d+|BMI\d+|BMA\d+|KX\d+",
-        "gyroscope": r"L3G\d+|MPU\d+|BMI\d+|LSM\d+|ICM\d+",
-        "magnetometer": r"HMC\d+|QMC\d+|LSM\d+|MMC\d+|RM\d+",
-        "proximity": r"APDS9960|VL53L0X|VL6180|GP2Y|VCNL4040|VCNL4010",
-        "light": r"BH1750|TSL\d+|MAX4\d+|VEML\d+|APDS9960|LTR329|OPT\d+",
-        "air_quality": r"CCS811|BME680|SGP\d+|SEN\d+|MQ\d+|MiCS",
-        "current": r"ACS\d+|INA\d+|MAX\d+|ZXCT\d+",
-        "voltage": r"INA\d+|MCP\d+|ADS\d+",
-        "ADC": r"ADS\d+|MCP33\d+|MCP32\d+|LTC\d+|NAU7802|HX711",
-        "GPS": r"NEO-[67]M|L80|MTK\d+|SIM\d+|SAM-M8Q|MAX-M8"
-    }
-    
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        component_lib = component.get('lib_id', '').upper()
-        
-        for sensor_type, pattern in sensor_patterns.items():
-            if re.search(pattern, component_value, re.IGNORECASE) or re.search(pattern, component_lib, re.IGNORECASE):
-                # Identify specific sensors
-                
-                # Temperature sensors
-                if sensor_type == "temperature":
-                    if re.search(r"DS18B20", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "temperature_sensor",
-                            "model": "DS18B20",
-                            "component": ref,
-                            "interface": "1-Wire",
-                            "range": "-55°C to +125°C"
-                        })
-                    elif re.search(r"BME280|BMP280", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "multi_sensor",
-                            "model": component_value,
-                            "component": ref,
-                            "measures": ["temperature", "pressure", "humidity" if "BME" in component_value else "pressure"],
-                            "interface": "I2C/SPI"
-                        })
-                    elif re.search(r"LM35", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "temperature_sensor",
-                            "model": "LM35",
-                            "component": ref,
-                            "interface": "Analog",
-                            "range": "0°C to +100°C"
-                        })
-                    else:
-                        sensor_interfaces.append({
-                            "type": "temperature_sensor",
-                            "model": component_value,
-                            "component": ref
-                        })
-                
-                # Motion sensors (accelerometer, gyroscope, etc.)
-                elif sensor_type in ["accelerometer", "gyroscope"]:
-                    if re.search(r"MPU6050", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "motion_sensor",
-                            "model": "MPU6050",
-                            "component": ref,
-                            "measures": ["accelerometer", "gyroscope"],
-                            "interface": "I2C"
-                        })
-                    elif re.search(r"MPU9250", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "motion_sensor",
-                            "model": "MPU9250",
-                            "component": ref,
-                            "measures": ["accelerometer", "gyroscope", "magnetometer"],
-                            "interface": "I2C/SPI"
-                        })
-                    elif re.search(r"LSM6DS3", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "motion_sensor",
-                            "model": "LSM6DS3",
-                            "component": ref,
-                            "measures": ["accelerometer", "gyroscope"],
-                            "interface": "I2C/SPI"
-                        })
-                    else:
-                        sensor_interfaces.append({
-                            "type": "motion_sensor",
-                            "model": component_value,
-                            "component": ref,
-                            "measures": [sensor_type]
-                        })
-                
-                # Light and proximity sensors
-                elif sensor_type in ["light", "proximity"]:
-                    if re.search(r"APDS9960", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "optical_sensor",
-                            "model": "APDS9960",
-                            "component": ref,
-                            "measures": ["proximity", "light", "gesture", "color"],
-                            "interface": "I2C"
-                        })
-                    elif re.search(r"VL53L0X", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "optical_sensor",
-                            "model": "VL53L0X",
-                            "component": ref,
-                            "measures": ["time-of-flight distance"],
-                            "interface": "I2C",
-                            "range": "Up to 2m"
-                        })
-                    elif re.search(r"BH1750", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "optical_sensor",
-                            "model": "BH1750",
-                            "component": ref,
-                            "measures": ["ambient light"],
-                            "interface": "I2C"
-                        })
-                    else:
-                        sensor_interfaces.append({
-                            "type": "optical_sensor",
-                            "model": component_value,
-                            "component": ref,
-                            "measures": [sensor_type]
-                        })
-                
-                # ADCs (often used for sensor interfaces)
-                elif sensor_type == "ADC":
-                    if re.search(r"ADS1115", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "analog_interface",
-                            "model": "ADS1115",
-                            "component": ref,
-                            "resolution": "16-bit",
-                            "channels": 4,
-                            "interface": "I2C"
-                        })
-                    elif re.search(r"HX711", component_value, re.IGNORECASE):
-                        sensor_interfaces.append({
-                            "type": "analog_interface",
-                            "model": "HX711",
-                            "component": ref,
-                            "resolution": "24-bit",
-                            "common_usage": "Load cell/strain gauge",
-                            "interface": "Digital"
-                        })
-                    else:
-                        sensor_interfaces.append({
-                            "type": "analog_interface",
-                            "model": component_value,
-                            "component": ref
-                        })
-                
-                # Other types of sensors
-                else:
-                    sensor_interfaces.append({
-                        "type": f"{sensor_type}_sensor",
-                        "model": component_value,
-                        "component": ref
-                    })
-                
-                # Once identified a component as a specific sensor, no need to check other types
-                break
-    
-    # Look for common analog sensors
-    # These often don't have specific ICs but have designators like "RT" for thermistors
-    thermistor_refs = [ref for ref in components.keys() if ref.startswith('RT') or ref.startswith('TH')]
-    for ref in thermistor_refs:
-        component = components[ref]
-        sensor_interfaces.append({
-            "type": "temperature_sensor",
-            "subtype": "thermistor",
-            "component": ref,
-            "value": component.get('value', ''),
-            "interface": "Analog"
-        })
-    
-    # Look for photodiodes, photoresistors (LDRs)
-    photosensor_refs = [ref for ref in components.keys() if ref.startswith('PD') or ref.startswith('LDR')]
-    for ref in photosensor_refs:
-        component = components[ref]
-        sensor_interfaces.append({
-            "type": "optical_sensor",
-            "subtype": "photosensor",
-            "component": ref,
-            "value": component.get('value', ''),
-            "interface": "Analog"
-        })
-    
-    # Look for potentiometers (often used for manual sensing/control)
-    pot_refs = [ref for ref in components.keys() if ref.startswith('RV') or ref.startswith('POT')]
-    for ref in pot_refs:
-        component = components[ref]
-        sensor_interfaces.append({
-            "type": "position_sensor",
-            "subtype": "potentiometer",
-            "component": ref,
-            "value": component.get('value', ''),
-            "interface": "Analog"
-        })
-    
-    return sensor_interfaces
+    return _identify("sensor_interface_circuits", components, nets, None, tags)
 
 
-def identify_microcontrollers(components: Dict[str, Any]) -> List[Dict[str, Any]]:
+def identify_microcontrollers(components: Dict[str, Any],
+                              tags: Optional[Dict[str, ComponentTags]] = None) -> List[Dict[str, Any]]:
     """Identify microcontroller circuits in the schematic.
     
     Args:
         components: Dictionary of components from netlist
-        
+        tags: Component classification (computed from components if not given)
+    
     Returns:
         List of identified microcontroller circuits
     """
-    microcontrollers = []
-    
-    # Common microcontroller families
-    mcu_patterns = {
-        "AVR": r"ATMEGA\d+|ATTINY\d+|AT90\w+",
-        "STM32": r"STM32\w+",
-        "PIC": r"PIC\d+\w+",
-        "ESP": r"ESP32|ESP8266",
-        "Arduino": r"ARDUINO",
-        "MSP430": r"MSP430\w+",
-        "RP2040": r"RP2040|PICO",
-        "NXP": r"LPC\d+|IMXRT\d+|MK\d+",
-        "SAM": r"SAMD\d+|SAM\w+",
-        "ARM Cortex": r"CORTEX|ARM",
-        "8051": r"8051|AT89"
-    }
-    
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        component_lib = component.get('lib_id', '').upper()
-        
-        for family, pattern in mcu_patterns.items():
-            if re.search(pattern, component_value, re.IGNORECASE) or re.search(pattern, component_lib, re.IGNORECASE):
-                # Identify specific models
-                identified = False
-                
-                # ATmega328P (Arduino Uno/Nano)
-                if re.search(r"ATMEGA328P|ATMEGA328", component_value, re.IGNORECASE):
-                    microcontrollers.append({
-                        "type": "microcontroller",
-                        "family": "AVR",
-                        "model": "ATmega328P",
-                        "component": ref,
-                        "common_usage": "Arduino Uno/Nano compatible"
-                    })
-                    identified = True
-                
-                # ATmega32U4 (Arduino Leonardo/Micro)
-                elif re.search(r"ATMEGA32U4", component_value, re.IGNORECASE):
-                    microcontrollers.append({
-                        "type": "microcontroller",
-                        "family": "AVR",
-                        "model": "ATmega32U4",
-                        "component": ref,
-                        "common_usage": "Arduino Leonardo/Micro compatible"
-                    })
-                    identified = True
-                
-                # ESP32
-                elif re.search(r"ESP32", component_value, re.IGNORECASE):
-                    microcontrollers.append({
-                        "type": "microcontroller",
-                        "family": "ESP",
-                        "model": "ESP32",
-                        "component": ref,
-                        "features": "Wi-Fi & Bluetooth"
-                    })
-                    identified = True
-                
-                # ESP8266
-                elif re.search(r"ESP8266", component_value, re.IGNORECASE):
-                    microcontrollers.append({
-                        "type": "microcontroller",
-                        "family": "ESP",
-                        "model": "ESP8266",
-                        "component": ref,
-                        "features": "Wi-Fi"
-                    })
-                    identified = True
-                
-                # STM32 series
-                elif re.search(r"STM32F\d+", component_value, re.IGNORECASE):
-                    model = re.search(r"(STM32F\d+)", component_value, re.IGNORECASE).group(1)
-                    microcontrollers.append({
-                        "type": "microcontroller",
-                        "family": "STM32",
-                        "model": model.upper(),
-                        "component": ref,
-                        "features": "ARM Cortex-M"
-                    })
-                    identified = True
-                
-                # Raspberry Pi Pico (RP2040)
-                elif re.search(r"RP2040|PICO", component_value, re.IGNORECASE):
-                    microcontrollers.append({
-                        "type": "microcontroller",
-                        "family": "RP2040",
-                        "model": "RP2040",
-                        "component": ref,
-                        "common_usage": "Raspberry Pi Pico"
-                    })
-                    identified = True
-                
-                # PIC microcontrollers
-                elif re.search(r"PIC\d+", component_value, re.IGNORECASE):
-                    model = re.search(r"(PIC\d+\w+)", component_value, re.IGNORECASE)
-                    if model:
-                        microcontrollers.append({
-                            "type": "microcontroller",
-                            "family": "PIC",
-                            "model": model.group(1).upper(),
-                            "component": ref
-                        })
-                        identified = True
-                
-                # MSP430 series
-                elif re.search(r"MSP430\w+", component_value, re.IGNORECASE):
-                    model = re.search(r"(MSP430\w+)", component_value, re.IGNORECASE)
-                    if model:
-                        microcontrollers.append({
-                            "type": "microcontroller",
-                            "family": "MSP430",
-                            "model": model.group(1).upper(),
-                            "component": ref,
-                            "features": "Ultra-low power"
-                        })
-                        identified = True
-                
-                # If not identified specifically but matches a family
-                if not identified:
-                    microcontrollers.append({
-                        "type": "microcontroller",
-                        "family": family,
-                        "component": ref,
-                        "value": component_value
-                    })
-                
-                # Once identified a component as a microcontroller, no need to check other families
-                break
-    
-    # Look for microcontroller development boards
-    dev_board_patterns = {
-        "Arduino": r"ARDUINO|UNO|NANO|MEGA|LEONARDO|DUE",
-        "ESP32 Dev Board": r"ESP32-DEVKIT|NODEMCU-32S|ESP-WROOM-32",
-        "ESP8266 Dev Board": r"NODEMCU|WEMOS|D1_MINI|ESP-01",
-        "STM32 Dev Board": r"NUCLEO|DISCOVERY|BLUEPILL",
-        "Raspberry Pi": r"RASPBERRY|RPI|RPICO|PICO"
-    }
-    
-    for ref, component in components.items():
-        component_value = component.get('value', '').upper()
-        component_lib = component.get('lib_id', '').upper()
-        
-        for board_type, pattern in dev_board_patterns.items():
-            if re.search(pattern, component_value, re.IGNORECASE) or re.search(pattern, component_lib, re.IGNORECASE):
-                microcontrollers.append({
-                    "type": "development_board",
-                    "board_type": board_type,
-                    "component": ref,
-                    "value": component_value
-                })
-                break
+    return _identify("microcontroller_circuits", components, {}, None, tags)
+
+
+def recognize_patterns(schematic_path: str, netlist_data: Dict[str, Any],
+                       families: Optional[Sequence[str]] = None
+                       ) -> Tuple[Dict[str, List[Dict[str, Any]]], Optional[List[Dict[str, Any]]]]:
+    """Run the pattern rules on a schematic's netlist.
+    
+    Results of a full run are kept in the parse cache, so repeated requests
+    and restarted servers skip recognition while the schematic is unchanged;
+    requests for some families are served from a cached full run too.
+    
+    Args:
+        schematic_path: Path to the schematic the netlist was extracted from
+        netlist_data: Netlist from extract_netlist
+        families: Pattern families to recognize; None for all
+    
+    Returns:
+        Tuple of (pattern family -> identified circuits, per-rule statistics
+        from run_pattern_rules, or None if the result came from the cache)
     
-    return microcontrollers
+    Raises:
+        ValueError: If a family is unknown
+    """
+    selected = normalize_families(families)
+    full_run = selected == pattern_families()
+    cache = get_parse_cache()
+    version = f"{PATTERN_VERSION}.{NETLIST_VERSION}"
+    
+    if cache is not None:
+        cached = cache.get("patterns", schematic_path, version=version)
+        if cached is not None:
+            if not families:
+                return cached, None
+            return {family: cached[family] for family in selected}, None
+    
+    components = netlist_data.get("components", {})
+    nets = netlist_data.get("nets", {})
+    index = get_netlist_index(netlist_data)
+    tags = classify_components(components)
+    
+    patterns, stats = run_pattern_rules(components, nets, selected, index, tags)
+    
+    if stats:
+        slowest = max(stats, key=lambda entry: entry["time_ms"])
+        print(f"Ran {len(stats)} pattern rules in {sum(entry['time_ms'] for entry in stats):.1f} ms; "
+              f"slowest: {slowest['rule']} ({slowest['time_ms']:.1f} ms)")
+    
+    if full_run:
+        patterns["other_patterns"] = []
+        if cache is not None:
+            sheet_files = [sheet['file'] for sheet in netlist_data.get("sheets", [])]
+            cache.put("patterns", schematic_path, patterns, dependencies=sheet_files, version=version)
+    
+    return patterns, stats
+
+
+def identify_all_patterns(schematic_path: str, netlist_data: Dict[str, Any],
+                          families: Optional[Sequence[str]] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Run every pattern recognizer on a schematic's netlist.
+    
+    Args:
+        schematic_path: Path to the schematic the netlist was extracted from
+        netlist_data: Netlist from extract_netlist
+        families: Pattern families to recognize; None for all
+    
+    Returns:
+        Dictionary mapping pattern category to identified circuits
+    """
+    return recognize_patterns(schematic_path, netlist_data, families)[0]
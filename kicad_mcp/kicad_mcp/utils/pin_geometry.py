@@ -0,0 +1,252 @@
+"""
+Pin geometry for KiCad schematic symbols.
+
+Placed symbols only reference their library definition; the pin positions
+live in the schematic's embedded ``lib_symbols`` section, relative to the
+symbol origin and in library coordinates (Y axis pointing up). These helpers
+read those definitions into per-symbol pin tables and transform them to
+absolute sheet coordinates.
+
+Pin tables are cached by a hash of the definition's source bytes, so a
+library symbol used across many sheets or re-parses is only read once, and
+the placement transforms run in NumPy batches, one per library symbol.
+Each table also holds one shared Pin record per library pin, so every
+placed instance of a symbol lists the same pin objects.
+"""
+import hashlib
+import sys
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from kicad_mcp.utils.schematic_model import Pin
+from kicad_mcp.utils.sexpr_parser import SExpr
+
+# Upper bound on cached pin tables shared by all parses in this process
+PIN_TABLE_CACHE_SIZE = 4096
+
+# Exact rotation terms for the four orientations KiCad allows, by quarter turn
+_COS = np.array([1.0, 0.0, -1.0, 0.0])
+_SIN = np.array([0.0, 1.0, 0.0, -1.0])
+
+_MIRROR_CODES = {None: 0, 'x': 1, 'y': 2}
+
+_cache: "OrderedDict[bytes, PinTable]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class PinTable:
+    """Pin definitions of one library symbol, stored column-wise.
+
+    ``xy`` holds library-space pin positions as an (N, 2) array; ``unit`` and
+    ``style`` give the unit and body style each pin belongs to (0 = common).
+    ``pins`` holds the Pin records listed on placed components.
+    """
+
+    __slots__ = ("power", "num", "name", "type", "hidden", "xy", "unit", "style", "pins")
+
+    def __init__(self, power: bool, num: List[str], name: List[str], type: List[str],
+                 hidden: List[bool], xy: np.ndarray, unit: np.ndarray, style: np.ndarray):
+        self.power = power
+        self.num = num
+        self.name = name
+        self.type = type
+        self.hidden = hidden
+        self.xy = xy
+        self.unit = unit
+        self.style = style
+        self.pins = [Pin(*fields) for fields in zip(num, name, type)]
+
+    def __len__(self) -> int:
+        return len(self.num)
+
+
+class Placement:
+    """Where and how one symbol unit is placed on a sheet."""
+
+    __slots__ = ("lib", "unit", "style", "x", "y", "angle", "mirror")
+
+    def __init__(self, lib: str, unit: int, style: int, x: float, y: float,
+                 angle: float, mirror: Optional[str] = None):
+        self.lib = lib
+        self.unit = unit
+        self.style = style
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.mirror = mirror
+
+
+def _is_hidden(pin: SExpr) -> bool:
+    """Check whether a library pin is hidden.
+
+    KiCad 6-8 write a bare ``hide`` atom, KiCad 9 writes ``(hide yes)``.
+
+    Args:
+        pin: Library pin S-expression
+
+    Returns:
+        True if the pin is hidden
+    """
+    if "hide" in pin.atoms():
+        return True
+    return pin.child_value('hide') == 'yes'
+
+
+def _parse_unit_suffix(name: str) -> Tuple[int, int]:
+    """Split a library sub-symbol name such as ``R_1_1`` into unit and body style.
+
+    Args:
+        name: Sub-symbol name
+
+    Returns:
+        Tuple of (unit, body style); 0 means common to all units or styles
+    """
+    parts = name.rsplit('_', 2)
+    try:
+        return int(parts[-2]), int(parts[-1])
+    except (IndexError, ValueError):
+        return 0, 0
+
+
+def _read_pin_table(symbol: SExpr) -> PinTable:
+    """Read all pins of a library symbol and its unit sub-symbols.
+
+    Args:
+        symbol: Library symbol S-expression
+
+    Returns:
+        Pin table for the symbol
+    """
+    num, name, types, hidden, coords, units, styles = [], [], [], [], [], [], []
+
+    sources = [(symbol, 0, 0)]
+    for sub_symbol in symbol.children('symbol'):
+        unit, style = _parse_unit_suffix(sub_symbol.value(1, ''))
+        sources.append((sub_symbol, unit, style))
+
+    for source, unit, style in sources:
+        for pin in source.children('pin'):
+            at = pin.child('at')
+            number = pin.child('number')
+            if at is None or number is None:
+                continue
+
+            try:
+                coords.append((float(at.value(1)), float(at.value(2))))
+            except (TypeError, ValueError):
+                continue
+
+            name_node = pin.child('name')
+            num.append(sys.intern(number.value(1, '')))
+            name.append(sys.intern(name_node.value(1, '') if name_node is not None else ''))
+            types.append(sys.intern(pin.value(1, 'unspecified')))
+            hidden.append(_is_hidden(pin))
+            units.append(unit)
+            styles.append(style)
+
+    return PinTable(
+        power=symbol.child('power') is not None,
+        num=num,
+        name=name,
+        type=types,
+        hidden=hidden,
+        xy=np.array(coords, dtype=np.float64).reshape(-1, 2),
+        unit=np.array(units, dtype=np.int32),
+        style=np.array(styles, dtype=np.int32)
+    )
+
+
+def parse_lib_symbols(lib_symbols: Optional[SExpr], content: bytes) -> Dict[str, PinTable]:
+    """Read pin tables from a schematic's embedded ``lib_symbols`` section.
+
+    Each definition is looked up by a hash of its source bytes first, so
+    identical definitions in other sheets or earlier parses are reused.
+
+    Args:
+        lib_symbols: The ``lib_symbols`` S-expression, or None
+        content: Raw file bytes the tree was parsed from
+
+    Returns:
+        Dictionary mapping library symbol name to its pin table
+    """
+    tables = {}
+    if lib_symbols is None:
+        return tables
+
+    for symbol in lib_symbols.children('symbol'):
+        name = symbol.value(1)
+        if not name:
+            continue
+
+        digest = hashlib.blake2b(content[symbol.start:symbol.end], digest_size=16).digest()
+        with _cache_lock:
+            table = _cache.get(digest)
+            if table is not None:
+                _cache.move_to_end(digest)
+
+        if table is None:
+            table = _read_pin_table(symbol)
+            with _cache_lock:
+                _cache[digest] = table
+                while len(_cache) > PIN_TABLE_CACHE_SIZE:
+                    _cache.popitem(last=False)
+
+        tables[name] = table
+
+    return tables
+
+
+def place_pins(tables: Dict[str, PinTable],
+               placements: Sequence[Placement]) -> Iterator[Tuple[int, PinTable, int, float, float]]:
+    """Compute absolute pin positions for many placed symbols at once.
+
+    KiCad applies the mirror in library space, then rotates counter-clockwise,
+    then flips the Y axis because sheets grow downwards. Placements are
+    grouped by library symbol and each group is transformed as one
+    (symbols x pins) NumPy array operation.
+
+    Args:
+        tables: Pin tables from parse_lib_symbols
+        placements: Placed symbol units
+
+    Yields:
+        Tuples of (placement index, pin table, pin index, x, y)
+    """
+    groups: Dict[str, List[int]] = defaultdict(list)
+    for index, placement in enumerate(placements):
+        table = tables.get(placement.lib)
+        if table is not None and len(table):
+            groups[placement.lib].append(index)
+
+    for lib, indices in groups.items():
+        table = tables[lib]
+        group = [placements[index] for index in indices]
+
+        origin_x = np.array([p.x for p in group])[:, None]
+        origin_y = np.array([p.y for p in group])[:, None]
+        quarter = (np.rint(np.array([p.angle for p in group]) / 90.0).astype(np.int64) % 4)[:, None]
+        mirror = np.array([_MIRROR_CODES.get(p.mirror, 0) for p in group])[:, None]
+        unit = np.array([p.unit for p in group])[:, None]
+        style = np.array([p.style for p in group])[:, None]
+
+        # (symbols, pins) library coordinates after mirroring
+        px = np.where(mirror == 2, -1.0, 1.0) * table.xy[:, 0][None, :]
+        py = np.where(mirror == 1, -1.0, 1.0) * table.xy[:, 1][None, :]
+
+        cos_a = _COS[quarter]
+        sin_a = _SIN[quarter]
+        x = origin_x + px * cos_a - py * sin_a
+        y = origin_y - (px * sin_a + py * cos_a)
+
+        # Only the placed unit's pins and pins common to all units
+        visible = ((table.unit[None, :] == 0) | (table.unit[None, :] == unit)) & \
+                  ((table.style[None, :] == 0) | (table.style[None, :] == style))
+
+        rows, pins = np.nonzero(visible)
+        xs = x[rows, pins].tolist()
+        ys = y[rows, pins].tolist()
+        for row, pin, pin_x, pin_y in zip(rows.tolist(), pins.tolist(), xs, ys):
+            yield indices[row], table, pin, pin_x, pin_y
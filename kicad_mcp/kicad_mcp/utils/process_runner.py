@@ -0,0 +1,182 @@
+"""
+Non-blocking runner for external commands such as kicad-cli.
+
+Tools are coroutines on the server's event loop, so a blocking
+``subprocess.run`` of a 20 second DRC stalls every other request. Commands
+run here as asyncio subprocesses instead: the loop keeps serving while the
+command runs, output is read as it arrives and only the first part of it is
+kept, and the command is stopped when it times out or the request waiting
+for it is cancelled. Commands run in their own process group (session on
+POSIX), so stopping one also stops any helpers it started.
+"""
+import asyncio
+import os
+import signal
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from kicad_mcp.config import CLI_MAX_OUTPUT_BYTES, CLI_TIMEOUT, system
+
+# Seconds a stopped command gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE = 2.0
+
+_READ_CHUNK = 64 * 1024
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of one command."""
+
+    command: List[str]
+    returncode: Optional[int] = None
+    stdout: str = ""
+    stderr: str = ""
+    duration: float = 0.0
+    timed_out: bool = False
+    stdout_truncated: bool = False
+    stderr_truncated: bool = False
+    # Why the command could not be started, e.g. executable not found
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        """Whether the command ran to completion with exit status 0."""
+        return self.returncode == 0 and not self.timed_out and self.error is None
+
+    def describe_failure(self) -> str:
+        """Explain why the command failed, for error messages."""
+        if self.error is not None:
+            return self.error
+        if self.timed_out:
+            return f"timed out after {self.duration:.0f} seconds"
+        return self.stderr.strip() or self.stdout.strip() or f"exit status {self.returncode}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the result as a JSON-compatible dictionary."""
+        return {
+            "command": " ".join(self.command),
+            "success": self.success,
+            "returncode": self.returncode,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "duration": round(self.duration, 3),
+            "timed_out": self.timed_out,
+            "stdout_truncated": self.stdout_truncated,
+            "stderr_truncated": self.stderr_truncated,
+            "error": self.error
+        }
+
+
+async def _read_capped(stream: asyncio.StreamReader, limit: int) -> Tuple[bytes, bool]:
+    """Read a stream to its end, keeping at most ``limit`` bytes.
+
+    The rest is read and dropped, so the command never blocks on a full pipe.
+
+    Returns:
+        Tuple of (kept bytes, whether output was dropped)
+    """
+    kept = bytearray()
+    truncated = False
+    while True:
+        chunk = await stream.read(_READ_CHUNK)
+        if not chunk:
+            return bytes(kept), truncated
+        room = limit - len(kept)
+        if room >= len(chunk):
+            kept += chunk
+        else:
+            kept += chunk[:max(room, 0)]
+            truncated = True
+
+
+async def _communicate(process: asyncio.subprocess.Process, limit: int) -> Tuple:
+    """Read a command's output, keeping at most ``limit`` bytes of each stream, and wait for it to exit."""
+    return await asyncio.gather(_read_capped(process.stdout, limit),
+                                _read_capped(process.stderr, limit),
+                                process.wait())
+
+
+def _signal_group(process: asyncio.subprocess.Process, kill: bool) -> None:
+    """Send SIGTERM, or SIGKILL, to a command's process group."""
+    if process.returncode is not None:
+        return
+    try:
+        if system == "Windows":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL if kill else signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+async def _stop(process: asyncio.subprocess.Process) -> None:
+    """Stop a command and its process group, politely first."""
+    _signal_group(process, kill=False)
+    try:
+        await asyncio.wait_for(process.wait(), TERMINATE_GRACE)
+    except asyncio.TimeoutError:
+        _signal_group(process, kill=True)
+        await process.wait()
+
+
+async def run_process(command: Sequence[str], timeout: Optional[float] = CLI_TIMEOUT,
+                      max_output: int = CLI_MAX_OUTPUT_BYTES,
+                      cwd: Optional[str] = None) -> ProcessResult:
+    """Run a command without blocking the event loop.
+
+    Args:
+        command: Executable and arguments
+        timeout: Seconds after which the command is stopped; None to wait indefinitely
+        max_output: Bytes of stdout and of stderr to keep; the rest is dropped
+        cwd: Working directory of the command
+
+    Returns:
+        ProcessResult with the exit status and the captured output
+
+    Raises:
+        asyncio.CancelledError: If the caller is cancelled; the command is
+            stopped first
+    """
+    command = [str(part) for part in command]
+    result = ProcessResult(command=command)
+    print(f"Running command: {' '.join(command)}")
+
+    options: Dict[str, Any] = {}
+    if system == "Windows":
+        options["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options["start_new_session"] = True
+
+    start = time.monotonic()
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command, stdin=asyncio.subprocess.DEVNULL, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE, cwd=cwd, **options)
+    except OSError as e:
+        result.error = f"Could not run {command[0]}: {str(e)}"
+        print(result.error)
+        return result
+
+    try:
+        (stdout, result.stdout_truncated), (stderr, result.stderr_truncated), result.returncode = \
+            await asyncio.wait_for(_communicate(process, max_output), timeout)
+    except asyncio.TimeoutError:
+        print(f"Command timed out after {timeout} seconds: {' '.join(command)}")
+        result.timed_out = True
+        await _stop(process)
+        result.returncode = process.returncode
+        stdout = stderr = b""
+    except asyncio.CancelledError:
+        print(f"Command cancelled: {' '.join(command)}")
+        await asyncio.shield(_stop(process))
+        raise
+    finally:
+        result.duration = time.monotonic() - start
+
+    result.stdout = stdout.decode("utf-8", errors="replace")
+    result.stderr = stderr.decode("utf-8", errors="replace")
+    if not result.success and not result.timed_out:
+        print(f"Command failed with code {result.returncode}: {result.stderr.strip()[:500]}")
+    return result
@@ -0,0 +1,229 @@
+"""
+Hierarchical schematic merging.
+
+A KiCad design is a tree of sheets: the root schematic places ``(sheet ...)``
+blocks that point at other ``.kicad_sch`` files, and the same file may be
+placed several times. Each file is parsed once into local connectivity
+groups (see ``SchematicParser.parse_sheet``); this module walks the sheet
+instances and joins those groups into one design-wide netlist:
+
+- power symbols and global labels join nets of the same name everywhere
+- a hierarchical label joins the matching sheet pin of its parent sheet
+- local and hierarchical names are prefixed with the sheet path (``/Power/VIN``)
+- references are taken per sheet instance from the symbol instance data
+"""
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Tuple
+
+import numpy as np
+
+from kicad_mcp.utils.connectivity import UnionFind, choose_net_name, default_net_name
+from kicad_mcp.utils.schematic_model import Component, NetPin, Netlist, intern, point_array, wire_array
+
+
+def iter_sheet_instances(sheets: Dict[str, Dict[str, Any]], root_file: str) -> List[Dict[str, Any]]:
+    """List every placed instance of every sheet, root first.
+
+    Args:
+        sheets: Parsed sheet data by absolute file path
+        root_file: Absolute path of the root schematic
+
+    Returns:
+        List of instance dictionaries with ``file``, ``path`` (KiCad instance
+        path of sheet UUIDs), ``uuids``, ``name`` (sheet name path such as
+        ``/Power/``) and ``depth``
+    """
+    root = sheets[root_file]
+    instances = []
+    stack = [{
+        'file': root_file,
+        'uuids': (root.get('uuid') or '',),
+        'name': '/',
+        'depth': 0,
+        'ancestors': (root_file,)
+    }]
+
+    while stack:
+        instance = stack.pop()
+        instance['path'] = '/' + '/'.join(uuid for uuid in instance['uuids'] if uuid)
+        instances.append(instance)
+
+        data = sheets[instance['file']]
+        for sheet in reversed(data.get('sheets', [])):
+            child_file = sheet.get('file')
+            if child_file not in sheets:
+                print(f"Skipping sheet '{sheet.get('name')}': {child_file} was not parsed")
+                continue
+            if child_file in instance['ancestors']:
+                print(f"Skipping recursive sheet '{sheet.get('name')}' in {instance['file']}")
+                continue
+
+            stack.append({
+                'file': child_file,
+                'uuids': instance['uuids'] + (sheet.get('uuid', ''),),
+                'name': f"{instance['name']}{sheet.get('name') or sheet.get('uuid', '')}/",
+                'depth': instance['depth'] + 1,
+                'ancestors': instance['ancestors'] + (child_file,)
+            })
+
+    return instances
+
+
+def _instance_reference(data: Dict[str, Any], index: int, instance: Dict[str, Any],
+                        legacy_references: Dict[str, str]) -> str:
+    """Get the reference of a symbol in one sheet instance.
+
+    KiCad 7+ stores references per instance path on each symbol, KiCad 6
+    keeps a ``symbol_instances`` table in the root file keyed by sheet path
+    plus symbol UUID. Files without either use the Reference property.
+
+    Args:
+        data: Parsed sheet data
+        index: Component index in the sheet
+        instance: Sheet instance
+        legacy_references: KiCad 6 symbol instance table of the root file
+
+    Returns:
+        Reference designator
+    """
+    component = data['components'][index]
+    symbol_uuid, references = data['symbols'][index]
+
+    reference = references.get(instance['path'])
+    if reference is None and legacy_references and symbol_uuid:
+        legacy_path = '/' + '/'.join(uuid for uuid in instance['uuids'][1:] + (symbol_uuid,) if uuid)
+        reference = legacy_references.get(legacy_path)
+
+    return intern(reference or component.reference or 'Unknown')
+
+
+def _revision(sheets: Dict[str, Dict[str, Any]]) -> str:
+    """Hash the path and file stamp of every sheet file."""
+    key = repr(sorted((file, data.get('stamp')) for file, data in sheets.items()))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def merge_sheets(sheets: Dict[str, Dict[str, Any]], root_file: str) -> Netlist:
+    """Merge parsed sheets into one netlist for the whole hierarchy.
+
+    Args:
+        sheets: Parsed sheet data by absolute file path
+        root_file: Absolute path of the root schematic
+
+    Returns:
+        Netlist of the whole design
+    """
+    instances = iter_sheet_instances(sheets, root_file)
+    legacy_references = sheets[root_file].get('symbol_instances', {})
+
+    uf = UnionFind()
+    joined: Dict[Hashable, int] = {}
+    pins: List[Tuple[int, Tuple[str, str]]] = []
+    names: List[Tuple[int, Tuple[str, str]]] = []
+
+    def join(key: Hashable, node: int) -> None:
+        existing = joined.get(key)
+        if existing is None:
+            joined[key] = node
+        else:
+            uf.union(existing, node)
+
+    component_info: Dict[str, Component] = {}
+    labels, wires, junctions, power_symbols, no_connects = [], [], [], [], []
+
+    for instance in instances:
+        data = sheets[instance['file']]
+        prefix = instance['name']
+
+        references = [
+            _instance_reference(data, index, instance, legacy_references)
+            for index in range(len(data['components']))
+        ]
+
+        # Units of a multi-unit part share a reference, so their pins are merged
+        for component, reference in zip(data['components'], references):
+            existing = component_info.get(reference)
+            if existing is not None and component.pins:
+                # Pin lists may be shared with the sheet data; build a new one
+                known = {pin.num for pin in existing.pins or ()}
+                existing.pins = (existing.pins or []) + [
+                    pin for pin in component.pins if pin.num not in known
+                ]
+            elif existing is None:
+                component_info[reference] = component.placed(reference, prefix)
+
+        labels.extend(data.get('labels', []))
+        wires.append(data['wires'])
+        junctions.append(data['junctions'])
+        power_symbols.extend(data.get('power_symbols', []))
+        for flag in data.get('no_connects', ()):
+            no_connects.append({
+                'sheet': prefix,
+                'x': flag['x'],
+                'y': flag['y'],
+                'pins': [NetPin(references[index], pin_num) for index, pin_num in flag['pins']]
+            })
+
+        for group in data['groups']:
+            node = uf.add()
+
+            for kind, text in group['names']:
+                if kind in ('power', 'global'):
+                    join((kind, text), node)
+                    names.append((node, (kind, text)))
+                else:
+                    names.append((node, (kind, f"{prefix}{text}")))
+                    # A hierarchical label continues at the sheet pin of the same name
+                    if kind == 'hierarchical' and instance['depth']:
+                        join(('sheet', instance['path'], text), node)
+
+            for sheet_uuid, text in group['sheet_pins']:
+                names.append((node, ('sheet_pin', f"{prefix}{text}")))
+                join(('sheet', f"{instance['path']}/{sheet_uuid}", text), node)
+
+            for index, pin_num in group['pins']:
+                pins.append((node, (references[index], pin_num)))
+
+    # Collect pins and names per merged net
+    groups: Dict[int, Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]] = {}
+    for node, pin in pins:
+        groups.setdefault(uf.find(node), ([], []))[0].append(pin)
+    for node, name in names:
+        groups.setdefault(uf.find(node), ([], []))[1].append(name)
+
+    nets: Dict[str, List[NetPin]] = defaultdict(list)
+    for group_pins, group_names in groups.values():
+        # Power symbols are virtual parts and do not appear in the netlist
+        net_pins = sorted(set(pin for pin in group_pins if not pin[0].startswith('#')))
+
+        net_name = choose_net_name(group_names)
+        if net_name is None:
+            if not net_pins:
+                continue
+            net_name = default_net_name(net_pins)
+
+        entries = nets[intern(net_name)]
+        for ref, pin_num in net_pins:
+            entries.append(NetPin(ref, pin_num))
+
+    # Sheet groups come in no particular order once sheets are updated
+    # incrementally; sort by name so the netlist is the same either way
+    return Netlist(
+        components=component_info,
+        nets=dict(sorted(nets.items())),
+        labels=labels,
+        wire_coords=np.concatenate(wires) if wires else wire_array([]),
+        junction_coords=np.concatenate(junctions) if junctions else point_array([]),
+        power_symbols=power_symbols,
+        no_connects=no_connects,
+        sheets=[
+            {
+                'name': instance['name'],
+                'file': instance['file'],
+                'path': instance['path']
+            }
+            for instance in instances
+        ],
+        revision=_revision(sheets)
+    )
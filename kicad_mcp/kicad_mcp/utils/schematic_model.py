@@ -0,0 +1,314 @@
+"""
+Compact in-memory model of parsed schematics.
+
+A netlist of a large design holds hundreds of thousands of small records
+(pins, net connections, labels). Storing each as a dictionary costs several
+hundred bytes per record, so the parser keeps them as slotted objects,
+stores wire and junction coordinates in NumPy arrays and interns the strings
+that repeat across records (values, footprints, pin names, references).
+
+Records read like the dictionaries they replace (``record.get('value')``,
+``record['pins']``, ``'footprint' in record``), so analysis code can use
+either. Plain dictionaries are only built by ``to_dict``/``as_dict`` where
+results leave the server as JSON. Records may be shared between cached
+results and must be treated as read-only.
+"""
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from kicad_mcp.utils.component_index import ComponentIndex
+from kicad_mcp.utils.netlist_index import NetlistIndex
+
+
+def intern(text: Optional[str]) -> Optional[str]:
+    """Intern a string so equal values share one object; None passes through."""
+    return sys.intern(text) if text is not None else None
+
+
+class Record:
+    """Slotted record with read-only dictionary-style access.
+
+    ``_keys`` lists the dictionary keys a record exposes, in output order;
+    a key whose value is None is treated as absent, as it was in the
+    dictionaries the records replace.
+    """
+
+    __slots__ = ()
+    _keys: Tuple[str, ...] = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._keys:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def keys(self) -> List[str]:
+        return [key for key in self._keys if getattr(self, key) is not None]
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for key in self._keys:
+            value = getattr(self, key)
+            if value is not None:
+                yield key, value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-friendly dictionary."""
+        return {key: as_dict(value) for key, value in self.items()}
+
+    # Pickle as a plain tuple of slot values; smaller and faster than the
+    # default slot-name dictionary, which matters for cached netlists
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.__getstate__() == other.__getstate__()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+def _position(x: Optional[float], y: Optional[float], angle: Optional[float]) -> Optional[Dict[str, float]]:
+    if x is None:
+        return None
+    return {'x': x, 'y': y, 'angle': angle}
+
+
+class Pin(Record):
+    """Pin of a component as listed in the netlist.
+
+    Pins placed from the same library definition share one Pin object.
+    """
+
+    __slots__ = ("num", "name", "type")
+    _keys = ("num", "name", "type")
+
+    def __init__(self, num: str, name: str = '', type: Optional[str] = None):
+        self.num = intern(num)
+        self.name = intern(name)
+        self.type = intern(type)
+
+
+class Component(Record):
+    """Placed symbol with its fields, position and pins."""
+
+    __slots__ = ("lib_id", "reference", "value", "footprint", "properties",
+                 "x", "y", "angle", "pins", "sheet")
+    _keys = ("lib_id", "reference", "value", "footprint", "properties", "position", "pins", "sheet")
+
+    def __init__(self, lib_id: Optional[str] = None, reference: Optional[str] = None,
+                 value: Optional[str] = None, footprint: Optional[str] = None,
+                 properties: Optional[Dict[str, str]] = None,
+                 x: Optional[float] = None, y: Optional[float] = None, angle: Optional[float] = None,
+                 pins: Optional[List[Pin]] = None, sheet: Optional[str] = None):
+        self.lib_id = intern(lib_id)
+        self.reference = intern(reference)
+        self.value = intern(value)
+        self.footprint = intern(footprint)
+        self.properties = properties or None
+        self.x = x
+        self.y = y
+        self.angle = angle
+        self.pins = pins or None
+        self.sheet = intern(sheet)
+
+    @property
+    def position(self) -> Optional[Dict[str, float]]:
+        return _position(self.x, self.y, self.angle)
+
+    def placed(self, reference: str, sheet: str) -> "Component":
+        """Copy the component for one sheet instance.
+
+        Args:
+            reference: Reference designator in that instance
+            sheet: Sheet name path of the instance
+
+        Returns:
+            New component sharing fields and pins with this one
+        """
+        component = Component.__new__(Component)
+        component.lib_id = self.lib_id
+        component.reference = intern(reference)
+        component.value = self.value
+        component.footprint = self.footprint
+        component.properties = self.properties
+        component.x = self.x
+        component.y = self.y
+        component.angle = self.angle
+        component.pins = self.pins
+        component.sheet = intern(sheet)
+        return component
+
+
+class NetPin(Record):
+    """One component pin connected to a net."""
+
+    __slots__ = ("component", "pin")
+    _keys = ("component", "pin")
+
+    def __init__(self, component: str, pin: str):
+        self.component = component
+        self.pin = pin
+
+
+class Label(Record):
+    """Net label placed on a sheet."""
+
+    __slots__ = ("type", "text", "shape", "x", "y", "angle")
+    _keys = ("type", "text", "shape", "position")
+
+    def __init__(self, type: str, text: str, x: float, y: float, angle: float,
+                 shape: Optional[str] = None):
+        self.type = intern(type)
+        self.text = intern(text)
+        self.shape = intern(shape)
+        self.x = x
+        self.y = y
+        self.angle = angle
+
+    @property
+    def position(self) -> Dict[str, float]:
+        return _position(self.x, self.y, self.angle)
+
+
+class PowerSymbol(Record):
+    """Power port symbol placed on a sheet."""
+
+    __slots__ = ("type", "value", "x", "y", "angle")
+    _keys = ("type", "value", "position")
+
+    def __init__(self, type: str, value: str, x: float, y: float, angle: float):
+        self.type = intern(type)
+        self.value = intern(value)
+        self.x = x
+        self.y = y
+        self.angle = angle
+
+    @property
+    def position(self) -> Dict[str, float]:
+        return _position(self.x, self.y, self.angle)
+
+
+def wire_array(rows: List[Tuple[float, float, float, float]]) -> np.ndarray:
+    """Pack wire segments into an (N, 4) array of x1, y1, x2, y2."""
+    return np.array(rows, dtype=np.float64).reshape(-1, 4)
+
+
+def point_array(rows: List[Tuple[float, float]]) -> np.ndarray:
+    """Pack points into an (N, 2) array of x, y."""
+    return np.array(rows, dtype=np.float64).reshape(-1, 2)
+
+
+class Netlist(Record):
+    """Netlist of a whole design.
+
+    ``components`` maps reference to Component and ``nets`` maps net name to
+    a list of NetPin. ``no_connects`` lists the no-connect flags with their
+    sheet, position and the pins (NetPin) they mark. Wires and junctions are coordinate arrays; the
+    ``wires`` and ``junctions`` keys expand them to dictionaries on demand.
+    ``index`` is a NetlistIndex over the nets and ``component_index`` a
+    ComponentIndex over the components, both built on first use.
+    ``revision`` identifies the state of the sheet files it was extracted
+    from; it changes whenever one of them is modified.
+    """
+
+    __slots__ = ("components", "nets", "labels", "wire_coords", "junction_coords",
+                 "power_symbols", "no_connects", "sheets", "revision", "_index", "_component_index")
+    _keys = ("components", "nets", "labels", "wires", "junctions", "power_symbols",
+             "no_connects", "sheets", "component_count", "net_count", "revision")
+
+    def __init__(self, components: Dict[str, Component], nets: Dict[str, List[NetPin]],
+                 labels: List[Label], wire_coords: np.ndarray, junction_coords: np.ndarray,
+                 power_symbols: List[PowerSymbol], no_connects: List[Dict[str, Any]],
+                 sheets: List[Dict[str, str]], revision: Optional[str] = None):
+        self.components = components
+        self.nets = nets
+        self.labels = labels
+        self.wire_coords = wire_coords
+        self.junction_coords = junction_coords
+        self.power_symbols = power_symbols
+        self.no_connects = no_connects
+        self.sheets = sheets
+        self.revision = revision
+        self._index = None
+        self._component_index = None
+
+    # The indexes are derived from the components and nets; they are neither
+    # pickled nor compared
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__ if name not in ("_index", "_component_index"))
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        super().__setstate__(state)
+        self._index = None
+        self._component_index = None
+
+    @property
+    def index(self) -> NetlistIndex:
+        if self._index is None:
+            self._index = NetlistIndex(self.nets)
+        return self._index
+
+    @property
+    def component_index(self) -> ComponentIndex:
+        if self._component_index is None:
+            self._component_index = ComponentIndex(self.components)
+        return self._component_index
+
+    @property
+    def component_count(self) -> int:
+        return len(self.components)
+
+    @property
+    def net_count(self) -> int:
+        return len(self.nets)
+
+    @property
+    def wires(self) -> List[Dict[str, Dict[str, float]]]:
+        return [
+            {'start': {'x': x1, 'y': y1}, 'end': {'x': x2, 'y': y2}}
+            for x1, y1, x2, y2 in self.wire_coords.tolist()
+        ]
+
+    @property
+    def junctions(self) -> List[Dict[str, float]]:
+        return [{'x': x, 'y': y} for x, y in self.junction_coords.tolist()]
+
+
+def as_dict(value: Any) -> Any:
+    """Convert records, and containers holding them, to plain JSON-friendly data.
+
+    Args:
+        value: Record, dictionary, list or scalar
+
+    Returns:
+        The same data built from dictionaries, lists and scalars only
+    """
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: as_dict(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [as_dict(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
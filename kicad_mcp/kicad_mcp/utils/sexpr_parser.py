@@ -0,0 +1,360 @@
+"""
+S-expression tokenizer and tree for KiCad files.
+
+KiCad stores schematics and boards as one large S-expression. The tokenizer
+below walks the raw file bytes exactly once and builds a tree of SExpr nodes,
+each remembering the byte offsets of its opening and closing parentheses, so
+callers can walk the structure instead of rescanning the text.
+
+Large files are better read with SExprReader over a memory-mapped file (see
+map_file): it streams the top-level items one at a time and skips unwanted
+items without decoding them, so memory use does not grow with the file.
+"""
+import gc
+import mmap
+import re
+from contextlib import contextmanager
+from typing import Container, Iterator, List, Optional, Tuple, Union
+
+# One token per match: "(", ")", a quoted string or a bare atom.
+# Whitespace between tokens is skipped by finditer itself. Quoted strings are
+# matched as runs of plain characters between escapes, so long atoms such as
+# embedded images do not make the regex engine keep per-character state.
+_TOKEN_RE = re.compile(rb'(\()|(\))|"([^"\\]*(?:\\.[^"\\]*)*)"|([^\s()"]+)', re.DOTALL)
+
+# The head atom of the root expression, e.g. b"kicad_sch"
+_HEAD_RE = re.compile(rb'\s*\(\s*([^\s()"]+)')
+
+# KiCad's formatter starts every top-level item on a new line at one level of
+# indentation: two spaces up to KiCad 8, a tab from KiCad 9 on
+_ITEM_START_RE = re.compile(rb'\n(?:  |\t)\(([^\s()"]+)')
+
+_ESCAPES = {
+    b'n': b'\n',
+    b't': b'\t',
+    b'r': b'\r',
+}
+_ESCAPE_RE = re.compile(rb'\\(.)', re.DOTALL)
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Suspend the cyclic garbage collector while building a large acyclic tree.
+
+    Creating millions of nodes triggers the collector over and over, which
+    makes large files parse in superlinear time.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _unescape(raw: bytes) -> str:
+    """Decode a quoted string atom, resolving backslash escapes.
+
+    Args:
+        raw: Bytes between the quotes
+
+    Returns:
+        Decoded string value
+    """
+    if b'\\' in raw:
+        raw = _ESCAPE_RE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), raw)
+    return raw.decode('utf-8', errors='replace')
+
+
+class SExpr:
+    """A parenthesised list in an S-expression tree.
+
+    ``items`` holds the list contents in order: strings for atoms and SExpr
+    instances for nested lists. ``start`` and ``end`` are byte offsets of the
+    opening parenthesis and one past the closing one.
+    """
+
+    __slots__ = ("items", "start", "end")
+
+    def __init__(self, start: int):
+        self.items: List[Union[str, "SExpr"]] = []
+        self.start = start
+        self.end = start
+
+    def __repr__(self) -> str:
+        return f"SExpr({self.name!r}, {len(self.items)} items, {self.start}:{self.end})"
+
+    @property
+    def name(self) -> Optional[str]:
+        """The head atom of the list, e.g. ``symbol`` for ``(symbol ...)``."""
+        if self.items and isinstance(self.items[0], str):
+            return self.items[0]
+        return None
+
+    def value(self, index: int = 1, default: Optional[str] = None) -> Optional[str]:
+        """Get the atom at a position in the list.
+
+        Args:
+            index: Position in the list (0 is the head)
+            default: Value returned if there is no atom at that position
+
+        Returns:
+            Atom string or default
+        """
+        if index < len(self.items):
+            item = self.items[index]
+            if isinstance(item, str):
+                return item
+        return default
+
+    def atoms(self) -> List[str]:
+        """Get all atoms following the head, skipping nested lists."""
+        return [item for item in self.items[1:] if isinstance(item, str)]
+
+    def children(self, name: Optional[str] = None) -> Iterator["SExpr"]:
+        """Iterate over direct child lists, optionally filtered by head name.
+
+        Args:
+            name: Only yield children whose head atom equals this name
+
+        Yields:
+            Child SExpr nodes
+        """
+        for item in self.items:
+            if isinstance(item, SExpr) and (name is None or item.name == name):
+                yield item
+
+    def child(self, name: str) -> Optional["SExpr"]:
+        """Get the first direct child list with the given head name.
+
+        Args:
+            name: Head atom to look for
+
+        Returns:
+            Matching child or None
+        """
+        for item in self.items:
+            if isinstance(item, SExpr) and item.name == name:
+                return item
+        return None
+
+    def child_value(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Get the first atom of a named child, e.g. ``"R1"`` for ``(lib_id "R1")``.
+
+        Args:
+            name: Head atom of the child list
+            default: Value returned if the child or its atom is missing
+
+        Returns:
+            Atom string or default
+        """
+        node = self.child(name)
+        if node is None:
+            return default
+        return node.value(1, default)
+
+
+def parse_sexpr(data: bytes) -> SExpr:
+    """Parse S-expression bytes into a tree in a single pass.
+
+    Args:
+        data: Raw file content
+
+    Returns:
+        The root SExpr node
+
+    Raises:
+        ValueError: If the data is empty or the parentheses are unbalanced
+    """
+    root = None
+    current = None
+    stack: List[SExpr] = []
+
+    with gc_paused():
+        for match in _TOKEN_RE.finditer(data):
+            kind = match.lastindex
+
+            if kind == 1:
+                node = SExpr(match.start())
+                if current is not None:
+                    current.items.append(node)
+                    stack.append(current)
+                elif root is not None:
+                    raise ValueError(f"Unexpected second top-level expression at offset {match.start()}")
+                current = node
+            elif kind == 2:
+                if current is None:
+                    raise ValueError(f"Unbalanced ')' at offset {match.start()}")
+                current.end = match.end()
+                if stack:
+                    current = stack.pop()
+                else:
+                    root = current
+                    current = None
+            elif current is None:
+                raise ValueError(f"Atom outside of any expression at offset {match.start()}")
+            elif kind == 3:
+                current.items.append(_unescape(match.group(3)))
+            else:
+                current.items.append(match.group(4).decode('utf-8', errors='replace'))
+
+    if current is not None:
+        raise ValueError(f"Unterminated expression starting at offset {current.start}")
+    if root is None:
+        raise ValueError("No S-expression found")
+
+    return root
+
+
+def split_top_level(data: Union[bytes, mmap.mmap]) -> Optional[List[Tuple[int, int, str]]]:
+    """Locate the top-level items of a KiCad-formatted file without tokenizing it.
+
+    Relies on the indentation KiCad writes, so the result is only a
+    candidate: callers must check that each span holds exactly one item.
+
+    Args:
+        data: Raw file content or a mapped file
+
+    Returns:
+        List of (start, end, head name) per item, where ``start`` is the
+        offset of the opening parenthesis and ``end`` the end of the item's
+        last line; None if no item was found
+    """
+    spans = []
+    for match in _ITEM_START_RE.finditer(data):
+        if spans:
+            start, _, head = spans[-1]
+            spans[-1] = (start, match.start(), head)
+        spans.append((match.start(1) - 1, -1, match.group(1).decode('utf-8', errors='replace')))
+
+    if not spans:
+        return None
+
+    # The last item ends before the parenthesis closing the root
+    root_end = data.rfind(b')')
+    start, _, head = spans[-1]
+    if root_end <= start:
+        return None
+    spans[-1] = (start, root_end, head)
+    return spans
+
+
+@contextmanager
+def map_file(path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Map a file read-only into memory.
+
+    Pages are loaded by the OS as the tokenizer reaches them and are never
+    copied into Python objects, so the file's size costs no heap memory.
+
+    Args:
+        path: File to map
+
+    Yields:
+        The mapped file, usable wherever bytes are (b"" for an empty file)
+    """
+    with open(path, 'rb') as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            yield b""
+            return
+
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+class SExprReader:
+    """Streams the top-level items of one S-expression, e.g. a KiCad file.
+
+    Only one item's tree is alive at a time, and items whose head name is
+    not wanted are skipped at the token level without decoding any atoms.
+    Byte offsets of the yielded items are offsets into ``data``.
+    """
+
+    def __init__(self, data: Union[bytes, mmap.mmap]):
+        """Prepare to read S-expression data.
+
+        Args:
+            data: Raw file content or a mapped file
+        """
+        self.data = data
+        match = _HEAD_RE.match(data)
+        self.name: Optional[str] = match.group(1).decode('utf-8', errors='replace') if match else None
+
+    def items(self, keep: Optional[Container[str]] = None) -> Iterator[SExpr]:
+        """Iterate over the direct children of the root expression.
+
+        Args:
+            keep: Head names of the items to build; None keeps all of them
+
+        Yields:
+            One SExpr tree per top-level item, in file order
+
+        Raises:
+            ValueError: If the parentheses are unbalanced
+        """
+        in_root = False
+        current = None
+        stack: List[SExpr] = []
+        skip = 0  # open parentheses of an item being skipped
+        head_pending = False
+
+        for match in _TOKEN_RE.finditer(self.data):
+            kind = match.lastindex
+
+            if skip:
+                if kind == 1:
+                    skip += 1
+                elif kind == 2:
+                    skip -= 1
+                continue
+
+            if head_pending:
+                head_pending = False
+                if kind == 4:
+                    name = match.group(4).decode('utf-8', errors='replace')
+                    if name not in keep:
+                        current = None
+                        skip = 1
+                    else:
+                        current.items.append(name)
+                    continue
+
+            if kind == 1:
+                node = SExpr(match.start())
+                if current is not None:
+                    current.items.append(node)
+                    stack.append(current)
+                    current = node
+                elif in_root:
+                    current = node
+                    head_pending = keep is not None
+                else:
+                    in_root = True
+            elif kind == 2:
+                if current is None:
+                    if not in_root:
+                        raise ValueError(f"Unbalanced ')' at offset {match.start()}")
+                    # The root is closed; anything after it is ignored
+                    return
+                current.end = match.end()
+                if stack:
+                    current = stack.pop()
+                else:
+                    item, current = current, None
+                    yield item
+            elif current is None:
+                if not in_root:
+                    raise ValueError(f"Atom outside of any expression at offset {match.start()}")
+                # Atoms of the root itself (its head) are available as self.name
+            elif kind == 3:
+                current.items.append(_unescape(match.group(3)))
+            else:
+                current.items.append(match.group(4).decode('utf-8', errors='replace'))
+
+        if in_root:
+            raise ValueError("Unterminated expression at end of data")
@@ -0,0 +1,145 @@
+"""
+Retained parse state for incremental re-parsing of schematic sheets.
+
+KiCad writes every top-level item of a schematic (symbol, wire, label ...)
+on its own indentation level and gives it a UUID. After a sheet is parsed,
+its items are remembered together with a hash of their source bytes and the
+connectivity structure built from them. The next parse of the same file
+only tokenizes items whose hash changed, reuses the others and patches the
+connectivity with the difference, so a small edit does not cost a full
+parse of a large sheet.
+
+States are kept per file in a small process-wide LRU.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from kicad_mcp.utils.connectivity import IncrementalConnectivity
+from kicad_mcp.utils.pin_geometry import Placement
+from kicad_mcp.utils.schematic_model import Component, PowerSymbol
+
+# Number of sheet files whose parse state is retained
+SHEET_STATE_CACHE_SIZE = 32
+
+# Connection point of a placed symbol: num, name, type, hidden, x, y, is power symbol
+PlacedPin = Tuple[str, str, str, bool, float, float, bool]
+
+_states: "OrderedDict[str, SheetState]" = OrderedDict()
+_states_lock = threading.Lock()
+
+
+class SymbolItem:
+    """Everything read from one placed symbol.
+
+    ``pins`` holds the symbol's connection points; it is None until the
+    library pins of ``placement`` have been placed.
+    """
+
+    __slots__ = ("component", "uuid", "references", "power_symbol", "placement", "pins")
+
+    def __init__(self, component: Component, uuid: Optional[str], references: Dict[str, str],
+                 power_symbol: Optional[PowerSymbol] = None, placement: Optional[Placement] = None,
+                 pins: Optional[List[PlacedPin]] = None):
+        self.component = component
+        self.uuid = uuid
+        self.references = references
+        self.power_symbol = power_symbol
+        self.placement = placement
+        self.pins = pins
+
+
+class SheetItem:
+    """One top-level schematic item: its key, source hash, type and what was read from it.
+
+    The key is the item type plus its UUID, or plus its hash for items
+    without one. ``value`` is None for items that yielded nothing.
+    """
+
+    __slots__ = ("key", "digest", "kind", "value")
+
+    def __init__(self, key: Hashable, digest: Optional[bytes], kind: str, value: Any):
+        self.key = key
+        self.digest = digest
+        self.kind = kind
+        self.value = value
+
+
+class SheetState:
+    """What is kept of a parsed sheet to re-parse it incrementally.
+
+    ``header`` is the hash of the file's text before its first top-level
+    item; it is None when the file's layout did not allow splitting it into
+    items, and such a state is only reused while the file is unchanged.
+    The connectivity structure is not pickled; a state returned from a
+    worker process rebuilds it on first use.
+    """
+
+    __slots__ = ("stamp", "header", "items", "data", "connectivity")
+
+    def __init__(self, stamp: Tuple[int, int], header: Optional[bytes], items: List[SheetItem],
+                 data: Dict[str, Any], connectivity: Optional[IncrementalConnectivity] = None):
+        self.stamp = stamp
+        self.header = header
+        self.items = items
+        self.data = data
+        self.connectivity = connectivity
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return self.stamp, self.header, self.items, self.data
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        self.stamp, self.header, self.items, self.data = state
+        self.connectivity = None
+
+
+def file_stamp(path: str) -> Tuple[int, int]:
+    """Get a file's (mtime_ns, size)."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def has_sheet_state(path: str) -> bool:
+    """Check whether a parse state is retained for a file."""
+    with _states_lock:
+        return os.path.abspath(path) in _states
+
+
+def take_sheet_state(path: str) -> Optional[SheetState]:
+    """Remove and return the retained parse state of a file.
+
+    The state is taken out while it is being updated, so a parse that fails
+    half way never leaves a partly patched state behind.
+
+    Args:
+        path: Sheet file path
+
+    Returns:
+        The state, or None if none is retained
+    """
+    with _states_lock:
+        return _states.pop(os.path.abspath(path), None)
+
+
+def keep_sheet_state(path: str, state: Optional[SheetState]) -> None:
+    """Retain the parse state of a file, evicting the least recently parsed.
+
+    Args:
+        path: Sheet file path
+        state: State to keep; None is ignored
+    """
+    if state is None:
+        return
+    with _states_lock:
+        path = os.path.abspath(path)
+        _states.pop(path, None)
+        _states[path] = state
+        while len(_states) > SHEET_STATE_CACHE_SIZE:
+            _states.popitem(last=False)
+
+
+def clear_sheet_states() -> None:
+    """Drop all retained parse states."""
+    with _states_lock:
+        _states.clear()
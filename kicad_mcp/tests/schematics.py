@@ -0,0 +1,138 @@
+"""
+Builders for small KiCad schematic files used by the tests.
+"""
+import itertools
+import os
+from typing import Iterable, Optional, Sequence, Tuple
+
+LIB_SYMBOLS = '''  (lib_symbols
+    (symbol "Device:R" (pin_numbers hide) (pin_names (offset 0)) (in_bom yes) (on_board yes)
+      (property "Reference" "R" (at 2.032 0 90) (effects (font (size 1.27 1.27))))
+      (property "Value" "R" (at 0 0 90) (effects (font (size 1.27 1.27))))
+      (symbol "R_1_1"
+        (pin passive line (at 0 3.81 270) (length 1.27) (name "~" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
+        (pin passive line (at 0 -3.81 90) (length 1.27) (name "~" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
+      )
+    )
+    (symbol "Device:C" (pin_numbers hide) (in_bom yes) (on_board yes)
+      (property "Reference" "C" (at 0.635 2.54 0) (effects (font (size 1.27 1.27))))
+      (symbol "C_1_1"
+        (pin passive line (at 0 3.81 270) (length 2.794) (name "~" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
+        (pin passive line (at 0 -3.81 90) (length 2.794) (name "~" (effects (font (size 1.27 1.27)))) (number "2" (effects (font (size 1.27 1.27)))))
+      )
+    )
+    (symbol "power:GND" (power) (pin_names (offset 0)) (in_bom yes) (on_board yes)
+      (property "Reference" "#PWR" (at 0 -6.35 0) (effects (font (size 1.27 1.27)) hide))
+      (property "Value" "GND" (at 0 -3.81 0) (effects (font (size 1.27 1.27))))
+      (symbol "GND_1_1"
+        (pin power_in line (at 0 0 270) (length 0) hide (name "GND" (effects (font (size 1.27 1.27)))) (number "1" (effects (font (size 1.27 1.27)))))
+      )
+    )
+  )
+'''
+
+# Distance from a Device:R or Device:C symbol's origin to its pins
+PIN_OFFSET = 3.81
+
+_uuids = itertools.count(1)
+
+
+def new_uuid() -> str:
+    """Get a UUID-shaped string unique within the test run."""
+    return f"00000000-0000-4000-8000-{next(_uuids):012d}"
+
+
+def symbol(lib_id: str, reference: str, value: str, x: float, y: float,
+           footprint: str = "", instances: Optional[Sequence[Tuple[str, str]]] = None,
+           uuid: Optional[str] = None) -> str:
+    """Build a placed symbol.
+
+    Args:
+        lib_id: Library symbol, e.g. "Device:R"
+        reference: Reference designator
+        value: Value property
+        x: X position in mm; pins of R and C are PIN_OFFSET above and below
+        y: Y position in mm
+        footprint: Footprint property
+        instances: (sheet path, reference) pairs for symbols on sub-sheets;
+            defaults to the root sheet
+        uuid: Symbol UUID; a new one by default
+
+    Returns:
+        S-expression text
+    """
+    paths = "".join(f'(path "{path}" (reference "{ref}") (unit 1))'
+                    for path, ref in instances or [("/ROOT", reference)])
+    return (f'  (symbol (lib_id "{lib_id}") (at {x:g} {y:g} 0) (unit 1) (uuid "{uuid or new_uuid()}")\n'
+            f'    (property "Reference" "{reference}" (at 0 0 0)) (property "Value" "{value}" (at 0 0 0))\n'
+            f'    (property "Footprint" "{footprint}" (at 0 0 0))\n'
+            f'    (instances (project "test" {paths})))\n')
+
+
+def wire(x1: float, y1: float, x2: float, y2: float) -> str:
+    """Build a wire segment."""
+    return f'  (wire (pts (xy {x1:g} {y1:g}) (xy {x2:g} {y2:g})) (uuid "{new_uuid()}"))\n'
+
+
+def label(name: str, x: float, y: float, kind: str = "label") -> str:
+    """Build a local, global or hierarchical label."""
+    shape = "" if kind == "label" else " (shape input)"
+    return f'  ({kind} "{name}"{shape} (at {x:g} {y:g} 0) (uuid "{new_uuid()}"))\n'
+
+
+def sheet(uuid: str, name: str, file: str, pins: Iterable[Tuple[str, float, float]] = ()) -> str:
+    """Build a sheet placement with (name, x, y) pins."""
+    pin_text = "".join(f' (pin "{pin}" bidirectional (at {x:g} {y:g} 180) (uuid "{new_uuid()}"))'
+                       for pin, x, y in pins)
+    return (f'  (sheet (at 0 0) (size 10 10) (uuid "{uuid}") (property "Sheetname" "{name}" (at 0 0 0))'
+            f' (property "Sheetfile" "{file}" (at 0 0 0)){pin_text})\n')
+
+
+def schematic(*items: str, uuid: str = "ROOT") -> str:
+    """Build a schematic file from items."""
+    return (f'(kicad_sch\n  (version 20231120)\n  (generator "eeschema")\n  (uuid "{uuid}")\n'
+            f'{LIB_SYMBOLS}{"".join(items)})\n')
+
+
+def write(path: str, text: str) -> str:
+    """Write a file, creating its directory; returns the path."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+
+def divider(count: int, uuid: str = "ROOT") -> str:
+    """Build a sheet of ``count`` R-C pairs, each R and C joined by net SIGn and C to GND.
+
+    The top pin of every resistor connects to net VIN through a label.
+    """
+    items = []
+    for n in range(1, count + 1):
+        x = (n % 100) * 20.32
+        y = (n // 100) * 30.48
+        items.append(symbol("Device:R", f"R{n}", "10k", x, y, footprint="Resistor_SMD:R_0402_1005Metric"))
+        items.append(symbol("Device:C", f"C{n}", "100n", x, y + 15.24, footprint="Capacitor_SMD:C_0402_1005Metric"))
+        items.append(wire(x, y + PIN_OFFSET, x, y + 15.24 - PIN_OFFSET))
+        items.append(label(f"SIG{n}", x, y + PIN_OFFSET))
+        items.append(label("VIN", x, y - PIN_OFFSET))
+        items.append(symbol("power:GND", f"#PWR{n}", "GND", x, y + 15.24 + PIN_OFFSET))
+    return schematic(*items, uuid=uuid)
+
+
+def hierarchical_project(directory: str, sub_value: str = "10k") -> str:
+    """Write a root schematic with one sub-sheet holding resistor R1.
+
+    R1's top pin reaches the root through hierarchical label IN, which the
+    root connects to global label VIN.
+
+    Returns:
+        Path of the root schematic
+    """
+    write(os.path.join(directory, "sub.kicad_sch"), schematic(
+        symbol("Device:R", "R1", sub_value, 100, 100, instances=[("/ROOT/S1", "R1")]),
+        label("IN", 100, 100 - PIN_OFFSET, "hierarchical_label"),
+        uuid="SUB"))
+    return write(os.path.join(directory, "root.kicad_sch"), schematic(
+        sheet("S1", "Channel", "sub.kicad_sch", [("IN", 50, 60)]),
+        label("VIN", 50, 60, "global_label")))
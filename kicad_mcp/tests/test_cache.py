@@ -0,0 +1,169 @@
+"""
+Tests for the in-memory parse cache and the persistent disk cache.
+"""
+import os
+import shutil
+
+from kicad_mcp.utils.disk_cache import DiskCache
+from kicad_mcp.utils.netlist_parser import extract_netlist
+from kicad_mcp.utils.parse_cache import ParseCache, estimate_size
+from tests.schematics import hierarchical_project, write
+
+
+def test_copied_project_with_changed_sub_sheet_is_not_served_from_disk(tmp_path):
+    original = hierarchical_project(str(tmp_path / "original"), sub_value="10k")
+    store = DiskCache(str(tmp_path / "cache"))
+    netlist = extract_netlist(original, cache=ParseCache(store=store))
+    assert netlist["components"]["R1"]["value"] == "10k"
+
+    # Same root schematic content, different sub-sheet
+    shutil.copytree(tmp_path / "original", tmp_path / "copy")
+    copy = str(tmp_path / "copy" / "root.kicad_sch")
+    sub_sheet = tmp_path / "copy" / "sub.kicad_sch"
+    sub_sheet.write_text(sub_sheet.read_text().replace('"10k"', '"22k"'))
+
+    # A new process: empty memory cache, same disk cache
+    netlist = extract_netlist(copy, cache=ParseCache(store=DiskCache(str(tmp_path / "cache"))))
+    assert netlist["components"]["R1"]["value"] == "22k"
+    assert all(sheet["file"].startswith(str(tmp_path / "copy")) for sheet in netlist["sheets"])
+
+
+def test_disk_cache_key_includes_source_path(tmp_path):
+    first = write(str(tmp_path / "a" / "board.txt"), "same")
+    second = write(str(tmp_path / "b" / "board.txt"), "same")
+    store = DiskCache(str(tmp_path / "cache"))
+    store.put("result", 1, first, {"from": "a"})
+
+    assert store.get("result", 1, first) == ({"from": "a"}, [])
+    assert store.get("result", 1, second) is None
+
+
+def _touch_later(path: str) -> None:
+    """Give a file a modification time after its current one."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def test_parse_cache_hit_and_miss(tmp_path):
+    source = write(str(tmp_path / "a.kicad_sch"), "one")
+    cache = ParseCache()
+
+    assert cache.get("netlist", source) is None
+    cache.put("netlist", source, {"value": 1})
+    assert cache.get("netlist", source) == {"value": 1}
+    assert cache.get("netlist", source, version=2) is None
+    assert cache.get("patterns", source) is None
+
+    write(source, "two!")
+    assert cache.get("netlist", source) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 4, 0)
+
+
+def test_parse_cache_checks_dependencies(tmp_path):
+    root = write(str(tmp_path / "root.kicad_sch"), "root")
+    sub = write(str(tmp_path / "sub.kicad_sch"), "sub")
+    cache = ParseCache()
+    cache.put("netlist", root, "result", dependencies=[sub])
+
+    assert cache.get("netlist", root) == "result"
+    os.unlink(sub)
+    assert cache.get("netlist", root) is None
+
+
+def test_parse_cache_content_verification(tmp_path):
+    source = write(str(tmp_path / "a.kicad_sch"), "same")
+    plain = ParseCache()
+    verified = ParseCache(verify_content=True)
+    for cache in (plain, verified):
+        cache.put("netlist", source, "result")
+
+    # Saved again without changes
+    _touch_later(source)
+    assert plain.get("netlist", source) is None
+    assert verified.get("netlist", source) == "result"
+
+    # Same size, other content
+    write(source, "diff")
+    _touch_later(source)
+    assert verified.get("netlist", source) is None
+
+
+def test_parse_cache_evicts_least_recently_used(tmp_path):
+    files = [write(str(tmp_path / f"{n}.kicad_sch"), str(n)) for n in range(3)]
+    value = list(range(1000))
+    cache = ParseCache(max_bytes=2 * estimate_size(value) + 100)
+
+    cache.put("netlist", files[0], value)
+    cache.put("netlist", files[1], value)
+    assert cache.get("netlist", files[0]) is value
+    cache.put("netlist", files[2], value)
+
+    assert cache.get("netlist", files[1]) is None
+    assert cache.get("netlist", files[0]) is value
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate(files[0])
+    assert cache.get("netlist", files[0]) is None
+
+
+def test_parse_cache_falls_back_to_disk(tmp_path):
+    source = write(str(tmp_path / "a.kicad_sch"), "content")
+    store = str(tmp_path / "cache")
+    ParseCache(store=DiskCache(store)).put("netlist", source, {"value": 1}, version=3)
+
+    # A new process
+    cache = ParseCache(store=DiskCache(store))
+    assert cache.get("netlist", source, version=3) == {"value": 1}
+    assert cache.get("netlist", source, version=3) == {"value": 1}
+    assert cache.get("netlist", source, version=4) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["store_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_disk_cache_hit_and_miss(tmp_path):
+    root = write(str(tmp_path / "root.kicad_sch"), "root")
+    sub = write(str(tmp_path / "sub.kicad_sch"), "sub")
+    store = DiskCache(str(tmp_path / "cache"))
+
+    assert store.get("netlist", 1, root) is None
+    store.put("netlist", 1, root, [1, 2, 3], dependencies=[sub])
+    assert store.get("netlist", 1, root) == ([1, 2, 3], [os.path.abspath(sub)])
+    assert store.get("netlist", 2, root) is None
+
+    # Touching a file without changing it keeps the artifact valid
+    _touch_later(sub)
+    assert store.get("netlist", 1, root) is not None
+
+    write(sub, "changed")
+    assert store.get("netlist", 1, root) is None
+    write(sub, "sub")
+    write(root, "changed")
+    assert store.get("netlist", 1, root) is None
+    assert (store.hits, store.misses) == (2, 4)
+
+
+def test_disk_cache_discards_unreadable_artifacts(tmp_path):
+    source = write(str(tmp_path / "a.kicad_sch"), "content")
+    store = DiskCache(str(tmp_path / "cache"))
+    store.put("netlist", 1, source, "result")
+    artifact = store._artifact_path("netlist", 1, os.path.abspath(source), store.digest(source))
+    write(artifact, "garbage")
+
+    assert store.get("netlist", 1, source) is None
+    assert not os.path.exists(artifact)
+
+
+def test_disk_cache_collects_least_recently_used(tmp_path):
+    files = [write(str(tmp_path / f"{n}.kicad_sch"), str(n)) for n in range(4)]
+    store = DiskCache(str(tmp_path / "cache"), max_bytes=10000)
+    value = os.urandom(3000)
+    for n, path in enumerate(files):
+        store.put("netlist", 1, path, value)
+        # Distinct last-use times, oldest first
+        artifact = store._artifact_path("netlist", 1, os.path.abspath(path), store.digest(path))
+        os.utime(artifact, (n, n))
+
+    assert store.stats()["bytes"] <= 10000
+    assert store.get("netlist", 1, files[0]) is None
+    assert store.get("netlist", 1, files[3]) is not None
@@ -0,0 +1,160 @@
+"""
+Tests for the kicad-cli job scheduler.
+"""
+import asyncio
+
+import pytest
+
+from kicad_mcp.utils.cli_scheduler import PRIORITY_BATCH, PRIORITY_INTERACTIVE, CliScheduler
+
+
+async def settle() -> None:
+    """Let every ready task run until it blocks."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+class Jobs:
+    """Jobs that record when they start and finish once released."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.started = []
+        self.running = 0
+        self.peak = 0
+
+    def job(self, name):
+        async def run():
+            self.started.append(name)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await self.gate.wait()
+            finally:
+                self.running -= 1
+            return name
+        return run
+
+
+def test_concurrency_limit():
+    async def main():
+        scheduler, jobs = CliScheduler(max_jobs=2), Jobs()
+        tasks = [asyncio.create_task(scheduler.run(jobs.job(n))) for n in range(6)]
+        await settle()
+        stats = scheduler.stats()
+        jobs.gate.set()
+        return await asyncio.gather(*tasks), jobs, stats, scheduler.stats()
+
+    results, jobs, during, after = asyncio.run(main())
+
+    assert results == list(range(6))
+    assert jobs.peak == 2
+    assert (during["running"], during["queue_depth"], during["queued"]["batch"]) == (2, 4, 4)
+    assert (after["running"], after["queue_depth"], after["completed"], after["peak_queue_depth"]) == (0, 0, 6, 4)
+
+
+def test_interactive_jobs_start_before_batch():
+    async def main():
+        scheduler, jobs = CliScheduler(max_jobs=1), Jobs()
+        tasks = [asyncio.create_task(scheduler.run(jobs.job("first")))]
+        await settle()
+        for name, priority in [("batch1", PRIORITY_BATCH), ("batch2", PRIORITY_BATCH),
+                               ("interactive1", PRIORITY_INTERACTIVE), ("interactive2", PRIORITY_INTERACTIVE)]:
+            tasks.append(asyncio.create_task(scheduler.run(jobs.job(name), priority)))
+            await settle()
+        jobs.gate.set()
+        await asyncio.gather(*tasks)
+        return jobs.started
+
+    assert asyncio.run(main()) == ["first", "interactive1", "interactive2", "batch1", "batch2"]
+
+
+def test_identical_jobs_are_merged():
+    async def main():
+        scheduler, jobs = CliScheduler(max_jobs=1), Jobs()
+        tasks = [asyncio.create_task(scheduler.run(jobs.job(n), key="drc")) for n in range(3)]
+        tasks.append(asyncio.create_task(scheduler.run(jobs.job("other"), key="other")))
+        await settle()
+        jobs.gate.set()
+        results = await asyncio.gather(*tasks)
+        # Once finished, the same key runs again
+        again = await scheduler.run(jobs.job("again"), key="drc")
+        return results, again, jobs.started, scheduler.stats()
+
+    results, again, started, stats = asyncio.run(main())
+
+    assert results == [0, 0, 0, "other"]
+    assert (again, started) == ("again", [0, "other", "again"])
+    assert (stats["submitted"], stats["merged"]) == (3, 2)
+
+
+def test_failures_reach_every_waiter():
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("kicad-cli crashed")
+
+    async def main():
+        scheduler = CliScheduler(max_jobs=1)
+        results = await asyncio.gather(*(scheduler.run(fail, key="drc") for _ in range(2)), return_exceptions=True)
+        return results, scheduler.stats()
+
+    results, stats = asyncio.run(main())
+
+    assert [str(error) for error in results] == ["kicad-cli crashed"] * 2
+    assert (stats["failed"], stats["running"]) == (1, 0)
+
+
+def test_cancelling_one_waiter_keeps_the_shared_job():
+    async def main():
+        scheduler, jobs = CliScheduler(max_jobs=1), Jobs()
+        first = asyncio.create_task(scheduler.run(jobs.job("drc"), key="drc"))
+        second = asyncio.create_task(scheduler.run(jobs.job("drc"), key="drc"))
+        await settle()
+        first.cancel()
+        await settle()
+        jobs.gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second, jobs.started
+
+    assert asyncio.run(main()) == ("drc", ["drc"])
+
+
+def test_cancelling_the_last_waiter_frees_the_slot():
+    async def main():
+        scheduler, jobs = CliScheduler(max_jobs=1), Jobs()
+        waiters = [asyncio.create_task(scheduler.run(jobs.job("stuck"), key="drc")) for _ in range(2)]
+        await settle()
+        queued = asyncio.create_task(scheduler.run(jobs.job("queued")))
+        await settle()
+        for waiter in waiters:
+            waiter.cancel()
+        await settle()
+        running = scheduler.stats()["running"]
+        # The queued job got the slot; the gate was never opened for "stuck"
+        started = list(jobs.started)
+        jobs.gate.set()
+        return await queued, started, running, scheduler.stats()
+
+    result, started, running, stats = asyncio.run(main())
+
+    assert (result, started, running) == ("queued", ["stuck", "queued"], 1)
+    assert (stats["running"], stats["cancelled"], stats["completed"]) == (0, 1, 1)
+
+
+def test_cancelled_queued_job_leaves_the_queue():
+    async def main():
+        scheduler, jobs = CliScheduler(max_jobs=1), Jobs()
+        running = asyncio.create_task(scheduler.run(jobs.job("running")))
+        await settle()
+        queued = asyncio.create_task(scheduler.run(jobs.job("queued")))
+        await settle()
+        queued.cancel()
+        await settle()
+        depth = scheduler.stats()["queue_depth"]
+        jobs.gate.set()
+        await running
+        follow_up = await scheduler.run(jobs.job("next"))
+        return depth, follow_up, jobs.started, scheduler.stats()["running"]
+
+    assert asyncio.run(main()) == (0, "next", ["running", "next"], 0)
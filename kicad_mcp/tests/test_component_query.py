@@ -0,0 +1,74 @@
+"""
+Tests for component filter expressions and the component index.
+"""
+import pytest
+
+from kicad_mcp.utils.component_index import ComponentIndex, parse_query
+
+COMPONENTS = {ref: {"reference": ref, **fields} for ref, fields in {
+    "R1": {"value": "4k7", "footprint": "Resistor_SMD:R_0402_1005Metric", "lib_id": "Device:R",
+           "properties": {"MPN": "RC0402FR-074K7L"}},
+    "R2": {"value": "10k", "footprint": "Resistor_SMD:R_0603_1608Metric", "lib_id": "Device:R"},
+    "C1": {"value": "100n", "footprint": "Capacitor_SMD:C_0402_1005Metric", "lib_id": "Device:C",
+           "properties": {"mpn": "GRM155R71C104KA88D"}},
+    "C2": {"value": "10uF", "footprint": "Capacitor_SMD:C_0805_2012Metric", "lib_id": "Device:C"},
+    "C3": {"value": "2.2u", "footprint": "Capacitor_SMD:C_0402_1005Metric", "lib_id": "Device:C"},
+    "U1": {"value": "STM32F103C8Tx", "footprint": "Package_QFP:LQFP-48_7x7mm_P0.5mm",
+           "lib_id": "MCU_ST_STM32F1:STM32F103C8Tx"},
+}.items()}
+
+
+@pytest.mark.parametrize("expression, tree", [
+    ("value", ("set", "value")),
+    ("value = 10k", ("cmp", "value", "=", "10k")),
+    ("value == 10k", ("cmp", "value", "=", "10k")),
+    ('footprint ~ "*0402*"', ("cmp", "footprint", "~", "*0402*")),
+    ("'Part Number' != x", ("cmp", "Part Number", "!=", "x")),
+    ("a or b and c", ("or", ("set", "a"), ("and", ("set", "b"), ("set", "c")))),
+    ("(a or b) and not c", ("and", ("or", ("set", "a"), ("set", "b")), ("not", ("set", "c")))),
+    ("NOT not a", ("not", ("not", ("set", "a")))),
+    ("value>=1u", ("cmp", "value", ">=", "1u")),
+])
+def test_parse_query(expression, tree):
+    assert parse_query(expression) == tree
+
+
+@pytest.mark.parametrize("expression", [
+    "", "   ", "value =", "(value", "value)", "not", "= 10k", "value = 10k extra", 'value = "open',
+])
+def test_parse_query_rejects_malformed_expressions(expression):
+    with pytest.raises(ValueError):
+        parse_query(expression)
+
+
+@pytest.mark.parametrize("expression, refs", [
+    ('ref ~ "C*"', ["C1", "C2", "C3"]),
+    ('footprint ~ "*0402*"', ["R1", "C1", "C3"]),
+    ('footprint ~ "*0402*" and value > 1u', ["R1", "C3"]),
+    ('ref ~ "C*" and footprint ~ "*0402*" and value > 1u', ["C3"]),
+    ("value = 4.7k", ["R1"]),
+    ("value = 10K", ["R2"]),
+    ("value <= 100n", ["C1"]),
+    ("value > 1k and lib = Device:R", ["R1", "R2"]),
+    ("not lib ~ Device:*", ["U1"]),
+    ('lib !~ "device:*"', ["U1"]),
+    ("MPN", ["R1", "C1"]),
+    ("mpn ~ GRM*", ["C1"]),
+    ("ref = R1 or ref = U1", ["R1", "U1"]),
+    ("value != 10k", ["R1", "C1", "C2", "C3", "U1"]),
+    ("sheet", []),
+])
+def test_query(expression, refs):
+    assert ComponentIndex(COMPONENTS).query(expression) == refs
+
+
+def test_ordering_comparison_needs_a_number():
+    with pytest.raises(ValueError):
+        ComponentIndex(COMPONENTS).query("value > big")
+
+
+def test_empty_index_still_checks_the_expression():
+    index = ComponentIndex({})
+    assert index.query("value > 1k") == []
+    with pytest.raises(ValueError):
+        index.query("value >")
@@ -0,0 +1,101 @@
+"""
+Tests for the persistent component search index.
+"""
+import pytest
+
+from kicad_mcp.utils import netlist_parser
+from kicad_mcp.utils.component_search import ComponentSearchIndex, index_words
+from tests.schematics import divider, schematic, symbol, write
+
+
+@pytest.fixture(autouse=True)
+def no_parse_cache(monkeypatch):
+    monkeypatch.setattr(netlist_parser, "get_parse_cache", lambda: None)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ScratchIndex(str(tmp_path / "index" / "components.sqlite3"))
+
+
+class ScratchIndex(ComponentSearchIndex):
+    """Index with a helper returning the references a query finds, by project name."""
+
+    def refs(self, query, field=None):
+        return {project["name"]: sorted(component["reference"] for component in project["components"])
+                for project in self.search(query, field=field)["projects"]}
+
+
+def project(directory, name: str, text: str) -> dict:
+    write(str(directory / name / f"{name}.kicad_sch"), text)
+    return {"name": name, "path": str(directory / name / f"{name}.kicad_pro")}
+
+
+def regulator(value: str = "TPS54331DDAR") -> str:
+    return schematic(symbol("Device:R", "U1", value, 0, 0, footprint="Package_SO:SOIC-8_3.9x4.9mm"))
+
+
+def test_index_words():
+    assert index_words("Package_SO:SOIC-8_3.9x4.9mm") == [
+        "package_so:soic-8_3.9x4.9mm", "package", "so", "soic-8", "3.9x4.9mm"]
+    assert index_words(" ~ ") == []
+
+
+def test_update_is_incremental(tmp_path, index):
+    projects = [project(tmp_path, "power", regulator()), project(tmp_path, "filter", divider(2))]
+
+    assert index.update(projects) == {"indexed": 2, "unchanged": 0, "removed": 0, "failed": 0}
+    assert index.update(projects) == {"indexed": 0, "unchanged": 2, "removed": 0, "failed": 0}
+    assert index.refs("TPS54331") == {"power": ["U1"]}
+
+    project(tmp_path, "power", regulator("LM2596S-5.0"))
+    assert index.update(projects) == {"indexed": 1, "unchanged": 1, "removed": 0, "failed": 0}
+    assert index.refs("TPS54331") == {}
+    assert index.refs("lm2596s") == {"power": ["U1"]}
+
+
+def test_projects_no_longer_listed_are_removed(tmp_path, index):
+    power, filter_ = project(tmp_path, "power", regulator()), project(tmp_path, "filter", divider(2))
+    index.update([power, filter_])
+
+    assert index.update([filter_]) == {"indexed": 0, "unchanged": 1, "removed": 1, "failed": 0}
+    assert index.refs("soic") == {}
+    result = index.search("10k")
+    assert (result["indexed_projects"], result["match_count"]) == (1, 2)
+
+
+def test_broken_schematic_counts_as_failed(tmp_path, index):
+    broken = project(tmp_path, "broken", "(kicad_sch (symbol")
+
+    assert index.update([broken])["failed"] == 1
+    # Retried once its files change
+    project(tmp_path, "broken", regulator())
+    assert index.update([broken])["indexed"] == 1
+
+
+def test_words_match_prefixes_and_all_words_must_match(tmp_path, index):
+    index.update([project(tmp_path, "filter", divider(2)), project(tmp_path, "power", regulator())])
+
+    assert index.refs("10") == {"filter": ["C1", "C2", "R1", "R2"]}
+    assert index.refs("10K 0402") == {"filter": ["R1", "R2"]}
+    assert index.refs("10k soic") == {}
+    assert index.refs("Device:") == {"filter": ["C1", "C2", "R1", "R2"], "power": ["U1"]}
+    with pytest.raises(ValueError):
+        index.search(" ,; ")
+
+
+def test_field_filter(tmp_path, index):
+    index.update([project(tmp_path, "filter", divider(2)), project(tmp_path, "power", regulator())])
+
+    assert index.refs("0402", field="footprint") == {"filter": ["C1", "C2", "R1", "R2"]}
+    assert index.refs("0402", field="value") == {}
+    assert index.refs("r", field="lib_id") == {"filter": ["R1", "R2"], "power": ["U1"]}
+    assert index.refs("tps", field="Value") == {"power": ["U1"]}
+
+
+def test_results_are_limited(tmp_path, index):
+    index.update([project(tmp_path, "filter", divider(5))])
+    result = index.search("100n", limit=2)
+
+    assert (result["match_count"], result["truncated"]) == (5, True)
+    assert sum(len(project["components"]) for project in result["projects"]) == 2
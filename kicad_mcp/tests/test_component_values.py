@@ -0,0 +1,49 @@
+"""
+Tests for parsing component values in engineering notation.
+"""
+import math
+
+import pytest
+
+from kicad_mcp.utils.component_utils import (
+    extract_capacitance_value, extract_inductance_value, extract_resistance_value, parse_value, parse_values,
+)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("4.7k", 4700.0), ("4k7", 4700.0), ("4R7", 4.7), ("R47", 0.47), ("2n2", 2.2e-9),
+    ("100nF", 1e-7), ("100 nF", 1e-7), ("10uF 16V", 1e-5), ("1Meg", 1e6), ("1e-6", 1e-6),
+    ("1,5k", 1500.0), ("4,7uF", 4.7e-6), ("0,1", 0.1), ("1,5 kOhm", 1500.0),
+])
+def test_parse_value(value, expected):
+    assert parse_value(value) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("value", [
+    "", "abc", "1.2.3", "4k7,5", "1,000", "1 000", "10.5.1k",
+])
+def test_values_cut_short_are_not_parsed(value):
+    assert parse_value(value) is None
+
+
+def test_parse_values():
+    values = parse_values(["10k", "1,5k", 2.2, "1,000", None, "10k"])
+    assert values[:3].tolist() == [10000.0, 1500.0, 2.2]
+    assert all(math.isnan(value) for value in values[3:5])
+    assert values[5] == 10000.0
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("10k", (10.0, "k")), ("4k7", (4.7, "k")), ("4700", (4.7, "k")), ("1,5k", (1.5, "k")),
+    ("100", (100.0, "Ω")), ("2M2", (2.2, "M")), ("1,5", (1.5, "Ω")),
+    ("100n", (None, None)), ("1,5,6k", (None, None)),
+])
+def test_extract_resistance_value(value, expected):
+    assert extract_resistance_value(value) == expected
+
+
+def test_extract_capacitance_and_inductance_values():
+    assert extract_capacitance_value("4,7uF") == (4.7, "μF")
+    assert extract_capacitance_value("100") == (None, None)
+    assert extract_inductance_value("2u2") == (2.2, "μH")
+    assert extract_inductance_value("10mH") == (10.0, "mH")
@@ -0,0 +1,149 @@
+"""
+Tests for the union-find connectivity engine and the nets built from it.
+"""
+from kicad_mcp.utils.connectivity import IncrementalConnectivity, UnionFind, choose_net_name, default_net_name
+from kicad_mcp.utils.netlist_parser import extract_netlist
+from tests.schematics import PIN_OFFSET, divider, label, schematic, symbol, wire, write
+
+
+def _pin_groups(groups):
+    return sorted(sorted(group["pins"]) for group in groups.values() if group["pins"])
+
+
+def test_union_find_merges_sets():
+    uf = UnionFind()
+    nodes = [uf.add() for _ in range(6)]
+    uf.union(nodes[0], nodes[1])
+    uf.union(nodes[2], nodes[3])
+    uf.union(nodes[1], nodes[3])
+
+    assert len(uf) == 6
+    assert len({uf.find(node) for node in nodes[:4]}) == 1
+    assert uf.find(nodes[4]) != uf.find(nodes[5])
+    assert uf.union(nodes[0], nodes[2]) == uf.find(nodes[0])
+
+
+def test_union_find_long_chain():
+    uf = UnionFind()
+    nodes = [uf.add() for _ in range(100000)]
+    for a, b in zip(nodes, nodes[1:]):
+        uf.union(b, a)
+    assert uf.find(nodes[-1]) == uf.find(nodes[0])
+
+
+def test_wire_ends_connect_and_junctions_join_wires():
+    graph = IncrementalConnectivity()
+    graph.add_wire("W1", 0, 0, 10, 0)
+    graph.add_wire("W2", 10, 0, 10, 10)
+    graph.add_pin("R1", 0, 0, "R1.1")
+    graph.add_pin("R2", 10, 10, "R2.1")
+    # A pin or wire end touching the middle of a wire needs a junction
+    graph.add_pin("R3", 5, 0, "R3.1")
+    graph.add_pin("R4", 20, 0, "R4.1")
+    graph.add_wire("W3", 5, 0, 5, -10)
+    graph.add_pin("R5", 5, -10, "R5.1")
+    assert _pin_groups(graph.resolve()) == [["R1.1", "R2.1"], ["R3.1", "R5.1"], ["R4.1"]]
+
+    graph.add_junction("J1", 5, 0)
+    assert _pin_groups(graph.resolve()) == [["R1.1", "R2.1", "R3.1", "R5.1"], ["R4.1"]]
+
+    graph.remove("J1")
+    assert _pin_groups(graph.resolve()) == [["R1.1", "R2.1"], ["R3.1", "R5.1"], ["R4.1"]]
+
+
+def test_labels_join_wires_they_sit_on():
+    graph = IncrementalConnectivity()
+    graph.add_wire("W1", 0, 0, 20, 0)
+    graph.add_pin("R1", 0, 0, "R1.1")
+    graph.add_label("L1", 10, 0, "local", "SIG")
+    graph.add_pin("R2", 50, 50, "R2.1")
+    graph.add_label("L2", 50, 50, "local", "SIG")
+
+    groups = graph.resolve()
+    assert _pin_groups(groups) == [["R1.1", "R2.1"]]
+    assert [group["names"] for group in groups.values()] == [[("local", "SIG")]]
+
+
+def test_equal_labels_merge_within_scope():
+    graph = IncrementalConnectivity()
+    graph.add_pin("R1", 0, 0, "R1.1")
+    graph.add_label("L1", 0, 0, "local", "SIG", scope="sheet1")
+    graph.add_pin("R2", 50, 50, "R2.1")
+    graph.add_label("L2", 50, 50, "local", "SIG", scope="sheet1")
+    graph.add_pin("R3", 90, 90, "R3.1")
+    graph.add_label("L3", 90, 90, "local", "SIG", scope="sheet2")
+
+    groups = graph.resolve()
+    assert _pin_groups(groups) == [["R1.1", "R2.1"], ["R3.1"]]
+    assert all(group["names"] == [("local", "SIG")] for group in groups.values())
+
+
+def test_points_and_pins_at():
+    graph = IncrementalConnectivity()
+    graph.add_pin("R1", 0, 0, "R1.1")
+    graph.add_pin("R2", 0, 0, "R2.1")
+    graph.add_point("S1", 0, 0, "sheet pin")
+
+    [group] = graph.resolve().values()
+    assert group["points"] == ["sheet pin"]
+    assert sorted(graph.pins_at(0, 0)) == ["R1.1", "R2.1"]
+    assert graph.pins_at(1, 0) == []
+
+
+def test_unchanged_groups_keep_their_ids():
+    graph = IncrementalConnectivity()
+    graph.add_pin("R1", 0, 0, "R1.1")
+    graph.add_pin("R2", 100, 0, "R2.1")
+    before = dict(graph.resolve())
+
+    graph.add_wire("W1", 100, 0, 110, 0)
+    graph.add_pin("R3", 110, 0, "R3.1")
+    after = graph.resolve()
+
+    [kept] = [group for group, summary in before.items() if summary["pins"] == ["R1.1"]]
+    assert after[kept] is before[kept]
+    assert _pin_groups(after) == [["R1.1"], ["R2.1", "R3.1"]]
+
+
+def test_incremental_connectivity_splits_and_joins_groups():
+    graph = IncrementalConnectivity()
+    graph.add_pin("R1", 0, 0, "R1.1")
+    graph.add_pin("R2", 10, 0, "R2.1")
+    graph.add_wire("W1", 0, 0, 10, 0)
+    assert _pin_groups(graph.resolve()) == [["R1.1", "R2.1"]]
+
+    graph.remove("W1")
+    assert _pin_groups(graph.resolve()) == [["R1.1"], ["R2.1"]]
+
+    graph.add_wire("W2", 0, 0, 10, 0)
+    assert _pin_groups(graph.resolve()) == [["R1.1", "R2.1"]]
+
+
+def test_net_names():
+    assert choose_net_name([("local", "/SIG"), ("global", "VIN"), ("power", "GND")]) == "VIN"
+    assert choose_net_name([("local", "/Sub/A"), ("local", "/B")]) == "/B"
+    assert choose_net_name([]) is None
+    assert default_net_name([("R2", "1"), ("R1", "2")]) == "Net-(R1-Pad2)"
+    assert default_net_name([("R1", "1")]) == "unconnected-(R1-Pad1)"
+
+
+def test_schematic_nets(tmp_path):
+    netlist = extract_netlist(write(str(tmp_path / "divider.kicad_sch"), divider(3)), cache=None)
+    nets = {name: sorted((pin.component, pin.pin) for pin in pins) for name, pins in netlist["nets"].items()}
+
+    assert nets["GND"] == [("C1", "2"), ("C2", "2"), ("C3", "2")]
+    assert nets["/VIN"] == [("R1", "1"), ("R2", "1"), ("R3", "1")]
+    assert nets["/SIG2"] == [("C2", "1"), ("R2", "2")]
+
+
+def test_unlabelled_wire_gets_default_name(tmp_path):
+    path = write(str(tmp_path / "pair.kicad_sch"), schematic(
+        symbol("Device:R", "R1", "1k", 0, 0),
+        symbol("Device:R", "R2", "1k", 20, 0),
+        wire(0, PIN_OFFSET, 20, PIN_OFFSET),
+        label("IN", 0, -PIN_OFFSET)))
+    nets = extract_netlist(path, cache=None)["nets"]
+
+    assert sorted((pin.component, pin.pin) for pin in nets["Net-(R1-Pad2)"]) == [("R1", "2"), ("R2", "2")]
+    assert [(pin.component, pin.pin) for pin in nets["/IN"]] == [("R1", "1")]
+    assert "unconnected-(R2-Pad1)" in nets
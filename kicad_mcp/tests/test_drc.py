@@ -0,0 +1,124 @@
+"""
+Tests for running and caching DRC checks through kicad-cli.
+
+A small Python script stands in for kicad-cli. It reports one clearance
+violation per line of the board's .kicad_dru file, so the result tells
+which rules a check was run with.
+"""
+import asyncio
+import os
+import shutil
+import stat
+import sys
+
+import pytest
+
+from kicad_mcp.tools.drc_impl import cli_drc
+from kicad_mcp.utils.cli_scheduler import job_key
+from kicad_mcp.utils.disk_cache import DiskCache
+from kicad_mcp.utils.parse_cache import ParseCache
+from tests.schematics import write
+
+FAKE_KICAD_CLI = '''#!{python}
+import json, os, sys
+args = sys.argv[1:]
+if args == ["version"]:
+    print("9.0.0")
+    sys.exit(0)
+output, board = args[args.index("--output") + 1], args[-1]
+with open(os.environ["FAKE_KICAD_CLI_LOG"], "a") as f:
+    f.write(board + "\\n")
+rules = os.path.splitext(board)[0] + ".kicad_dru"
+lines = open(rules).read().splitlines() if os.path.exists(rules) else []
+violations = [{{"type": "clearance", "message": "Clearance violation", "severity": "error",
+               "items": [{{"uuid": str(n), "pos": {{"x": n, "y": 0}}}}]}} for n in range(len(lines))]
+json.dump({{"violations": violations}}, open(output, "w"))
+'''
+
+
+@pytest.fixture
+def kicad_cli(tmp_path, monkeypatch):
+    """Install the fake kicad-cli; returns a function counting its DRC runs."""
+    path = write(str(tmp_path / "bin" / "kicad-cli"), FAKE_KICAD_CLI.format(python=sys.executable))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+    monkeypatch.setattr(cli_drc, "find_kicad_cli", lambda: path)
+    log = str(tmp_path / "bin" / "runs")
+    monkeypatch.setenv("FAKE_KICAD_CLI_LOG", log)
+
+    def runs() -> int:
+        try:
+            with open(log) as f:
+                return len(f.readlines())
+        except OSError:
+            return 0
+    return runs
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """Install a parse cache backed by a disk cache in the test directory."""
+    cache = ParseCache(store=DiskCache(str(tmp_path / "cache")))
+    monkeypatch.setattr(cli_drc, "get_parse_cache", lambda: cache)
+    return cache
+
+
+def write_board(directory, rules: int) -> str:
+    """Write a board with a project file and a rules file of ``rules`` lines."""
+    write(os.path.join(directory, "board.kicad_pro"), "{}")
+    write(os.path.join(directory, "board.kicad_dru"), "(rule)\n" * rules)
+    return write(os.path.join(directory, "board.kicad_pcb"), "(kicad_pcb (version 20240108))\n")
+
+
+def run_drc(pcb_file: str, **kwargs):
+    return asyncio.run(cli_drc.run_drc_via_cli(pcb_file, **kwargs))
+
+
+def test_unchanged_board_is_served_from_cache(tmp_path, kicad_cli, cache):
+    board = write_board(str(tmp_path / "project"), rules=2)
+
+    first = run_drc(board)
+    second = run_drc(board)
+    forced = run_drc(board, force=True)
+
+    assert (first["cached"], second["cached"], forced["cached"]) == (False, True, False)
+    assert second["total_violations"] == first["total_violations"] == 2
+    assert kicad_cli() == 2
+
+
+def test_changed_rules_run_again(tmp_path, kicad_cli, cache):
+    board = write_board(str(tmp_path / "project"), rules=2)
+    run_drc(board)
+
+    write_board(str(tmp_path / "project"), rules=5)
+    result = run_drc(board)
+
+    assert result["cached"] is False
+    assert result["total_violations"] == 5
+
+
+def test_copied_board_with_other_rules_is_not_served_from_disk(tmp_path, kicad_cli, monkeypatch):
+    original = write_board(str(tmp_path / "original"), rules=2)
+    store = str(tmp_path / "cache")
+    monkeypatch.setattr(cli_drc, "get_parse_cache", lambda: ParseCache(store=DiskCache(store)))
+    assert run_drc(original)["total_violations"] == 2
+
+    # Same board content, different design rules next to it
+    shutil.copytree(str(tmp_path / "original"), str(tmp_path / "copy"))
+    copy = os.path.join(str(tmp_path / "copy"), "board.kicad_pcb")
+    write(os.path.join(str(tmp_path / "copy"), "board.kicad_dru"), "(rule)\n" * 7)
+
+    result = run_drc(copy)
+    assert result["cached"] is False
+    assert result["total_violations"] == 7
+    assert result["pcb_file"] == copy
+
+
+def test_job_key_does_not_read_inputs(tmp_path, monkeypatch):
+    board = write(str(tmp_path / "board.kicad_pcb"), "(kicad_pcb)\n")
+    monkeypatch.setattr("builtins.open", lambda *args, **kwargs: pytest.fail("input file was read"))
+
+    key = job_key("drc", "kicad-cli", inputs=[board])
+    assert key == job_key("drc", "kicad-cli", inputs=[os.path.relpath(board)])
+    os.utime(board, ns=(1, 1))
+    assert job_key("drc", "kicad-cli", inputs=[board]) != key
+    assert job_key("drc", "kicad-cli", inputs=[board + ".missing"]) is None
@@ -0,0 +1,145 @@
+"""
+Tests for violation fingerprints and the comparison of DRC checks.
+"""
+import time
+
+import pytest
+
+from kicad_mcp.utils import drc_history
+from kicad_mcp.utils.drc_diff import (
+    StoredSummaries, ViolationSummaries, diff_violations, fingerprint_hex, fingerprint_violation,
+    pack_fingerprints, pack_summaries, unpack_fingerprints, violation_fingerprints,
+)
+from kicad_mcp.utils.drc_history import DrcHistoryStore
+
+
+def violation(kind: str, *items, description: str = "") -> dict:
+    return {
+        "type": kind,
+        "severity": "error",
+        "description": description or kind,
+        "items": [{"uuid": uuid, "pos": {"x": x, "y": y}} for uuid, x, y in items]
+    }
+
+
+CLEARANCE = violation("clearance", ("a", 10.0, 20.0), ("b", 11.0, 20.0))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = DrcHistoryStore(str(tmp_path / "drc_history.sqlite3"))
+    monkeypatch.setattr(drc_history, "_store", store)
+    return store
+
+
+def test_fingerprint_ignores_item_order_and_small_moves():
+    fingerprint = fingerprint_violation(CLEARANCE)
+    swapped = violation("clearance", ("b", 11.0, 20.0), ("a", 10.0, 20.0))
+    nudged = violation("clearance", ("a", 10.02, 20.0), ("b", 11.0, 19.98))
+
+    assert fingerprint_violation(swapped) == fingerprint
+    assert fingerprint_violation(nudged) == fingerprint
+    assert -(1 << 63) <= fingerprint < 1 << 63
+
+
+@pytest.mark.parametrize("other", [
+    violation("clearance", ("a", 10.5, 20.0), ("b", 11.0, 20.0)),
+    violation("clearance", ("a", 10.0, 20.0), ("c", 11.0, 20.0)),
+    violation("track_width", ("a", 10.0, 20.0), ("b", 11.0, 20.0)),
+], ids=["moved", "other item", "other type"])
+def test_fingerprint_changes(other):
+    assert fingerprint_violation(other) != fingerprint_violation(CLEARANCE)
+
+
+def test_fingerprint_hex_round_trip():
+    violations = [CLEARANCE, violation("hole", ("h", 1.0, 2.0)), {"message": "no items"}]
+    fingerprints = violation_fingerprints(violations)
+
+    labelled = [{"fingerprint": fingerprint_hex(fingerprint)} for fingerprint in fingerprints]
+    assert violation_fingerprints(labelled) == fingerprints
+    assert violation_fingerprints([{"fingerprint": fingerprint_hex(-1)}]) == [-1]
+    assert all(len(fingerprint_hex(fingerprint)) == 16 for fingerprint in fingerprints)
+
+
+def test_packing_round_trip():
+    fingerprints = [-(1 << 63), -1, 0, 1, (1 << 63) - 1]
+    assert unpack_fingerprints(pack_fingerprints(fingerprints)) == fingerprints
+
+    violations = [CLEARANCE, violation("hole", ("h", 1.0, 2.0))]
+    stored = StoredSummaries(pack_summaries(violations))
+    assert list(stored) == list(ViolationSummaries(violations))
+    assert stored[1] == {"type": "hole", "severity": "error", "description": "hole",
+                         "position": {"x": 1.0, "y": 2.0}}
+    assert len(StoredSummaries(pack_summaries([]))) == 0
+
+
+def test_diff_violations():
+    kept = [violation("clearance", (f"k{n}", n, 0.0)) for n in range(5)]
+    fixed = [violation("clearance", (f"f{n}", n, 1.0)) for n in range(2)]
+    new = [violation("hole", (f"n{n}", n, 2.0)) for n in range(3)]
+    older, newer = kept + fixed, new[:1] + kept + new[1:]
+
+    diff = diff_violations(violation_fingerprints(newer), ViolationSummaries(newer),
+                           violation_fingerprints(older), ViolationSummaries(older))
+
+    assert (diff["added_count"], diff["resolved_count"], diff["persistent_count"]) == (3, 2, 5)
+    assert diff["added_by_type"] == {"hole": 3}
+    assert diff["resolved_by_type"] == {"clearance": 2}
+    assert [entry["fingerprint"] for entry in diff["added"]] == [
+        fingerprint_hex(fingerprint_violation(item)) for item in new]
+    assert not diff["truncated"]
+
+
+def test_diff_details_are_limited():
+    newer = [violation("clearance", (f"n{n}", n, 0.0)) for n in range(50)]
+    diff = diff_violations(violation_fingerprints(newer), ViolationSummaries(newer), [], [], limit=10)
+
+    assert diff["added_count"] == 50
+    assert len(diff["added"]) == 10
+    assert diff["truncated"]
+
+
+def test_compare_with_previous(store):
+    older = [CLEARANCE, violation("hole", ("h", 1.0, 2.0))]
+    store.add("/p/board.kicad_pro", 2, {"clearance": 1, "hole": 1}, timestamp=1000.0, violations=older)
+
+    current = {
+        "total_violations": 2,
+        "violation_categories": {"clearance": 2},
+        "violations": [CLEARANCE, violation("clearance", ("c", 5.0, 5.0))],
+    }
+    comparison = drc_history.compare_with_previous("/p/board.kicad_pro", current)
+
+    assert comparison["change"] == 0
+    assert comparison["resolved_categories"] == {"hole": 1}
+    assert comparison["changed_categories"]["clearance"]["change"] == 1
+    violations = comparison["violations"]
+    assert (violations["added_count"], violations["resolved_count"], violations["persistent_count"]) == (1, 1, 1)
+    assert violations["resolved"][0]["type"] == "hole"
+    assert drc_history.compare_with_previous("/p/missing.kicad_pro", current) is None
+
+
+def test_compare_checks(store):
+    # Recent checks, so that none is thinned out of the history
+    now = time.time()
+    store.add("/p/board.kicad_pro", 1, {}, timestamp=now - 300, violations=[CLEARANCE])
+    store.add("/p/board.kicad_pro", 0, {}, timestamp=now - 200, violations=[])
+    store.add("/p/board.kicad_pro", 1, {}, timestamp=now - 100, violations=[CLEARANCE])
+
+    latest = drc_history.compare_checks("/p/board.kicad_pro")
+    assert (latest["newer"]["timestamp"], latest["older"]["timestamp"]) == (now - 100, now - 200)
+    assert latest["violations"]["added_count"] == 1
+
+    span = drc_history.compare_checks("/p/board.kicad_pro", newer=now - 100, older=now - 300)
+    assert span["change"] == 0
+    assert span["violations"]["persistent_count"] == 1
+
+    assert drc_history.compare_checks("/p/board.kicad_pro", newer=now - 300) is None
+
+
+def test_compare_checks_needs_violation_details(store):
+    store.add("/p/board.kicad_pro", 3, {}, timestamp=1000.0)
+    store.add("/p/board.kicad_pro", 1, {}, timestamp=2000.0, violations=[CLEARANCE])
+
+    with pytest.raises(ValueError):
+        drc_history.compare_checks("/p/board.kicad_pro")
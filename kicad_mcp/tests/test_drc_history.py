@@ -0,0 +1,127 @@
+"""
+Tests for the SQLite DRC history store.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from kicad_mcp.utils import drc_history
+from kicad_mcp.utils.drc_history import HISTORY_SCHEMA_VERSION, DrcHistoryStore, project_key
+
+DAY = 24 * 3600
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DrcHistoryStore(str(tmp_path / "history" / "drc_history.sqlite3"))
+
+
+def test_add_and_read_entries(store):
+    store.add("/p/board.kicad_pro", 3, {"Clearance": 3}, timestamp=1000.0)
+    store.add("/p/board.kicad_pro", 1, {"Clearance": 1}, timestamp=2000.0)
+    store.add("/p/other.kicad_pro", 9, {}, timestamp=1500.0)
+
+    entries = store.entries("/p/board.kicad_pro")
+    assert [entry["total_violations"] for entry in entries] == [1, 3]
+    assert entries[0]["violation_categories"] == {"Clearance": 1}
+    assert [entry["timestamp"] for entry in store.entries("/p/board.kicad_pro", since=1500.0)] == [2000.0]
+    assert [entry["timestamp"] for entry in store.entries("/p/board.kicad_pro", until=1500.0)] == [1000.0]
+    assert store.entries("/p/missing.kicad_pro") == []
+
+
+def test_project_key_is_stable_across_spellings(tmp_path):
+    project = tmp_path / "board.kicad_pro"
+    project.write_text("{}")
+    spellings = [str(project), str(tmp_path / "." / "board.kicad_pro"), os.path.relpath(str(project))]
+    assert len({project_key(path) for path in spellings}) == 1
+    assert project_key(str(tmp_path / "other.kicad_pro")) != project_key(str(project))
+
+
+def test_history_survives_a_new_store(store):
+    store.add("/p/board.kicad_pro", 2, {}, timestamp=1000.0)
+    reopened = DrcHistoryStore(store.path)
+    assert [entry["total_violations"] for entry in reopened.entries("/p/board.kicad_pro")] == [2]
+
+
+def test_old_checks_are_thinned_out(store):
+    now = time.time()
+    timestamps = [
+        now - 60 * DAY,                                # first check, always kept
+        now - 40 * DAY, now - 40 * DAY + 60,           # same day: latest kept
+        now - 2 * DAY, now - 2 * DAY + 60,             # same hour: latest kept
+        now - 3600, now - 1800, now - 60,              # last day: all kept
+    ]
+    for timestamp in timestamps:
+        store.add("/p/board.kicad_pro", 0, {}, timestamp=timestamp)
+
+    kept = sorted(entry["timestamp"] for entry in store.entries("/p/board.kicad_pro"))
+    assert kept == [timestamps[0], timestamps[2], timestamps[4], *timestamps[5:]]
+
+
+def test_entries_are_downsampled_to_max_entries(store):
+    for n in range(100):
+        store.add("/p/board.kicad_pro", n, {}, timestamp=float(n))
+
+    entries = store.entries("/p/board.kicad_pro", max_entries=10)
+    timestamps = [entry["timestamp"] for entry in entries]
+    assert len(entries) <= 11
+    assert timestamps[0] == 99.0 and timestamps[-1] == 0.0
+    assert timestamps == sorted(timestamps, reverse=True)
+
+
+def test_concurrent_writers_lose_nothing(store):
+    stores = [DrcHistoryStore(store.path) for _ in range(4)]
+
+    def write(writer: DrcHistoryStore, offset: int) -> None:
+        for n in range(25):
+            writer.add("/p/board.kicad_pro", offset + n, {}, timestamp=time.time())
+
+    threads = [threading.Thread(target=write, args=(writer, 100 * n)) for n, writer in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(store.entries("/p/board.kicad_pro")) == 100
+
+
+def test_legacy_json_history_is_imported(tmp_path):
+    directory = tmp_path / "history"
+    directory.mkdir()
+    legacy = {
+        "project_path": "/p/board.kicad_pro",
+        "entries": [
+            {"timestamp": 1000.0, "total_violations": 4, "violation_categories": {"Clearance": 4}},
+            {"timestamp": 2000.0, "total_violations": 2, "violation_categories": {"Clearance": 2}},
+        ]
+    }
+    (directory / "board_1234_drc_history.json").write_text(json.dumps(legacy))
+    (directory / "broken_drc_history.json").write_text("{")
+
+    store = DrcHistoryStore(str(directory / "drc_history.sqlite3"))
+    assert [entry["total_violations"] for entry in store.entries("/p/board.kicad_pro")] == [2, 4]
+
+
+def test_version_1_database_is_migrated(tmp_path):
+    path = str(tmp_path / "drc_history.sqlite3")
+    connection = sqlite3.connect(path)
+    drc_history._execute_script(connection, drc_history._SCHEMA)
+    connection.execute("INSERT INTO projects (key, path) VALUES (?, ?)",
+                       (project_key("/p/board.kicad_pro"), "/p/board.kicad_pro"))
+    connection.execute("INSERT INTO runs (project_id, timestamp, total_violations, categories) VALUES (1, 1000, 5, '{}')")
+    connection.execute("PRAGMA user_version = 1")
+    connection.commit()
+    connection.close()
+
+    store = DrcHistoryStore(path)
+    store.add("/p/board.kicad_pro", 1, {}, timestamp=2000.0, violations=[{"type": "clearance"}])
+
+    assert store.check("/p/board.kicad_pro", at=1000.0)["fingerprints"] is None
+    assert len(store.check("/p/board.kicad_pro")["fingerprints"]) == 1
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == HISTORY_SCHEMA_VERSION
+    connection.close()
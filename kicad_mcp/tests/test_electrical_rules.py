@@ -0,0 +1,93 @@
+"""
+Tests for the electrical rule checks from pin types.
+"""
+from kicad_mcp.utils.electrical_rules import check_electrical_rules
+from kicad_mcp.utils.schematic_model import Component, NetPin, Netlist, Pin, PowerSymbol, point_array, wire_array
+
+
+def netlist(connections, power_symbols=(), no_connects=()):
+    """Build a netlist from net name -> ("REF.num", pin type) pairs."""
+    pins = {}
+    for net_pins in connections.values():
+        for pin, pin_type in net_pins:
+            ref, num = pin.split(".")
+            pins.setdefault(ref, []).append(Pin(num, "", pin_type))
+    components = {ref: Component(lib_id="Test:U", reference=ref, value="", pins=ref_pins)
+                  for ref, ref_pins in pins.items()}
+    nets = {name: [NetPin(*pin.split(".")) for pin, _ in net_pins] for name, net_pins in connections.items()}
+    return Netlist(components, nets, [], wire_array([]), point_array([]),
+                   [PowerSymbol(name, name, 0.0, 0.0, 0.0) for name in power_symbols], list(no_connects), [])
+
+
+def issues_of(netlist_data, kind):
+    return [issue for issue in check_electrical_rules(netlist_data) if issue["type"] == kind]
+
+
+def test_lone_power_input_on_signal_net():
+    data = netlist({"Net-(U1-Pad3)": [("U1.3", "power_in")], "/EN": [("U1.4", "power_in")]})
+
+    assert [(issue["net"], issue["component"], issue["pin"]) for issue in issues_of(data, "unconnected_power_input")] == [
+        ("Net-(U1-Pad3)", "U1", "3"), ("/EN", "U1", "4")]
+
+
+def test_nets_named_by_power_symbols_are_supplies():
+    rails = ["+1V8", "VBAT", "+24V", "-12V", "VIN"]
+    connections = {rail: [(f"U{n}.1", "power_in")] for n, rail in enumerate(rails)}
+    # Supply prefixes and ground count without a power symbol
+    connections["VCC_IO"] = [("U9.1", "power_in")]
+    connections["GND"] = [("U9.2", "power_in")]
+
+    assert issues_of(netlist(connections, power_symbols=rails), "unconnected_power_input") == []
+    assert [issue["net"] for issue in issues_of(netlist(connections), "unconnected_power_input")] == rails
+    # Power symbols of plain dictionaries
+    plain = {"components": {}, "nets": netlist(connections).nets,
+             "power_symbols": [{"type": rail, "value": rail} for rail in rails]}
+    assert issues_of(plain, "unconnected_power_input") == []
+
+
+def test_connected_or_flagged_power_inputs_are_fine():
+    flag = {"sheet": "/", "x": 1.0, "y": 2.0, "pins": [NetPin("U2", "1")]}
+    data = netlist({"/RAIL": [("U1.1", "power_in"), ("U3.1", "power_out")],
+                    "Net-(U2-Pad1)": [("U2.1", "power_in")]}, no_connects=[flag])
+
+    assert issues_of(data, "unconnected_power_input") == []
+
+
+def test_multiple_drivers():
+    data = netlist({
+        "/A": [("U1.1", "output"), ("U2.1", "output"), ("U3.1", "input")],
+        "/B": [("U1.2", "output"), ("U4.1", "power_out")],
+        "/C": [("U1.3", "output"), ("U2.3", "tri_state"), ("U3.3", "open_collector")],
+    })
+    issues = issues_of(data, "multiple_drivers")
+
+    assert [issue["net"] for issue in issues] == ["/A", "/B"]
+    assert issues[0]["pins"] == [{"component": "U1", "pin": "1"}, {"component": "U2", "pin": "1"}]
+
+
+def test_undriven_inputs():
+    flag = {"sheet": "/", "x": 0.0, "y": 0.0, "pins": [NetPin("U5", "1"), NetPin("U6", "1")]}
+    data = netlist({
+        "/A": [("U1.1", "input"), ("U2.1", "input")],
+        "/B": [("U1.2", "input"), ("R1.1", "passive")],
+        "/C": [("U1.3", "input")],
+        "/D": [("U1.4", "input"), ("U2.4", "power_in")],
+        "/E": [("U5.1", "input"), ("U6.1", "input")],
+    }, no_connects=[flag])
+    issues = issues_of(data, "undriven_input")
+
+    assert [issue["net"] for issue in issues] == ["/A", "/D"]
+    assert issues[1]["pins"] == [{"component": "U1", "pin": "4"}]
+
+
+def test_unused_no_connect_flags():
+    flags = [{"sheet": "/sub/", "x": 10.0, "y": 20.0, "pins": []},
+             {"sheet": "/", "x": 1.0, "y": 1.0, "pins": [NetPin("U1", "1")]}]
+    data = netlist({"/A": [("U1.1", "output")]}, no_connects=flags)
+
+    assert issues_of(data, "unused_no_connect") == [{
+        "type": "unused_no_connect",
+        "sheet": "/sub/",
+        "position": {"x": 10.0, "y": 20.0},
+        "description": "No-connect flag at (10.0, 20.0) on sheet /sub/ is not on a pin"
+    }]
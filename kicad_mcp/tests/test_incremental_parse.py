@@ -0,0 +1,115 @@
+"""
+Tests for incremental re-parsing of changed schematic items.
+
+After each edit the incremental result is compared with a parse from
+scratch, and the parser's log tells how many items it read again.
+"""
+import os
+import re
+
+import pytest
+
+from kicad_mcp.utils.netlist_parser import extract_netlist
+from kicad_mcp.utils.schematic_model import as_dict
+from kicad_mcp.utils.sheet_state import clear_sheet_states, has_sheet_state
+from tests.schematics import divider, hierarchical_project, symbol, write
+
+
+@pytest.fixture(autouse=True)
+def no_retained_states():
+    clear_sheet_states()
+    yield
+    clear_sheet_states()
+
+
+def _extract(path: str, capsys):
+    capsys.readouterr()
+    netlist = as_dict(dict(extract_netlist(path, cache=None).items()))
+    return netlist, capsys.readouterr().out
+
+
+def _fresh(path: str, capsys):
+    clear_sheet_states()
+    return _extract(path, capsys)[0]
+
+
+def _edit(path: str, pattern: str, replacement: str, count: int = 1) -> None:
+    with open(path) as f:
+        text = f.read()
+    text, replaced = re.subn(pattern, replacement, text, count=count)
+    assert replaced == count
+    # Keep the modification time moving even on coarse file systems
+    mtime = os.stat(path).st_mtime_ns
+    write(path, text)
+    os.utime(path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+
+
+def _reread(log: str):
+    match = re.search(r"Re-read (\d+) changed items of (\d+)", log)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+EDITS = [
+    # Moving a wire end disconnects C1 from R1's net
+    ("move wire", r"\(wire \(pts \(xy 20\.32 3\.81\) \(xy 20\.32 11\.43\)\)",
+     "(wire (pts (xy 20.32 3.81) (xy 20.32 8.89))", 1),
+    ("change value", r'"Value" "10k"', '"Value" "4k7"', 1),
+    ("delete label", r'  \(label "SIG2" [^\n]*\n', "", 0),
+    ("add symbol", r'(?=  \(label "SIG2")', symbol("Device:R", "R99", "1M", 500, 500), 1),
+]
+
+
+@pytest.mark.parametrize("name, pattern, replacement, changed", EDITS, ids=[edit[0] for edit in EDITS])
+def test_incremental_parse_matches_full_parse(tmp_path, capsys, name, pattern, replacement, changed):
+    path = write(str(tmp_path / "divider.kicad_sch"), divider(20))
+    before, _ = _extract(path, capsys)
+    assert has_sheet_state(path)
+
+    _edit(path, pattern, replacement)
+    after, log = _extract(path, capsys)
+
+    assert _reread(log) is not None and _reread(log)[0] == changed
+    assert after == _fresh(path, capsys)
+    assert after != before
+
+
+def test_moved_wire_changes_nets(tmp_path, capsys):
+    path = write(str(tmp_path / "divider.kicad_sch"), divider(3))
+    _extract(path, capsys)
+    _edit(path, *EDITS[0][1:3])
+    nets = _extract(path, capsys)[0]["nets"]
+
+    assert nets["/SIG1"] == [{"component": "R1", "pin": "2"}]
+    assert nets["unconnected-(C1-Pad1)"] == [{"component": "C1", "pin": "1"}]
+
+
+def test_unchanged_file_is_not_read_again(tmp_path, capsys):
+    path = write(str(tmp_path / "divider.kicad_sch"), divider(5))
+    first, _ = _extract(path, capsys)
+    second, log = _extract(path, capsys)
+
+    assert "Schematic unchanged since last parse" in log
+    assert second == first
+
+
+def test_changed_library_symbols_read_file_again(tmp_path, capsys):
+    path = write(str(tmp_path / "divider.kicad_sch"), divider(5))
+    _extract(path, capsys)
+    _edit(path, r'\(length 1\.27\)', "(length 2.54)", count=2)
+    after, log = _extract(path, capsys)
+
+    assert _reread(log) is None
+    assert after == _fresh(path, capsys)
+
+
+def test_incremental_parse_of_sub_sheet(tmp_path, capsys):
+    root = hierarchical_project(str(tmp_path))
+    _extract(root, capsys)
+
+    _edit(str(tmp_path / "sub.kicad_sch"), r'"Value" "10k"', '"Value" "22k"')
+    after, log = _extract(root, capsys)
+
+    assert "Schematic unchanged since last parse" in log
+    assert _reread(log) == (1, 4)
+    assert after["components"]["R1"]["value"] == "22k"
+    assert after == _fresh(root, capsys)
@@ -0,0 +1,97 @@
+"""
+Tests for the classification of nets by name.
+"""
+import random
+import re
+
+import pytest
+
+from kicad_mcp.utils import net_classifier
+from kicad_mcp.utils.net_classifier import BUS_SIGNALS, GROUND_NETS, POWER_NET_PREFIXES, classify_net, classify_nets
+
+
+def substring_roles(name: str) -> frozenset:
+    """The roles a net had before the compiled classifier: one substring test per signal."""
+    upper_name = name.upper()
+    roles = {role for role, signals in BUS_SIGNALS.items() if any(signal in upper_name for signal in signals)}
+    if name.startswith(POWER_NET_PREFIXES):
+        roles.add("power")
+    if name in GROUND_NETS:
+        roles.add("ground")
+    return frozenset(roles)
+
+
+@pytest.mark.parametrize("name, roles", [
+    ("/I2C_SDA", {"i2c"}),
+    ("scl", {"i2c"}),
+    ("SPI_MOSI", {"spi"}),
+    ("/uart_rxd", {"uart"}),
+    ("USB_D+", {"usb"}),
+    ("ETH_MDIO", {"ethernet"}),
+    ("LED1", set()),
+    ("Net-(R1-Pad2)", set()),
+    ("", set()),
+])
+def test_bus_roles(name, roles):
+    assert classify_net(name) == roles
+
+
+@pytest.mark.parametrize("name, roles", [
+    # TX+ is an Ethernet pair and contains the UART's TX
+    ("ETH_TX+", {"ethernet", "uart"}),
+    # MDIO contains MDI; DM and SS overlap the signals around them
+    ("MDIO", {"ethernet"}),
+    ("USB_DM", {"usb"}),
+    ("SSCK", {"spi"}),
+    # Signals found at later positions after an overlapping one
+    ("SDATX", {"i2c", "uart"}),
+    ("MISOSCL", {"spi", "i2c"}),
+])
+def test_overlapping_signals(name, roles):
+    assert classify_net(name) == roles
+
+
+@pytest.mark.parametrize("name, roles", [
+    ("GND", {"power", "ground"}),
+    # VSS also contains the SPI's SS
+    ("VSS", {"ground", "spi"}),
+    ("PGND", {"ground"}),
+    ("+3V3", {"power"}),
+    ("VDD_CORE", {"power"}),
+    ("GND_SENSE", {"power"}),
+    ("VBUS", {"usb"}),
+    # Power prefixes are case-sensitive and anchored at the start
+    ("vcc", set()),
+    ("/+5V", set()),
+])
+def test_power_domain_roles(name, roles):
+    assert classify_net(name) == roles
+
+
+def test_trie_alternation_prefers_the_longest_word():
+    pattern = re.compile(net_classifier._trie_pattern(["SS", "S", "SPI_SCK", "SPI"]))
+
+    assert pattern.fullmatch("S") and pattern.fullmatch("SPI") and not pattern.fullmatch("SP")
+    assert pattern.match("SPI_SCKX").group() == "SPI_SCK"
+    assert pattern.match("SPI_SX").group() == "SPI"
+    assert pattern.match("SSX").group() == "SS"
+    assert net_classifier._trie_pattern([]) == ""
+
+
+def test_equal_roles_share_one_set():
+    roles = classify_nets(["/SCL", "SCL_2", "LED", "RESET"])
+
+    assert roles["/SCL"] is roles["SCL_2"]
+    assert roles["LED"] is roles["RESET"]
+
+
+def test_random_names_match_substring_logic():
+    rng = random.Random(15)
+    fragments = [signal for signals in BUS_SIGNALS.values() for signal in signals]
+    fragments += list(POWER_NET_PREFIXES) + list(GROUND_NETS) + ["_", "/", "N", "1", "x", "d", "s", "+", "-"]
+    names = ["".join(rng.choice(fragments) if rng.random() < 0.4 else rng.choice("ABCDEIMNOPRSTUVXdms+-_1")
+                     for _ in range(rng.randint(0, 8)))
+             for _ in range(10000)]
+    names += list(GROUND_NETS) + list(POWER_NET_PREFIXES)
+
+    assert [name for name in names if classify_net(name) != substring_roles(name)] == []
@@ -0,0 +1,115 @@
+"""
+Tests for the CSR component/net graph.
+"""
+import random
+from collections import deque
+
+import numpy as np
+
+from kicad_mcp.utils.netlist_graph import NetlistGraph
+
+
+def build(connections):
+    """Build a graph from net name -> component references, one pin per reference."""
+    nets = {name: [(ref, "1") for ref in refs] for name, refs in connections.items()}
+    return NetlistGraph(nets, {name: list(dict.fromkeys(refs)) for name, refs in connections.items()})
+
+
+def bfs_path(connections, source, target, excluded=()):
+    """Shortest component/net chain by a plain breadth-first search."""
+    nets_of = {}
+    for name, refs in connections.items():
+        if name not in excluded:
+            for ref in refs:
+                nets_of.setdefault(ref, []).append(name)
+    parents = {source: None}
+    queue = deque([source])
+    while queue:
+        ref = queue.popleft()
+        if ref == target:
+            path = [ref]
+            while parents[path[-1]] is not None:
+                path.extend(parents[path[-1]])
+            return path[::-1]
+        for name in nets_of.get(ref, ()):
+            for other in connections[name]:
+                if other not in parents:
+                    parents[other] = (name, ref)
+                    queue.append(other)
+    return None
+
+
+# R1 - SIG - R2 - OUT - J1, all on GND; R3 alone on its own net
+CIRCUIT = {
+    "SIG": ["R1", "R2"],
+    "OUT": ["R2", "J1", "J1"],
+    "GND": ["R1", "R2", "J1", "R3"],
+    "NC": ["R3"],
+}
+
+
+def test_adjacency():
+    graph = build(CIRCUIT)
+
+    assert graph.components == ["R1", "R2", "J1", "R3"]
+    assert graph.edge_count == 9
+    assert graph.pin_counts.tolist() == [2, 3, 4, 1]
+    j1 = graph.component_ids["J1"]
+    nets = graph.component_indices[graph.component_indptr[j1]:graph.component_indptr[j1 + 1]]
+    assert [graph.nets[net] for net in nets] == ["OUT", "GND"]
+
+
+def test_connected_components():
+    graph = build(CIRCUIT)
+    assert len(set(graph.connected_components().tolist())) == 1
+
+    labels = graph.connected_components(graph.mask_nets(["GND"]))
+    ids = graph.component_ids
+    assert labels[ids["R1"]] == labels[ids["R2"]] == labels[ids["J1"]] == ids["R1"]
+    assert labels[ids["R3"]] == ids["R3"]
+
+
+def test_shortest_path_and_exclude_mask():
+    graph = build(CIRCUIT)
+
+    assert graph.shortest_path("R1", "J1") == ["R1", "GND", "J1"]
+    supply = graph.supply_mask({"GND": {"power", "ground"}, "SIG": set()})
+    assert graph.shortest_path("R1", "J1", supply) == ["R1", "SIG", "R2", "OUT", "J1"]
+    assert graph.shortest_path("R1", "R3", supply) is None
+    assert graph.shortest_path("R1", "R1") == ["R1"]
+
+
+def test_fanout():
+    graph = build(CIRCUIT)
+
+    assert graph.fanout_histogram() == {1: 1, 2: 1, 3: 1, 4: 1}
+    assert graph.top_fanout(2) == [{"net": "GND", "pins": 4, "components": 4},
+                                   {"net": "OUT", "pins": 3, "components": 2}]
+    assert len(graph.top_fanout(10)) == 4
+    assert graph.top_fanout(0) == []
+
+
+def test_traversals_match_plain_bfs():
+    rng = random.Random(17)
+    refs = [f"U{n}" for n in range(200)]
+    connections = {f"N{n}": rng.sample(refs, rng.randint(1, 3)) for n in range(150)}
+    excluded = {f"N{n}" for n in range(0, 150, 7)}
+    graph = build(connections)
+    exclude = graph.mask_nets(excluded)
+    labels = graph.connected_components(exclude)
+
+    present = [ref for ref in refs if ref in graph.component_ids]
+    for _ in range(200):
+        source, target = rng.sample(present, 2)
+        expected = bfs_path(connections, source, target, excluded)
+        path = graph.shortest_path(source, target, exclude)
+        same_group = labels[graph.component_ids[source]] == labels[graph.component_ids[target]]
+        assert (path is None) == (expected is None) == (not same_group)
+        if path is not None:
+            assert len(path) == len(expected)
+            assert not excluded.intersection(path[1::2])
+            assert all(path[i] in connections[path[i + 1]] and path[i + 2] in connections[path[i + 1]]
+                       for i in range(0, len(path) - 1, 2))
+
+    # Every group is labelled by its smallest member
+    assert all(labels[labels] == labels) and all(labels <= np.arange(len(labels)))
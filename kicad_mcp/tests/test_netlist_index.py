@@ -0,0 +1,100 @@
+"""
+Tests for the net/component/pin index of a netlist.
+"""
+import random
+import time
+
+from kicad_mcp.utils.netlist_index import NetlistIndex, get_netlist_index
+from kicad_mcp.utils.pattern_recognition import identify_filters
+from kicad_mcp.utils.schematic_model import Component, NetPin, Netlist, point_array, wire_array
+
+
+def make_netlist(net_count: int, seed: int = 1) -> Netlist:
+    """Build a random netlist of resistors, capacitors and op-amps with about ``net_count`` nets."""
+    rng = random.Random(seed)
+    components = {}
+    pins = []
+
+    def add(prefix: str, count: int, value: str, lib_id: str, pin_count: int) -> None:
+        for n in range(1, count + 1):
+            ref = f"{prefix}{n}"
+            components[ref] = Component(lib_id=lib_id, reference=ref, value=value)
+            pins.extend((ref, str(pin)) for pin in range(1, pin_count + 1))
+
+    add("R", net_count, "10k", "Device:R", 2)
+    add("C", net_count // 3, "100n", "Device:C", 2)
+    add("U", net_count // 50, "TL072", "Amplifier_Operational:TL072", 8)
+
+    names = [f"N{n}" for n in range(net_count)]
+    nets = {"GND": []}
+    for ref, pin in pins:
+        name = "GND" if rng.random() < 0.01 else rng.choice(names)
+        nets.setdefault(name, []).append(NetPin(ref, pin))
+    return Netlist(components, nets, [], wire_array([]), point_array([]), [], [], [])
+
+
+def test_lookups():
+    nets = {
+        "VIN": [NetPin("R1", "1"), NetPin("U1", "8"), NetPin("R1", "1")],
+        "OUT": [NetPin("R1", "2"), NetPin("C1", "1")],
+        "GND": [NetPin("C1", "2"), NetPin("U1", "4"), {"pin": "9"}],
+    }
+    index = NetlistIndex(nets)
+
+    assert index.nets_of("R1") == ["VIN", "OUT"]
+    assert index.nets_of("R9") == []
+    assert index.components_on("GND") == ["C1", "U1"]
+    assert index.components_on("VIN") == ["R1", "U1"]
+    assert index.net_of("C1", "1") == "OUT"
+    assert index.net_of("C1", "3") is None
+    assert index.connects("U1", "GND") and not index.connects("R1", "GND")
+    assert index.net_has_prefix("OUT", "C") and not index.net_has_prefix("OUT", "U")
+    assert "ground" in index.roles_of("GND")
+
+
+def test_index_matches_pin_scan():
+    netlist = make_netlist(500)
+    index = get_netlist_index(netlist)
+    assert get_netlist_index(netlist) is index
+
+    for ref in ("R1", "R250", "C10", "U3"):
+        expected = [name for name, pins in netlist.nets.items() if any(pin.component == ref for pin in pins)]
+        assert index.nets_of(ref) == expected
+        for name in expected:
+            assert ref in index.components_on(name)
+
+    for name, pins in netlist.nets.items():
+        for pin in pins:
+            assert index.net_of(pin.component, pin.pin) == name
+
+
+def test_plain_dictionaries_get_a_new_index():
+    netlist = {"nets": {"A": [{"component": "R1", "pin": "1"}]}}
+    assert get_netlist_index(netlist).nets_of("R1") == ["A"]
+    assert get_netlist_index(netlist) is not get_netlist_index(netlist)
+
+
+def test_lookups_on_10k_nets_are_fast():
+    netlist = make_netlist(10000)
+    assert len(netlist.nets) > 9000
+
+    started = time.perf_counter()
+    index = get_netlist_index(netlist)
+    build_time = time.perf_counter() - started
+
+    refs = list(netlist.components)
+    started = time.perf_counter()
+    for ref in refs:
+        for name in index.nets_of(ref):
+            index.components_on(name)
+    lookup_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    filters = identify_filters(netlist.components, netlist.nets, index)
+    filter_time = time.perf_counter() - started
+
+    # Scanning every pin per component would take minutes at this size
+    assert build_time < 1.0
+    assert lookup_time < 1.0
+    assert filter_time < 5.0
+    assert filters
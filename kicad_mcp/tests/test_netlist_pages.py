@@ -0,0 +1,69 @@
+"""
+Tests for paginated netlist views and their cursors.
+"""
+import os
+
+import pytest
+
+from kicad_mcp.utils.netlist_pages import paginate_netlist, query_components
+from kicad_mcp.utils.netlist_parser import extract_netlist
+from kicad_mcp.utils.sheet_state import clear_sheet_states
+from tests.schematics import divider, write
+
+
+@pytest.fixture(autouse=True)
+def no_retained_states():
+    clear_sheet_states()
+    yield
+    clear_sheet_states()
+
+
+def _change_value(path: str, old: str, new: str) -> None:
+    with open(path) as f:
+        text = f.read()
+    mtime = os.stat(path).st_mtime_ns
+    write(path, text.replace(f'"Value" "{old}"', f'"Value" "{new}"', 1))
+    os.utime(path, ns=(mtime + 10 ** 9, mtime + 10 ** 9))
+
+
+def test_pages_cover_the_netlist(tmp_path):
+    netlist = extract_netlist(write(str(tmp_path / "divider.kicad_sch"), divider(10)), cache=None)
+
+    components, nets, cursor = {}, {}, None
+    while True:
+        page = paginate_netlist(netlist, cursor, limit=3, fields=["ref", "value"])
+        components.update(page["components"])
+        nets.update(page["nets"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert list(components) == list(netlist.components)
+    assert list(nets) == list(netlist.nets)
+    assert components["R1"] == {"reference": "R1", "value": "10k"}
+
+
+def test_cursor_of_other_query_is_rejected(tmp_path):
+    netlist = extract_netlist(write(str(tmp_path / "divider.kicad_sch"), divider(10)), cache=None)
+    cursor = paginate_netlist(netlist, limit=3)["next_cursor"]
+
+    with pytest.raises(ValueError):
+        paginate_netlist(netlist, cursor, limit=3, ref_prefix="C")
+
+
+def test_cursor_from_before_an_edit_is_rejected(tmp_path):
+    path = write(str(tmp_path / "divider.kicad_sch"), divider(10))
+    netlist = extract_netlist(path, cache=None)
+    page_cursor = paginate_netlist(netlist, limit=3)["next_cursor"]
+    query_cursor = query_components(netlist, 'ref ~ "R*"', limit=3)["next_cursor"]
+
+    # Same number of components and nets, different content
+    _change_value(path, "10k", "22k")
+    edited = extract_netlist(path, cache=None)
+    assert (edited.component_count, edited.net_count) == (netlist.component_count, netlist.net_count)
+
+    with pytest.raises(ValueError):
+        paginate_netlist(edited, page_cursor, limit=3)
+    with pytest.raises(ValueError):
+        query_components(edited, 'ref ~ "R*"', query_cursor, limit=3)
+    assert paginate_netlist(netlist, page_cursor, limit=3)["components"]
@@ -0,0 +1,154 @@
+"""
+Tests for component classification and the power supply, microcontroller
+and sensor recognizers.
+"""
+import pytest
+
+from kicad_mcp.utils.component_classifier import classify_part
+from kicad_mcp.utils.pattern_recognition import (identify_microcontrollers, identify_power_supplies,
+                                                 identify_sensor_interfaces)
+from kicad_mcp.utils.schematic_model import Component, NetPin, Pin
+
+
+def _components(*values: str) -> dict:
+    return {f"U{n}": {"reference": f"U{n}", "value": value, "lib_id": "Lib:Part"}
+            for n, value in enumerate(values, 1)}
+
+
+def test_classifier_reports_matched_part_numbers():
+    tags = classify_part("stm32f103c8tx", "MCU_ST_STM32F1:STM32F103C8Tx")
+
+    assert tags.first("mcu") == "STM32"
+    assert tags.first("mcu_model") == "STM32"
+    assert tags.part_number("mcu_model", "STM32") == "STM32F103"
+    assert tags.part_number("mcu", "STM32") == "STM32F103C8TX"
+    assert tags.part_number("mcu_model", "PIC") is None
+    assert classify_part("10k", "Device:R").get("sensor_model") == ()
+
+
+@pytest.mark.parametrize("value, family, model", [
+    ("ATmega328P-AU", "AVR", "ATmega328P"),
+    ("atmega32u4", "AVR", "ATmega32U4"),
+    ("ESP32-WROOM-32", "ESP", "ESP32"),
+    ("STM32F407VG", "STM32", "STM32F407"),
+    ("PIC16F877A", "PIC", "PIC16F877A"),
+    ("MSP430G2553", "MSP430", "MSP430G2553"),
+    ("RP2040", "RP2040", "RP2040"),
+])
+def test_microcontroller_models(value, family, model):
+    # Some parts are also reported as development boards (ATMEGA32U4)
+    [match] = [match for match in identify_microcontrollers(_components(value))
+               if match["type"] == "microcontroller"]
+    assert (match["family"], match["model"]) == (family, model)
+
+
+def test_microcontroller_without_known_model():
+    [match] = identify_microcontrollers(_components("STM32L031K6"))
+    assert match["family"] == "STM32"
+    assert "model" not in match and match["value"] == "STM32L031K6"
+
+
+@pytest.mark.parametrize("value, kind, model", [
+    ("DS18B20", "temperature_sensor", "DS18B20"),
+    ("BME280", "multi_sensor", "BME280"),
+    ("MPU9250", "motion_sensor", "MPU9250"),
+    ("VL53L0X", "optical_sensor", "VL53L0X"),
+    ("HX711", "analog_interface", "HX711"),
+    ("ADS1015", "voltage_sensor", "ADS1015"),
+    ("TMP36", "temperature_sensor", "TMP36"),
+])
+def test_sensor_models(value, kind, model):
+    [match] = identify_sensor_interfaces(_components(value), {})
+    assert (match["type"], match["model"]) == (kind, model)
+
+
+def test_bmp280_does_not_measure_humidity():
+    [match] = identify_sensor_interfaces(_components("BMP280"), {})
+    assert "humidity" not in match["measures"]
+
+
+def _power_design():
+    """A hand-built netlist with five converters, an LC input filter and a ferrite."""
+    parts = {
+        # Buck: inductor from the PH switch node to the 3.3 V load
+        "U1": ("TPS54331", "Regulator_Switching:TPS54331",
+               {"1": "BOOT", "2": "VIN", "5": "VSENSE", "7": "GND", "8": "PH"}),
+        # Boost: inductor fed from the IN pin's net, output through a diode
+        "U2": ("MT3608", "Regulator_Switching:MT3608", {"1": "SW", "2": "GND", "3": "FB", "5": "IN"}),
+        # Buck-boost controller with unnamed pins
+        "U3": ("LTC3780", "Custom:LTC3780", {"1": "", "2": ""}),
+        # Four-switch buck-boost
+        "U4": ("LM5175", "Regulator_Controller:LM5175", {"1": "SW1", "2": "SW2", "3": "VIN", "4": "VOUT"}),
+        # Inverting: inductor from the switch node to ground
+        "U6": ("LM2611", "Regulator_Switching:LM2611", {"1": "SW", "2": "VIN", "3": "FB"}),
+        "U5": ("STM32F103C8Tx", "MCU_ST_STM32F1:STM32F103C8Tx", {"1": "VDD", "2": "VDDA", "3": "PA0"}),
+    }
+    for ref in ("L1", "L2", "L3", "L4", "L5", "L6", "L7", "L8", "D1", "D2"):
+        parts[ref] = ("", "Device:" + ref[0], {"1": "", "2": ""})
+    for ref in ("C1", "C2", "C3", "C4", "C5", "C6", "C7", "C8", "R1", "R2", "R3"):
+        parts[ref] = ("", "Device:" + ref[0], {"1": "~", "2": "~"})
+
+    components = {
+        ref: Component(lib_id=lib_id, reference=ref, value=value,
+                       pins=[Pin(num, name) for num, name in pins.items()])
+        for ref, (value, lib_id, pins) in parts.items()
+    }
+    connections = {
+        "VIN": ["U1.2", "C1.1", "L5.2"],
+        "SW1": ["U1.8", "L1.1"],
+        "+3V3": ["L1.2", "C2.1", "R1.1", "L6.1"],
+        "FB1": ["U1.5", "R1.2"],
+        "VBAT": ["U2.5", "L2.1", "C3.1"],
+        "SW2": ["U2.1", "L2.2", "D1.1"],
+        "+12V": ["D1.2", "C4.1"],
+        "N3A": ["U3.1", "L3.1"],
+        "N3B": ["U3.2", "L3.2"],
+        "SW4A": ["U4.1", "L4.1"],
+        "SW4B": ["U4.2", "L4.2"],
+        "VIN4": ["U4.3", "C6.1"],
+        "VOUT4": ["U4.4", "C7.1"],
+        "SW6": ["U6.1", "L8.1", "D2.2"],
+        "VIN6": ["U6.2"],
+        "-5V": ["D2.1", "C8.1"],
+        # LC input filter in front of the buck converter
+        "VRAW": ["L5.1", "C5.1"],
+        # Ferrite to the MCU's analog supply
+        "+3V3A": ["L6.2", "U5.2"],
+        # Inductor between resistors only
+        "N7A": ["L7.1", "R2.1"],
+        "N7B": ["L7.2", "R3.1"],
+        "GND": ["U1.7", "U2.2", "L8.2", "C1.2", "C2.2", "C3.2", "C4.2", "C5.2", "C6.2", "C7.2", "C8.2",
+                "R2.2", "R3.2"],
+    }
+    nets = {name: [NetPin(*pin.split(".")) for pin in pins] for name, pins in connections.items()}
+    return components, nets
+
+
+def test_switching_regulator_topologies():
+    components, nets = _power_design()
+    found = {match["main_component"]: match for match in identify_power_supplies(components, nets)
+             if match["type"] == "switching_regulator"}
+
+    assert sorted(found) == ["U1", "U2", "U3", "U4", "U6"]
+    summary = {ref: (match["subtype"], match["inductor"], match["switch_node"], match["input_net"],
+                     match["output_net"]) for ref, match in found.items()}
+    assert summary == {
+        "U1": ("buck", "L1", "SW1", "VIN", "+3V3"),
+        "U2": ("boost", "L2", "SW2", "VBAT", "+12V"),
+        "U3": ("buck_boost", "L3", "N3A", None, None),
+        "U4": ("buck_boost", "L4", "SW4A", "VIN4", "VOUT4"),
+        "U6": ("inverting", "L8", "SW6", "VIN6", "-5V"),
+    }
+    assert (found["U1"]["input_capacitors"], found["U1"]["output_capacitors"]) == (["C1"], ["C2"])
+    assert (found["U2"]["input_capacitors"], found["U2"]["output_capacitors"]) == (["C3"], ["C4"])
+    assert (found["U4"]["input_capacitors"], found["U4"]["output_capacitors"]) == (["C6"], ["C7"])
+    assert found["U6"]["output_capacitors"] == ["C8"]
+
+
+def test_filters_and_loose_inductors_are_not_converters():
+    components, nets = _power_design()
+    inductors = {match["inductor"] for match in identify_power_supplies(components, nets)
+                 if match["type"] == "switching_regulator"}
+
+    # L5 (LC filter on a controller's input), L6 (MCU ferrite) and L7 (no controller)
+    assert inductors == {"L1", "L2", "L3", "L4", "L8"}
@@ -0,0 +1,93 @@
+"""
+Tests for reading library pin tables and placing pins on the sheet.
+
+Expected coordinates are worked out by hand from KiCad's convention:
+mirror in library space, rotate counter-clockwise, then flip Y.
+"""
+import pytest
+
+from kicad_mcp.utils.pin_geometry import Placement, parse_lib_symbols, place_pins
+from kicad_mcp.utils.sexpr_parser import parse_sexpr
+
+LIB_SYMBOLS = b'''(lib_symbols
+  (symbol "Test:P"
+    (symbol "P_0_1"
+      (pin passive line (at 2.54 3.81 270) (length 1.27) (name "A") (number "1"))
+    )
+  )
+  (symbol "Test:U"
+    (symbol "U_0_1"
+      (pin power_in line (at 0 10.16 270) (length 2.54) (hide yes) (name "VCC") (number "8"))
+    )
+    (symbol "U_1_1"
+      (pin input line (at -7.62 0 0) (length 2.54) (name "+") (number "3"))
+    )
+    (symbol "U_2_1"
+      (pin input line (at -7.62 2.54 0) (length 2.54) (name "+") (number "5"))
+    )
+    (symbol "U_2_2"
+      (pin input line (at -5.08 2.54 0) (length 2.54) (name "+") (number "5"))
+    )
+  )
+)'''
+
+
+@pytest.fixture(scope="module")
+def tables():
+    return parse_lib_symbols(parse_sexpr(LIB_SYMBOLS), LIB_SYMBOLS)
+
+
+def _place(tables, *placements):
+    return [(index, table.num[pin], round(x, 6), round(y, 6))
+            for index, table, pin, x, y in place_pins(tables, placements)]
+
+
+def test_pin_table(tables):
+    table = tables["Test:U"]
+    assert table.num == ["8", "3", "5", "5"]
+    assert table.unit.tolist() == [0, 1, 2, 2] and table.style.tolist() == [1, 1, 1, 2]
+    assert table.hidden == [True, False, False, False]
+    assert table.type[0] == "power_in"
+    assert [pin.num for pin in table.pins] == table.num
+
+
+def test_identical_definitions_share_a_table(tables):
+    again = parse_lib_symbols(parse_sexpr(LIB_SYMBOLS), LIB_SYMBOLS)
+    assert again["Test:P"] is tables["Test:P"]
+
+
+@pytest.mark.parametrize("angle, mirror, expected", [
+    (0, None, (102.54, 46.19)),
+    (90, None, (96.19, 47.46)),
+    (180, None, (97.46, 53.81)),
+    (270, None, (103.81, 52.54)),
+    (-90, None, (103.81, 52.54)),
+    (0, "x", (102.54, 53.81)),
+    (0, "y", (97.46, 46.19)),
+    (90, "x", (103.81, 47.46)),
+])
+def test_rotation_and_mirror(tables, angle, mirror, expected):
+    placed = _place(tables, Placement("Test:P", 1, 1, 100.0, 50.0, angle, mirror))
+    assert placed == [(0, "1", *expected)]
+
+
+def test_multi_unit_symbol(tables):
+    placed = _place(tables,
+                    Placement("Test:U", 1, 1, 10.0, 10.0, 0),
+                    Placement("Test:U", 2, 1, 50.0, 10.0, 0),
+                    Placement("Test:U", 2, 2, 90.0, 10.0, 180))
+
+    assert sorted(placed) == [
+        (0, "3", 2.38, 10.0),
+        (0, "8", 10.0, -0.16),
+        (1, "5", 42.38, 7.46),
+        (1, "8", 50.0, -0.16),
+        # U_0_1 pins belong to body style 1 only
+        (2, "5", 95.08, 12.54),
+    ]
+
+
+def test_unknown_library_symbols_are_skipped(tables):
+    placed = _place(tables, Placement("Test:Missing", 1, 1, 0.0, 0.0, 0),
+                    Placement("Test:P", 1, 1, 0.0, 0.0, 0))
+    assert [index for index, *_ in placed] == [1]
@@ -0,0 +1,127 @@
+"""
+Tests for the non-blocking command runner.
+"""
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from kicad_mcp.config import system
+from kicad_mcp.utils import process_runner
+from kicad_mcp.utils.process_runner import run_process
+
+pytestmark = pytest.mark.skipif(system == "Windows", reason="uses POSIX shells and process groups")
+
+
+def python(code: str) -> list:
+    return [sys.executable, "-c", code]
+
+
+def alive(pid: int) -> bool:
+    """Whether a process exists and has not exited (zombies count as exited)."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().rsplit(")", 1)[1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        return True
+
+
+async def _read_pid(path, timeout: float = 5.0) -> int:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        text = path.read_text() if path.exists() else ""
+        if text.strip():
+            return int(text)
+        await asyncio.sleep(0.02)
+    raise AssertionError("command did not start")
+
+
+def test_output_and_exit_status():
+    result = asyncio.run(run_process(python("import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)")))
+
+    assert (result.returncode, result.stdout.strip(), result.stderr.strip()) == (3, "out", "err")
+    assert not result.success
+    assert result.describe_failure() == "err"
+    assert result.to_dict()["returncode"] == 3
+
+
+def test_start_errors_are_reported():
+    missing = asyncio.run(run_process(["/nonexistent/kicad-cli", "version"]))
+    assert missing.error.startswith("Could not run /nonexistent/kicad-cli")
+    assert missing.returncode is None and not missing.success
+    assert missing.describe_failure() == missing.error
+
+    bad_cwd = asyncio.run(run_process(python("pass"), cwd="/nonexistent/directory"))
+    assert bad_cwd.error is not None
+
+
+def test_output_is_capped():
+    code = "import sys; sys.stdout.buffer.write(b'x' * 50_000_000); sys.stderr.write('done')"
+    result = asyncio.run(run_process(python(code), max_output=1000))
+
+    assert result.success
+    assert (len(result.stdout), result.stdout_truncated) == (1000, True)
+    assert (result.stderr, result.stderr_truncated) == ("done", False)
+
+
+def test_timeout_stops_the_process_group(tmp_path):
+    pid_file = tmp_path / "pid"
+    command = ["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"]
+    start = time.monotonic()
+    result = asyncio.run(run_process(command, timeout=0.5))
+
+    assert time.monotonic() - start < 10
+    assert result.timed_out and not result.success
+    assert result.describe_failure().startswith("timed out")
+    # The background sleep was in the same group and is gone as well
+    assert not alive(int(pid_file.read_text()))
+
+
+def test_commands_ignoring_sigterm_are_killed(monkeypatch):
+    monkeypatch.setattr(process_runner, "TERMINATE_GRACE", 0.2)
+    command = ["sh", "-c", "trap '' TERM; sleep 30 & wait; sleep 30"]
+    result = asyncio.run(run_process(command, timeout=0.3))
+
+    assert result.timed_out
+    assert result.returncode == -9
+
+
+def test_cancellation_stops_the_command(tmp_path):
+    pid_file = tmp_path / "pid"
+    command = ["sh", "-c", f"sleep 30 & echo $! > {pid_file}; wait"]
+
+    async def cancel() -> int:
+        task = asyncio.create_task(run_process(command))
+        pid = await _read_pid(pid_file)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return pid
+
+    assert not alive(asyncio.run(cancel()))
+
+
+def test_loop_keeps_running_during_a_command():
+    async def main():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        await run_process(python("import time; time.sleep(0.5)"))
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(main()) > 10
@@ -0,0 +1,61 @@
+"""
+Tests for the compact schematic model.
+"""
+import gc
+import pickle
+import tracemalloc
+
+from kicad_mcp.utils.netlist_parser import extract_netlist
+from kicad_mcp.utils.schematic_model import Component, NetPin, Pin, as_dict
+from kicad_mcp.utils.sheet_state import clear_sheet_states
+from tests.schematics import divider, write
+
+
+def test_records_read_like_dictionaries():
+    pins = [Pin("1", "~", "passive"), Pin("2")]
+    component = Component(lib_id="Device:R", reference="R1", value="10k", x=1.0, y=2.0, angle=90.0, pins=pins)
+
+    assert component["value"] == "10k"
+    assert component.get("footprint") is None and "footprint" not in component
+    assert component["position"] == {"x": 1.0, "y": 2.0, "angle": 90.0}
+    assert as_dict(component) == {
+        "lib_id": "Device:R", "reference": "R1", "value": "10k",
+        "position": {"x": 1.0, "y": 2.0, "angle": 90.0},
+        "pins": [{"num": "1", "name": "~", "type": "passive"}, {"num": "2", "name": ""}]
+    }
+    assert pickle.loads(pickle.dumps(component)) == component
+
+
+def test_placed_components_share_fields():
+    component = Component(lib_id="Device:R", reference="R1", value="10k", pins=[Pin("1")])
+    placed = component.placed("R101", "/Sub/")
+
+    assert (placed.reference, placed.sheet) == ("R101", "/Sub/")
+    assert placed.pins is component.pins
+    assert as_dict({"net": [NetPin("R1", "1")]}) == {"net": [{"component": "R1", "pin": "1"}]}
+
+
+def test_netlist_takes_less_memory_than_plain_dictionaries(tmp_path):
+    path = write(str(tmp_path / "divider.kicad_sch"), divider(300))
+    # Library pin tables and interned strings are shared by later parses
+    extract_netlist(path, cache=None)
+    clear_sheet_states()
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        netlist = extract_netlist(path, cache=None)
+        clear_sheet_states()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+
+        plain = as_dict(netlist)
+        gc.collect()
+        plain_size = tracemalloc.get_traced_memory()[0] - retained
+    finally:
+        tracemalloc.stop()
+
+    assert len(plain["components"]) == 900
+    # The same data as nested dictionaries, not counting the strings it
+    # shares with the records, takes over twice the memory
+    assert retained < plain_size / 2
@@ -0,0 +1,141 @@
+"""
+Tests for the S-expression tokenizer, tree and streaming reader.
+"""
+import time
+
+import pytest
+
+from kicad_mcp.utils.netlist_parser import extract_netlist
+from kicad_mcp.utils.schematic_model import as_dict
+from kicad_mcp.utils.sexpr_parser import SExprReader, map_file, parse_sexpr, split_top_level
+from kicad_mcp.utils.sheet_state import clear_sheet_states
+from tests.schematics import divider, write
+
+
+def test_parse_builds_tree_with_offsets():
+    data = b'(kicad_sch (version 20231120) (symbol (lib_id "Device:R") (at 1.5 -2 90)))'
+    root = parse_sexpr(data)
+
+    assert root.name == "kicad_sch"
+    assert (root.start, root.end) == (0, len(data))
+    symbol = root.child("symbol")
+    assert symbol.child_value("lib_id") == "Device:R"
+    assert symbol.child("at").atoms() == ["1.5", "-2", "90"]
+    assert data[symbol.start:symbol.end] == b'(symbol (lib_id "Device:R") (at 1.5 -2 90))'
+    assert [child.name for child in root.children()] == ["version", "symbol"]
+
+
+def test_parse_quoted_strings():
+    root = parse_sexpr(b'(property "Value" "10k \\"1%\\"\\nline" "a (b) c" "")')
+    assert root.atoms() == ["Value", '10k "1%"\nline', "a (b) c", ""]
+
+
+@pytest.mark.parametrize("data", [b"", b"(a (b)", b"(a))", b"(a) (b)", b"atom"])
+def test_parse_rejects_malformed_input(data):
+    with pytest.raises(ValueError):
+        parse_sexpr(data)
+
+
+def test_reader_streams_only_wanted_items():
+    data = b'(kicad_sch\n  (wire (pts))\n  (symbol (lib_id "A"))\n  (image (data "xyz"))\n  (symbol (lib_id "B"))\n)'
+    reader = SExprReader(data)
+    items = list(reader.items(keep={"symbol"}))
+
+    assert reader.name == "kicad_sch"
+    assert [item.child_value("lib_id") for item in items] == ["A", "B"]
+    assert all(data[item.start:item.end].startswith(b"(symbol") for item in items)
+
+
+def test_split_top_level_matches_parsed_items():
+    data = divider(5).encode('utf-8')
+    spans = split_top_level(data)
+    items = parse_sexpr(data).children()
+
+    for (start, end, head), item in zip(spans, items):
+        assert (start, head) == (item.start, item.name)
+        assert data[item.end:end].strip() == b""
+
+
+def _parse_time(data: bytes) -> float:
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        parse_sexpr(data)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def test_parse_time_grows_linearly_with_file_size():
+    small = divider(250).encode('utf-8')
+    large = divider(2000).encode('utf-8')
+    size_ratio = len(large) / len(small)
+
+    time_ratio = _parse_time(large) / _parse_time(small)
+
+    # A quadratic parser would take about size_ratio ** 2 times longer
+    assert time_ratio < size_ratio * 2
+
+
+def test_mapped_empty_file(tmp_path):
+    path = tmp_path / "empty.kicad_sch"
+    path.write_bytes(b"")
+
+    with map_file(str(path)) as content:
+        assert content == b""
+        reader = SExprReader(content)
+        assert reader.name is None
+        assert list(reader.items()) == []
+
+
+def test_mapped_file_skips_unwanted_items(tmp_path):
+    path = tmp_path / "sheet.kicad_sch"
+    path.write_bytes(b'(kicad_sch\n  (image (data "((not" "parsed)))"))\n  (symbol (lib_id "A") (at 1 2 0))\n'
+                     b'  (wire (pts (xy 0 0) (xy 1 1)))\n  (symbol (lib_id "B"))\n)\n')
+
+    with map_file(str(path)) as content:
+        reader = SExprReader(content)
+        symbols = list(reader.items(keep={"symbol"}))
+        assert [item.child_value("lib_id") for item in symbols] == ["A", "B"]
+        assert content[symbols[0].start:symbols[0].end] == b'(symbol (lib_id "A") (at 1 2 0))'
+        assert [item.name for item in SExprReader(content).items()] == ["image", "symbol", "wire", "symbol"]
+
+
+def test_long_string_atoms_with_escaped_quotes(tmp_path):
+    # Embedded images and long descriptions become atoms of megabytes
+    text = ('x' * 200000 + '\\"quoted\\" (paren) \\\\') * 5
+    path = tmp_path / "image.kicad_sch"
+    path.write_bytes(f'(kicad_sch\n  (image (data "{text}" "after"))\n  (symbol (lib_id "A"))\n)\n'.encode())
+
+    expected = ('x' * 200000 + '"quoted" (paren) \\') * 5
+    with map_file(str(path)) as content:
+        image, item = SExprReader(content).items()
+        assert image.child("data").atoms() == [expected, "after"]
+        assert item.child_value("lib_id") == "A"
+        assert [item.name for item in SExprReader(content).items(keep={"symbol"})] == ["symbol"]
+
+
+@pytest.mark.parametrize("data", [b"(kicad_sch (symbol (at 1 2)", b")(kicad_sch)", b"x (kicad_sch)"])
+def test_reader_rejects_malformed_input(data):
+    with pytest.raises(ValueError):
+        list(SExprReader(data).items())
+
+
+def test_symbols_before_lib_symbols(tmp_path):
+    text = divider(3)
+    start = text.index("  (lib_symbols")
+    end = text.index("\n  )\n", start) + len("\n  )\n")
+    moved = text[:start] + text[end:-2] + text[start:end] + ")\n"
+    assert moved.index("(lib_symbols") > moved.index("(symbol (lib_id")
+
+    normal = extract_netlist(write(str(tmp_path / "normal.kicad_sch"), text), cache=None)
+    clear_sheet_states()
+    reordered = extract_netlist(write(str(tmp_path / "moved.kicad_sch"), moved), cache=None)
+    clear_sheet_states()
+
+    assert as_dict(reordered)["nets"] == as_dict(normal)["nets"]
+    assert reordered["nets"]["/SIG1"] == normal["nets"]["/SIG1"]
+    assert len(reordered["nets"]["/SIG1"]) == 2
+
+
+def test_reader_stops_at_the_end_of_the_root():
+    assert [item.name for item in SExprReader(b"(kicad_sch (a)) trailing (b)").items()] == ["a"]